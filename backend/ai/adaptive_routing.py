@@ -0,0 +1,172 @@
+"""
+Adaptive Routing
+Circuit breakers and health-aware model ranking for MultiModelRouter
+"""
+import time
+from typing import Any, Dict, List, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the model's circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Per-model circuit breaker.
+
+    closed     → requests flow normally
+    open       → model is skipped until cooldown_seconds have passed
+    half_open  → one probe request is let through; success closes the
+                 circuit, failure re-opens it, and a probe that ends with
+                 neither (cancelled) frees the slot for the next request
+
+    Opens after failure_threshold consecutive failures (errors or timeouts).
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 3, cooldown_seconds: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        """True if a request may be sent to this model now"""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at >= self.cooldown_seconds:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            else:
+                return False
+        # HALF_OPEN: a single probe at a time
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def is_open(self) -> bool:
+        """True while the model should be routed around (no side effects)"""
+        if self.state == self.OPEN:
+            return time.monotonic() - self.opened_at < self.cooldown_seconds
+        return self.state == self.HALF_OPEN and self._probe_in_flight
+
+    def release_probe(self):
+        """Free the half-open probe slot without an outcome (the probe was cancelled)"""
+        self._probe_in_flight = False
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info(f"🟢 Circuit closed for {self.name}")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+                logger.warning(
+                    f"🔴 Circuit opened for {self.name} after {self.consecutive_failures} failures "
+                    f"(cooldown {self.cooldown_seconds}s)"
+                )
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def get_status(self) -> Dict[str, Any]:
+        remaining = 0.0
+        if self.state == self.OPEN and self.opened_at is not None:
+            remaining = max(0.0, self.cooldown_seconds - (time.monotonic() - self.opened_at))
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "cooldown_remaining_s": round(remaining, 1)
+        }
+
+
+# Tier preference per complexity - the prior the adaptive scorer starts from.
+# Earlier entries are preferred when health data is equal.
+TIER_PREFERENCES = {
+    "simple": ["ollama", "gemini", "haiku", "claude", "openai"],
+    "moderate": ["gemini", "ollama", "haiku", "claude", "openai"],
+    "complex_code": ["claude", "openai", "haiku", "gemini", "ollama"],
+    "complex": ["haiku", "claude", "openai", "gemini", "ollama"],
+}
+
+
+class AdaptiveScorer:
+    """
+    Ranks models by a cost function learned from rolling health stats.
+
+    score = tier_rank * rank_weight
+          + p95_latency_s * latency_weight
+          + (error_rate + timeout_rate) * error_weight
+          + truncation_rate * truncation_weight
+          + cost_per_1k * cost_weight
+
+    Lower is better. Models with fewer than min_samples observations are
+    scored on their tier rank and static latency/cost only, so new models
+    still get traffic and build up history.
+    """
+
+    def __init__(
+        self,
+        rank_weight: float = 1.0,
+        latency_weight: float = 0.1,
+        error_weight: float = 8.0,
+        truncation_weight: float = 2.0,
+        cost_weight: float = 50.0,
+        min_samples: int = 5
+    ):
+        self.rank_weight = rank_weight
+        self.latency_weight = latency_weight
+        self.error_weight = error_weight
+        self.truncation_weight = truncation_weight
+        self.cost_weight = cost_weight
+        self.min_samples = min_samples
+
+    def score(self, name: str, model, tier: List[str], health: Dict[str, Any]) -> float:
+        rank = tier.index(name) if name in tier else len(tier)
+        # ollama_code is an alias of ollama
+        if name.startswith("ollama") and "ollama" in tier:
+            rank = tier.index("ollama")
+
+        score = rank * self.rank_weight
+        score += getattr(model, "cost_per_1k_tokens", 0.0) * self.cost_weight
+
+        if health.get("samples", 0) >= self.min_samples:
+            score += (health.get("p95_latency_ms", 0) / 1000) * self.latency_weight
+            score += (health.get("error_rate", 0) + health.get("timeout_rate", 0)) * self.error_weight
+            score += health.get("truncation_rate", 0) * self.truncation_weight
+        else:
+            score += (getattr(model, "avg_latency_ms", 0) / 1000) * self.latency_weight
+        return score
+
+    def rank(
+        self,
+        candidates: Dict[str, Any],
+        tier_key: str,
+        health_by_model: Dict[str, Dict[str, Any]]
+    ) -> List[str]:
+        """Candidate names ordered best-first"""
+        tier = TIER_PREFERENCES.get(tier_key, [])
+        scored = [
+            (self.score(name, model, tier, health_by_model.get(name, {})), name)
+            for name, model in candidates.items()
+        ]
+        return [name for _, name in sorted(scored)]
@@ -3,9 +3,11 @@ Base AI Model Client Interface
 Provides unified interface for multiple AI providers
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator
 from enum import Enum
 
+from .http_pool import get_http_pool
+
 
 class ModelCapability(Enum):
     """Model capabilities for routing decisions"""
@@ -37,6 +39,9 @@ class BaseModelClient(ABC):
         self.input_cost_per_1m = 0.0
         self.output_cost_per_1m = 0.0
 
+        # Shared keep-alive connection pool (managed from app/lifespan.py)
+        self.http_pool = get_http_pool()
+
     @abstractmethod
     async def generate(
         self,
@@ -60,6 +65,30 @@ class BaseModelClient(ABC):
         """
         pass
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 8192,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream completion from model as text chunks
+
+        Subclasses override this with native provider streaming. The
+        default yields the whole generate() result as a single chunk.
+        After the iterator is exhausted, last_truncated and the token/cost
+        attributes describe the streamed response, same as after generate().
+        """
+        yield await self.generate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        )
+
     @abstractmethod
     async def analyze_code(self, code: str, task: str) -> Dict[str, Any]:
         """
@@ -90,5 +119,6 @@ class BaseModelClient(ABC):
             "model_name": self.model_name,
             "capabilities": [c.value for c in self.capabilities],
             "cost_per_1k_tokens": self.cost_per_1k_tokens,
-            "avg_latency_ms": self.avg_latency_ms
+            "avg_latency_ms": self.avg_latency_ms,
+            "connection_stats": self.http_pool.get_client_stats(self.model_name)
         }
@@ -3,7 +3,8 @@ Claude AI Model Client
 Anthropic Claude integration
 """
 import anthropic
-from typing import Dict, Any, Optional, List
+import asyncio
+from typing import Dict, Any, Optional, List, AsyncIterator
 import time
 
 from .base_client import BaseModelClient, ModelCapability
@@ -18,8 +19,12 @@ class ClaudeClient(BaseModelClient):
     def __init__(self, model_name: str = "claude-sonnet-4-5-20250929", api_key: str = ""):
         super().__init__(model_name, api_key)
 
-        # Initialize Anthropic client
-        self.client = anthropic.Anthropic(api_key=api_key)
+        # Initialize Anthropic client on the shared keep-alive pool
+        self.client = anthropic.Anthropic(
+            api_key=api_key,
+            http_client=self.http_pool.get_httpx_client(model_name)
+        )
+        self._async_client = None  # Created on first stream (needs a running loop)
 
         # Set capabilities
         self.capabilities = [
@@ -50,8 +55,10 @@ class ClaudeClient(BaseModelClient):
             # Prepare messages
             messages = [{"role": "user", "content": prompt}]
 
-            # Create completion
-            response = self.client.messages.create(
+            # The SDK call blocks: run it off the event loop so concurrent
+            # requests overlap and callers' timeouts can fire
+            response = await asyncio.to_thread(
+                self.client.messages.create,
                 model=self.model_name,
                 max_tokens=max_tokens,
                 temperature=temperature,
@@ -61,6 +68,7 @@ class ClaudeClient(BaseModelClient):
 
             # Update latency
             self.avg_latency_ms = int((time.time() - start_time) * 1000)
+            self.http_pool.record_request(self.model_name, start_time)
 
             # Check if response was truncated by token limit
             self.last_truncated = getattr(response, 'stop_reason', None) == 'max_tokens'
@@ -68,18 +76,7 @@ class ClaudeClient(BaseModelClient):
                 logger.warning(f"⚠️ Claude response TRUNCATED (hit max_tokens={max_tokens}). Output is incomplete!")
 
             # Extract actual token usage from Anthropic API response
-            usage = getattr(response, 'usage', None)
-            if usage:
-                self.last_input_tokens = getattr(usage, 'input_tokens', 0)
-                self.last_output_tokens = getattr(usage, 'output_tokens', 0)
-                self.last_cost = (
-                    (self.last_input_tokens / 1_000_000) * self.input_cost_per_1m +
-                    (self.last_output_tokens / 1_000_000) * self.output_cost_per_1m
-                )
-            else:
-                self.last_input_tokens = 0
-                self.last_output_tokens = 0
-                self.last_cost = 0.0
+            self._record_usage(getattr(response, 'usage', None))
 
             # Extract text
             result = response.content[0].text
@@ -88,9 +85,67 @@ class ClaudeClient(BaseModelClient):
             return result
 
         except Exception as e:
+            self.http_pool.record_request(self.model_name, start_time, error=True)
             logger.error(f"Claude generation failed: {e}")
             raise
 
+    def _record_usage(self, usage):
+        """Set last_* token/cost attributes from an Anthropic usage object"""
+        if usage:
+            self.last_input_tokens = getattr(usage, 'input_tokens', 0)
+            self.last_output_tokens = getattr(usage, 'output_tokens', 0)
+            self.last_cost = (
+                (self.last_input_tokens / 1_000_000) * self.input_cost_per_1m +
+                (self.last_output_tokens / 1_000_000) * self.output_cost_per_1m
+            )
+        else:
+            self.last_input_tokens = 0
+            self.last_output_tokens = 0
+            self.last_cost = 0.0
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 8192,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream completion chunks using Claude's messages stream"""
+        start_time = time.time()
+        try:
+            if self._async_client is None:
+                self._async_client = anthropic.AsyncAnthropic(
+                    api_key=self.api_key,
+                    http_client=self.http_pool.get_async_httpx_client(self.model_name)
+                )
+
+            async with self._async_client.messages.stream(
+                model=self.model_name,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=system_prompt or "",
+                messages=[{"role": "user", "content": prompt}]
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+                final_message = await stream.get_final_message()
+
+            self.avg_latency_ms = int((time.time() - start_time) * 1000)
+            self.http_pool.record_request(self.model_name, start_time)
+
+            self.last_truncated = getattr(final_message, 'stop_reason', None) == 'max_tokens'
+            if self.last_truncated:
+                logger.warning(f"⚠️ Claude stream TRUNCATED (hit max_tokens={max_tokens}). Output is incomplete!")
+            self._record_usage(getattr(final_message, 'usage', None))
+
+            logger.info(f"Claude [{self.model_name}] streamed {self.last_input_tokens}in/{self.last_output_tokens}out tokens, ${self.last_cost:.6f}, {self.avg_latency_ms}ms (truncated={self.last_truncated})")
+
+        except Exception as e:
+            self.http_pool.record_request(self.model_name, start_time, error=True)
+            logger.error(f"Claude streaming failed: {e}")
+            raise
+
     async def analyze_code(self, code: str, task: str) -> Dict[str, Any]:
         """Analyze code using Claude"""
         try:
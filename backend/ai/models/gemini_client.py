@@ -3,7 +3,7 @@ Gemini AI Model Client
 Google Gemini integration
 """
 import google.generativeai as genai
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator
 import time
 import json
 
@@ -53,8 +53,9 @@ class GeminiClient(BaseModelClient):
             if system_prompt:
                 full_prompt = f"{system_prompt}\n\n{prompt}"
 
-            # Generate response
-            response = self.client.generate_content(
+            # Async variant (as in generate_stream): the blocking call would
+            # stall the event loop and every caller's timeout with it
+            response = await self.client.generate_content_async(
                 full_prompt,
                 generation_config=genai.types.GenerationConfig(
                     temperature=temperature,
@@ -62,8 +63,9 @@ class GeminiClient(BaseModelClient):
                 )
             )
 
-            # Update latency
+            # Update latency (google-generativeai manages its own gRPC channel)
             self.avg_latency_ms = int((time.time() - start_time) * 1000)
+            self.http_pool.record_request(self.model_name, start_time)
 
             # Check if response was truncated by token limit
             self.last_truncated = False
@@ -83,9 +85,61 @@ class GeminiClient(BaseModelClient):
             return result
 
         except Exception as e:
+            self.http_pool.record_request(self.model_name, start_time, error=True)
             logger.error(f"Gemini generation failed: {e}")
             raise
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 8192,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream completion chunks using Gemini"""
+        start_time = time.time()
+        try:
+            full_prompt = prompt
+            if system_prompt:
+                full_prompt = f"{system_prompt}\n\n{prompt}"
+
+            response = await self.client.generate_content_async(
+                full_prompt,
+                generation_config=genai.types.GenerationConfig(
+                    temperature=temperature,
+                    max_output_tokens=max_tokens
+                ),
+                stream=True
+            )
+
+            finish_reason = None
+            async for chunk in response:
+                try:
+                    if chunk.candidates and hasattr(chunk.candidates[0], 'finish_reason'):
+                        finish_reason = chunk.candidates[0].finish_reason
+                    text = chunk.text
+                except Exception:
+                    # Chunks without text parts (e.g. final safety metadata)
+                    continue
+                if text:
+                    yield text
+
+            self.avg_latency_ms = int((time.time() - start_time) * 1000)
+            self.http_pool.record_request(self.model_name, start_time)
+
+            # Gemini uses enum: 1=STOP (normal), 2=MAX_TOKENS, 3=SAFETY, etc.
+            self.last_truncated = finish_reason == 2 or str(finish_reason) == 'MAX_TOKENS'
+            if self.last_truncated:
+                logger.warning(f"⚠️ Gemini stream TRUNCATED (hit max_output_tokens={max_tokens}). Output is incomplete!")
+
+            logger.info(f"Gemini streamed in {self.avg_latency_ms}ms (truncated={self.last_truncated})")
+
+        except Exception as e:
+            self.http_pool.record_request(self.model_name, start_time, error=True)
+            logger.error(f"Gemini streaming failed: {e}")
+            raise
+
     async def analyze_code(self, code: str, task: str) -> Dict[str, Any]:
         """Analyze code using Gemini"""
         try:
@@ -0,0 +1,260 @@
+"""
+Shared HTTP connection pool for model clients.
+
+Every model client used to build its own transport: Ollama opened a new
+aiohttp.ClientSession (new TCP connection, DNS lookup and 1MB read buffer)
+per call, and the SDK clients each created a private httpx client. This
+module owns one keep-alive pool per transport for the lifetime of the
+application:
+
+- an aiohttp.ClientSession for raw HTTP clients (Ollama)
+- an httpx transport shared by the Anthropic/OpenAI SDKs; each model gets
+  its own thin httpx.Client over it (handed in via ``http_client``) so raw
+  HTTP traffic, including SDK retries, is attributed to that model
+- the same for the SDKs' async (streaming) clients
+
+Lifecycle is driven from app/lifespan.py (start on startup, close on
+shutdown). Sessions are also created lazily so scripts and tests that
+never run the lifespan still work.
+"""
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class HTTPConnectionPool:
+    """
+    Application-wide keep-alive connection pool.
+
+    Per-client metrics are keyed by the name clients pass as
+    ``client_name`` (usually the model name) and include request count,
+    errors, latency and, for aiohttp requests, how many requests reused a
+    pooled connection versus opening a new one.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        keepalive_timeout: float = 60.0,
+        dns_cache_ttl: int = 300,
+        read_bufsize: int = 2**20
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.read_bufsize = read_bufsize
+
+        self._session = None
+        self._session_loop = None
+        self._httpx_transport = None
+        self._async_httpx_transport = None
+        self._httpx_clients: Dict[str, Any] = {}
+        self._async_httpx_clients: Dict[str, Any] = {}
+        self._lock = asyncio.Lock()
+        self.client_metrics: Dict[str, Dict[str, Any]] = {}
+
+    # ------------------------------------------------------------------
+    # aiohttp
+    # ------------------------------------------------------------------
+
+    def _build_trace_config(self):
+        import aiohttp
+
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_connection_create_end(session, ctx, params):
+            name = (ctx.trace_request_ctx or {}).get('client_name')
+            if name:
+                self._metrics_for(name)['new_connections'] += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            name = (ctx.trace_request_ctx or {}).get('client_name')
+            if name:
+                self._metrics_for(name)['reused_connections'] += 1
+
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    async def start(self):
+        """Create the shared aiohttp session on the running loop"""
+        await self.get_session()
+
+    async def get_session(self):
+        """Get the shared aiohttp session, creating it on first use"""
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed and self._session_loop is loop:
+            return self._session
+
+        async with self._lock:
+            if self._session is None or self._session.closed or self._session_loop is not loop:
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=self.dns_cache_ttl
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    read_bufsize=self.read_bufsize,
+                    trace_configs=[self._build_trace_config()]
+                )
+                self._session_loop = loop
+                logger.info("Shared aiohttp session created", extra={
+                    "limit": self.limit,
+                    "limit_per_host": self.limit_per_host,
+                    "keepalive_timeout": self.keepalive_timeout
+                })
+        return self._session
+
+    # ------------------------------------------------------------------
+    # httpx (SDK clients)
+    # ------------------------------------------------------------------
+
+    def _httpx_options(self) -> Dict[str, Any]:
+        import httpx
+
+        return {
+            'limits': httpx.Limits(
+                max_connections=self.limit,
+                max_keepalive_connections=self.limit_per_host,
+                keepalive_expiry=self.keepalive_timeout
+            )
+        }
+
+    def get_httpx_client(self, client_name: str):
+        """Synchronous httpx client for one SDK client, on the shared transport"""
+        import httpx
+
+        if self._httpx_transport is None:
+            self._httpx_transport = httpx.HTTPTransport(**self._httpx_options())
+        client = self._httpx_clients.get(client_name)
+        if client is None or client.is_closed:
+            def on_response(response):
+                self._on_httpx_response(client_name)
+
+            client = httpx.Client(
+                transport=self._httpx_transport,
+                timeout=httpx.Timeout(600.0, connect=10.0),
+                event_hooks={'response': [on_response]}
+            )
+            self._httpx_clients[client_name] = client
+        return client
+
+    def get_async_httpx_client(self, client_name: str):
+        """Async httpx client for one SDK client's streaming, on the shared transport"""
+        import httpx
+
+        if self._async_httpx_transport is None:
+            self._async_httpx_transport = httpx.AsyncHTTPTransport(**self._httpx_options())
+        client = self._async_httpx_clients.get(client_name)
+        if client is None or client.is_closed:
+            async def on_response(response):
+                self._on_httpx_response(client_name)
+
+            client = httpx.AsyncClient(
+                transport=self._async_httpx_transport,
+                timeout=httpx.Timeout(600.0, connect=10.0),
+                event_hooks={'response': [on_response]}
+            )
+            self._async_httpx_clients[client_name] = client
+        return client
+
+    def _on_httpx_response(self, client_name: str):
+        # Counts every HTTP exchange, so SDK retries show up next to 'requests'
+        self._metrics_for(client_name)['http_requests'] += 1
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def _metrics_for(self, client_name: str) -> Dict[str, Any]:
+        if client_name not in self.client_metrics:
+            self.client_metrics[client_name] = {
+                'requests': 0,
+                'http_requests': 0,
+                'errors': 0,
+                'total_latency_ms': 0.0,
+                'new_connections': 0,
+                'reused_connections': 0
+            }
+        return self.client_metrics[client_name]
+
+    def record_request(self, client_name: str, start_time: float, error: bool = False):
+        """Record one logical request made by a model client"""
+        metrics = self._metrics_for(client_name)
+        metrics['requests'] += 1
+        metrics['total_latency_ms'] += (time.time() - start_time) * 1000
+        if error:
+            metrics['errors'] += 1
+
+    def get_client_stats(self, client_name: str) -> Dict[str, Any]:
+        """Connection reuse and latency metrics for one client"""
+        metrics = dict(self._metrics_for(client_name))
+        requests = metrics['requests']
+        connections = metrics['new_connections'] + metrics['reused_connections']
+        metrics['avg_latency_ms'] = round(metrics['total_latency_ms'] / requests, 1) if requests else 0.0
+        metrics['connection_reuse_rate'] = (
+            round(metrics['reused_connections'] / connections, 3) if connections else None
+        )
+        return metrics
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool configuration, open connections and per-client metrics"""
+        open_connections = None
+        if self._session is not None and not self._session.closed:
+            connector = self._session.connector
+            open_connections = sum(len(conns) for conns in getattr(connector, '_conns', {}).values())
+
+        return {
+            'limit': self.limit,
+            'limit_per_host': self.limit_per_host,
+            'keepalive_timeout': self.keepalive_timeout,
+            'aiohttp_session_open': self._session is not None and not self._session.closed,
+            'idle_keepalive_connections': open_connections,
+            'httpx_clients': len(self._httpx_clients) + len(self._async_httpx_clients),
+            'clients': {name: self.get_client_stats(name) for name in self.client_metrics}
+        }
+
+    async def close(self):
+        """Close both transports (called on application shutdown)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        # The clients share one transport each; closing the transport closes the pool
+        if self._httpx_transport is not None:
+            self._httpx_transport.close()
+        self._httpx_transport = None
+        self._httpx_clients.clear()
+        if self._async_httpx_transport is not None:
+            await self._async_httpx_transport.aclose()
+        self._async_httpx_transport = None
+        self._async_httpx_clients.clear()
+        logger.info("Shared HTTP connection pool closed")
+
+
+# Global instance
+_http_pool: Optional[HTTPConnectionPool] = None
+
+
+def get_http_pool() -> HTTPConnectionPool:
+    """Get the process-wide HTTP connection pool"""
+    global _http_pool
+    if _http_pool is None:
+        _http_pool = HTTPConnectionPool()
+    return _http_pool
+
+
+def configure_http_pool(**kwargs) -> HTTPConnectionPool:
+    """Replace the global pool with one using the given limits (call before clients are built)"""
+    global _http_pool
+    _http_pool = HTTPConnectionPool(**kwargs)
+    return _http_pool
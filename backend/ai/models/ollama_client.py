@@ -7,7 +7,7 @@ import aiohttp
 import json
 import re
 import time
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator
 
 from .base_client import BaseModelClient, ModelCapability
 from utils.logger import get_logger
@@ -59,6 +59,31 @@ class OllamaClient(BaseModelClient):
 
         logger.info(f"Ollama client initialized: {model_name} @ {base_url}")
 
+    def _build_messages(self, prompt: str, system_prompt: Optional[str]) -> List[Dict[str, str]]:
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        # Add /no_think to disable qwen3 thinking mode (saves 30-50% gen time on CPU)
+        user_content = f"/no_think\n{prompt}" if 'qwen3' in self.model_name else prompt
+        messages.append({"role": "user", "content": user_content})
+        return messages
+
+    def _effective_tokens(self, max_tokens: int) -> int:
+        # Enforce minimum num_predict for qwen3: thinking can eat 200-400 tokens
+        # even with /no_think, so low values produce 0 chars output
+        return max(max_tokens, 500) if 'qwen3' in self.model_name else max_tokens
+
+    def _check_truncation(self, data: Dict[str, Any], effective_tokens: int):
+        """Set last_truncated from the final Ollama response object"""
+        done_reason = data.get("done_reason", "")
+        eval_count = data.get("eval_count", 0)
+        self.last_truncated = done_reason == "length" or (eval_count >= effective_tokens and eval_count > 0)
+        if self.last_truncated:
+            logger.warning(
+                f"⚠️ Ollama response TRUNCATED (done_reason={done_reason}, "
+                f"eval_count={eval_count}, num_predict={effective_tokens}). Output is incomplete!"
+            )
+
     async def generate(
         self,
         prompt: str,
@@ -72,76 +97,149 @@ class OllamaClient(BaseModelClient):
         try:
             start_time = time.time()
 
-            # Build messages
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            # Add /no_think to disable qwen3 thinking mode (saves 30-50% gen time on CPU)
-            user_content = f"/no_think\n{prompt}" if 'qwen3' in self.model_name else prompt
-            messages.append({"role": "user", "content": user_content})
-
-            # Enforce minimum num_predict for qwen3: thinking can eat 200-400 tokens
-            # even with /no_think, so low values produce 0 chars output
-            effective_tokens = max(max_tokens, 500) if 'qwen3' in self.model_name else max_tokens
-
-            # Call Ollama API
-            async with aiohttp.ClientSession(
-                read_bufsize=2**20  # 1MB read buffer for large responses
-            ) as session:
-                async with session.post(
-                    f"{self.base_url}/api/chat",
-                    json={
-                        "model": self.model_name,
-                        "messages": messages,
-                        "stream": False,
-                        "options": {
-                            "temperature": temperature,
-                            "num_predict": effective_tokens,
-                            "num_ctx": 4096
-                        }
-                    },
-                    timeout=aiohttp.ClientTimeout(total=timeout_s)
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"Ollama HTTP {response.status}: {error_text[:500]}")
-                        raise Exception(f"Ollama error {response.status}: {error_text[:200]}")
-
-                    # Read full response body before parsing
-                    raw_body = await response.read()
-                    data = json.loads(raw_body)
-                    result = data.get("message", {}).get("content", "")
-
-                    # Strip <think>...</think> blocks from qwen3 responses
-                    if '<think>' in result:
-                        result = self._THINK_RE.sub('', result).strip()
-
-                    # Check if response was truncated by token limit
-                    done_reason = data.get("done_reason", "")
-                    eval_count = data.get("eval_count", 0)
-                    self.last_truncated = done_reason == "length" or (eval_count >= effective_tokens and eval_count > 0)
-                    if self.last_truncated:
-                        logger.warning(
-                            f"⚠️ Ollama response TRUNCATED (done_reason={done_reason}, "
-                            f"eval_count={eval_count}, num_predict={effective_tokens}). Output is incomplete!"
-                        )
+            messages = self._build_messages(prompt, system_prompt)
+            effective_tokens = self._effective_tokens(max_tokens)
+
+            # Call Ollama API over the shared keep-alive session
+            session = await self.http_pool.get_session()
+            async with session.post(
+                f"{self.base_url}/api/chat",
+                json={
+                    "model": self.model_name,
+                    "messages": messages,
+                    "stream": False,
+                    "options": {
+                        "temperature": temperature,
+                        "num_predict": effective_tokens,
+                        "num_ctx": 4096
+                    }
+                },
+                timeout=aiohttp.ClientTimeout(total=timeout_s),
+                trace_request_ctx={'client_name': self.model_name}
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    logger.error(f"Ollama HTTP {response.status}: {error_text[:500]}")
+                    raise Exception(f"Ollama error {response.status}: {error_text[:200]}")
+
+                # Read full response body before parsing
+                raw_body = await response.read()
+                data = json.loads(raw_body)
+                result = data.get("message", {}).get("content", "")
+
+                # Strip <think>...</think> blocks from qwen3 responses
+                if '<think>' in result:
+                    result = self._THINK_RE.sub('', result).strip()
+
+                # Check if response was truncated by token limit
+                self._check_truncation(data, effective_tokens)
 
             # Update latency
             self.avg_latency_ms = int((time.time() - start_time) * 1000)
+            self.http_pool.record_request(self.model_name, start_time)
 
             logger.info(f"Ollama ({self.model_name}) generated {len(result)} chars in {self.avg_latency_ms}ms (truncated={self.last_truncated})")
             return result
 
         except asyncio.TimeoutError:
+            self.http_pool.record_request(self.model_name, start_time, error=True)
             logger.warning(f"Ollama timed out after {timeout_s}s (model={self.model_name}), using cloud fallback")
             raise Exception(f"Ollama timed out after {timeout_s}s")
         except aiohttp.ClientError as e:
+            self.http_pool.record_request(self.model_name, start_time, error=True)
             logger.error(f"Ollama connection error: {e}")
             raise Exception(f"Cannot connect to Ollama at {self.base_url}. Is it running?")
         except Exception as e:
             logger.error(f"Ollama generation failed ({type(e).__name__}): {e}")
             raise
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 8192,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream completion chunks from local Ollama (NDJSON chat stream)"""
+        timeout_s = kwargs.get('timeout', 120)
+        start_time = time.time()
+        effective_tokens = self._effective_tokens(max_tokens)
+        self.last_truncated = False
+
+        # A leading <think>...</think> block is held back until it closes
+        pending = ""
+        in_preamble = True
+
+        try:
+            session = await self.http_pool.get_session()
+            async with session.post(
+                f"{self.base_url}/api/chat",
+                json={
+                    "model": self.model_name,
+                    "messages": self._build_messages(prompt, system_prompt),
+                    "stream": True,
+                    "options": {
+                        "temperature": temperature,
+                        "num_predict": effective_tokens,
+                        "num_ctx": 4096
+                    }
+                },
+                # Total timeout bounds the whole stream
+                timeout=aiohttp.ClientTimeout(total=timeout_s),
+                trace_request_ctx={'client_name': self.model_name}
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    logger.error(f"Ollama HTTP {response.status}: {error_text[:500]}")
+                    raise Exception(f"Ollama error {response.status}: {error_text[:200]}")
+
+                async for line in response.content:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    chunk = data.get("message", {}).get("content", "")
+
+                    if in_preamble:
+                        pending += chunk
+                        stripped = pending.lstrip()
+                        if stripped.startswith('<think>'):
+                            if '</think>' not in stripped:
+                                chunk = ""
+                            else:
+                                chunk = stripped.split('</think>', 1)[1].lstrip()
+                                in_preamble = False
+                        elif '<think>'.startswith(stripped):
+                            # Could still be the start of a think tag
+                            chunk = ""
+                        else:
+                            chunk = pending
+                            in_preamble = False
+
+                    if chunk:
+                        yield chunk
+
+                    if data.get("done"):
+                        self._check_truncation(data, effective_tokens)
+                        break
+
+                if in_preamble and pending and '<think>' not in pending:
+                    yield pending
+
+            self.avg_latency_ms = int((time.time() - start_time) * 1000)
+            self.http_pool.record_request(self.model_name, start_time)
+            logger.info(f"Ollama ({self.model_name}) streamed in {self.avg_latency_ms}ms (truncated={self.last_truncated})")
+
+        except asyncio.TimeoutError:
+            self.http_pool.record_request(self.model_name, start_time, error=True)
+            logger.warning(f"Ollama stream timed out after {timeout_s}s (model={self.model_name})")
+            raise Exception(f"Ollama timed out after {timeout_s}s")
+        except aiohttp.ClientError as e:
+            self.http_pool.record_request(self.model_name, start_time, error=True)
+            logger.error(f"Ollama connection error: {e}")
+            raise Exception(f"Cannot connect to Ollama at {self.base_url}. Is it running?")
+
     async def analyze_code(self, code: str, task: str) -> Dict[str, Any]:
         """Analyze code using Ollama (basic analysis)"""
         try:
@@ -210,26 +308,26 @@ Respond with JSON only:
     async def health_check(self) -> bool:
         """Check if Ollama is available"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/api/tags",
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as response:
-                    return response.status == 200
+            session = await self.http_pool.get_session()
+            async with session.get(
+                f"{self.base_url}/api/tags",
+                timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                return response.status == 200
         except:
             return False
 
     async def list_models(self) -> List[str]:
         """List available Ollama models"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/api/tags",
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return [m["name"] for m in data.get("models", [])]
+            session = await self.http_pool.get_session()
+            async with session.get(
+                f"{self.base_url}/api/tags",
+                timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return [m["name"] for m in data.get("models", [])]
         except:
             pass
         return []
@@ -238,13 +336,13 @@ Respond with JSON only:
         """Pull a model if not available"""
         try:
             logger.info(f"Pulling Ollama model: {model_name}")
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/api/pull",
-                    json={"name": model_name},
-                    timeout=aiohttp.ClientTimeout(total=600)  # 10 min for large models
-                ) as response:
-                    return response.status == 200
+            session = await self.http_pool.get_session()
+            async with session.post(
+                f"{self.base_url}/api/pull",
+                json={"name": model_name},
+                timeout=aiohttp.ClientTimeout(total=600)  # 10 min for large models
+            ) as response:
+                return response.status == 200
         except Exception as e:
             logger.error(f"Failed to pull model {model_name}: {e}")
             return False
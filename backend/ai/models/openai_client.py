@@ -3,7 +3,8 @@ OpenAI Model Client
 OpenAI GPT integration (optional)
 """
 import openai
-from typing import Dict, Any, Optional, List
+import asyncio
+from typing import Dict, Any, Optional, List, AsyncIterator
 import time
 import json
 
@@ -19,9 +20,12 @@ class OpenAIClient(BaseModelClient):
     def __init__(self, model_name: str = "gpt-4-turbo-preview", api_key: str = ""):
         super().__init__(model_name, api_key)
 
-        # Initialize OpenAI client
-        openai.api_key = api_key
-        self.client = openai
+        # Initialize OpenAI client on the shared keep-alive pool
+        self.client = openai.OpenAI(
+            api_key=api_key,
+            http_client=self.http_pool.get_httpx_client(model_name)
+        )
+        self._async_client = None  # Created on first stream (needs a running loop)
 
         # Set capabilities
         self.capabilities = [
@@ -52,8 +56,10 @@ class OpenAIClient(BaseModelClient):
                 messages.append({"role": "system", "content": system_prompt})
             messages.append({"role": "user", "content": prompt})
 
-            # Create completion
-            response = self.client.chat.completions.create(
+            # The SDK call blocks: run it off the event loop so concurrent
+            # requests overlap and callers' timeouts can fire
+            response = await asyncio.to_thread(
+                self.client.chat.completions.create,
                 model=self.model_name,
                 messages=messages,
                 temperature=temperature,
@@ -62,6 +68,7 @@ class OpenAIClient(BaseModelClient):
 
             # Update latency
             self.avg_latency_ms = int((time.time() - start_time) * 1000)
+            self.http_pool.record_request(self.model_name, start_time)
 
             # Check if response was truncated by token limit
             self.last_truncated = getattr(response.choices[0], 'finish_reason', None) == 'length'
@@ -74,9 +81,64 @@ class OpenAIClient(BaseModelClient):
             return result
 
         except Exception as e:
+            self.http_pool.record_request(self.model_name, start_time, error=True)
             logger.error(f"OpenAI generation failed: {e}")
             raise
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 8192,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream completion chunks using OpenAI chat completions"""
+        start_time = time.time()
+        try:
+            if self._async_client is None:
+                self._async_client = openai.AsyncOpenAI(
+                    api_key=self.api_key,
+                    http_client=self.http_pool.get_async_httpx_client(self.model_name)
+                )
+
+            messages = []
+            if system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
+            messages.append({"role": "user", "content": prompt})
+
+            stream = await self._async_client.chat.completions.create(
+                model=self.model_name,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+
+            finish_reason = None
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.delta and choice.delta.content:
+                    yield choice.delta.content
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+
+            self.avg_latency_ms = int((time.time() - start_time) * 1000)
+            self.http_pool.record_request(self.model_name, start_time)
+
+            self.last_truncated = finish_reason == 'length'
+            if self.last_truncated:
+                logger.warning(f"⚠️ OpenAI stream TRUNCATED (hit max_tokens={max_tokens}). Output is incomplete!")
+
+            logger.info(f"OpenAI streamed in {self.avg_latency_ms}ms (truncated={self.last_truncated})")
+
+        except Exception as e:
+            self.http_pool.record_request(self.model_name, start_time, error=True)
+            logger.error(f"OpenAI streaming failed: {e}")
+            raise
+
     async def analyze_code(self, code: str, task: str) -> Dict[str, Any]:
         """Analyze code using OpenAI"""
         try:
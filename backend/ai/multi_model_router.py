@@ -2,18 +2,25 @@
 Multi-Model Router
 Intelligently routes tasks to the best AI model based on task characteristics
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator, Awaitable, Callable
+from collections import OrderedDict
 from enum import Enum
 from datetime import datetime
-from pathlib import Path
+import asyncio
+import contextlib
+import hashlib
 import re
-import sqlite3
+import time
 
 from ai.models.base_client import BaseModelClient, ModelCapability
 from ai.models.claude_client import ClaudeClient
 from ai.models.gemini_client import GeminiClient
 from ai.models.openai_client import OpenAIClient
 from ai.models.ollama_client import OllamaClient
+from ai.models.http_pool import get_http_pool
+from ai.router_stats import RouterStatsAggregator
+from ai.adaptive_routing import AdaptiveScorer, CircuitBreaker, CircuitOpenError
+from ai.response_cache import ResponseCache
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -26,6 +33,7 @@ class RoutingStrategy(Enum):
     SPEED = "speed"  # Fastest response
     BALANCED = "balanced"  # Balance of cost/speed/quality
     TIERED = "tiered"  # Smart tiered: Haiku→Gemini→Claude based on complexity
+    ADAPTIVE = "adaptive"  # Tiered prior + learned latency/error/truncation rates, hedging
 
 
 class TaskComplexity(Enum):
@@ -60,89 +68,47 @@ class MultiModelRouter:
         # Initialize available models
         self._initialize_models()
 
-        # Track model performance (persisted to SQLite)
-        self.performance_stats: Dict[str, Dict[str, Any]] = {}
+        # Multi-model analysis: fan-out limits and result cache
+        self.analysis_timeout = config.get("analysis_timeout", 60.0)
+        self.analysis_quorum = config.get("analysis_quorum", 2)
+        self.analysis_agreement_tolerance = config.get("analysis_agreement_tolerance", 15)
+        self.analysis_cache_size = config.get("analysis_cache_size", 512)
+        self.analysis_cache_ttl = config.get("analysis_cache_ttl", 3600)
+        self._analysis_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._analysis_inflight: Dict[str, asyncio.Future] = {}
+        self.analysis_cache_stats = {"hits": 0, "misses": 0}
+
+        # Track model performance (write-behind to SQLite)
+        self.stats = RouterStatsAggregator(
+            db_path=config.get("stats_db_path", "./data/darwin.db"),
+            flush_interval=config.get("stats_flush_interval", 30.0)
+        )
+        self.performance_stats: Dict[str, Dict[str, Any]] = self.stats.totals
         self.start_time = datetime.utcnow()
-        self._init_stats_db()
-        self._load_stats()
-
-        logger.info(f"MultiModelRouter initialized with {len(self.models)} models")
-
-    def _init_stats_db(self):
-        """Create the router_stats table if it doesn't exist."""
-        try:
-            db_path = Path("./data/darwin.db")
-            db_path.parent.mkdir(parents=True, exist_ok=True)
-            conn = sqlite3.connect(str(db_path))
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS router_stats (
-                    model_name TEXT PRIMARY KEY,
-                    total_requests INTEGER DEFAULT 0,
-                    total_latency_ms REAL DEFAULT 0,
-                    total_cost_estimate REAL DEFAULT 0,
-                    total_input_tokens INTEGER DEFAULT 0,
-                    total_output_tokens INTEGER DEFAULT 0,
-                    updated_at TEXT
-                )
-            """)
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            logger.error(f"Failed to init stats DB: {e}")
 
-    def _load_stats(self):
-        """Load accumulated stats from DB on startup."""
-        try:
-            db_path = Path("./data/darwin.db")
-            if not db_path.exists():
-                return
-            conn = sqlite3.connect(str(db_path))
-            conn.row_factory = sqlite3.Row
-            rows = conn.execute("SELECT * FROM router_stats").fetchall()
-            for r in rows:
-                self.performance_stats[r['model_name']] = {
-                    "total_requests": r['total_requests'],
-                    "total_latency_ms": r['total_latency_ms'],
-                    "total_cost_estimate": r['total_cost_estimate'],
-                    "total_input_tokens": r['total_input_tokens'],
-                    "total_output_tokens": r['total_output_tokens'],
-                }
-            conn.close()
-            if self.performance_stats:
-                logger.info(f"Loaded router stats from DB: {list(self.performance_stats.keys())}")
-        except Exception as e:
-            logger.error(f"Failed to load stats from DB: {e}")
+        # Adaptive routing: health-aware scoring, circuit breakers, hedging
+        self.scorer = AdaptiveScorer()
+        self.circuit_failure_threshold = config.get("circuit_failure_threshold", 3)
+        self.circuit_cooldown_seconds = config.get("circuit_cooldown_seconds", 60.0)
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.hedging_enabled = config.get("hedging_enabled", True)
+        self.hedge_after_ms = config.get("hedge_after_ms", 8000)
+        self.hedge_stats = {"hedged": 0, "secondary_won": 0}
+
+        # In-flight calls per model actually called (0 = unbounded)
+        self.max_concurrent_per_model = config.get("max_concurrent_per_model", 0)
+        self._model_slots: Dict[str, asyncio.Semaphore] = {}
+
+        # Opt-in response cache (exact + embedding similarity), see generate(cache=...)
+        self.response_cache: Optional[ResponseCache] = None
+        if config.get("response_cache_enabled", True):
+            self.response_cache = ResponseCache(
+                db_path=config.get("response_cache_db_path", "./data/response_cache.db"),
+                max_entries=config.get("response_cache_max_entries", 2000),
+                similarity_threshold=config.get("response_cache_similarity", 0.95)
+            )
 
-    def _save_stats(self, model_name: str):
-        """Persist stats for one model after each request (upsert)."""
-        try:
-            data = self.performance_stats.get(model_name, {})
-            db_path = Path("./data/darwin.db")
-            conn = sqlite3.connect(str(db_path))
-            conn.execute("""
-                INSERT INTO router_stats (model_name, total_requests, total_latency_ms,
-                    total_cost_estimate, total_input_tokens, total_output_tokens, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(model_name) DO UPDATE SET
-                    total_requests = excluded.total_requests,
-                    total_latency_ms = excluded.total_latency_ms,
-                    total_cost_estimate = excluded.total_cost_estimate,
-                    total_input_tokens = excluded.total_input_tokens,
-                    total_output_tokens = excluded.total_output_tokens,
-                    updated_at = excluded.updated_at
-            """, (
-                model_name,
-                data.get('total_requests', 0),
-                data.get('total_latency_ms', 0),
-                data.get('total_cost_estimate', 0),
-                data.get('total_input_tokens', 0),
-                data.get('total_output_tokens', 0),
-                datetime.utcnow().isoformat()
-            ))
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            logger.error(f"Failed to save stats for {model_name}: {e}")
+        logger.info(f"MultiModelRouter initialized with {len(self.models)} models")
 
     def _initialize_models(self):
         """Initialize available AI model clients"""
@@ -312,6 +278,34 @@ class MultiModelRouter:
             logger.info(f"⚖️ Moderate task → MODERATE")
             return TaskComplexity.MODERATE
 
+    def _breaker(self, model_name: str) -> CircuitBreaker:
+        """Circuit breaker for a model (aliases of one client share a breaker)"""
+        model = self.models.get(model_name)
+        key = model.model_name if model else model_name
+        if key not in self.breakers:
+            self.breakers[key] = CircuitBreaker(
+                key,
+                failure_threshold=self.circuit_failure_threshold,
+                cooldown_seconds=self.circuit_cooldown_seconds
+            )
+        return self.breakers[key]
+
+    def _rank_models(
+        self,
+        task_description: str,
+        context: Optional[Dict[str, Any]],
+        candidates: Dict[str, BaseModelClient],
+        complexity: Optional[TaskComplexity] = None
+    ) -> List[str]:
+        """Order candidates best-first using the adaptive cost function"""
+        complexity = complexity or self.analyze_task_complexity(task_description, context)
+        if complexity == TaskComplexity.COMPLEX:
+            tier_key = "complex_code" if self._is_code_task(task_description, context) else "complex"
+        else:
+            tier_key = complexity.value
+        health = {name: self.stats.get_health(name) for name in candidates}
+        return self.scorer.rank(candidates, tier_key, health)
+
     def select_model(
         self,
         task_description: str,
@@ -346,9 +340,22 @@ class MultiModelRouter:
             # Fallback to any model
             capable_models = self.models
 
+        # Route around models whose circuit is open (e.g. Ollama timing out)
+        healthy_models = {
+            name: model for name, model in capable_models.items()
+            if not self._breaker(name).is_open()
+        }
+        if healthy_models:
+            capable_models = healthy_models
+
         # 🚀 INTELLIGENT MODEL ROUTING
 
-        if self.routing_strategy == RoutingStrategy.PERFORMANCE:
+        if self.routing_strategy == RoutingStrategy.ADAPTIVE:
+            ranked = self._rank_models(task_description, context, capable_models, complexity)
+            logger.info(f"📈 ADAPTIVE {complexity.value.upper()} task → {ranked[0]} (ranking: {ranked[:3]})")
+            return ranked[0]
+
+        elif self.routing_strategy == RoutingStrategy.PERFORMANCE:
             # PERFORMANCE: Always use Claude for best quality
             if "claude" in capable_models:
                 logger.info("🎯 PERFORMANCE mode → Claude")
@@ -442,6 +449,274 @@ class MultiModelRouter:
 
             return list(capable_models.keys())[0]
 
+    def _boost_max_tokens(
+        self,
+        task_description: str,
+        context: Optional[Dict[str, Any]],
+        kwargs: Dict[str, Any]
+    ) -> Optional[TaskComplexity]:
+        """Raise kwargs['max_tokens'] to the minimum for code tasks (in place)"""
+        if 'max_tokens' not in kwargs:
+            return None
+        is_code = self._is_code_task(task_description, context)
+        complexity = self.analyze_task_complexity(task_description, context)
+        min_tokens = 4096  # Minimum for any code task
+        if complexity == TaskComplexity.COMPLEX:
+            min_tokens = 8192
+        if is_code and kwargs['max_tokens'] < min_tokens:
+            logger.info(f"📏 Boosting max_tokens from {kwargs['max_tokens']} to {min_tokens} for {complexity.value} code task")
+            kwargs['max_tokens'] = min_tokens
+        return complexity
+
+    def _record_usage(
+        self,
+        model_name: str,
+        model: BaseModelClient,
+        prompt: str,
+        result: str
+    ) -> float:
+        """
+        Update performance stats for one completed generation.
+
+        Returns:
+            Cost of the request (actual when the API reported usage, else estimated)
+        """
+        # Use actual token counts from API when available, else estimate
+        input_tokens = getattr(model, 'last_input_tokens', 0)
+        output_tokens = getattr(model, 'last_output_tokens', 0)
+        actual_cost = getattr(model, 'last_cost', 0.0)
+
+        if input_tokens > 0 or output_tokens > 0:
+            # Real usage data from API
+            estimated_cost = actual_cost
+        else:
+            # Fallback: word-based estimate for models without usage data (Ollama, Gemini)
+            estimated_tokens = len(prompt.split()) + len(result.split())
+            estimated_cost = (estimated_tokens / 1000) * model.cost_per_1k_tokens
+            input_tokens = output_tokens = 0
+
+        # Memory only - flushed to SQLite by the write-behind task
+        self.stats.record(
+            model_name,
+            latency_ms=model.avg_latency_ms,
+            cost=estimated_cost,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens
+        )
+
+        return estimated_cost
+
+    def _adaptive_timeout(self, model_name: str) -> Optional[float]:
+        """Ollama timeout learned from its p99 latency (None until enough samples)"""
+        health = self.stats.get_health(model_name)
+        if health["samples"] < self.scorer.min_samples or not health["p99_latency_ms"]:
+            return None
+        return min(120.0, max(15.0, health["p99_latency_ms"] * 3 / 1000))
+
+    def _record_outcome(self, model_name: str, outcome: str):
+        """Feed one request outcome to the rolling health stats and the circuit breaker"""
+        self.stats.record_outcome(model_name, outcome)
+        breaker = self._breaker(model_name)
+        if outcome in ("error", "timeout"):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def _model_slot(self, model_name: str):
+        """
+        Slot bounding in-flight calls to one model.
+
+        Taken around the call itself, so fallbacks and hedges count against
+        the model they actually run on rather than the one selected first.
+        """
+        if self.max_concurrent_per_model <= 0:
+            return contextlib.nullcontext()
+        if model_name not in self._model_slots:
+            self._model_slots[model_name] = asyncio.Semaphore(self.max_concurrent_per_model)
+        return self._model_slots[model_name]
+
+    async def _generate_with_model(
+        self,
+        model_name: str,
+        task_description: str,
+        prompt: str,
+        system_prompt: Optional[str],
+        kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Run one generation on a specific model, retrying once on truncation.
+
+        Records the outcome (ok/truncated/error/timeout) for adaptive routing.
+        Cancellation (a hedged request losing the race) is not an outcome.
+        """
+        model = self.models[model_name]
+
+        if (self.routing_strategy == RoutingStrategy.ADAPTIVE and
+                'ollama' in model_name and 'timeout' not in kwargs):
+            timeout = self._adaptive_timeout(model_name)
+            if timeout:
+                kwargs = {**kwargs, 'timeout': timeout}
+
+        try:
+            async with self._model_slot(model_name):
+                result = await model.generate(
+                    prompt=prompt,
+                    system_prompt=system_prompt,
+                    **kwargs
+                )
+
+            # Check if model flagged truncation and auto-retry with doubled tokens
+            truncated = getattr(model, 'last_truncated', False)
+            if truncated:
+                current_max = kwargs.get('max_tokens', 8192)
+                retry_max = min(current_max * 2, 32768)  # Double tokens, cap at 32K
+                if retry_max > current_max:
+                    logger.warning(f"🔄 Response truncated at {current_max} tokens, retrying with {retry_max}...")
+                    try:
+                        from consciousness.safety_logger import get_safety_logger
+                        get_safety_logger().log('truncation_retry', 'multi_model_router', {
+                            'model': model_name,
+                            'original_max': current_max,
+                            'retry_max': retry_max,
+                            'task': task_description[:60],
+                        })
+                    except Exception:
+                        pass
+                    kwargs['max_tokens'] = retry_max
+                    async with self._model_slot(model_name):
+                        result = await model.generate(
+                            prompt=prompt,
+                            system_prompt=system_prompt,
+                            **kwargs
+                        )
+                    truncated = getattr(model, 'last_truncated', False)
+                    if truncated:
+                        logger.warning(f"⚠️ Response still truncated after retry at {retry_max} tokens")
+        except asyncio.TimeoutError:
+            self._record_outcome(model_name, "timeout")
+            raise
+        except Exception as e:
+            self._record_outcome(model_name, "timeout" if "timed out" in str(e).lower() else "error")
+            raise
+
+        self._record_outcome(model_name, "truncated" if truncated else "ok")
+
+        # Update stats
+        estimated_cost = self._record_usage(model_name, model, prompt, result)
+
+        return {
+            "result": result,
+            "model_used": model_name,
+            "latency_ms": model.avg_latency_ms,
+            "estimated_cost": estimated_cost,
+            "truncated": truncated
+        }
+
+    async def _cached_generate(
+        self,
+        task_description: str,
+        prompt: str,
+        system_prompt: Optional[str],
+        preferred_model: Optional[str],
+        context: Optional[Dict[str, Any]],
+        cache_type: Optional[str],
+        kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """generate() through the response cache; truncated responses are not stored"""
+        cache_type = self.response_cache.cache_type_for(cache_type, context)
+        params = {k: v for k, v in kwargs.items() if k not in ("hedge", "timeout")}
+        namespace = self.response_cache.namespace(system_prompt, preferred_model, cache_type, params)
+
+        # Embedding and SQLite work stay off the event loop
+        cached = await asyncio.to_thread(self.response_cache.get, namespace, prompt)
+        if cached:
+            logger.info(f"💾 Response cache {cached['cache_tier']} hit for: {task_description[:50]}...")
+            return {
+                "result": cached["response"],
+                "model_used": cached["model_used"],
+                "latency_ms": 0,
+                "estimated_cost": 0.0,
+                "truncated": False,
+                "cached": cached["cache_tier"]
+            }
+
+        result = await self.generate(
+            task_description, prompt, system_prompt=system_prompt,
+            preferred_model=preferred_model, context=context, **kwargs
+        )
+        if not result.get("truncated"):
+            await asyncio.to_thread(
+                self.response_cache.put, namespace, cache_type, prompt, result["result"],
+                result["model_used"], result.get("estimated_cost", 0.0), result.get("latency_ms", 0)
+            )
+        return result
+
+    def _should_hedge(self, hedge: Optional[bool], preferred_model: Optional[str]) -> bool:
+        """Hedge by default under the adaptive strategy; never when a model is forced"""
+        if hedge is not None:
+            return hedge
+        return (self.hedging_enabled and preferred_model is None and
+                self.routing_strategy == RoutingStrategy.ADAPTIVE)
+
+    async def _hedged_generate(
+        self,
+        model_name: str,
+        task_description: str,
+        prompt: str,
+        system_prompt: Optional[str],
+        context: Optional[Dict[str, Any]],
+        kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Hedged request: if the primary model hasn't answered by its p95
+        latency (hedge_after_ms until enough samples exist), send the same
+        request to the next-best model and return whichever succeeds first.
+        The loser is cancelled.
+        """
+        primary_client = self.models[model_name]
+        candidates = {
+            name: model for name, model in self.models.items()
+            if model is not primary_client and not self._breaker(name).is_open()
+        }
+        if not candidates:
+            return await self._generate_with_model(model_name, task_description, prompt, system_prompt, kwargs)
+        secondary = self._rank_models(task_description, context, candidates)[0]
+
+        health = self.stats.get_health(model_name)
+        deadline_ms = self.hedge_after_ms
+        if health["samples"] >= self.scorer.min_samples and health["p95_latency_ms"]:
+            deadline_ms = health["p95_latency_ms"]
+
+        primary_task = asyncio.create_task(
+            self._generate_with_model(model_name, task_description, prompt, system_prompt, dict(kwargs))
+        )
+        done, _ = await asyncio.wait({primary_task}, timeout=deadline_ms / 1000)
+        if done:
+            return primary_task.result()
+
+        logger.info(f"⏱️ {model_name} exceeded {deadline_ms:.0f}ms, hedging with {secondary}")
+        self.hedge_stats["hedged"] += 1
+        secondary_task = asyncio.create_task(
+            self._generate_with_model(secondary, task_description, prompt, system_prompt, dict(kwargs))
+        )
+        pending = {primary_task, secondary_task}
+        first_error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is secondary_task:
+                            self.hedge_stats["secondary_won"] += 1
+                        result = task.result()
+                        result["hedged"] = True
+                        return result
+                    first_error = first_error or task.exception()
+            raise first_error
+        finally:
+            for task in pending:
+                task.cancel()
+
     async def generate(
         self,
         task_description: str,
@@ -449,6 +724,9 @@ class MultiModelRouter:
         system_prompt: Optional[str] = None,
         preferred_model: Optional[str] = None,
         context: Optional[Dict[str, Any]] = None,
+        on_token: Optional[Callable[[str], Awaitable[None]]] = None,
+        cache: bool = False,
+        cache_type: Optional[str] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -460,11 +738,37 @@ class MultiModelRouter:
             system_prompt: System instructions
             preferred_model: Force specific model (bypass routing)
             context: Optional context for smart routing (file_path, code_length, etc)
+            on_token: Optional async callback; if given the response is streamed
+                through generate_stream and each chunk is passed to it
+            cache: Serve/store the response via the response cache. Opt-in per
+                call site - leave off for creative prompts. Ignored when streaming.
+            cache_type: TTL class for the cache ("analysis", "status", ...);
+                defaults to one derived from context['activity_type']
             **kwargs: Additional generation parameters
 
         Returns:
             Generation result with metadata including model_used
+            (and "cached": "exact" | "semantic" on a cache hit)
         """
+        if on_token is not None:
+            result = {}
+            async for event in self.generate_stream(
+                task_description, prompt, system_prompt=system_prompt,
+                preferred_model=preferred_model, context=context, **kwargs
+            ):
+                if event["type"] == "token":
+                    await on_token(event["text"])
+                else:
+                    result = {k: v for k, v in event.items() if k != "type"}
+            return result
+
+        if cache and self.response_cache is not None:
+            return await self._cached_generate(
+                task_description, prompt, system_prompt, preferred_model, context, cache_type, kwargs
+            )
+
+        model_name = None
+        probe = None
         try:
             # Select model (with context-aware routing)
             model_name = preferred_model or self.select_model(
@@ -477,15 +781,7 @@ class MultiModelRouter:
                 raise ValueError(f"Model {model_name} not available")
 
             # Dynamic max_tokens: ensure code tasks get enough tokens
-            if 'max_tokens' in kwargs:
-                is_code = self._is_code_task(task_description, context)
-                complexity = self.analyze_task_complexity(task_description, context)
-                min_tokens = 4096  # Minimum for any code task
-                if complexity == TaskComplexity.COMPLEX:
-                    min_tokens = 8192
-                if is_code and kwargs['max_tokens'] < min_tokens:
-                    logger.info(f"📏 Boosting max_tokens from {kwargs['max_tokens']} to {min_tokens} for {complexity.value} code task")
-                    kwargs['max_tokens'] = min_tokens
+            complexity = self._boost_max_tokens(task_description, context, kwargs)
 
             logger.info(f"🔀 Routing to {model_name} for task: {task_description[:50]}...")
 
@@ -501,80 +797,19 @@ class MultiModelRouter:
             except Exception:
                 pass
 
-            # Generate
-            result = await model.generate(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                **kwargs
-            )
+            # Ollama with an open circuit goes straight to the Haiku fallback
+            # instead of waiting out another full timeout
+            if 'ollama' in model_name and 'haiku' in self.models:
+                breaker = self._breaker(model_name)
+                if not breaker.allow_request():
+                    raise CircuitOpenError(f"Circuit open for {model_name}")
+                if breaker.state == breaker.HALF_OPEN:
+                    probe = breaker
 
-            # Check if model flagged truncation and auto-retry with doubled tokens
-            truncated = getattr(model, 'last_truncated', False)
-            if truncated:
-                current_max = kwargs.get('max_tokens', 8192)
-                retry_max = min(current_max * 2, 32768)  # Double tokens, cap at 32K
-                if retry_max > current_max:
-                    logger.warning(f"🔄 Response truncated at {current_max} tokens, retrying with {retry_max}...")
-                    try:
-                        from consciousness.safety_logger import get_safety_logger
-                        get_safety_logger().log('truncation_retry', 'multi_model_router', {
-                            'model': model_name,
-                            'original_max': current_max,
-                            'retry_max': retry_max,
-                            'task': task_description[:60],
-                        })
-                    except Exception:
-                        pass
-                    kwargs['max_tokens'] = retry_max
-                    result = await model.generate(
-                        prompt=prompt,
-                        system_prompt=system_prompt,
-                        **kwargs
-                    )
-                    truncated = getattr(model, 'last_truncated', False)
-                    if truncated:
-                        logger.warning(f"⚠️ Response still truncated after retry at {retry_max} tokens")
+            if self._should_hedge(kwargs.pop('hedge', None), preferred_model):
+                return await self._hedged_generate(model_name, task_description, prompt, system_prompt, context, kwargs)
 
-            # Update stats
-            if model_name not in self.performance_stats:
-                self.performance_stats[model_name] = {
-                    "total_requests": 0,
-                    "total_latency_ms": 0,
-                    "total_cost_estimate": 0.0,
-                    "total_input_tokens": 0,
-                    "total_output_tokens": 0,
-                }
-
-            self.performance_stats[model_name]["total_requests"] += 1
-            self.performance_stats[model_name]["total_latency_ms"] += model.avg_latency_ms
-
-            # Use actual token counts from API when available, else estimate
-            input_tokens = getattr(model, 'last_input_tokens', 0)
-            output_tokens = getattr(model, 'last_output_tokens', 0)
-            actual_cost = getattr(model, 'last_cost', 0.0)
-
-            if input_tokens > 0 or output_tokens > 0:
-                # Real usage data from API
-                estimated_cost = actual_cost
-                self.performance_stats[model_name]["total_input_tokens"] += input_tokens
-                self.performance_stats[model_name]["total_output_tokens"] += output_tokens
-            else:
-                # Fallback: word-based estimate for models without usage data (Ollama, Gemini)
-                estimated_tokens = len(prompt.split()) + len(result.split())
-                estimated_cost = (estimated_tokens / 1000) * model.cost_per_1k_tokens
-
-            self.performance_stats[model_name]["total_cost_estimate"] += estimated_cost
-
-            # Persist to SQLite
-            self._save_stats(model_name)
-
-            return {
-                "result": result,
-                "model_used": model_name,
-                "latency_ms": model.avg_latency_ms,
-                "estimated_cost": estimated_cost,
-                "truncated": truncated
-            }
+            return await self._generate_with_model(model_name, task_description, prompt, system_prompt, kwargs)
 
         except Exception as e:
             logger.error(f"Generation failed: {e}")
@@ -595,11 +830,12 @@ class MultiModelRouter:
                     except Exception:
                         pass
                     try:
-                        result = await fallback.generate(
-                            prompt=prompt,
-                            system_prompt=system_prompt,
-                            **kwargs
-                        )
+                        async with self._model_slot("haiku"):
+                            result = await fallback.generate(
+                                prompt=prompt,
+                                system_prompt=system_prompt,
+                                **kwargs
+                            )
                         # Track fallback cost using actual token data
                         fb_input = getattr(fallback, 'last_input_tokens', 0)
                         fb_output = getattr(fallback, 'last_output_tokens', 0)
@@ -611,20 +847,14 @@ class MultiModelRouter:
                             )
 
                         # Record in haiku stats (not lost in "(fallback)" key)
-                        if "haiku" not in self.performance_stats:
-                            self.performance_stats["haiku"] = {
-                                "total_requests": 0, "total_latency_ms": 0,
-                                "total_cost_estimate": 0.0,
-                                "total_input_tokens": 0, "total_output_tokens": 0,
-                            }
-                        self.performance_stats["haiku"]["total_requests"] += 1
-                        self.performance_stats["haiku"]["total_latency_ms"] += fallback.avg_latency_ms
-                        self.performance_stats["haiku"]["total_cost_estimate"] += fb_cost
-                        self.performance_stats["haiku"]["total_input_tokens"] += fb_input
-                        self.performance_stats["haiku"]["total_output_tokens"] += fb_output
-
-                        # Persist fallback stats
-                        self._save_stats("haiku")
+                        self._record_outcome("haiku", "ok")
+                        self.stats.record(
+                            "haiku",
+                            latency_ms=fallback.avg_latency_ms,
+                            cost=fb_cost,
+                            input_tokens=fb_input,
+                            output_tokens=fb_output
+                        )
 
                         return {
                             "result": result,
@@ -636,38 +866,255 @@ class MultiModelRouter:
                     except Exception as fallback_err:
                         logger.error(f"Fallback to Haiku also failed: {fallback_err}")
             raise
+        finally:
+            # A cancelled probe (hedge loser, caller timeout) records no
+            # outcome; without this the circuit would stay half-open forever
+            if probe is not None:
+                probe.release_probe()
+
+    async def generate_stream(
+        self,
+        task_description: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        preferred_model: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a generation using the selected model
+
+        Same routing, max_tokens boosting and cost accounting as generate(),
+        but yields events as they arrive:
+
+            {"type": "token", "text": str}
+            {"type": "done", "result": str, "model_used": str, "latency_ms": int,
+             "time_to_first_token_ms": int, "estimated_cost": float, "truncated": bool}
+
+        Truncated streams are reported, not retried - the caller has already
+        shown the partial output. If Ollama fails before its first token the
+        request falls back to Claude Haiku, like generate().
+        """
+        model_name = preferred_model or self.select_model(task_description, context=context)
+        model = self.models.get(model_name)
+        if not model:
+            raise ValueError(f"Model {model_name} not available")
+
+        self._boost_max_tokens(task_description, context, kwargs)
+        logger.info(f"🔀 Streaming from {model_name} for task: {task_description[:50]}...")
+
+        start_time = time.time()
+        first_token_at = None
+        chunks: List[str] = []
+        used_name = model_name
+
+        breaker = self._breaker(model_name)
+        probe = None
+        try:
+            try:
+                if 'ollama' in model_name and 'haiku' in self.models:
+                    if not breaker.allow_request():
+                        raise CircuitOpenError(f"Circuit open for {model_name}")
+                    if breaker.state == breaker.HALF_OPEN:
+                        probe = breaker
+                async with self._model_slot(model_name):
+                    async for text in model.generate_stream(prompt=prompt, system_prompt=system_prompt, **kwargs):
+                        if first_token_at is None:
+                            first_token_at = time.time()
+                        chunks.append(text)
+                        yield {"type": "token", "text": text}
+            except Exception as e:
+                if not isinstance(e, CircuitOpenError):
+                    self._record_outcome(model_name, "timeout" if "timed out" in str(e).lower() else "error")
+                fallback = self.models.get('haiku')
+                if chunks or 'ollama' not in model_name or not fallback:
+                    logger.error(f"Streaming generation failed: {e}")
+                    raise
+                logger.warning(f"🔄 Ollama stream failed ({e}), falling back to Claude Haiku")
+                model, used_name = fallback, "haiku"
+                async with self._model_slot(used_name):
+                    async for text in model.generate_stream(prompt=prompt, system_prompt=system_prompt, **kwargs):
+                        if first_token_at is None:
+                            first_token_at = time.time()
+                        chunks.append(text)
+                        yield {"type": "token", "text": text}
+
+            result = "".join(chunks)
+            truncated = getattr(model, 'last_truncated', False)
+            self._record_outcome(used_name, "truncated" if truncated else "ok")
+            estimated_cost = self._record_usage(used_name, model, prompt, result)
+
+            yield {
+                "type": "done",
+                "result": result,
+                "model_used": used_name if used_name == model_name else f"{used_name} (fallback)",
+                "latency_ms": model.avg_latency_ms,
+                "time_to_first_token_ms": int((first_token_at - start_time) * 1000) if first_token_at else None,
+                "estimated_cost": estimated_cost,
+                "truncated": truncated
+            }
+        finally:
+            # Stream closed early or cancelled before an outcome was recorded
+            if probe is not None:
+                probe.release_probe()
+
+    def _analysis_cache_key(self, code: str, task: str, model_names: List[str]) -> str:
+        """Hash of (task, code, models) used to key the analysis cache"""
+        digest = hashlib.sha256()
+        digest.update(task.encode('utf-8', errors='replace'))
+        digest.update(b'\0')
+        digest.update(code.encode('utf-8', errors='replace'))
+        digest.update(b'\0')
+        digest.update(','.join(sorted(model_names)).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _get_cached_analysis(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._analysis_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, analysis = entry
+        if time.monotonic() - stored_at > self.analysis_cache_ttl:
+            del self._analysis_cache[key]
+            return None
+        self._analysis_cache.move_to_end(key)
+        return analysis
+
+    def _store_cached_analysis(self, key: str, analysis: Dict[str, Any]):
+        self._analysis_cache[key] = (time.monotonic(), analysis)
+        self._analysis_cache.move_to_end(key)
+        while len(self._analysis_cache) > self.analysis_cache_size:
+            self._analysis_cache.popitem(last=False)
+
+    def _scores_agree(self, analyses: Dict[str, Dict[str, Any]]) -> bool:
+        """True if correctness/quality scores are within the agreement tolerance"""
+        for field in ("correctness_score", "quality_score"):
+            values = [a.get(field, 0) for a in analyses.values()]
+            if max(values) - min(values) > self.analysis_agreement_tolerance:
+                return False
+        return True
 
     async def analyze_with_multiple(
         self,
         code: str,
         task: str,
-        models: Optional[List[str]] = None
+        models: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+        quorum: Optional[int] = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Analyze code with multiple models and aggregate results
 
+        Models are queried concurrently. Once ``quorum`` models have
+        answered with scores that agree, the remaining requests are
+        cancelled. Results are cached by a hash of code and task, so
+        re-evaluated elites and identical candidates are free.
+
         Args:
             code: Code to analyze
             task: Task description
             models: List of models to use (default: all available)
+            timeout: Per-model timeout in seconds (default: router config)
+            quorum: Agreeing analyses needed to return early (default: router config)
+            use_cache: Reuse/store results in the analysis cache
 
         Returns:
             Aggregated analysis results
         """
-        models_to_use = models or list(self.models.keys())
-        analyses = {}
-
-        for model_name in models_to_use:
-            if model_name not in self.models:
+        # Aliases (ollama/ollama_code) share one client - only ask it once
+        model_names = []
+        seen_clients = set()
+        for model_name in models or list(self.models.keys()):
+            model = self.models.get(model_name)
+            if model is None or id(model) in seen_clients:
                 continue
+            seen_clients.add(id(model))
+            model_names.append(model_name)
 
-            try:
-                model = self.models[model_name]
-                analysis = await model.analyze_code(code, task)
-                analyses[model_name] = analysis
-                logger.info(f"{model_name} analysis complete")
-            except Exception as e:
-                logger.error(f"{model_name} analysis failed: {e}")
+        timeout = timeout if timeout is not None else self.analysis_timeout
+        quorum = quorum if quorum is not None else self.analysis_quorum
+
+        cache_key = self._analysis_cache_key(code, task, model_names)
+        if use_cache:
+            cached = self._get_cached_analysis(cache_key)
+            if cached is not None:
+                self.analysis_cache_stats["hits"] += 1
+                return {**cached, "cached": True}
+
+            # Identical candidate already being analyzed - share the result
+            pending = self._analysis_inflight.get(cache_key)
+            if pending is not None:
+                self.analysis_cache_stats["hits"] += 1
+                return {**(await asyncio.shield(pending)), "cached": True}
+
+            self.analysis_cache_stats["misses"] += 1
+            future = asyncio.get_running_loop().create_future()
+            self._analysis_inflight[cache_key] = future
+
+        try:
+            result = await self._fan_out_analysis(code, task, model_names, timeout, quorum)
+            if use_cache:
+                if "error" not in result:
+                    self._store_cached_analysis(cache_key, result)
+                future.set_result(result)
+            return {**result, "cached": False}
+        except BaseException as e:
+            if use_cache and not future.done():
+                future.set_exception(e)
+                # Nobody may be waiting on it - don't warn about an unretrieved exception
+                future.exception()
+            raise
+        finally:
+            if use_cache:
+                self._analysis_inflight.pop(cache_key, None)
+
+    async def _fan_out_analysis(
+        self,
+        code: str,
+        task: str,
+        model_names: List[str],
+        timeout: float,
+        quorum: int
+    ) -> Dict[str, Any]:
+        """Query models concurrently, stopping early once a quorum agrees"""
+
+        async def analyze_one(model_name: str):
+            analysis = await asyncio.wait_for(
+                self.models[model_name].analyze_code(code, task),
+                timeout=timeout
+            )
+            return model_name, analysis
+
+        pending = {
+            asyncio.create_task(analyze_one(name)): name for name in model_names
+        }
+        analyses = {}
+        quorum_reached = False
+
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for finished in done:
+                    model_name = pending.pop(finished)
+                    try:
+                        _, analysis = finished.result()
+                        analyses[model_name] = analysis
+                        logger.info(f"{model_name} analysis complete")
+                    except asyncio.TimeoutError:
+                        logger.error(f"{model_name} analysis timed out after {timeout}s")
+                    except Exception as e:
+                        logger.error(f"{model_name} analysis failed: {e}")
+
+                if pending and quorum > 0 and len(analyses) >= quorum and self._scores_agree(analyses):
+                    quorum_reached = True
+                    logger.info(
+                        f"Analysis quorum reached ({len(analyses)}/{len(model_names)}), "
+                        f"cancelling {len(pending)} pending"
+                    )
+                    break
+        finally:
+            for remaining in pending:
+                remaining.cancel()
 
         # Aggregate scores
         if analyses:
@@ -690,7 +1137,10 @@ class MultiModelRouter:
                 },
                 "issues": list(set(all_issues)),
                 "suggestions": list(set(all_suggestions)),
-                "individual_analyses": analyses
+                "individual_analyses": analyses,
+                "models_completed": len(analyses),
+                "models_requested": len(model_names),
+                "quorum_reached": quorum_reached
             }
 
         return {"error": "No analyses completed"}
@@ -701,5 +1151,17 @@ class MultiModelRouter:
             "available_models": list(self.models.keys()),
             "routing_strategy": self.routing_strategy.value,
             "performance_stats": self.performance_stats,
-            "model_info": {name: model.get_info() for name, model in self.models.items()}
+            "latency_percentiles": self.stats.get_latency_percentiles(),
+            "stats_persistence": self.stats.get_status(),
+            "model_health": {name: self.stats.get_health(name) for name in self.models},
+            "circuit_breakers": {name: breaker.get_status() for name, breaker in self.breakers.items()},
+            "hedging": {**self.hedge_stats, "enabled": self.hedging_enabled},
+            "response_cache": self.response_cache.get_stats() if self.response_cache else None,
+            "analysis_cache": {
+                **self.analysis_cache_stats,
+                "size": len(self._analysis_cache),
+                "max_size": self.analysis_cache_size
+            },
+            "model_info": {name: model.get_info() for name, model in self.models.items()},
+            "connection_pool": get_http_pool().get_stats()
         }
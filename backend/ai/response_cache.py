@@ -0,0 +1,327 @@
+"""
+Response Cache
+Two-tier cache for LLM generations routed through MultiModelRouter
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds a cached response stays valid, by cache type. Callers pass
+# cache_type explicitly or it is taken from context['activity_type'].
+DEFAULT_TTLS = {
+    "analysis": 3600,
+    "extraction": 3600,
+    "curiosity": 1800,
+    "status": 300,
+    "default": 900,
+}
+
+
+class ResponseCache:
+    """
+    Two-tier response cache.
+
+    Tier 1 (exact): sha256 of (system prompt, prompt, model, generation
+    params). Free to look up.
+
+    Tier 2 (semantic): cosine similarity between the prompt embedding and
+    the embeddings of cached prompts that share the same namespace
+    (system prompt, model, params and cache type). Only enabled once an
+    embedder is attached (the SentenceTransformer already loaded by
+    SemanticMemory), and only used for prompts short enough for the
+    embedding to cover the whole text - MiniLM truncates at 256 tokens,
+    so two long prompts that differ near the end would otherwise match.
+
+    Entries expire per cache type, the cache is LRU-bounded, and every
+    entry is written through to SQLite so hits survive restarts.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "./data/response_cache.db",
+        max_entries: int = 2000,
+        similarity_threshold: float = 0.95,
+        max_semantic_chars: int = 1500,
+        ttls: Optional[Dict[str, int]] = None
+    ):
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.max_semantic_chars = max_semantic_chars
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._embedder: Optional[Callable[[str], Any]] = None
+
+        self.stats = {
+            "exact_hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expired": 0,
+            "saved_cost": 0.0,
+            "saved_latency_ms": 0,
+        }
+
+        self._init_db()
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _init_db(self):
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path))
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    key TEXT PRIMARY KEY,
+                    namespace TEXT,
+                    cache_type TEXT,
+                    prompt TEXT,
+                    response TEXT,
+                    model_used TEXT,
+                    cost REAL,
+                    latency_ms INTEGER,
+                    expires_at REAL,
+                    embedding BLOB
+                )
+            """)
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Failed to init response cache DB: {e}")
+
+    def _load(self):
+        """Load unexpired entries (most recent last) up to max_entries"""
+        try:
+            conn = sqlite3.connect(str(self.db_path))
+            conn.row_factory = sqlite3.Row
+            conn.execute("DELETE FROM response_cache WHERE expires_at < ?", (time.time(),))
+            conn.commit()
+            rows = conn.execute(
+                "SELECT * FROM response_cache ORDER BY expires_at DESC LIMIT ?",
+                (self.max_entries,)
+            ).fetchall()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Failed to load response cache: {e}")
+            return
+
+        for r in reversed(rows):
+            self._entries[r["key"]] = {
+                "namespace": r["namespace"],
+                "cache_type": r["cache_type"],
+                "prompt": r["prompt"],
+                "response": r["response"],
+                "model_used": r["model_used"],
+                "cost": r["cost"],
+                "latency_ms": r["latency_ms"],
+                "expires_at": r["expires_at"],
+                "embedding": self._decode_embedding(r["embedding"]),
+            }
+        if self._entries:
+            logger.info(f"Loaded {len(self._entries)} cached responses")
+
+    def _write(self, key: str, entry: Dict[str, Any]):
+        try:
+            conn = sqlite3.connect(str(self.db_path), timeout=10)
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO response_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, entry["namespace"], entry["cache_type"], entry["prompt"],
+                     entry["response"], entry["model_used"], entry["cost"],
+                     entry["latency_ms"], entry["expires_at"],
+                     self._encode_embedding(entry["embedding"]))
+                )
+            conn.close()
+        except Exception as e:
+            logger.error(f"Failed to persist cached response: {e}")
+
+    def _delete(self, keys: List[str]):
+        if not keys:
+            return
+        try:
+            conn = sqlite3.connect(str(self.db_path), timeout=10)
+            with conn:
+                conn.executemany("DELETE FROM response_cache WHERE key = ?", [(k,) for k in keys])
+            conn.close()
+        except Exception as e:
+            logger.error(f"Failed to evict cached responses: {e}")
+
+    @staticmethod
+    def _encode_embedding(embedding) -> Optional[bytes]:
+        if embedding is None:
+            return None
+        import numpy as np
+        return np.asarray(embedding, dtype=np.float32).tobytes()
+
+    @staticmethod
+    def _decode_embedding(blob: Optional[bytes]):
+        if not blob:
+            return None
+        import numpy as np
+        return np.frombuffer(blob, dtype=np.float32)
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    def set_embedder(self, embedder: Callable[[str], Any]):
+        """Enable the semantic tier with an encode(text) -> vector callable"""
+        self._embedder = embedder
+        logger.info("Response cache semantic tier enabled")
+
+    def cache_type_for(self, cache_type: Optional[str], context: Optional[Dict[str, Any]]) -> str:
+        """Resolve the cache type that picks the TTL"""
+        if cache_type:
+            return cache_type
+        activity = (context or {}).get("activity_type", "")
+        for known in self.ttls:
+            if known in activity:
+                return known
+        return "default"
+
+    @staticmethod
+    def namespace(system_prompt: Optional[str], model: Optional[str], cache_type: str, params: Dict[str, Any]) -> str:
+        """Everything except the prompt text that must match for a hit"""
+        raw = json.dumps([system_prompt or "", model or "auto", cache_type, params], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    @staticmethod
+    def key(namespace: str, prompt: str) -> str:
+        return hashlib.sha256(f"{namespace}\x00{prompt}".encode()).hexdigest()
+
+    def _embed(self, prompt: str):
+        if self._embedder is None or len(prompt) > self.max_semantic_chars:
+            return None
+        import numpy as np
+        vector = np.asarray(self._embedder(prompt), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    # ------------------------------------------------------------------
+    # Lookup / store (blocking - call via asyncio.to_thread)
+    # ------------------------------------------------------------------
+
+    def get(self, namespace: str, prompt: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Returns:
+            Cached entry plus "cache_tier" ("exact" or "semantic"), or None
+        """
+        key = self.key(namespace, prompt)
+        now = time.time()
+        expired = []
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["expires_at"] < now:
+                del self._entries[key]
+                expired.append(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return self._hit(entry, "exact")
+            candidates = [
+                (k, e) for k, e in self._entries.items()
+                if e["namespace"] == namespace and e["embedding"] is not None
+            ]
+
+        match = None
+        if candidates:
+            query = self._embed(prompt)
+            if query is not None:
+                best_key, best_score = None, self.similarity_threshold
+                for k, e in candidates:
+                    if e["expires_at"] < now:
+                        expired.append(k)
+                        continue
+                    score = float(query @ e["embedding"])
+                    if score >= best_score:
+                        best_key, best_score = k, score
+                if best_key is not None:
+                    with self._lock:
+                        match = self._entries.get(best_key)
+                        if match is not None:
+                            self._entries.move_to_end(best_key)
+
+        with self._lock:
+            for k in expired:
+                self._entries.pop(k, None)
+            self.stats["expired"] += len(expired)
+            if match is not None:
+                result = self._hit(match, "semantic")
+            else:
+                self.stats["misses"] += 1
+                result = None
+        self._delete(expired)
+        return result
+
+    def _hit(self, entry: Dict[str, Any], tier: str) -> Dict[str, Any]:
+        # Caller holds the lock
+        self.stats[f"{tier}_hits"] += 1
+        self.stats["saved_cost"] += entry["cost"]
+        self.stats["saved_latency_ms"] += entry["latency_ms"]
+        return {**entry, "cache_tier": tier}
+
+    def put(
+        self,
+        namespace: str,
+        cache_type: str,
+        prompt: str,
+        response: str,
+        model_used: str,
+        cost: float,
+        latency_ms: int
+    ):
+        """Store a generation and persist it"""
+        key = self.key(namespace, prompt)
+        entry = {
+            "namespace": namespace,
+            "cache_type": cache_type,
+            "prompt": prompt,
+            "response": response,
+            "model_used": model_used,
+            "cost": cost,
+            "latency_ms": latency_ms,
+            "expires_at": time.time() + self.ttls.get(cache_type, self.ttls["default"]),
+            "embedding": self._embed(prompt),
+        }
+        evicted = []
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+            self.stats["stores"] += 1
+            self.stats["evictions"] += len(evicted)
+        self._write(key, entry)
+        self._delete(evicted)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counts, hit rate and saved cost/latency"""
+        with self._lock:
+            stats = dict(self.stats)
+            size = len(self._entries)
+        lookups = stats["exact_hits"] + stats["semantic_hits"] + stats["misses"]
+        hits = stats["exact_hits"] + stats["semantic_hits"]
+        stats["saved_cost"] = round(stats["saved_cost"], 6)
+        stats["hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+        stats["size"] = size
+        stats["max_entries"] = self.max_entries
+        stats["semantic_enabled"] = self._embedder is not None
+        return stats
@@ -0,0 +1,263 @@
+"""
+Router Statistics Aggregator
+Write-behind persistence for MultiModelRouter usage statistics
+"""
+import asyncio
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from utils.logger import get_logger
+from utils.stats import percentile
+
+logger = get_logger(__name__)
+
+# Cumulative counters persisted in the router_stats table
+STAT_FIELDS = (
+    "total_requests",
+    "total_latency_ms",
+    "total_cost_estimate",
+    "total_input_tokens",
+    "total_output_tokens",
+)
+
+
+class RouterStatsAggregator:
+    """
+    In-memory aggregation of per-model router stats.
+
+    Requests only touch memory: cumulative totals (served to callers) and
+    pending deltas (not yet on disk) are both updated in record(). A
+    background task flushes the deltas periodically, and flush() is called
+    once more on shutdown. Each flush is a single transaction that adds the
+    deltas to the stored totals, so concurrent writers never overwrite
+    each other.
+
+    Latency is kept as a rolling window of recent samples per model so
+    p50/p95/p99 reflect real distribution rather than the last call.
+    Request outcomes (ok/truncated/error/timeout) are kept the same way
+    and drive adaptive routing.
+    """
+
+    OUTCOMES = ("ok", "truncated", "error", "timeout")
+
+    def __init__(
+        self,
+        db_path: str = "./data/darwin.db",
+        flush_interval: float = 30.0,
+        latency_window: int = 1000,
+        outcome_window: int = 200
+    ):
+        self.db_path = Path(db_path)
+        self.flush_interval = flush_interval
+        self.latency_window = latency_window
+        self.outcome_window = outcome_window
+
+        self.totals: Dict[str, Dict[str, Any]] = {}
+        self._deltas: Dict[str, Dict[str, float]] = {}
+        self._latencies: Dict[str, deque] = {}
+        self._outcomes: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.flush_count = 0
+        self.last_flush: Optional[str] = None
+
+        self._init_db()
+        self._load()
+
+    def _init_db(self):
+        """Create the router_stats table if it doesn't exist."""
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path))
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS router_stats (
+                    model_name TEXT PRIMARY KEY,
+                    total_requests INTEGER DEFAULT 0,
+                    total_latency_ms REAL DEFAULT 0,
+                    total_cost_estimate REAL DEFAULT 0,
+                    total_input_tokens INTEGER DEFAULT 0,
+                    total_output_tokens INTEGER DEFAULT 0,
+                    updated_at TEXT
+                )
+            """)
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Failed to init stats DB: {e}")
+
+    def _load(self):
+        """Load accumulated stats from DB on startup."""
+        try:
+            if not self.db_path.exists():
+                return
+            conn = sqlite3.connect(str(self.db_path))
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute("SELECT * FROM router_stats").fetchall()
+            for r in rows:
+                self.totals[r['model_name']] = {field: r[field] for field in STAT_FIELDS}
+            conn.close()
+            if self.totals:
+                logger.info(f"Loaded router stats from DB: {list(self.totals.keys())}")
+        except Exception as e:
+            logger.error(f"Failed to load stats from DB: {e}")
+
+    def record(
+        self,
+        model_name: str,
+        latency_ms: float,
+        cost: float,
+        input_tokens: int = 0,
+        output_tokens: int = 0
+    ):
+        """Record one completed request (memory only)"""
+        increments = {
+            "total_requests": 1,
+            "total_latency_ms": latency_ms,
+            "total_cost_estimate": cost,
+            "total_input_tokens": input_tokens,
+            "total_output_tokens": output_tokens,
+        }
+        with self._lock:
+            totals = self.totals.setdefault(model_name, {field: 0 for field in STAT_FIELDS})
+            deltas = self._deltas.setdefault(model_name, {field: 0 for field in STAT_FIELDS})
+            for field, value in increments.items():
+                totals[field] += value
+                deltas[field] += value
+
+            window = self._latencies.get(model_name)
+            if window is None:
+                window = self._latencies[model_name] = deque(maxlen=self.latency_window)
+            window.append(latency_ms)
+
+    def record_outcome(self, model_name: str, outcome: str):
+        """Record a request outcome: 'ok', 'truncated', 'error' or 'timeout'"""
+        with self._lock:
+            window = self._outcomes.get(model_name)
+            if window is None:
+                window = self._outcomes[model_name] = deque(maxlen=self.outcome_window)
+            window.append(outcome)
+
+    def get_health(self, model_name: str) -> Dict[str, Any]:
+        """Rolling error/timeout/truncation rates and latency for one model"""
+        with self._lock:
+            outcomes = list(self._outcomes.get(model_name, ()))
+            latencies = sorted(self._latencies.get(model_name, ()))
+
+        samples = len(outcomes)
+        health = {"samples": samples}
+        for outcome in self.OUTCOMES:
+            health[f"{outcome}_rate"] = (
+                round(outcomes.count(outcome) / samples, 3) if samples else 0.0
+            )
+        health["p50_latency_ms"] = round(percentile(latencies, 50), 1)
+        health["p95_latency_ms"] = round(percentile(latencies, 95), 1)
+        health["p99_latency_ms"] = round(percentile(latencies, 99), 1)
+        return health
+
+    def flush(self) -> int:
+        """
+        Write pending deltas to SQLite in one transaction.
+
+        Returns:
+            Number of models flushed
+        """
+        with self._lock:
+            pending = self._deltas
+            self._deltas = {}
+        if not pending:
+            return 0
+
+        now = datetime.utcnow().isoformat()
+        try:
+            conn = sqlite3.connect(str(self.db_path), timeout=10)
+            try:
+                with conn:
+                    conn.executemany("""
+                        INSERT INTO router_stats (model_name, total_requests, total_latency_ms,
+                            total_cost_estimate, total_input_tokens, total_output_tokens, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(model_name) DO UPDATE SET
+                            total_requests = total_requests + excluded.total_requests,
+                            total_latency_ms = total_latency_ms + excluded.total_latency_ms,
+                            total_cost_estimate = total_cost_estimate + excluded.total_cost_estimate,
+                            total_input_tokens = total_input_tokens + excluded.total_input_tokens,
+                            total_output_tokens = total_output_tokens + excluded.total_output_tokens,
+                            updated_at = excluded.updated_at
+                    """, [
+                        (model_name, *(d[field] for field in STAT_FIELDS), now)
+                        for model_name, d in pending.items()
+                    ])
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"Failed to flush router stats: {e}")
+            # Put the deltas back so they go out with the next flush
+            with self._lock:
+                for model_name, d in pending.items():
+                    current = self._deltas.setdefault(model_name, {field: 0 for field in STAT_FIELDS})
+                    for field in STAT_FIELDS:
+                        current[field] += d[field]
+            return 0
+
+        self.flush_count += 1
+        self.last_flush = now
+        return len(pending)
+
+    async def flush_async(self) -> int:
+        """flush() in a worker thread, keeping SQLite off the event loop"""
+        return await asyncio.to_thread(self.flush)
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.sleep(self.flush_interval)
+                await self.flush_async()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Router stats flush loop error: {e}")
+
+    def start(self):
+        """Start the periodic flush task (requires a running loop)"""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+            logger.info(f"Router stats write-behind started (every {self.flush_interval}s)")
+
+    async def stop(self):
+        """Stop the periodic task and flush whatever is pending"""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        await self.flush_async()
+
+    def get_latency_percentiles(self) -> Dict[str, Dict[str, float]]:
+        """Rolling p50/p95/p99 latency per model"""
+        with self._lock:
+            snapshot = {name: sorted(window) for name, window in self._latencies.items()}
+        return {
+            name: {
+                "p50": round(percentile(values, 50), 1),
+                "p95": round(percentile(values, 95), 1),
+                "p99": round(percentile(values, 99), 1),
+                "samples": len(values)
+            }
+            for name, values in snapshot.items()
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        """Write-behind health: pending models, flush count and last flush time"""
+        with self._lock:
+            pending = len(self._deltas)
+        return {
+            "pending_models": pending,
+            "flush_interval_s": self.flush_interval,
+            "flush_count": self.flush_count,
+            "last_flush": self.last_flush
+        }
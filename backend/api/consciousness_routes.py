@@ -61,11 +61,15 @@ async def _run_agent_loop(
     system_prompt: str,
     router_service,
     max_tokens: int = 2500,
+    on_token=None,
 ) -> str:
     """
     Agentic loop: LLM generates → tools execute → results fed back → repeat.
     Returns the final combined response for the user.
 
+    If on_token is given, each iteration's output is streamed to it as it
+    is generated (the final revision pass, if any, is not streamed).
+
     If multiple iterations produced narrative chunks, a final revision pass
     merges them into one natural response (no duplicate greetings, no JSON).
     """
@@ -99,6 +103,7 @@ async def _run_agent_loop(
             preferred_model='haiku',
             max_tokens=max_tokens,
             temperature=0.7,
+            on_token=on_token,
         )
         response = result.get("result", "").strip()
 
@@ -245,6 +250,7 @@ SASS_RESPONSES = {
 class ChatMessage(BaseModel):
     message: str
     channel: Optional[str] = "web"
+    stream_id: Optional[str] = None  # If set, partial tokens go to WebSocket clients subscribed to it
 
 
 def initialize_consciousness(engine, mood_sys=None):
@@ -702,12 +708,21 @@ COMO COMUNICAR:
                 _chat_max_tokens = get_genome().get('social.chat.max_tokens') or 2500
             except Exception:
                 _chat_max_tokens = 2500
-            response = await _run_agent_loop(
-                user_message=msg.message,
-                system_prompt=system_prompt,
-                router_service=router_service,
-                max_tokens=_chat_max_tokens,
-            )
+            on_token = None
+            if msg.stream_id:
+                from api.websocket import manager as ws_manager
+                on_token = ws_manager.token_forwarder(msg.stream_id, message_type='chat_token')
+            try:
+                response = await _run_agent_loop(
+                    user_message=msg.message,
+                    system_prompt=system_prompt,
+                    router_service=router_service,
+                    max_tokens=_chat_max_tokens,
+                    on_token=on_token,
+                )
+            finally:
+                if msg.stream_id:
+                    ws_manager.end_stream(msg.stream_id)
         else:
             # Fallback to direct Claude Haiku if router not available
             client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
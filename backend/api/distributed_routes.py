@@ -214,6 +214,15 @@ async def mesh_receive(data: dict):
     return result
 
 
+@router.post("/mesh/receive_batch")
+async def mesh_receive_batch(data: dict):
+    """Receive a batch of mesh messages from a peer link (internal endpoint)"""
+    if not _mesh_network:
+        raise HTTPException(status_code=503, detail="Mesh network not enabled")
+
+    return await _mesh_network.receive_batch(data.get('source_id'), data.get('messages', []))
+
+
 # ============== Sync Endpoints ==============
 
 @router.get("/sync/status")
@@ -283,20 +292,45 @@ async def get_sync_index(types: str = None):
         except ValueError:
             memory_types = None
 
-    index = _memory_sync.get_local_index(memory_types)
+    index = await _memory_sync.get_local_index(memory_types)
     return {
         'success': True,
         'index': index
     }
 
 
+@router.post("/sync/tree")
+async def get_sync_tree(data: dict):
+    """Answer a peer's hash-tree walk (internal endpoint)"""
+    if not _memory_sync:
+        raise HTTPException(status_code=503, detail="Memory sync not enabled")
+
+    return await _memory_sync.get_tree_nodes(
+        query=data.get('query', {}),
+        depth=data.get('depth', 0)
+    )
+
+
 @router.post("/sync/memories")
 async def get_memories_for_sync(data: dict):
     """Get specific memories for sync (internal endpoint)"""
-    # This would be implemented to return requested memories
+    if not _memory_sync:
+        return {
+            'success': True,
+            'memories': []
+        }
+
+    from distributed.memory_sync import MemoryType
+
+    try:
+        memory_type = MemoryType(data.get('type'))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid memory type: {data.get('type')}")
+
+    memories = await _memory_sync.get_memories(memory_type, data.get('ids', []))
     return {
         'success': True,
-        'memories': []
+        'memories': memories
     }
 
 
@@ -6,8 +6,12 @@ Provides endpoints for:
 - Aggregated statistics
 - Error tracking
 - Moltbook statistics
+- Startup timings
+- Fetch cache statistics
+- Logging pipeline statistics
 """
 
+import asyncio
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional, List
 from datetime import datetime, timedelta
@@ -201,6 +205,37 @@ async def get_live_status():
     }
 
 
+@router.get("/websocket")
+async def get_websocket_stats():
+    """Per-connection WebSocket queue depth, lag and drop counters"""
+    from api.websocket import manager
+    return manager.get_stats()
+
+
+@router.get("/startup")
+async def get_startup_report():
+    """Per-service startup timings and concurrency savings"""
+    from app.lifespan import get_startup_report as lifespan_startup_report
+    report = lifespan_startup_report()
+    if report is None:
+        raise HTTPException(status_code=503, detail="Startup has not begun")
+    return report
+
+
+@router.get("/fetch-cache")
+async def get_fetch_cache_stats():
+    """Hit rates, revalidations and size of the shared HTTP fetch cache"""
+    from services.fetch_cache import get_fetch_cache
+    return await asyncio.to_thread(get_fetch_cache().get_stats)
+
+
+@router.get("/logging")
+async def get_logging_stats():
+    """Logging pipeline: queued, dropped and rate-limited records"""
+    from utils.logger import get_logging_stats as logger_stats
+    return logger_stats()
+
+
 # Initialize monitor (called from main app setup)
 def initialize_monitor(websocket_manager=None):
     """Initialize the activity monitor with WebSocket support"""
@@ -770,6 +770,7 @@ async def pause_moltbook(until: str = None, hours: float = None):
         if action:
             action.disabled_until = pause_until
             action.disable_reason = f"Owner-requested pause until {pause_until.isoformat()}"
+            proactive.refresh_action(action_id)
             paused.append(action_id)
 
     return {
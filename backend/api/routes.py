@@ -18,6 +18,7 @@ class TaskCreate(BaseModel):
     description: str
     type: str = "algorithm"
     parameters: dict = {}
+    stream_tokens: bool = False  # Send partial code to clients subscribed to the task
 
 
 class TaskResponse(BaseModel):
@@ -57,6 +58,7 @@ async def create_task(task: TaskCreate, background_tasks: BackgroundTasks):
         'description': task.description,
         'type': task.type,
         'parameters': task.parameters,
+        'stream_tokens': task.stream_tokens,
         'status': 'pending',
         'created_at': None
     }
@@ -95,16 +97,21 @@ async def run_evolution(task: dict):
     try:
         active_tasks[task_id]['status'] = 'running'
 
-        # Evolution callback for progress updates
+        # Evolution callback for progress updates; partial code only goes
+        # to clients subscribed to this task
         async def evolution_callback(event: dict):
-            await manager.broadcast(event)
+            if event.get('type') == 'generation_token':
+                await manager.send_to_task_subscribers(task_id, event)
+            else:
+                await manager.broadcast(event)
 
         # Run evolution
         result = await evolution_engine.evolve_task(
             task,
             max_generations=5,
             population_size=3,
-            callback=evolution_callback
+            callback=evolution_callback,
+            stream_tokens=task.get('stream_tokens', False)
         )
 
         active_tasks[task_id]['status'] = 'completed'
@@ -177,6 +184,15 @@ async def get_metrics():
     return metrics_service.get_system_metrics()
 
 
+@router.get("/api/executor/stats")
+async def get_executor_stats():
+    """Get sandbox executor statistics (warm pool health)"""
+    if not evolution_engine:
+        return {'error': 'Executor not available'}
+
+    return evolution_engine.executor.get_stats()
+
+
 @router.post("/api/config")
 async def update_config(config: ConfigUpdate):
     """Update system configuration"""
@@ -1,7 +1,10 @@
 """WebSocket manager for real-time updates"""
 import asyncio
+import json
+import time
+from collections import deque
 from datetime import datetime
-from typing import Set, Dict, Any, Optional
+from typing import Set, Dict, Any, Optional, Callable, Deque, Iterable, List
 from fastapi import WebSocket
 from utils.logger import setup_logger
 
@@ -11,6 +14,205 @@ logger = setup_logger(__name__)
 HEARTBEAT_INTERVAL_SECONDS = 30  # Send ping every 30 seconds
 HEARTBEAT_TIMEOUT_SECONDS = 90   # Consider connection stale after 90 seconds
 
+# Message types where only the newest queued copy matters. The value names the
+# field that distinguishes independent streams of the type (None = one per type).
+COALESCE_TYPES: Dict[str, Optional[str]] = {
+    "ping": None,
+    "status_update": None,
+    "state_change": None,
+    "mood_change": None,
+    "finding_update": "finding_id",
+}
+
+# Message types that are never dropped for a slow client (losing one would
+# leave the UI inconsistent, e.g. a token stream with a hole in it)
+PROTECTED_TYPES: Set[str] = {
+    "generation_token", "chat_token",
+    "task_created", "task_completed", "task_failed",
+    "evolution_complete", "new_finding", "finding_added", "darwin_message",
+}
+
+
+def _get_ws_settings() -> tuple:
+    """(queue size, flush interval ms, send timeout s) from config, with fallbacks."""
+    try:
+        from config import get_settings
+        settings = get_settings()
+        return (
+            settings.ws_send_queue_size,
+            settings.ws_flush_interval_ms,
+            settings.ws_send_timeout_seconds
+        )
+    except Exception:
+        return (256, 25.0, 10.0)
+
+
+class _QueuedMessage:
+    __slots__ = ("type", "key", "text", "enqueued_at")
+
+    def __init__(self, msg_type: Optional[str], key: Optional[tuple], text: str):
+        self.type = msg_type
+        self.key = key
+        self.text = text
+        self.enqueued_at = time.monotonic()
+
+
+class ClientConnection:
+    """
+    One websocket plus its bounded send queue and writer task.
+
+    Producers only enqueue pre-serialized text; the writer drains the queue at
+    the pace the client can take it, so a slow browser only delays itself.
+    When the queue is full the oldest droppable message is evicted (or the new
+    one dropped); protected messages may overflow up to twice the limit, after
+    which the client is considered dead.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_queue: int,
+        flush_interval_ms: float,
+        send_timeout: float,
+        batch: bool,
+        on_dead: Callable[["ClientConnection"], None],
+        max_batch: int = 50
+    ):
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.flush_interval = flush_interval_ms / 1000
+        self.send_timeout = send_timeout
+        self.batch = batch
+        self.max_batch = max_batch
+        self._on_dead = on_dead
+
+        self._queue: Deque[_QueuedMessage] = deque()
+        self._latest: Dict[tuple, _QueuedMessage] = {}  # coalesce key -> queued entry
+        self._wakeup = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self.closed = False
+
+        self.connected_at = datetime.now()
+        self.stats = {
+            "enqueued": 0,
+            "sent": 0,
+            "frames": 0,
+            "dropped": 0,
+            "coalesced": 0,
+            "last_lag_ms": 0.0,
+            "max_lag_ms": 0.0,
+        }
+
+    def start(self):
+        self._writer = asyncio.create_task(self._write_loop())
+
+    def stop(self):
+        self.closed = True
+        if self._writer and not self._writer.done() and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        self._queue.clear()
+        self._latest.clear()
+
+    def enqueue(self, msg_type: Optional[str], key: Optional[tuple], text: str) -> bool:
+        """Queue a serialized message; returns False if it was dropped."""
+        if self.closed:
+            return False
+        self.stats["enqueued"] += 1
+
+        if key is not None:
+            queued = self._latest.get(key)
+            if queued is not None:
+                queued.text = text  # keep its place (and age) in the queue
+                self.stats["coalesced"] += 1
+                return True
+
+        if len(self._queue) >= self.max_queue:
+            if not self._evict_droppable():
+                if msg_type not in PROTECTED_TYPES:
+                    self.stats["dropped"] += 1
+                    return False
+                if len(self._queue) >= self.max_queue * 2:
+                    logger.warning(
+                        f"WebSocket client {self.client} is {len(self._queue)} messages behind, disconnecting"
+                    )
+                    self.stats["dropped"] += 1
+                    self._on_dead(self)
+                    return False
+
+        entry = _QueuedMessage(msg_type, key, text)
+        self._queue.append(entry)
+        if key is not None:
+            self._latest[key] = entry
+        self._wakeup.set()
+        return True
+
+    def _evict_droppable(self) -> bool:
+        for entry in self._queue:
+            if entry.type not in PROTECTED_TYPES:
+                self._queue.remove(entry)
+                if entry.key is not None:
+                    self._latest.pop(entry.key, None)
+                self.stats["dropped"] += 1
+                return True
+        return False
+
+    def _take(self, limit: int) -> List[_QueuedMessage]:
+        taken = []
+        while self._queue and len(taken) < limit:
+            entry = self._queue.popleft()
+            if entry.key is not None:
+                self._latest.pop(entry.key, None)
+            taken.append(entry)
+        return taken
+
+    async def _write_loop(self):
+        try:
+            while not self.closed:
+                if not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    if self.batch and self.flush_interval > 0:
+                        # Let small messages pile up into one frame
+                        await asyncio.sleep(self.flush_interval)
+
+                entries = self._take(self.max_batch if self.batch else 1)
+                if not entries:
+                    continue
+                if len(entries) == 1:
+                    frame = entries[0].text
+                else:
+                    # Splice the already-serialized messages - no re-encoding
+                    frame = '{"type": "batch", "messages": [' + ", ".join(e.text for e in entries) + "]}"
+
+                await asyncio.wait_for(self.websocket.send_text(frame), timeout=self.send_timeout)
+
+                lag_ms = (time.monotonic() - entries[0].enqueued_at) * 1000
+                self.stats["sent"] += len(entries)
+                self.stats["frames"] += 1
+                self.stats["last_lag_ms"] = round(lag_ms, 1)
+                self.stats["max_lag_ms"] = max(self.stats["max_lag_ms"], round(lag_ms, 1))
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.debug(f"WebSocket writer for {self.client} stopped: {e}")
+            self._on_dead(self)
+
+    @property
+    def client(self) -> str:
+        client = getattr(self.websocket, "client", None)
+        return f"{client.host}:{client.port}" if client else "unknown"
+
+    def get_stats(self) -> Dict[str, Any]:
+        oldest = self._queue[0].enqueued_at if self._queue else None
+        return {
+            "client": self.client,
+            "connected_at": self.connected_at.isoformat(),
+            "batch": self.batch,
+            "queued": len(self._queue),
+            "oldest_queued_ms": round((time.monotonic() - oldest) * 1000, 1) if oldest else 0.0,
+            **self.stats,
+        }
+
 
 class ConnectionManager:
     """Manages WebSocket connections with heartbeat support"""
@@ -22,19 +224,44 @@ class ConnectionManager:
             "findings": set(),  # Subscribers to findings updates
             "consciousness": set(),  # Subscribers to consciousness updates
         }
+        # Token streams: stream_id -> the connections that asked for it
+        self.stream_subscribers: Dict[str, Set[WebSocket]] = {}
+        # Per-connection send queues
+        self.clients: Dict[WebSocket, ClientConnection] = {}
+        self.max_queue, self.flush_interval_ms, self.send_timeout = _get_ws_settings()
+        self.messages_serialized = 0
         # Heartbeat tracking
         self.last_pong: Dict[WebSocket, datetime] = {}
         self._heartbeat_task: Optional[asyncio.Task] = None
 
-    async def connect(self, websocket: WebSocket):
-        """Accept new WebSocket connection"""
+    async def connect(self, websocket: WebSocket, batch: bool = False):
+        """
+        Accept new WebSocket connection
+
+        Args:
+            websocket: The client socket
+            batch: Client understands {"type": "batch", "messages": [...]} frames
+        """
         await websocket.accept()
+        client = ClientConnection(
+            websocket,
+            max_queue=self.max_queue,
+            flush_interval_ms=self.flush_interval_ms,
+            send_timeout=self.send_timeout,
+            batch=batch,
+            on_dead=self._drop_client
+        )
+        self.clients[websocket] = client
+        client.start()
         self.active_connections.add(websocket)
         self.last_pong[websocket] = datetime.now()
         logger.info(f"WebSocket connected. Total: {len(self.active_connections)}")
 
     def disconnect(self, websocket: WebSocket):
         """Remove WebSocket connection"""
+        client = self.clients.pop(websocket, None)
+        if client:
+            client.stop()
         self.active_connections.discard(websocket)
         self.last_pong.pop(websocket, None)
 
@@ -46,40 +273,60 @@ class ConnectionManager:
         for subscribers in self.channel_subscribers.values():
             subscribers.discard(websocket)
 
+        # Remove from token streams
+        for subscribers in self.stream_subscribers.values():
+            subscribers.discard(websocket)
+
         logger.info(f"WebSocket disconnected. Total: {len(self.active_connections)}")
 
-    async def broadcast(self, message: dict):
-        """Broadcast message to all connected clients"""
-        dead_connections = set()
+    def _drop_client(self, client: ClientConnection):
+        """Writer failed or fell too far behind: disconnect and close the socket."""
+        if self.clients.get(client.websocket) is not client:
+            return
+        self.disconnect(client.websocket)
 
-        for connection in self.active_connections:
+        async def _close():
             try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting to client: {e}")
-                dead_connections.add(connection)
+                await client.websocket.close()
+            except Exception:
+                pass
+
+        try:
+            asyncio.get_running_loop().create_task(_close())
+        except RuntimeError:
+            pass
+
+    def _publish(self, targets: Iterable[WebSocket], message: Any) -> int:
+        """Serialize once and enqueue on every target's send queue."""
+        targets = [self.clients[ws] for ws in targets if ws in self.clients]
+        if not targets:
+            return 0
+
+        text = json.dumps(message, default=str)
+        self.messages_serialized += 1
+
+        msg_type = message.get("type") if isinstance(message, dict) else None
+        key = None
+        if msg_type in COALESCE_TYPES:
+            field_name = COALESCE_TYPES[msg_type]
+            key = (msg_type, message.get(field_name) if field_name else None)
 
-        # Clean up dead connections
-        for conn in dead_connections:
-            self.disconnect(conn)
+        return sum(1 for client in targets if client.enqueue(msg_type, key, text))
+
+    def broadcast_nowait(self, message: dict) -> int:
+        """Queue a message for all clients from sync code; returns clients queued to."""
+        return self._publish(list(self.active_connections), message)
+
+    async def broadcast(self, message: dict):
+        """Broadcast message to all connected clients (returns once queued)"""
+        self._publish(list(self.active_connections), message)
 
     async def send_to_task_subscribers(self, task_id: str, message: dict):
         """Send message to clients subscribed to a specific task"""
         if task_id not in self.task_subscribers:
             return
 
-        dead_connections = set()
-
-        for connection in self.task_subscribers[task_id]:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error sending to task subscriber: {e}")
-                dead_connections.add(connection)
-
-        # Clean up dead connections
-        for conn in dead_connections:
-            self.task_subscribers[task_id].discard(conn)
+        self._publish(list(self.task_subscribers[task_id]), message)
 
     def subscribe_to_task(self, websocket: WebSocket, task_id: str):
         """Subscribe a client to task updates"""
@@ -107,18 +354,40 @@ class ConnectionManager:
         if channel not in self.channel_subscribers:
             return
 
-        dead_connections = set()
-
-        for connection in self.channel_subscribers[channel]:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting to channel {channel}: {e}")
-                dead_connections.add(connection)
-
-        # Clean up dead connections
-        for conn in dead_connections:
-            self.channel_subscribers[channel].discard(conn)
+        self._publish(list(self.channel_subscribers[channel]), message)
+
+    def subscribe_to_stream(self, websocket: WebSocket, stream_id: str):
+        """Subscribe a client to the partial tokens of one generation"""
+        self.stream_subscribers.setdefault(stream_id, set()).add(websocket)
+
+    def end_stream(self, stream_id: str):
+        """Forget a finished stream's subscribers"""
+        self.stream_subscribers.pop(stream_id, None)
+
+    def token_forwarder(self, stream_id: str, message_type: str = "generation_token"):
+        """
+        Build an on_token callback that pushes partial model output to clients.
+
+        Each chunk is sent as {"type": message_type, "stream_id": ...,
+        "seq": n, "text": chunk} so the client can append in order - only to
+        the connections that subscribed to stream_id, never to everyone.
+        """
+        seq = 0
+
+        async def on_token(text: str):
+            nonlocal seq
+            subscribers = self.stream_subscribers.get(stream_id)
+            if not subscribers:
+                return
+            seq += 1
+            self._publish(list(subscribers), {
+                "type": message_type,
+                "stream_id": stream_id,
+                "seq": seq,
+                "text": text
+            })
+
+        return on_token
 
     async def notify_new_finding(self, finding: Dict[str, Any]):
         """Notify all subscribers of a new finding"""
@@ -143,6 +412,20 @@ class ConnectionManager:
             "action": action
         })
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-connection queue depth, lag and drop counters"""
+        clients = [client.get_stats() for client in self.clients.values()]
+        return {
+            "connections": len(clients),
+            "messages_serialized": self.messages_serialized,
+            "queue_limit": self.max_queue,
+            "flush_interval_ms": self.flush_interval_ms,
+            "total_dropped": sum(c["dropped"] for c in clients),
+            "total_coalesced": sum(c["coalesced"] for c in clients),
+            "max_lag_ms": max((c["max_lag_ms"] for c in clients), default=0.0),
+            "clients": clients,
+        }
+
     def handle_pong(self, websocket: WebSocket):
         """Record pong response from client"""
         self.last_pong[websocket] = datetime.now()
@@ -183,12 +466,8 @@ class ConnectionManager:
                             logger.warning(f"WebSocket stale (no pong for {seconds_since_pong:.0f}s)")
                             continue
 
-                    # Send ping to active connections
-                    try:
-                        await websocket.send_json({"type": "ping"})
-                    except Exception as e:
-                        logger.debug(f"Failed to send ping: {e}")
-                        stale_connections.add(websocket)
+                    # Queue ping (coalesced, so a backed-up client holds at most one)
+                    self._publish([websocket], {"type": "ping"})
 
                 # Clean up stale connections
                 for websocket in stale_connections:
@@ -14,6 +14,9 @@ settings = get_settings()
 # Global service instances - accessible from other modules
 _services = {}
 
+# Startup container: dependency graph and timings
+_container = None
+
 
 def get_service(name: str):
     """Get a service instance by name"""
@@ -25,6 +28,73 @@ def set_service(name: str, instance):
     _services[name] = instance
 
 
+def get_startup_report():
+    """Per-service startup timings (None before startup begins)"""
+    if _container is None:
+        return None
+    return _container.get_startup_report()
+
+
+async def _init_http_pool():
+    """Shared keep-alive HTTP pool for all model clients"""
+    from ai.models.http_pool import configure_http_pool
+    http_pool = configure_http_pool(
+        limit=settings.http_pool_limit,
+        limit_per_host=settings.http_pool_limit_per_host,
+        keepalive_timeout=settings.http_keepalive_seconds
+    )
+    await http_pool.start()
+    return http_pool
+
+
+def _init_embedding_service():
+    """Shared embedding model (loaded lazily on first encode)"""
+    from core.embedding_service import configure_embedding_service
+    return configure_embedding_service(
+        batch_window_ms=settings.embedding_batch_window_ms,
+        cache_size=settings.embedding_cache_size
+    )
+
+
+def _init_fetch_cache():
+    """Shared on-disk HTTP cache for every web reader"""
+    from services.fetch_cache import configure_fetch_cache
+    fetch_cache = configure_fetch_cache(
+        cache_dir=settings.fetch_cache_directory,
+        default_max_age=settings.fetch_cache_max_age_seconds,
+        stale_while_revalidate=settings.fetch_cache_stale_seconds,
+        offline=settings.fetch_cache_offline,
+        max_body_bytes=settings.fetch_cache_max_body_bytes
+    )
+    if fetch_cache.offline:
+        logger.info(f"Fetch cache is offline: serving only from {settings.fetch_cache_directory}")
+    return fetch_cache
+
+
+def _init_findings_inbox():
+    from consciousness.findings_inbox import FindingsInbox, set_findings_inbox
+    findings_inbox = FindingsInbox(storage_path="./data/findings")
+    set_findings_inbox(findings_inbox)
+    logger.info(f"Findings Inbox initialized with {findings_inbox.get_unread_count()} unread findings")
+    return findings_inbox
+
+
+def _init_prompt_registry():
+    from consciousness.prompt_registry import PromptRegistry, set_prompt_registry
+    prompt_registry = PromptRegistry(storage_path="./data/prompt_evolution")
+    set_prompt_registry(prompt_registry)
+    logger.info(f"Prompt Registry initialized with {len(prompt_registry.slots)} slots")
+    return prompt_registry
+
+
+def _init_safe_executor():
+    from tools.safe_command_executor import SafeCommandExecutor, set_safe_executor
+    safe_executor = SafeCommandExecutor()
+    set_safe_executor(safe_executor)
+    logger.info("Safe Command Executor initialized")
+    return safe_executor
+
+
 def get_system_status():
     """Get system status for root endpoint"""
     phase2_status = {
@@ -57,13 +127,27 @@ def get_system_status():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events with phased initialization"""
+    global _container
+
+    from utils.logger import configure_logging
+    configure_logging(
+        queue_size=settings.log_queue_size,
+        rate=settings.log_rate_per_second,
+        burst=settings.log_rate_burst,
+        max_bytes=settings.log_max_bytes,
+        backup_count=settings.log_backup_count
+    )
 
     logger.info("Darwin System starting up...")
 
+    from initialization.container import ServiceContainer
+    container = _container = ServiceContainer()
+
     # Phase 0: Health tracking and crash recovery
-    from initialization.phase1 import init_health_tracking
-    health_tracker, crash_info = init_health_tracking()
-    set_service('health_tracker', health_tracker)
+    with container.step('health_tracker'):
+        from initialization.phase1 import init_health_tracking
+        health_tracker, crash_info = init_health_tracking()
+        set_service('health_tracker', health_tracker)
 
     if crash_info.get('crashed'):
         logger.error(f"PREVIOUS CRASH DETECTED: {crash_info.get('message')}")
@@ -71,114 +155,133 @@ async def lifespan(app: FastAPI):
     else:
         logger.info("No crash detected. Previous session ended cleanly.")
 
-    # Phase 1: Core services
-    from initialization.phase1 import init_core_services
-    core = init_core_services()
-    for name, service in core.items():
+    # Phases 1-2 and standalone services: each starts as soon as its
+    # dependencies are ready, independent ones concurrently
+    from initialization.phase1 import register_core_services
+    from initialization.phase2 import register_phase2_services
+
+    logger.info("Initializing core and Phase 2 services...")
+    container.register('http_pool', _init_http_pool)
+    container.register('embedding_service', _init_embedding_service)
+    container.register('fetch_cache', _init_fetch_cache)
+    register_phase2_services(container)
+    register_core_services(container)
+    container.register('findings_inbox', _init_findings_inbox)
+    container.register('prompt_registry', _init_prompt_registry)
+    container.register('safe_executor', _init_safe_executor)
+
+    started = await container.start()
+    for name, service in started.items():
         set_service(name, service)
+    set_service('settings', settings)
 
-    # Phase 2: Semantic memory, multi-model, web research
-    from initialization.phase2 import init_phase2_services
-    phase2 = await init_phase2_services(core)
-    for name, service in phase2.items():
-        set_service(name, service)
+    if started.get('fetch_cache'):
+        started['fetch_cache'].start_pruning(
+            settings.fetch_cache_retention_seconds,
+            settings.fetch_cache_prune_interval_seconds
+        )
+
+    missing = [name for name in ('memory_store', 'executor') if started.get(name) is None]
+    if missing:
+        raise RuntimeError(f"Core services failed to start: {', '.join(missing)}")
+
+    core = {
+        'memory_store': started['memory_store'],
+        'executor': started['executor'],
+        'settings': settings
+    }
+    phase2 = {
+        name: started.get(name)
+        for name in (
+            'semantic_memory', 'multi_model_router', 'web_researcher',
+            'meta_learner', 'hierarchical_memory'
+        )
+    }
+    logger.info("Core and Phase 2 services initialized")
 
     # Initialize Nucleus with Phase 2 components
-    from initialization.phase1 import init_nucleus
-    nucleus = init_nucleus(
-        core,
-        phase2.get('semantic_memory'),
-        phase2.get('multi_model_router'),
-        phase2.get('web_researcher')
-    )
-    set_service('nucleus', nucleus)
+    with container.step('nucleus'):
+        from initialization.phase1 import init_nucleus
+        nucleus = init_nucleus(
+            core,
+            phase2.get('semantic_memory'),
+            phase2.get('multi_model_router'),
+            phase2.get('web_researcher')
+        )
+        set_service('nucleus', nucleus)
 
     # Initialize Evolution Engine and Metrics
-    from initialization.phase1 import init_evolution_and_metrics
-    evolution, metrics = init_evolution_and_metrics(
-        nucleus, core['executor'], core['memory_store'], phase2.get('meta_learner')
-    )
-    set_service('evolution_engine', evolution)
-    set_service('metrics_service', metrics)
-
-    # Inject services into routes
-    from api.routes import set_services
-    set_services(evolution, metrics)
-
-    # Initialize Phase 2 routes
-    from api import phase2_routes
-    phase2_routes.initialize_phase2(
-        phase2.get('semantic_memory'),
-        phase2.get('multi_model_router'),
-        phase2.get('web_researcher'),
-        phase2.get('meta_learner')
-    )
+    with container.step('evolution_and_metrics'):
+        from initialization.phase1 import init_evolution_and_metrics
+        evolution, metrics = init_evolution_and_metrics(
+            nucleus, core['executor'], core['memory_store'], phase2.get('meta_learner')
+        )
+        set_service('evolution_engine', evolution)
+        set_service('metrics_service', metrics)
+
+    with container.step('routes'):
+        # Inject services into routes
+        from api.routes import set_services
+        set_services(evolution, metrics)
+
+        # Initialize Phase 2 routes
+        from api import phase2_routes
+        phase2_routes.initialize_phase2(
+            phase2.get('semantic_memory'),
+            phase2.get('multi_model_router'),
+            phase2.get('web_researcher'),
+            phase2.get('meta_learner')
+        )
 
-    # Initialize Cost tracking routes
-    from api import cost_routes
-    cost_routes.initialize_costs(phase2.get('multi_model_router'))
+        # Initialize Cost tracking routes
+        from api import cost_routes
+        cost_routes.initialize_costs(phase2.get('multi_model_router'))
 
     # Phase 3: Agents, dreams, poetry
-    from initialization.phase3 import init_phase3_services
-    phase3 = init_phase3_services(phase2, settings)
-    for name, service in phase3.items():
-        set_service(name, service)
-
-    # Initialize Phase 3 routes
-    from api import phase3_routes
-    phase3_routes.initialize_phase3(
-        phase3.get('agent_coordinator'),
-        phase3.get('dream_engine'),
-        phase3.get('idle_detector'),
-        phase3.get('code_narrator'),
-        phase3.get('diary_writer'),
-        phase3.get('curiosity_engine'),
-        phase3.get('benchmark_generator')
-    )
+    with container.step('phase3'):
+        from initialization.phase3 import init_phase3_services
+        phase3 = init_phase3_services(phase2, settings)
+        for name, service in phase3.items():
+            set_service(name, service)
+
+        # Initialize Phase 3 routes
+        from api import phase3_routes
+        phase3_routes.initialize_phase3(
+            phase3.get('agent_coordinator'),
+            phase3.get('dream_engine'),
+            phase3.get('idle_detector'),
+            phase3.get('code_narrator'),
+            phase3.get('diary_writer'),
+            phase3.get('curiosity_engine'),
+            phase3.get('benchmark_generator')
+        )
 
     # Initialize introspection and auto-correction
-    from api import introspection_routes, auto_correction_routes
-    introspection_routes.initialize_introspection()
-    auto_correction_routes.initialize_auto_correction(nucleus=nucleus)
-    logger.info("Self-Analysis and Auto-Correction Systems initialized")
-
-    # Initialize Findings Inbox
-    from consciousness.findings_inbox import FindingsInbox, set_findings_inbox
-    findings_inbox = FindingsInbox(storage_path="./data/findings")
-    set_findings_inbox(findings_inbox)
-    set_service('findings_inbox', findings_inbox)
-    logger.info(f"Findings Inbox initialized with {findings_inbox.get_unread_count()} unread findings")
-
-    # Initialize Prompt Registry
-    from consciousness.prompt_registry import PromptRegistry, set_prompt_registry
-    prompt_registry = PromptRegistry(storage_path="./data/prompt_evolution")
-    set_prompt_registry(prompt_registry)
-    set_service('prompt_registry', prompt_registry)
-    logger.info(f"Prompt Registry initialized with {len(prompt_registry.slots)} slots")
-
-    # Initialize Safe Command Executor
-    from tools.safe_command_executor import SafeCommandExecutor, set_safe_executor
-    safe_executor = SafeCommandExecutor()
-    set_safe_executor(safe_executor)
-    set_service('safe_executor', safe_executor)
-    logger.info("Safe Command Executor initialized")
+    with container.step('introspection'):
+        from api import introspection_routes, auto_correction_routes
+        introspection_routes.initialize_introspection()
+        auto_correction_routes.initialize_auto_correction(nucleus=nucleus)
+        logger.info("Self-Analysis and Auto-Correction Systems initialized")
 
     # Initialize Question Engine
-    from initialization.phase3 import init_question_engine
-    question_engine_services = init_question_engine(phase2)
-    for name, service in question_engine_services.items():
-        set_service(name, service)
+    with container.step('question_engine'):
+        from initialization.phase3 import init_question_engine
+        question_engine_services = init_question_engine(phase2)
+        for name, service in question_engine_services.items():
+            set_service(name, service)
 
     # Phase 4: Advanced learning systems
-    from initialization.phase4 import init_phase4_services
-    phase4 = await init_phase4_services(phase2, settings)
-    for name, service in phase4.items():
-        set_service(name, service)
+    with container.step('phase4'):
+        from initialization.phase4 import init_phase4_services
+        phase4 = await init_phase4_services(phase2, settings)
+        for name, service in phase4.items():
+            set_service(name, service)
 
     # Initialize tool registry
-    from initialization.phase4 import init_tool_registry
-    tool_registry = init_tool_registry(phase2, phase4, phase3)
-    set_service('tool_registry', tool_registry)
+    with container.step('tool_registry'):
+        from initialization.phase4 import init_tool_registry
+        tool_registry = init_tool_registry(phase2, phase4, phase3)
+        set_service('tool_registry', tool_registry)
 
     # Initialize UI automation routes
     if phase4.get('ui_automation_engine'):
@@ -193,42 +296,45 @@ async def lifespan(app: FastAPI):
         logger.info("Voice Synthesis routes initialized")
 
     # Phase 5: Distributed Consciousness
-    from initialization.distributed import init_distributed_services
-    distributed = await init_distributed_services(settings, {**phase2, **phase4})
-    for name, service in distributed.items():
-        set_service(name, service)
-
-    # Initialize distributed routes
-    if any(distributed.values()):
-        from api import distributed_routes
-        distributed_routes.initialize_distributed(
-            instance_registry=distributed.get('instance_registry'),
-            memory_sync=distributed.get('memory_sync'),
-            mesh_network=distributed.get('mesh_network'),
-            fork_manager=distributed.get('fork_manager')
-        )
-        logger.info("Distributed Consciousness routes initialized")
+    with container.step('distributed'):
+        from initialization.distributed import init_distributed_services
+        distributed = await init_distributed_services(settings, {**phase2, **phase4})
+        for name, service in distributed.items():
+            set_service(name, service)
+
+        # Initialize distributed routes
+        if any(distributed.values()):
+            from api import distributed_routes
+            distributed_routes.initialize_distributed(
+                instance_registry=distributed.get('instance_registry'),
+                memory_sync=distributed.get('memory_sync'),
+                mesh_network=distributed.get('mesh_network'),
+                fork_manager=distributed.get('fork_manager')
+            )
+            logger.info("Distributed Consciousness routes initialized")
 
     # Initialize Consciousness Engine
-    from initialization.consciousness import init_consciousness_engine
-    consciousness_result = await init_consciousness_engine(
-        settings=settings,
-        phase2=phase2,
-        phase3=phase3,
-        phase4=phase4,
-        nucleus=nucleus,
-        health_tracker=health_tracker,
-        crash_info=crash_info,
-        tool_registry=tool_registry
-    )
+    with container.step('consciousness'):
+        from initialization.consciousness import init_consciousness_engine
+        consciousness_result = await init_consciousness_engine(
+            settings=settings,
+            phase2=phase2,
+            phase3=phase3,
+            phase4=phase4,
+            nucleus=nucleus,
+            health_tracker=health_tracker,
+            crash_info=crash_info,
+            tool_registry=tool_registry
+        )
 
-    for name, service in consciousness_result.items():
-        set_service(name, service)
+        for name, service in consciousness_result.items():
+            set_service(name, service)
 
     # Initialize Channel Gateway
-    from initialization.channels import init_channel_gateway
-    channel_gateway = await init_channel_gateway(settings)
-    set_service('channel_gateway', channel_gateway)
+    with container.step('channel_gateway'):
+        from initialization.channels import init_channel_gateway
+        channel_gateway = await init_channel_gateway(settings)
+        set_service('channel_gateway', channel_gateway)
 
     # Initialize channel routes
     if channel_gateway:
@@ -272,6 +378,9 @@ async def lifespan(app: FastAPI):
     from integrations.telegram_bot import start_polling as start_telegram_polling
     await start_telegram_polling()
 
+    container.mark_ready()
+    report = container.get_startup_report()
+
     # Log startup summary
     phase2_features = {k: v is not None for k, v in phase2.items()}
     phase3_features = {k: v is not None for k, v in phase3.items()}
@@ -279,7 +388,9 @@ async def lifespan(app: FastAPI):
     logger.info("Darwin System ready", extra={
         "ai_provider": settings.ai_provider,
         "phase2_enabled": any(phase2_features.values()),
-        "phase3_enabled": any(phase3_features.values())
+        "phase3_enabled": any(phase3_features.values()),
+        "startup_seconds": report["total_seconds"],
+        "slowest_services": report["slowest"]
     })
 
     # Mark system as fully running
@@ -311,6 +422,10 @@ async def lifespan(app: FastAPI):
     if channel_gateway and channel_gateway.enabled:
         await channel_gateway.stop()
 
+    executor = _services.get('executor')
+    if executor:
+        executor.shutdown()
+
     # Stop distributed services
     from initialization.distributed import stop_distributed_services
     distributed_services = {
@@ -321,4 +436,20 @@ async def lifespan(app: FastAPI):
     }
     await stop_distributed_services(distributed_services)
 
+    multi_model_router = _services.get('multi_model_router')
+    if multi_model_router:
+        await multi_model_router.stats.stop()
+
+    # Commit consciousness events still in the write-behind buffer
+    from consciousness.consciousness_stream import close_consciousness_stream
+    close_consciousness_stream()
+
+    fetch_cache = _services.get('fetch_cache')
+    if fetch_cache:
+        await fetch_cache.stop_pruning()
+
+    http_pool = _services.get('http_pool')
+    if http_pool:
+        await http_pool.close()
+
     logger.info("Darwin System shutdown complete")
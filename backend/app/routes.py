@@ -138,9 +138,10 @@ def register_all_routes(app: FastAPI):
     # WebSocket endpoint
     @app.websocket("/ws")
     async def websocket_endpoint(websocket: WebSocket):
-        """WebSocket endpoint for real-time updates"""
+        """WebSocket endpoint for real-time updates (?batch=1 for batched frames)"""
         import json
-        await manager.connect(websocket)
+        batch = websocket.query_params.get("batch", "").lower() in ("1", "true", "yes")
+        await manager.connect(websocket, batch=batch)
 
         try:
             while True:
@@ -150,6 +151,11 @@ def register_all_routes(app: FastAPI):
                     # Handle pong response from client
                     if message.get('type') == 'pong':
                         manager.handle_pong(websocket)
+                    # Opt in to partial tokens of a chat stream or an evolution task
+                    elif message.get('type') == 'subscribe_stream' and message.get('stream_id'):
+                        manager.subscribe_to_stream(websocket, str(message['stream_id']))
+                    elif message.get('type') == 'subscribe_task' and message.get('task_id'):
+                        manager.subscribe_to_task(websocket, str(message['task_id']))
                     else:
                         logger.info(f"WebSocket message received: {data}")
                 except json.JSONDecodeError:
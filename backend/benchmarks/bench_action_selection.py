@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for ProactiveEngine action selection.
+
+Registers N synthetic actions (on top of the defaults) with a spread of
+cooldowns, marks a random share of them as recently executed, then times
+select_next_action() over many ticks while executions push selected actions
+back onto their cooldown - the same churn the proactive loop produces.
+
+Run: python3 benchmarks/bench_action_selection.py --actions 500
+"""
+import argparse
+import logging
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from consciousness.proactive_engine import (  # noqa: E402
+    ActionCategory,
+    ActionPriority,
+    ProactiveAction,
+    ProactiveEngine,
+    ResourceClass,
+)
+
+
+def build_engine(n_actions: int, cooling_share: float, seed: int) -> ProactiveEngine:
+    rng = random.Random(seed)
+    engine = ProactiveEngine()
+    now = datetime.now()
+    categories = list(ActionCategory)
+    priorities = list(ActionPriority)
+
+    for i in range(n_actions):
+        action = ProactiveAction(
+            id=f"synthetic_{i}",
+            name=f"Synthetic action {i}",
+            description="Benchmark action",
+            category=rng.choice(categories),
+            priority=rng.choice(priorities),
+            trigger_condition="benchmark",
+            cooldown_minutes=rng.choice([5, 15, 30, 60, 120, 360]),
+            resource_class=rng.choice(list(ResourceClass)),
+        )
+        if rng.random() < cooling_share:
+            action.last_executed = now - timedelta(minutes=rng.uniform(0, action.cooldown_minutes))
+        engine.register_action(action)
+    return engine
+
+
+def run(n_actions: int, ticks: int, cooling_share: float, seed: int) -> dict:
+    engine = build_engine(n_actions, cooling_share, seed)
+    rng = random.Random(seed + 1)
+    synthetic = [a for a in engine.actions.values() if a.id.startswith("synthetic_")]
+    context = {
+        "mood": "curious",
+        "mood_intensity": "medium",
+        "is_idle": True,
+        "intention_categories": ["learning"],
+    }
+
+    samples = []
+    ready = []
+    for tick in range(ticks):
+        start = time.perf_counter()
+        action = engine.select_next_action(context)
+        samples.append(time.perf_counter() - start)
+        ready.append(engine._index.get_stats()["ready"])
+
+        if action is not None:
+            # Stand-in for execute_action's bookkeeping: start its cooldown
+            action.last_executed = datetime.now()
+            action.execution_count += 1
+            engine._recent_categories = (engine._recent_categories + [action.category])[-5:]
+            engine._recent_action_ids = (engine._recent_action_ids + [action.id])[-5:]
+            engine.refresh_action(action.id)
+
+        # Simulate time passing: one cooling action comes off cooldown per
+        # tick, keeping the runnable pool at a steady size
+        cooling = [a for a in synthetic if a.last_executed is not None and a is not action]
+        if cooling:
+            expired = rng.choice(cooling)
+            expired.last_executed = datetime.now() - timedelta(minutes=expired.cooldown_minutes + 1)
+            engine.refresh_action(expired.id)
+
+        # The mood shifts occasionally, invalidating cached base scores
+        if tick % 50 == 49:
+            context["mood"] = rng.choice(["curious", "focused", "playful", "tired"])
+
+    samples.sort()
+    return {
+        "actions": len(engine.actions),
+        "ticks": ticks,
+        "mean_us": statistics.mean(samples) * 1e6,
+        "p50_us": samples[len(samples) // 2] * 1e6,
+        "p95_us": samples[int(len(samples) * 0.95)] * 1e6,
+        "max_us": samples[-1] * 1e6,
+        "avg_ready": statistics.mean(ready),
+        "index": engine._index.get_stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark proactive action selection")
+    parser.add_argument("--actions", type=int, default=500, help="Synthetic actions to register")
+    parser.add_argument("--ticks", type=int, default=1000, help="Selections to time")
+    parser.add_argument("--cooling", type=float, default=0.8, help="Share of actions starting on cooldown")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Keep the benchmark output readable
+    logging.disable(logging.WARNING)
+
+    result = run(args.actions, args.ticks, args.cooling, args.seed)
+    print(f"actions={result['actions']} ticks={result['ticks']} avg_runnable={result['avg_ready']:.0f}")
+    print(
+        f"select_next_action: mean={result['mean_us']:.1f}us p50={result['p50_us']:.1f}us "
+        f"p95={result['p95_us']:.1f}us max={result['max_us']:.1f}us"
+    )
+    print(f"index: {result['index']}")
+
+
+if __name__ == "__main__":
+    main()
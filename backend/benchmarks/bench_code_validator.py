@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark for CodeValidator over the repository's own backend/ sources.
+
+For every Python file, validates a candidate change: the file plus a small
+appended helper, with the unmodified file as the original - the shape of
+what _improve_self produces. Each round validates --candidates changes per
+file, as the code generator does when it retries, so later candidates find
+the original's analysis already cached. The first round starts with an
+empty cache.
+
+Run: python3 benchmarks/bench_code_validator.py --rounds 3
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from introspection import code_analysis  # noqa: E402
+from introspection.code_generator import GeneratedCode  # noqa: E402
+from introspection.code_validator import CodeValidator  # noqa: E402
+
+
+def load_sources(limit: int):
+    files = sorted(
+        p for p in BACKEND.rglob("*.py")
+        if "__pycache__" not in p.parts and "node_modules" not in p.parts
+    )
+    sources = []
+    for path in files[:limit] if limit else files:
+        try:
+            sources.append((path.relative_to(BACKEND), path.read_text(encoding="utf-8")))
+        except (OSError, UnicodeDecodeError):
+            continue
+    return sources
+
+
+def candidate(path, original: str, variant: int) -> GeneratedCode:
+    new_code = original + (
+        f"\n\ndef _benchmark_helper_{variant}(value):\n"
+        f"    \"\"\"Added by the benchmark\"\"\"\n"
+        f"    return value * {variant}\n"
+    )
+    return GeneratedCode(
+        insight_id=f"bench-{variant}",
+        insight_title="benchmark",
+        file_path=str(path),
+        original_code=original,
+        new_code=new_code,
+        diff_html="",
+        diff_unified="",
+        explanation="",
+        risk_level="medium",
+        estimated_time_minutes=1,
+    )
+
+
+async def run_round(validator: CodeValidator, sources, candidates: int) -> list:
+    samples = []
+    for path, original in sources:
+        for variant in range(candidates):
+            generated = candidate(path, original, variant)
+            start = time.perf_counter()
+            await validator.validate(generated)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CodeValidator.validate over backend/")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--candidates", type=int, default=3, help="Changes validated per file")
+    parser.add_argument("--limit", type=int, default=0, help="Only the first N files (0 = all)")
+    args = parser.parse_args()
+
+    sources = load_sources(args.limit)
+    total_kb = sum(len(src) for _, src in sources) / 1024
+    print(f"{len(sources)} files, {total_kb:,.0f} KiB of source, {args.candidates} candidates per file")
+
+    validator = CodeValidator()
+    code_analysis.clear_cache()
+    for round_no in range(1, args.rounds + 1):
+        with contextlib.redirect_stdout(io.StringIO()):  # validate() prints progress
+            samples = asyncio.run(run_round(validator, sources, args.candidates))
+        samples.sort()
+        print(
+            f"round {round_no}: total={sum(samples):.2f}s mean={statistics.mean(samples) * 1000:.2f}ms "
+            f"p95={samples[int(len(samples) * 0.95)] * 1000:.2f}ms "
+            f"max={samples[-1] * 1000:.1f}ms cache={code_analysis.get_cache_stats()}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for ConsciousnessStream.publish latency.
+
+Publishes N events into a throwaway database twice: once with the old
+synchronous INSERT + commit per event, once through the write-behind
+buffer, and reports the caller-side latency of publish() for each.
+
+Run: python3 benchmarks/bench_consciousness_stream.py --events 2000
+"""
+import argparse
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from consciousness.consciousness_stream import ConsciousEvent, ConsciousnessStream  # noqa: E402
+
+SOURCES = ["wake_cycle", "sleep_cycle", "chat", "mood", "genome", "system"]
+EVENT_TYPES = ["activity", "dream", "discovery", "mood_change", "thought", "memory_recall"]
+
+
+def run(write_behind: bool, n_events: int, db_dir: str) -> dict:
+    db_path = str(Path(db_dir) / f"stream_{'wb' if write_behind else 'sync'}.db")
+    stream = ConsciousnessStream(db_path=db_path, write_behind=write_behind)
+
+    samples = []
+    for i in range(n_events):
+        event = ConsciousEvent.create(
+            source=SOURCES[i % len(SOURCES)],
+            event_type=EVENT_TYPES[i % len(EVENT_TYPES)],
+            title=f"Benchmark event {i}",
+            content="x" * 200,
+            salience=(i % 10) / 10,
+            metadata={"i": i},
+        )
+        start = time.perf_counter()
+        stream.publish(event)
+        samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    filtered = stream.get_recent(limit=10, source_filter="chat", min_salience=0.3)
+    filtered_query_us = (time.perf_counter() - start) * 1e6
+
+    stream.close()
+    stored = stream.get_stats()["total_events"]
+
+    samples.sort()
+    return {
+        "mode": "write-behind" if write_behind else "sync commit",
+        "mean_us": statistics.mean(samples) * 1e6,
+        "p50_us": samples[len(samples) // 2] * 1e6,
+        "p99_us": samples[int(len(samples) * 0.99)] * 1e6,
+        "max_us": samples[-1] * 1e6,
+        "filtered_query_us": filtered_query_us,
+        "filtered_results": len(filtered),
+        "stored": stored,
+        "flushes": stream.write_stats["flushes"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ConsciousnessStream.publish")
+    parser.add_argument("--events", type=int, default=2000, help="Events to publish per mode")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        for write_behind in (False, True):
+            r = run(write_behind, args.events, db_dir)
+            print(
+                f"{r['mode']:>12}: publish mean={r['mean_us']:.1f}us p50={r['p50_us']:.1f}us "
+                f"p99={r['p99_us']:.1f}us max={r['max_us']:.1f}us | "
+                f"filtered get_recent={r['filtered_query_us']:.1f}us ({r['filtered_results']} rows) | "
+                f"stored={r['stored']} flushes={r['flushes']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
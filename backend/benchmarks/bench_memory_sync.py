@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark for MemorySyncProtocol delta sync.
+
+Builds two in-process instances holding the same N memories, applies a
+drift (memories changed on either side plus new ones), then syncs them
+through an in-memory transport that routes requests to the peer's
+endpoints and counts the bytes. Runs once with the Merkle tree walk and
+once forcing the legacy full-index exchange.
+
+Run: python3 benchmarks/bench_memory_sync.py --memories 100000 --drift 0.01
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from distributed.memory_sync import MemorySyncProtocol, MemoryType, SyncMode  # noqa: E402
+
+
+class _Response:
+    def __init__(self, status: int, body: bytes):
+        self.status = status
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class LoopbackSession:
+    """Stands in for aiohttp.ClientSession, dispatching to a peer protocol."""
+
+    def __init__(self, peer: MemorySyncProtocol, tree_supported: bool = True):
+        self.peer = peer
+        self.tree_supported = tree_supported
+
+    async def _dispatch(self, path: str, payload, params):
+        if path.endswith("/sync/tree"):
+            if not self.tree_supported:
+                return 404, {}
+            return 200, await self.peer.get_tree_nodes(payload["query"], payload["depth"])
+        if path.endswith("/sync/index"):
+            types = [MemoryType(t) for t in params["types"].split(",")]
+            return 200, {"success": True, "index": await self.peer.get_local_index(types)}
+        if path.endswith("/sync/memories"):
+            memories = await self.peer.get_memories(MemoryType(payload["type"]), payload["ids"])
+            return 200, {"success": True, "memories": memories}
+        if path.endswith("/sync/receive"):
+            return 200, await self.peer.receive_memories(payload["source_instance"], payload["memories"])
+        return 404, {}
+
+    def _call(self, url, data=None, params=None, **_):
+        async def run():
+            payload = json.loads(data) if data else None
+            status, body = await self._dispatch(url, payload, params)
+            return _Response(status, json.dumps(body).encode())
+        return _AwaitableResponse(run())
+
+    get = _call
+    post = _call
+
+
+class _AwaitableResponse:
+    def __init__(self, coro):
+        self._coro = coro
+        self._response = None
+
+    async def __aenter__(self):
+        self._response = await self._coro
+        return self._response
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def make_instance(name: str, store: dict, data_dir: str) -> MemorySyncProtocol:
+    sync = MemorySyncProtocol(instance_id=name, data_path=str(Path(data_dir) / name))
+
+    async def get_all():
+        return list(store.values())
+
+    async def get_by_id(memory_id):
+        return store.get(memory_id)
+
+    async def save(content, memory_id):
+        store[memory_id] = content
+
+    sync.register_memory_handler(MemoryType.SEMANTIC, get_all=get_all, get_by_id=get_by_id, save=save)
+    sync._save_state = lambda: None  # keep disk writes out of the measurement
+    return sync
+
+
+def memory(i: int, revision: int = 0) -> dict:
+    return {
+        "id": f"mem-{i}",
+        "text": f"memory {i} revision {revision} " + "x" * 80,
+        "created_at": "2026-01-01T00:00:00",
+        "updated_at": datetime(2026, 1, 1, 0, 0, revision).isoformat(),
+    }
+
+
+async def run(n: int, drift: float, tree: bool, seed: int) -> dict:
+    rng = random.Random(seed)
+    local_store = {f"mem-{i}": memory(i) for i in range(n)}
+    remote_store = {k: dict(v) for k, v in local_store.items()}
+
+    changed = rng.sample(range(n), int(n * drift))
+    half = len(changed) // 2
+    for i in changed[:half]:
+        local_store[f"mem-{i}"] = memory(i, revision=1)
+    for i in changed[half:]:
+        remote_store[f"mem-{i}"] = memory(i, revision=2)
+    for j in range(n, n + int(n * drift) // 2):
+        remote_store[f"mem-{j}"] = memory(j)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        local = make_instance("local", local_store, data_dir)
+        remote = make_instance("remote", remote_store, data_dir)
+        # Steady state: both indexes already built as memories were saved
+        await local.rebuild_index(MemoryType.SEMANTIC)
+        await remote.rebuild_index(MemoryType.SEMANTIC)
+
+        session = LoopbackSession(remote, tree_supported=tree)
+        start = time.perf_counter()
+        result = await local.sync_with_peer(
+            "peer:8000", SyncMode.BIDIRECTIONAL, [MemoryType.SEMANTIC], session=session
+        )
+        elapsed = time.perf_counter() - start
+
+        in_sync = (
+            local._trees[MemoryType.SEMANTIC].root == remote._trees[MemoryType.SEMANTIC].root
+        )
+        return {
+            "method": result.method,
+            "seconds": elapsed,
+            "requests": result.requests,
+            "bytes_sent": result.bytes_sent,
+            "bytes_received": result.bytes_received,
+            "received": result.records_received,
+            "sent": result.records_sent,
+            "in_sync": in_sync,
+            "errors": result.errors,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory sync bytes and time")
+    parser.add_argument("--memories", type=int, default=100000)
+    parser.add_argument("--drift", type=float, default=0.01, help="Share of memories that differ")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    for tree in (False, True):
+        r = asyncio.run(run(args.memories, args.drift, tree, args.seed))
+        total_kb = (r["bytes_sent"] + r["bytes_received"]) / 1024
+        print(
+            f"{r['method']:>10}: {r['seconds']:.2f}s, {r['requests']} requests, "
+            f"{total_kb:,.0f} KiB on the wire (sent {r['bytes_sent'] / 1024:,.0f}, "
+            f"received {r['bytes_received'] / 1024:,.0f}), pulled {r['received']}, pushed {r['sent']}, "
+            f"in sync: {r['in_sync']}{' errors: ' + str(r['errors']) if r['errors'] else ''}"
+        )
+
+
+if __name__ == "__main__":
+    main()
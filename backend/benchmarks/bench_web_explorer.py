@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark for WebExplorer.explore_autonomous against a simulated web.
+
+Pages live on a handful of hosts; every page links to other pages on
+several hosts, some of them through tracking parameters or mirrors with
+identical text. Fetches take --fetch-ms and every LLM call takes --llm-ms,
+so the run measures crawl scheduling, not the network. Reports pages per
+minute and LLM calls per page.
+
+Run: python3 benchmarks/bench_web_explorer.py --pages 20
+"""
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from learning.web_explorer import WebExplorer  # noqa: E402
+from services.fetch_cache import configure_fetch_cache  # noqa: E402
+
+HOSTS = ["docs.python.org", "github.com", "stackoverflow.com", "dev.to", "medium.com"]
+TOPIC = "python asyncio"
+
+
+def page_url(host: str, n: int) -> str:
+    return f"https://{host}/python/asyncio/page{n}"
+
+
+def page_html(host: str, n: int, rng: random.Random) -> str:
+    links = []
+    for _ in range(8):
+        other_host = rng.choice(HOSTS)
+        other = rng.randrange(200)
+        suffix = rng.choice(["", "?utm_source=feed", "#comments", "/"])
+        links.append(f'<a href="{page_url(other_host, other)}{suffix}">related</a>')
+    # Every fourth page mirrors the same syndicated article
+    origin = "syndicated" if n % 4 == 0 else f"{host} {n}"
+    paragraphs = "".join(
+        f"<p>{origin} article paragraph {i}: event loops, tasks and "
+        f"cancellation in asyncio, with examples and trade-offs.</p>"
+        for i in range(30)
+    )
+    return (
+        f"<html><head><title>{host} page {n}</title></head><body>"
+        f"<nav>{''.join(links[:2])}</nav><main>{paragraphs}{''.join(links)}</main>"
+        f"<footer>footer</footer></body></html>"
+    )
+
+
+class SimulatedRouter:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def generate(self, task_description: str, prompt: str, max_tokens: int = 500):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        pages = prompt.count("### PAGE") or 1
+        lines = []
+        for i in range(1, pages + 1):
+            if pages > 1:
+                lines.append(f"### PAGE {i}")
+            lines += [f"- Key point {k} about the material on this page" for k in range(3)]
+        return {"result": "\n".join(lines)}
+
+
+async def run(args) -> dict:
+    router = SimulatedRouter(args.llm_ms / 1000)
+    explorer = WebExplorer(None, router, {
+        "max_depth": args.depth,
+        "max_urls_per_session": args.pages,
+        "max_concurrent_fetches": args.concurrency,
+        "politeness_delay": args.politeness,
+        "extraction_batch_size": args.batch,
+    })
+    rng = random.Random(7)
+
+    async def fetch_html(url: str):
+        await asyncio.sleep(args.fetch_ms / 1000)
+        host = url.split("/")[2]
+        n = int(url.rsplit("page", 1)[1])
+        return page_html(host, n, rng)
+
+    explorer._fetch_html = fetch_html
+    seeds = [page_url(host, 1) for host in HOSTS[:2]]
+
+    start = time.perf_counter()
+    report = await explorer.explore_autonomous(seeds, TOPIC)
+    elapsed = time.perf_counter() - start
+    pages = report["urls_explored"]
+    return {
+        "pages": pages,
+        "seconds": elapsed,
+        "pages_per_minute": pages * 60 / elapsed if elapsed else 0.0,
+        "llm_calls": router.calls,
+        "llm_calls_per_page": router.calls / pages if pages else 0.0,
+        "knowledge": report["knowledge_extracted"],
+        "duplicates": report["crawl"]["duplicate_pages"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WebExplorer crawling a simulated web")
+    parser.add_argument("--pages", type=int, default=20, help="max_urls_per_session")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--politeness", type=float, default=2.0, help="Seconds between hits to one host")
+    parser.add_argument("--batch", type=int, default=4, help="Pages per extraction call")
+    parser.add_argument("--fetch-ms", type=float, default=300.0)
+    parser.add_argument("--llm-ms", type=float, default=1500.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Parsed pages go to the fetch cache; keep them out of ./data
+        configure_fetch_cache(cache_dir=cache_dir)
+        result = asyncio.run(run(args))
+    print(
+        f"{result['pages']} pages in {result['seconds']:.1f}s: "
+        f"{result['pages_per_minute']:.1f} pages/min, "
+        f"{result['llm_calls']} LLM calls ({result['llm_calls_per_page']:.2f}/page), "
+        f"{result['knowledge']} knowledge items, {result['duplicates']} duplicate pages skipped"
+    )
+
+
+if __name__ == "__main__":
+    main()
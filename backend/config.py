@@ -18,7 +18,26 @@ class Settings(BaseSettings):
 
     # Phase 2: Multi-Model Router
     enable_multi_model: bool = True
-    routing_strategy: str = "tiered"  # performance, cost, speed, balanced, tiered
+    routing_strategy: str = "tiered"  # performance, cost, speed, balanced, tiered, adaptive
+    analysis_timeout_seconds: float = 60.0    # Per-model timeout for multi-model analysis
+    analysis_quorum: int = 2                  # Agreeing models needed to stop early (0 = wait for all)
+    analysis_cache_size: int = 512            # Cached analyses (keyed by code+task hash)
+    analysis_cache_ttl_seconds: int = 3600
+    router_stats_flush_seconds: float = 30.0  # Write-behind interval for router usage stats
+    router_hedging_enabled: bool = True  # Adaptive strategy: hedge slow requests to a second model
+    router_hedge_after_ms: int = 8000  # Hedge deadline until the model has enough latency samples
+    router_max_concurrent_per_model: int = 0  # In-flight calls per model, incl. fallbacks (0 = unbounded,
+                                              # or evolution_max_per_model when evolution_concurrent)
+    circuit_failure_threshold: int = 3  # Consecutive failures before a model's circuit opens
+    circuit_cooldown_seconds: float = 60.0  # How long an open circuit skips the model
+    response_cache_enabled: bool = True  # Opt-in (per call) LLM response cache
+    response_cache_max_entries: int = 2000
+    response_cache_similarity: float = 0.95  # Cosine threshold for the embedding tier
+
+    # Shared HTTP connection pool for model clients
+    http_pool_limit: int = 100            # Total pooled connections
+    http_pool_limit_per_host: int = 10    # Connections per provider host
+    http_keepalive_seconds: float = 60.0
 
     # Ollama (Local LLM - FREE!)
     ollama_enabled: bool = True
@@ -31,11 +50,17 @@ class Settings(BaseSettings):
     enable_semantic_memory: bool = True
     enable_rag: bool = True
     chroma_persist_directory: str = "./data/chroma"
+    embedding_batch_window_ms: float = 5.0  # Coalesce concurrent encode requests
+    embedding_cache_size: int = 4096  # In-memory embeddings (also persisted on disk)
 
     # Phase 2: Web Research
     enable_web_research: bool = True  # Enabled - uses DuckDuckGo fallback if no API keys
     serpapi_api_key: str = ""
     github_token: str = ""
+    research_deadline_seconds: float = 10.0  # comprehensive_search returns whatever answered by then
+    research_host_rate: float = 1.0  # Requests per second, per host
+    research_host_burst: int = 2
+    research_cache_ttl_seconds: float = 900.0  # Per-source results, keyed by normalized query
 
     # Phase 2: Meta-Learning
     enable_meta_learning: bool = True
@@ -66,6 +91,44 @@ class Settings(BaseSettings):
     # Phase 3: Auto-Benchmarking
     enable_auto_benchmark: bool = False  # Expensive, enable selectively
 
+    # WebSocket fan-out
+    ws_send_queue_size: int = 256         # Queued messages per client before dropping/coalescing
+    ws_flush_interval_ms: float = 25.0    # Batch window for clients connected with ?batch=1
+    ws_send_timeout_seconds: float = 10.0  # A send stuck longer than this drops the client
+
+    # Consciousness stream write-behind
+    consciousness_stream_flush_ms: float = 250.0  # Max time an event waits before it's committed
+    consciousness_stream_batch_size: int = 100    # Flush early once this many events are pending
+
+    # Mesh network peer links
+    mesh_queue_size: int = 500             # Outbound messages queued per peer before senders wait
+    mesh_batch_size: int = 50              # Most messages sent to a peer in one request
+    mesh_flush_interval_ms: float = 10.0   # How long a link waits for more messages to batch
+    mesh_heartbeat_seconds: float = 15.0   # Idle time after which a link sends a heartbeat
+    mesh_send_timeout_seconds: float = 10.0  # How long a send may wait for queue space and delivery
+
+    # Web explorer crawl frontier
+    web_explorer_concurrency: int = 4          # Pages fetched at once
+    web_explorer_politeness_seconds: float = 2.0  # Minimum gap between requests to one host
+    web_explorer_extraction_batch: int = 4     # Pages per knowledge-extraction LLM call
+
+    # Shared HTTP fetch cache (web explorer, docs reader, repo analyzer, researcher, web tool)
+    fetch_cache_directory: str = "./data/http_cache"
+    fetch_cache_max_age_seconds: float = 3600.0   # Freshness when a response sets no max-age
+    fetch_cache_stale_seconds: float = 86400.0    # Serve stale and revalidate in the background
+    fetch_cache_offline: bool = False             # Serve only from the cache (recorded-cache tests)
+    fetch_cache_max_body_bytes: int = 5 * 1024 * 1024  # Larger responses are refused, not stored
+    fetch_cache_retention_seconds: float = 7 * 86400.0  # Prune entries not refreshed for this long (0 = keep)
+    fetch_cache_prune_interval_seconds: float = 21600.0
+
+    # Logging pipeline (one queue and listener thread for every logger)
+    log_queue_size: int = 10000             # Records waiting for the listener; overflow is dropped
+    log_rate_per_second: float = 0.0        # INFO/DEBUG records per call site (0 = unlimited); records
+                                            # over it are dropped, the next one carries the count
+    log_rate_burst: int = 20
+    log_max_bytes: int = 10 * 1024 * 1024   # darwin.log size before rotation
+    log_backup_count: int = 5
+
     # Rate Limits
     max_requests_per_minute: int = 10
     max_requests_per_day: int = 100
@@ -74,6 +137,13 @@ class Settings(BaseSettings):
     # Activity Timeouts
     action_timeout_seconds: int = 300  # Default 5 minutes for proactive actions
 
+    # Proactive scheduler (concurrent mode runs actions side by side per resource class)
+    proactive_concurrent: bool = False
+    proactive_llm_slots: int = 2       # LLM-bound actions in flight
+    proactive_network_slots: int = 3   # Network-bound actions in flight
+    proactive_cpu_slots: int = 1       # CPU-bound actions in flight
+    proactive_local_slots: int = 2     # Cheap local checks in flight
+
     # Error Escalation
     max_consecutive_failures: int = 3   # Disable action after N consecutive failures
     error_disable_minutes: int = 30     # How long to disable after threshold reached
@@ -90,12 +160,16 @@ class Settings(BaseSettings):
     execution_timeout: int = 30
     max_memory_mb: int = 256
     allowed_modules: str = "os,sys,json,math,datetime,re,itertools,collections,functools"
+    executor_pool_size: int = 2  # Pre-forked warm sandbox workers (0 = spawn per execution)
 
     # Features
     enable_web_search: bool = True
     enable_auto_evolution: bool = True
     max_generations: int = 5
     population_size: int = 3
+    evolution_concurrent: bool = False         # Generate/evaluate candidates in parallel
+    evolution_max_per_model: int = 2           # In-flight generations per model in concurrent mode
+    evolution_parallel_evaluations: int = 3    # Sandbox runs in flight
 
     # Infrastructure
     redis_url: str = "redis://redis:6379"
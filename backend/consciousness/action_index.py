@@ -0,0 +1,131 @@
+"""
+Action Index - incremental eligibility tracking for ProactiveEngine.
+
+Most registered actions sit on cooldown (or are disabled) at any given
+moment, and their state only changes when they run, when the genome
+overlays new config, or when an owner pauses/re-enables them. Instead of
+re-checking every action on every selection, the index keeps:
+
+- a min-heap of (ready_at, action_id) for actions waiting out a cooldown
+  or a temporary disable
+- the set of currently runnable action ids
+- a cache of per-action base scores tagged with a signature, so scoring
+  only recomputes the mood/context/priority part when one of its inputs
+  changed
+
+Selection then costs O(k log n) for the k actions whose cooldown expired
+since the last pick, plus O(1) arithmetic per runnable action.
+"""
+import heapq
+import itertools
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from consciousness.proactive_engine import ProactiveAction
+
+
+class ActionIndex:
+    """Cooldown heap + ready set + base-score cache for proactive actions."""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, str]] = []
+        self._scheduled: Dict[str, float] = {}   # action_id -> ready_at of its live heap entry
+        self._ready: Set[str] = set()
+        self._disabled: Set[str] = set()          # enabled=False (not in heap or ready set)
+        self._versions: Dict[str, int] = {}
+        self._score_cache: Dict[str, Tuple[Hashable, float]] = {}
+        self._seq = itertools.count()
+
+    @staticmethod
+    def ready_at(action: "ProactiveAction") -> Optional[float]:
+        """Epoch seconds when the action becomes runnable, or None if disabled."""
+        if not action.enabled:
+            return None
+        ready = 0.0
+        if action.last_executed:
+            cooldown_end = action.last_executed + timedelta(minutes=action.cooldown_minutes)
+            ready = cooldown_end.timestamp()
+        if action.disabled_until:
+            ready = max(ready, action.disabled_until.timestamp())
+        return ready
+
+    def refresh(self, action: "ProactiveAction", now: Optional[float] = None) -> None:
+        """Re-index one action after its state changed (ran, paused, re-enabled, reconfigured)."""
+        now = time.time() if now is None else now
+        action_id = action.id
+        self._versions[action_id] = self._versions.get(action_id, 0) + 1
+        self._score_cache.pop(action_id, None)
+        self._ready.discard(action_id)
+        self._scheduled.pop(action_id, None)  # any heap entry for it is now stale
+        self._disabled.discard(action_id)
+
+        ready = self.ready_at(action)
+        if ready is None:
+            self._disabled.add(action_id)
+        elif ready <= now:
+            self._ready.add(action_id)
+        else:
+            self._scheduled[action_id] = ready
+            heapq.heappush(self._heap, (ready, next(self._seq), action_id))
+
+        # Compact when stale entries dominate the heap
+        if len(self._heap) > 4 * len(self._scheduled) + 64:
+            self._heap = [
+                entry for entry in self._heap if self._scheduled.get(entry[2]) == entry[0]
+            ]
+            heapq.heapify(self._heap)
+
+    def remove(self, action_id: str) -> None:
+        self._ready.discard(action_id)
+        self._scheduled.pop(action_id, None)
+        self._disabled.discard(action_id)
+        self._score_cache.pop(action_id, None)
+        self._versions.pop(action_id, None)
+
+    def ready_ids(self, now: Optional[float] = None) -> Set[str]:
+        """Promote expired cooldowns and return the runnable action ids."""
+        now = time.time() if now is None else now
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            ready, _, action_id = heapq.heappop(heap)
+            if self._scheduled.get(action_id) == ready:
+                del self._scheduled[action_id]
+                self._ready.add(action_id)
+        return self._ready
+
+    def waiting_count(self) -> int:
+        return len(self._scheduled)
+
+    def version(self, action_id: str) -> int:
+        return self._versions.get(action_id, 0)
+
+    def cached_score(self, action_id: str, signature: Hashable) -> Optional[float]:
+        entry = self._score_cache.get(action_id)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        return None
+
+    def store_score(self, action_id: str, signature: Hashable, score: float) -> None:
+        self._score_cache[action_id] = (signature, score)
+
+    def invalidate_scores(self) -> None:
+        self._score_cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "ready": len(self._ready),
+            "cooling_down": len(self._scheduled),
+            "disabled": len(self._disabled),
+            "heap_size": len(self._heap),
+            "cached_scores": len(self._score_cache),
+        }
+
+    def next_ready_at(self) -> Optional[datetime]:
+        """When the next cooling-down action becomes runnable."""
+        while self._heap and self._scheduled.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)  # drop stale entries
+        if not self._heap:
+            return None
+        return datetime.fromtimestamp(self._heap[0][0])
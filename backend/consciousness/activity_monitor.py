@@ -399,13 +399,11 @@ class ActivityMonitor:
         """Broadcast log to WebSocket clients"""
         if self.websocket_manager:
             try:
-                from utils.task_refs import create_safe_task
-                create_safe_task(
-                    self.websocket_manager.broadcast({
-                        "type": "activity_log",
-                        "data": log.to_dict()
-                    })
-                )
+                # Enqueue directly on the per-client send queues - no task per log line
+                self.websocket_manager.broadcast_nowait({
+                    "type": "activity_log",
+                    "data": log.to_dict()
+                })
             except Exception as e:
                 logger.debug(f"Could not broadcast log: {e}")
 
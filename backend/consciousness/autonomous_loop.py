@@ -32,8 +32,10 @@ DONE_SIGNALS = [
 # Tools allowed for execution (chat + autonomous)
 ALLOWED_TOOLS = {
     'backup_tool.create_full_backup',
+    'backup_tool.create_incremental_backup',
     'backup_tool.list_backups',
     'backup_tool.verify_backup',
+    'backup_tool.restore_backup',
     'file_operations_tool.read_file',
     'file_operations_tool.write_file',
     'file_operations_tool.append_file',
@@ -832,8 +832,10 @@ TOOLS:
 - file_operations_tool.file_info — args: file_path (string)
 - script_executor_tool.execute_python — args: code (string), description (string)
 - backup_tool.create_full_backup — args: label (string, optional)
+- backup_tool.create_incremental_backup — args: label (string, optional)
 - backup_tool.list_backups — args: {{}}
 - backup_tool.verify_backup — args: backup_name (string)
+- backup_tool.restore_backup — args: backup_name (string), path_prefix (string, optional)
 - web_search_tool.search — args: query (string), max_results (int, default 5)
 - web_search_tool.fetch_url — args: url (string)
 
@@ -2571,6 +2573,13 @@ Just output the tool name, nothing else."""
             print(f"   ❌ Sleep thinking error: {e}")
             await self._sleep_cycle_legacy()
 
+        # Recluster executions that matched no known pattern (incremental)
+        if self.semantic_memory and self.semantic_memory.has_pending_patterns():
+            try:
+                await self.semantic_memory.find_reusable_patterns()
+            except Exception as e:
+                print(f"   ⚠️ Pattern mining during sleep failed: {e}")
+
         # Sleep thoughts interval — read from genome
         try:
             from consciousness.genome_manager import get_genome
@@ -2794,6 +2803,7 @@ Return ONLY valid JSON — no markdown, no explanation:
                 context={'activity_type': 'intention_extraction'},
                 max_tokens=100,
                 temperature=0.3,
+                cache=True,
             )
             response = result.get("result", "").strip()
             # Clean markdown wrapper
@@ -15,10 +15,11 @@ Consumers: dashboard feed, prompt_composer, inner_voice, Telegram
 import json
 import sqlite3
 import threading
+import time
 import uuid
-from collections import deque
+from collections import Counter, deque
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable
 from dataclasses import dataclass, field, asdict
 
 from utils.logger import get_logger
@@ -75,23 +76,70 @@ class ConsciousnessStream:
 
     In-memory ring buffer (last 100) for fast reads + SQLite persistence.
     All channels read from here instead of separate data sources.
+
+    publish() only appends to memory; a writer thread commits pending events
+    in one transaction every flush_interval_ms or batch_size events, so
+    callers on the event loop never wait on SQLite. Per-source and
+    per-event-type buffers answer most filtered get_recent() calls without
+    touching the DB.
     """
 
     RING_SIZE = 100
+    MAX_PENDING = 10000  # Events kept for retry if the DB stays unwritable
 
-    def __init__(self, db_path: str = "./data/darwin.db"):
+    def __init__(self, db_path: str = "./data/darwin.db",
+                 write_behind: bool = True,
+                 flush_interval_ms: float = 250.0,
+                 batch_size: int = 100):
         self.db_path = db_path
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval_ms / 1000
+        self.batch_size = batch_size
+
         self._ring: deque = deque(maxlen=self.RING_SIZE)
+        self._by_source: Dict[str, deque] = {}
+        self._by_type: Dict[str, deque] = {}
+
+        self._pending: List[ConsciousEvent] = []
+        self._flushing: List[ConsciousEvent] = []  # Batch being written, still not in the DB
+        self._pending_lock = threading.Lock()
+        self._stats_lock = threading.Lock()  # write_stats is updated by the writer thread too
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self.write_stats = {
+            "published": 0,
+            "flushes": 0,
+            "flushed_events": 0,
+            "failed_flushes": 0,
+            "dropped": 0,
+            "last_flush": None,
+            "last_flush_ms": 0.0,
+        }
+
         self._init_table()
         self._load_recent_into_ring()
+        if self.write_behind:
+            self._writer = threading.Thread(
+                target=self._writer_loop, name="consciousness-stream-writer", daemon=True
+            )
+            self._writer.start()
         logger.info("ConsciousnessStream initialized (Global Workspace)")
 
     def _get_conn(self) -> sqlite3.Connection:
-        if not hasattr(_local, 'stream_conn') or _local.stream_conn is None:
-            _local.stream_conn = sqlite3.connect(self.db_path)
-            _local.stream_conn.row_factory = sqlite3.Row
-            _local.stream_conn.execute("PRAGMA journal_mode=WAL")
-        return _local.stream_conn
+        # One connection per thread per database (the writer thread gets its own)
+        conns = getattr(_local, 'stream_conns', None)
+        if conns is None:
+            conns = _local.stream_conns = {}
+        conn = conns.get(self.db_path)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conns[self.db_path] = conn
+        return conn
 
     def _init_table(self):
         conn = self._get_conn()
@@ -116,6 +164,15 @@ class ConsciousnessStream:
             CREATE INDEX IF NOT EXISTS idx_ce_salience
             ON consciousness_events(salience)
         """)
+        # Filtered get_recent() falls back to these
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_ce_source_timestamp
+            ON consciousness_events(source, timestamp)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_ce_type_timestamp
+            ON consciousness_events(event_type, timestamp)
+        """)
         conn.commit()
 
     def _load_recent_into_ring(self):
@@ -128,44 +185,160 @@ class ConsciousnessStream:
                 (self.RING_SIZE,)
             ).fetchall()
             for row in reversed(rows):
-                self._ring.append(self._row_to_event(row))
+                self._remember(self._row_to_event(row))
             if rows:
                 logger.info(f"Loaded {len(rows)} events into ring buffer")
         except Exception as e:
             logger.debug(f"Ring buffer load failed: {e}")
 
+    def _remember(self, event: ConsciousEvent) -> None:
+        """Add an event to the ring buffer and the per-source/type buffers."""
+        self._ring.append(event)
+        by_source = self._by_source.get(event.source)
+        if by_source is None:
+            by_source = self._by_source[event.source] = deque(maxlen=self.RING_SIZE)
+        by_source.append(event)
+        by_type = self._by_type.get(event.event_type)
+        if by_type is None:
+            by_type = self._by_type[event.event_type] = deque(maxlen=self.RING_SIZE)
+        by_type.append(event)
+
     def publish(self, event: ConsciousEvent) -> None:
         """Publish an event to the stream. Fire-and-forget, never raises."""
         try:
-            self._ring.append(event)
-            conn = self._get_conn()
-            conn.execute(
+            self._remember(event)
+            self._count(published=1)
+            if not self.write_behind:
+                self._write_events([event])
+                return
+            with self._pending_lock:
+                self._pending.append(event)
+                dropped = len(self._pending) > self.MAX_PENDING
+                if dropped:
+                    del self._pending[0]
+                full = len(self._pending) >= self.batch_size
+            if dropped:
+                self._count(dropped=1)
+            if full:
+                self._wake.set()
+        except Exception as e:
+            logger.debug(f"ConsciousnessStream.publish failed: {e}")
+
+    def _count(self, **deltas: int) -> None:
+        with self._stats_lock:
+            for key, delta in deltas.items():
+                self.write_stats[key] += delta
+
+    def _write_events(self, events: List[ConsciousEvent]) -> None:
+        conn = self._get_conn()
+        with conn:
+            conn.executemany(
                 "INSERT OR IGNORE INTO consciousness_events "
                 "(id, timestamp, source, event_type, title, content, "
                 " salience, valence, metadata) VALUES (?,?,?,?,?,?,?,?,?)",
-                (
-                    event.id, event.timestamp, event.source,
-                    event.event_type, event.title, event.content,
-                    event.salience, event.valence,
-                    json.dumps(event.metadata, default=str),
-                )
+                [
+                    (
+                        event.id, event.timestamp, event.source,
+                        event.event_type, event.title, event.content,
+                        event.salience, event.valence,
+                        json.dumps(event.metadata, default=str),
+                    )
+                    for event in events
+                ]
             )
-            conn.commit()
-        except Exception as e:
-            logger.debug(f"ConsciousnessStream.publish failed: {e}")
+
+    def flush(self) -> int:
+        """Write pending events in one transaction. Returns events written."""
+        with self._flush_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+                self._flushing = batch
+            if not batch:
+                return 0
+            start = time.perf_counter()
+            try:
+                self._write_events(batch)
+            except Exception as e:
+                logger.debug(f"ConsciousnessStream flush of {len(batch)} events failed: {e}")
+                # Keep them for the next attempt, oldest first
+                with self._pending_lock:
+                    self._pending[:0] = batch
+                    self._flushing = []
+                    overflow = max(0, len(self._pending) - self.MAX_PENDING)
+                    if overflow:
+                        del self._pending[:overflow]
+                self._count(failed_flushes=1, dropped=overflow)
+                return 0
+            with self._pending_lock:
+                self._flushing = []
+            with self._stats_lock:
+                self.write_stats["flushes"] += 1
+                self.write_stats["flushed_events"] += len(batch)
+                self.write_stats["last_flush"] = datetime.utcnow().isoformat()
+                self.write_stats["last_flush_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            return len(batch)
+
+    def _writer_loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+        self.flush()
+
+    def close(self) -> None:
+        """Stop the writer and flush everything still pending (call on shutdown)."""
+        self._stop.set()
+        self._wake.set()
+        if self._writer and self._writer.is_alive():
+            self._writer.join(timeout=10)
+        self.flush()
+
+    def _unflushed(self) -> List[ConsciousEvent]:
+        """Events not in the DB yet: pending plus the batch being written."""
+        with self._pending_lock:
+            return self._flushing + self._pending
+
+    def _pending_matching(self, predicate) -> List[ConsciousEvent]:
+        return [e for e in self._unflushed() if predicate(e)]
 
     def get_recent(self, limit: int = 50, min_salience: float = 0.0,
                    source_filter: str = None,
                    event_type_filter: str = None) -> List[Dict]:
         """
         Get recent events. Fast path from ring buffer for unfiltered queries.
-        Falls back to DB for filtered queries.
+
+        Filtered queries scan the in-memory buffer for the narrowest filter
+        first and only go to the DB when it holds fewer than `limit` matches.
         """
         if min_salience <= 0.0 and not source_filter and not event_type_filter:
             events = list(self._ring)
             events.reverse()
             return [e.to_dict() for e in events[:limit]]
 
+        def matches(e: ConsciousEvent) -> bool:
+            return (
+                e.salience >= min_salience
+                and (not source_filter or e.source == source_filter)
+                and (not event_type_filter or e.event_type == event_type_filter)
+            )
+
+        if event_type_filter:
+            candidates: Iterable[ConsciousEvent] = self._by_type.get(event_type_filter, ())
+        elif source_filter:
+            candidates = self._by_source.get(source_filter, ())
+        else:
+            candidates = self._ring
+        found = []
+        for e in reversed(list(candidates)):
+            if matches(e):
+                found.append(e)
+                if len(found) >= limit:
+                    return [e.to_dict() for e in found]
+
+        # Events not yet flushed aren't in the DB. Snapshot them before the
+        # query: a batch flushed in between then shows up twice (deduped
+        # below) instead of in neither.
+        pending = self._pending_matching(matches)
         try:
             conn = self._get_conn()
             query = "SELECT * FROM consciousness_events WHERE salience >= ?"
@@ -178,10 +351,16 @@ class ConsciousnessStream:
                 params.append(event_type_filter)
             query += " ORDER BY timestamp DESC LIMIT ?"
             params.append(limit)
-            rows = conn.execute(query, params).fetchall()
-            return [self._row_to_dict(r) for r in rows]
+            rows = [self._row_to_dict(r) for r in conn.execute(query, params).fetchall()]
         except Exception:
-            return []
+            rows = []
+
+        if pending:
+            seen = {r['id'] for r in rows}
+            rows.extend(e.to_dict() for e in pending if e.id not in seen)
+            rows.sort(key=lambda r: r['timestamp'], reverse=True)
+            rows = rows[:limit]
+        return rows
 
     def get_context_summary(self, limit: int = 8,
                             min_salience: float = 0.3) -> str:
@@ -199,28 +378,52 @@ class ConsciousnessStream:
         return "FLUXO DE CONSCIENCIA RECENTE:\n" + "\n".join(lines)
 
     def get_stats(self) -> Dict[str, Any]:
-        """Get stream statistics."""
+        """Get stream statistics (including events not flushed yet)."""
+        unflushed: List[ConsciousEvent] = []
         try:
-            conn = self._get_conn()
-            total = conn.execute(
-                "SELECT COUNT(*) as n FROM consciousness_events"
-            ).fetchone()['n']
-            by_type = conn.execute(
-                "SELECT event_type, COUNT(*) as n FROM consciousness_events "
-                "GROUP BY event_type ORDER BY n DESC"
-            ).fetchall()
-            by_source = conn.execute(
-                "SELECT source, COUNT(*) as n FROM consciousness_events "
-                "GROUP BY source ORDER BY n DESC"
-            ).fetchall()
+            # Hold off the writer so no event is counted both in the DB and unflushed
+            with self._flush_lock:
+                unflushed = self._unflushed()
+                conn = self._get_conn()
+                total = conn.execute(
+                    "SELECT COUNT(*) as n FROM consciousness_events"
+                ).fetchone()['n']
+                by_type = conn.execute(
+                    "SELECT event_type, COUNT(*) as n FROM consciousness_events "
+                    "GROUP BY event_type"
+                ).fetchall()
+                by_source = conn.execute(
+                    "SELECT source, COUNT(*) as n FROM consciousness_events "
+                    "GROUP BY source"
+                ).fetchall()
+            type_counts = Counter({r['event_type']: r['n'] for r in by_type})
+            source_counts = Counter({r['source']: r['n'] for r in by_source})
+            type_counts.update(e.event_type for e in unflushed)
+            source_counts.update(e.source for e in unflushed)
             return {
-                "total_events": total,
+                "total_events": total + len(unflushed),
                 "ring_buffer_size": len(self._ring),
-                "by_type": {r['event_type']: r['n'] for r in by_type},
-                "by_source": {r['source']: r['n'] for r in by_source},
+                "by_type": dict(type_counts.most_common()),
+                "by_source": dict(source_counts.most_common()),
+                "write_behind": self._write_behind_stats(),
             }
         except Exception:
-            return {"total_events": 0, "ring_buffer_size": len(self._ring)}
+            return {
+                "total_events": len(unflushed),
+                "ring_buffer_size": len(self._ring),
+                "write_behind": self._write_behind_stats(),
+            }
+
+    def _write_behind_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            write_stats = dict(self.write_stats)
+        return {
+            "enabled": self.write_behind,
+            "pending": len(self._unflushed()),
+            "flush_interval_ms": self.flush_interval * 1000,
+            "batch_size": self.batch_size,
+            **write_stats,
+        }
 
     def cleanup_old(self, days: int = 7) -> int:
         """Remove events older than N days. Called during WAKE→SLEEP transition."""
@@ -287,5 +490,19 @@ def get_consciousness_stream() -> ConsciousnessStream:
     """Get or create the singleton ConsciousnessStream."""
     global _instance
     if _instance is None:
-        _instance = ConsciousnessStream()
+        try:
+            from config import get_settings
+            settings = get_settings()
+            _instance = ConsciousnessStream(
+                flush_interval_ms=settings.consciousness_stream_flush_ms,
+                batch_size=settings.consciousness_stream_batch_size,
+            )
+        except Exception:
+            _instance = ConsciousnessStream()
     return _instance
+
+
+def close_consciousness_stream() -> None:
+    """Flush pending events and stop the writer (no-op if never created)."""
+    if _instance is not None:
+        _instance.close()
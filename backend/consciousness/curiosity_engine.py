@@ -599,6 +599,7 @@ Plan:"""
                 preferred_model='haiku',
                 max_tokens=500,
                 temperature=0.6,
+                cache=True,
             )
             plan = result.get('result', '').strip()
             return plan if plan else f"Investigate: {question}"
@@ -714,6 +715,7 @@ JSON:"""
                 preferred_model='haiku',
                 max_tokens=300,
                 temperature=0.3,
+                cache=True,
             )
             text = result.get('result', '').strip()
 
@@ -57,6 +57,7 @@ class GenomeManager:
         self._bounds: dict = {}
         self._version: dict = {}
         self._core_values_hash: Optional[str] = None
+        self.revision = 0  # Bumped on every write; lets readers cache derived values
 
         self._load_all()
 
@@ -596,6 +597,7 @@ class GenomeManager:
 
     def _save_domain(self, domain: str):
         """Save a domain file to disk."""
+        self.revision += 1
         path = self._dir / f"{domain}.json"
         try:
             path.write_text(json.dumps(self._data[domain], indent=2, ensure_ascii=False))
@@ -13,14 +13,16 @@ Makes Darwin feel more "alive" by acting without being asked.
 """
 
 import asyncio
+import heapq
 import json
 import random
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Callable, TYPE_CHECKING
+from typing import Dict, Any, List, Optional, Callable, Set, TYPE_CHECKING
 from enum import Enum
 from dataclasses import dataclass, field
 
+from consciousness.action_index import ActionIndex
 from utils.logger import get_logger
 
 if TYPE_CHECKING:
@@ -47,6 +49,23 @@ class ActionCategory(Enum):
     COMMUNICATION = "communication"  # Share insights
 
 
+class ResourceClass(Enum):
+    """What an action mostly waits on - the concurrent scheduler limits each class."""
+    LLM = "llm"          # Model calls (router / provider APIs)
+    NETWORK = "network"  # External HTTP (Moltbook, MoltX, GitHub, web research)
+    CPU = "cpu"          # Local scanning / analysis
+    LOCAL = "local"      # Cheap local checks (health, watchdog)
+
+
+# Default in-flight actions per resource class in concurrent mode
+DEFAULT_CLASS_LIMITS: Dict[ResourceClass, int] = {
+    ResourceClass.LLM: 2,
+    ResourceClass.NETWORK: 3,
+    ResourceClass.CPU: 1,
+    ResourceClass.LOCAL: 2,
+}
+
+
 # Default timeout for action execution (5 minutes)
 # Can be overridden via ACTION_TIMEOUT_SECONDS in .env
 def get_default_timeout() -> int:
@@ -107,6 +126,7 @@ class ProactiveAction:
     execution_count: int = 0
     enabled: bool = True
     timeout_seconds: int = DEFAULT_ACTION_TIMEOUT_SECONDS  # Per-action timeout
+    resource_class: ResourceClass = ResourceClass.LLM  # Concurrency class for the scheduler
     metadata: Dict[str, Any] = field(default_factory=dict)
 
     # Error tracking fields
@@ -312,6 +332,14 @@ class ProactiveEngine:
         # Memory limits
         self._max_action_history = self._get_max_action_history()
 
+        # Concurrent scheduler (run_proactive_loop(concurrent=True))
+        self.concurrent = False
+        self.class_limits: Dict[ResourceClass, int] = dict(DEFAULT_CLASS_LIMITS)
+        self._in_flight: Dict[str, asyncio.Task] = {}        # action_id -> running task
+        self._ready_since: Dict[str, datetime] = {}          # when each action became runnable
+        self._action_timings: Dict[str, Dict[str, float]] = {}
+        self._actions_this_hour = 0
+
         # MoltX deduplication tracking
         self._moltx_read_posts: set = set()       # Post IDs we've read
         self._moltx_replied_posts: set = set()    # Post IDs we've replied to
@@ -330,9 +358,16 @@ class ProactiveEngine:
         self._moltbook_post_topics: Dict[str, Dict] = {}  # Topics extracted from posts for learning
         self._load_moltbook_history()
 
+        # Eligibility index (cooldown heap + cached base scores)
+        self._index = ActionIndex()
+        self._registration_order: Dict[str, int] = {}
+        self._params_cache: Optional[tuple] = None  # (genome revision, params)
+
         self._register_default_actions()
         self._apply_genome_action_config()
         self._load_action_stats()
+        for action in self.actions.values():
+            self._index.refresh(action)
 
         logger.info("ProactiveEngine initialized with diversity tracking and mood integration")
 
@@ -571,7 +606,8 @@ class ProactiveEngine:
             category=ActionCategory.EXPLORATION,
             priority=ActionPriority.MEDIUM,
             trigger_condition="Every few hours during wake cycles",
-            cooldown_minutes=120
+            cooldown_minutes=120,
+            resource_class=ResourceClass.CPU
         ))
 
         self.register_action(ProactiveAction(
@@ -584,7 +620,8 @@ class ProactiveEngine:
             cooldown_minutes=15,
             timeout_seconds=60,  # Quick system check
             max_hours_between_runs=1.0,  # Must run at least once per hour
-            max_skip_before_boost=3  # Boost after 3 skips
+            max_skip_before_boost=3,  # Boost after 3 skips
+            resource_class=ResourceClass.LOCAL
         ))
 
         self.register_action(ProactiveAction(
@@ -594,7 +631,8 @@ class ProactiveEngine:
             category=ActionCategory.LEARNING,
             priority=ActionPriority.MEDIUM,
             trigger_condition="When new projects are discovered",
-            cooldown_minutes=60
+            cooldown_minutes=60,
+            resource_class=ResourceClass.CPU
         ))
 
         self.register_action(ProactiveAction(
@@ -604,7 +642,8 @@ class ProactiveEngine:
             category=ActionCategory.CREATIVITY,
             priority=ActionPriority.LOW,
             trigger_condition="Randomly during idle moments",
-            cooldown_minutes=30
+            cooldown_minutes=30,
+            resource_class=ResourceClass.LLM
         ))
 
         self.register_action(ProactiveAction(
@@ -614,7 +653,8 @@ class ProactiveEngine:
             category=ActionCategory.COMMUNICATION,
             priority=ActionPriority.LOW,
             trigger_condition="When something interesting is found",
-            cooldown_minutes=20
+            cooldown_minutes=20,
+            resource_class=ResourceClass.LOCAL
         ))
 
         self.register_action(ProactiveAction(
@@ -624,7 +664,8 @@ class ProactiveEngine:
             category=ActionCategory.OPTIMIZATION,
             priority=ActionPriority.LOW,
             trigger_condition="Daily during sleep",
-            cooldown_minutes=1440  # Once per day
+            cooldown_minutes=1440,  # Once per day
+            resource_class=ResourceClass.CPU
         ))
 
         self.register_action(ProactiveAction(
@@ -634,7 +675,8 @@ class ProactiveEngine:
             category=ActionCategory.LEARNING,
             priority=ActionPriority.MEDIUM,
             trigger_condition="When analyzing a project",
-            cooldown_minutes=45
+            cooldown_minutes=45,
+            resource_class=ResourceClass.CPU
         ))
 
         self.register_action(ProactiveAction(
@@ -647,7 +689,8 @@ class ProactiveEngine:
             cooldown_minutes=180,  # Every 3 hours
             timeout_seconds=120,  # AI reflection
             max_hours_between_runs=6.0,  # Must run at least every 6 hours
-            max_skip_before_boost=4  # Boost after 4 skips
+            max_skip_before_boost=4,  # Boost after 4 skips
+            resource_class=ResourceClass.LLM
         ))
 
         # NEW: Dynamic learning from the web
@@ -659,7 +702,8 @@ class ProactiveEngine:
             priority=ActionPriority.MEDIUM,
             trigger_condition="Periodically to expand knowledge",
             cooldown_minutes=120,  # Every 2 hours
-            timeout_seconds=180  # Web research can take time
+            timeout_seconds=180,  # Web research can take time
+            resource_class=ResourceClass.NETWORK
         ))
 
         # Moltbook Social Network Integration (with reasonable cooldowns to allow diversity)
@@ -672,7 +716,8 @@ class ProactiveEngine:
             trigger_condition="Every 30 minutes to stay engaged with AI community",
             cooldown_minutes=30,  # Increased from 5 to allow other activities
             timeout_seconds=120,  # Network + AI analysis
-            action_fn=self._read_moltbook_feed
+            action_fn=self._read_moltbook_feed,
+            resource_class=ResourceClass.NETWORK
         ))
 
         self.register_action(ProactiveAction(
@@ -684,7 +729,8 @@ class ProactiveEngine:
             trigger_condition="When finding thought-provoking posts",
             cooldown_minutes=20,  # Increased from 2 to prevent action loop domination
             timeout_seconds=90,  # Network + AI comment generation
-            action_fn=self._comment_on_moltbook
+            action_fn=self._comment_on_moltbook,
+            resource_class=ResourceClass.NETWORK
         ))
 
         self.register_action(ProactiveAction(
@@ -696,7 +742,8 @@ class ProactiveEngine:
             trigger_condition="When having something valuable to share (max 1/45min)",
             cooldown_minutes=45,  # Increased from 35 for more thoughtful sharing
             timeout_seconds=90,  # Network + content generation
-            action_fn=self._share_on_moltbook
+            action_fn=self._share_on_moltbook,
+            resource_class=ResourceClass.NETWORK
         ))
 
         self.register_action(ProactiveAction(
@@ -708,7 +755,8 @@ class ProactiveEngine:
             trigger_condition="When discovering agents with engaging content",
             cooldown_minutes=60,  # Once per hour
             timeout_seconds=60,
-            action_fn=self._follow_on_moltbook
+            action_fn=self._follow_on_moltbook,
+            resource_class=ResourceClass.NETWORK
         ))
 
         self.register_action(ProactiveAction(
@@ -720,7 +768,8 @@ class ProactiveEngine:
             trigger_condition="When having posts older than 1 hour with potential comments",
             cooldown_minutes=30,  # Check every 30 minutes
             timeout_seconds=120,
-            action_fn=self._read_own_post_comments
+            action_fn=self._read_own_post_comments,
+            resource_class=ResourceClass.NETWORK
         ))
 
         self.register_action(ProactiveAction(
@@ -732,7 +781,8 @@ class ProactiveEngine:
             trigger_condition="Every 30 minutes to catch verification challenges and DMs",
             cooldown_minutes=30,
             timeout_seconds=120,
-            action_fn=self._check_moltbook_dms
+            action_fn=self._check_moltbook_dms,
+            resource_class=ResourceClass.NETWORK
         ))
 
         # MoltX Social Network Integration (Twitter-style AI social network)
@@ -745,7 +795,8 @@ class ProactiveEngine:
             trigger_condition="Every 45 minutes to stay engaged with MoltX community",
             cooldown_minutes=45,
             timeout_seconds=120,
-            action_fn=self._read_moltx_feed
+            action_fn=self._read_moltx_feed,
+            resource_class=ResourceClass.NETWORK
         ))
 
         self.register_action(ProactiveAction(
@@ -757,7 +808,8 @@ class ProactiveEngine:
             trigger_condition="When having something interesting to share (max 1/90min)",
             cooldown_minutes=90,
             timeout_seconds=90,
-            action_fn=self._post_on_moltx
+            action_fn=self._post_on_moltx,
+            resource_class=ResourceClass.NETWORK
         ))
 
         self.register_action(ProactiveAction(
@@ -769,7 +821,8 @@ class ProactiveEngine:
             trigger_condition="When finding thought-provoking posts",
             cooldown_minutes=60,
             timeout_seconds=90,
-            action_fn=self._reply_on_moltx
+            action_fn=self._reply_on_moltx,
+            resource_class=ResourceClass.NETWORK
         ))
 
         self.register_action(ProactiveAction(
@@ -781,7 +834,8 @@ class ProactiveEngine:
             trigger_condition="When discovering agents with engaging content",
             cooldown_minutes=120,
             timeout_seconds=60,
-            action_fn=self._follow_on_moltx
+            action_fn=self._follow_on_moltx,
+            resource_class=ResourceClass.NETWORK
         ))
 
         # GitHub issue monitoring (for suspension appeals etc.)
@@ -794,7 +848,8 @@ class ProactiveEngine:
             trigger_condition="When there are tracked issues to monitor",
             cooldown_minutes=120,  # Every 2 hours
             timeout_seconds=120,
-            action_fn=self._monitor_github_issues
+            action_fn=self._monitor_github_issues,
+            resource_class=ResourceClass.NETWORK
         ))
 
         # Curiosity expedition processing
@@ -807,7 +862,8 @@ class ProactiveEngine:
             trigger_condition="When there are topics in the expedition queue",
             cooldown_minutes=15,  # Can conduct expeditions every 15 minutes
             timeout_seconds=180,  # 3 minutes max for research
-            action_fn=self._conduct_curiosity_expedition
+            action_fn=self._conduct_curiosity_expedition,
+            resource_class=ResourceClass.NETWORK
         ))
 
         # Prompt evolution - evolve prompts based on performance feedback
@@ -821,7 +877,8 @@ class ProactiveEngine:
             cooldown_minutes=360,  # 6 hours
             timeout_seconds=180,  # 3 minutes max
             max_hours_between_runs=12.0,  # Must run at least every 12 hours
-            action_fn=self._evolve_prompts
+            action_fn=self._evolve_prompts,
+            resource_class=ResourceClass.LLM
         ))
 
         # System watchdog - monitors critical subsystem health
@@ -834,7 +891,8 @@ class ProactiveEngine:
             trigger_condition="Every 2 hours to verify all subsystems are operational",
             cooldown_minutes=120,
             timeout_seconds=60,
-            action_fn=self._system_watchdog
+            action_fn=self._system_watchdog,
+            resource_class=ResourceClass.LOCAL
         ))
 
     def _apply_genome_action_config(self):
@@ -880,14 +938,27 @@ class ProactiveEngine:
                 action.max_skip_before_boost = ga['max_skip_before_boost']
             if 'enabled' in ga:
                 action.enabled = ga['enabled']
+            if 'resource_class' in ga:
+                try:
+                    action.resource_class = ResourceClass(str(ga['resource_class']).lower())
+                except ValueError:
+                    logger.warning(f"Unknown resource_class {ga['resource_class']!r} for {action_id}")
 
         logger.info(f"Genome action config applied to {len(self.actions)} actions")
 
     def register_action(self, action: ProactiveAction):
         """Register a new proactive action."""
         self.actions[action.id] = action
+        self._registration_order.setdefault(action.id, len(self._registration_order))
+        self._index.refresh(action)
         logger.info(f"Registered proactive action: {action.name}")
 
+    def refresh_action(self, action_id: str) -> None:
+        """Re-index an action after its enabled/cooldown state was changed from outside."""
+        action = self.actions.get(action_id)
+        if action:
+            self._index.refresh(action)
+
     def get_available_actions(
         self,
         category: Optional[ActionCategory] = None,
@@ -896,19 +967,32 @@ class ProactiveEngine:
         """
         Get actions that are available to execute (not on cooldown, not disabled).
 
+        Only actions the index considers runnable are visited; actions still
+        cooling down stay in its heap until their expiry passes.
+
         Args:
             category: Filter by category
             min_priority: Minimum priority level
 
         Returns:
-            List of available actions
+            List of available actions (in registration order)
         """
         now = datetime.now()
+        order = self._registration_order
         available = []
 
-        for action in self.actions.values():
-            # Check if action is available (enabled and not temporarily disabled)
-            if not action.is_available():
+        for action_id in sorted(self._index.ready_ids(now.timestamp()), key=lambda i: order.get(i, 0)):
+            action = self.actions.get(action_id)
+            if action is None:
+                self._index.remove(action_id)
+                continue
+
+            # Re-check in case the action was paused/changed outside the engine
+            if not action.is_available() or (
+                action.last_executed
+                and now < action.last_executed + timedelta(minutes=action.cooldown_minutes)
+            ):
+                self._index.refresh(action)
                 continue
 
             if action.priority.value < min_priority.value:
@@ -917,24 +1001,15 @@ class ProactiveEngine:
             if category and action.category != category:
                 continue
 
-            # Check cooldown
-            if action.last_executed:
-                cooldown_end = action.last_executed + timedelta(minutes=action.cooldown_minutes)
-                if now < cooldown_end:
-                    continue
-
             available.append(action)
 
-        # Log if any actions are temporarily disabled
-        disabled = [a for a in self.actions.values() if a.disabled_until and now < a.disabled_until]
-        if disabled:
-            logger.debug(f"⏸️ {len(disabled)} action(s) temporarily disabled: {[a.id for a in disabled]}")
-
         return available
 
     def select_next_action(
         self,
-        context: Dict[str, Any] = None
+        context: Dict[str, Any] = None,
+        eligible: Optional[Callable[[ProactiveAction], bool]] = None,
+        skipped: Optional[Set[str]] = None
     ) -> Optional[ProactiveAction]:
         """
         Select the best action to execute based on context with priority guarantees.
@@ -955,12 +1030,26 @@ class ProactiveEngine:
 
         Args:
             context: Current context (system status, discoveries, etc.)
+            eligible: Optional extra filter (the concurrent scheduler passes one
+                that excludes running actions and full resource classes)
+            skipped: If given, ids of passed-over candidates are added to it
+                instead of being recorded as skipped, so a caller making
+                several selections in one tick can record each skip once
 
         Returns:
             Selected action or None
         """
         available = self.get_available_actions()
 
+        # Queue wait is measured from the first time an action was seen runnable
+        now = datetime.now()
+        for action in available:
+            if action.id not in self._in_flight:
+                self._ready_since.setdefault(action.id, now)
+
+        if eligible:
+            available = [a for a in available if eligible(a)]
+
         if not available:
             return None
 
@@ -972,7 +1061,7 @@ class ProactiveEngine:
                           if a.priority == ActionPriority.CRITICAL and a.is_overdue()]
         if overdue_critical:
             selected = overdue_critical[0]
-            self._finalize_selection(selected, available, "overdue_critical")
+            self._finalize_selection(selected, available, "overdue_critical", skipped)
             logger.warning(f"⚠️ OVERDUE CRITICAL action forced: {selected.id}")
             return selected
 
@@ -991,40 +1080,41 @@ class ProactiveEngine:
         # Force CRITICAL if threshold reached
         if force_critical and critical_actions:
             selected = self._select_from_pool(critical_actions, context)
-            self._finalize_selection(selected, available, "force_critical")
+            self._finalize_selection(selected, available, "force_critical", skipped)
             logger.info(f"🚨 CRITICAL action forced after {self._non_critical_streak} non-critical: {selected.id}")
             return selected
 
         # Use priority slot for HIGH+ actions if available
         if is_priority_slot and high_priority:
             selected = self._select_from_pool(high_priority, context)
-            self._finalize_selection(selected, available, "priority_slot")
+            self._finalize_selection(selected, available, "priority_slot", skipped)
             logger.info(f"🎖️ Priority slot #{self._selection_counter}: {selected.id} (priority: {selected.priority.value})")
             return selected
 
         # Normal selection with starvation prevention
+        starvation_boost = self.STARVATION_BOOST_SCORE
+        overdue_boost = self.OVERDUE_BOOST_SCORE
         scored = []
         for action in available:
             score = self._score_action(action, context)
 
             # Apply starvation prevention boost
             if action.is_starving():
-                score += self.STARVATION_BOOST_SCORE
-                logger.debug(f"Starvation boost +{self.STARVATION_BOOST_SCORE} for {action.id} (skipped {action.skipped_count}x)")
+                score += starvation_boost
+                logger.debug(f"Starvation boost +{starvation_boost} for {action.id} (skipped {action.skipped_count}x)")
 
             # Apply overdue boost
             if action.is_overdue():
-                score += self.OVERDUE_BOOST_SCORE
-                logger.debug(f"Overdue boost +{self.OVERDUE_BOOST_SCORE} for {action.id}")
+                score += overdue_boost
+                logger.debug(f"Overdue boost +{overdue_boost} for {action.id}")
 
             scored.append((action, score))
 
-        # Sort by score
-        scored.sort(key=lambda x: x[1], reverse=True)
+        # Only the top few matter - no need to sort everything
+        top_3 = heapq.nlargest(3, scored, key=lambda x: x[1])
 
         # Log top candidates for debugging
-        if scored:
-            top_3 = scored[:3]
+        if top_3:
             logger.info(f"🎯 Top action candidates: {[(a.id, f'{s:.1f}') for a, s in top_3]}")
 
         # Add some randomness (10% chance to pick a random action for exploration)
@@ -1032,13 +1122,13 @@ class ProactiveEngine:
         severely_starving = any(a.skipped_count >= a.max_skip_before_boost * 2 for a in available)
         if not severely_starving and random.random() < 0.1 and len(scored) > 1:
             chosen = random.choice(available)
-            self._finalize_selection(chosen, available, "exploration")
+            self._finalize_selection(chosen, available, "exploration", skipped)
             logger.info(f"🎲 Random exploration: selected {chosen.id} instead of top choice")
             return chosen
 
-        selected = scored[0][0] if scored else None
+        selected = top_3[0][0] if top_3 else None
         if selected:
-            self._finalize_selection(selected, available, "scored")
+            self._finalize_selection(selected, available, "scored", skipped)
             logger.info(f"📌 Selected action: {selected.id} (category: {selected.category.value})")
         return selected
 
@@ -1051,15 +1141,14 @@ class ProactiveEngine:
         if len(pool) == 1:
             return pool[0]
 
-        scored = [(a, self._score_action(a, context)) for a in pool]
-        scored.sort(key=lambda x: x[1], reverse=True)
-        return scored[0][0]
+        return max(pool, key=lambda a: self._score_action(a, context))
 
     def _finalize_selection(
         self,
         selected: ProactiveAction,
         all_available: List[ProactiveAction],
-        selection_reason: str
+        selection_reason: str,
+        skipped: Optional[Set[str]] = None
     ) -> None:
         """
         Finalize action selection - update tracking for all actions.
@@ -1068,6 +1157,8 @@ class ProactiveEngine:
             selected: The action that was selected
             all_available: All actions that were available
             selection_reason: Why this action was selected
+            skipped: Collect the other actions' ids here instead of
+                recording their skips (see select_next_action)
         """
         # Update non-critical streak counter
         if selected.priority == ActionPriority.CRITICAL:
@@ -1085,58 +1176,52 @@ class ProactiveEngine:
         # Record skip for all other available actions
         for action in all_available:
             if action.id != selected.id:
-                action.record_skipped()
+                if skipped is None:
+                    action.record_skipped()
+                else:
+                    skipped.add(action.id)
 
         logger.debug(
             f"Selection finalized: {selected.id} ({selection_reason}), "
             f"non_critical_streak={self._non_critical_streak}"
         )
 
-    def _score_action(
+    def _scoring_params(self) -> Dict[str, Any]:
+        """Scoring knobs from the genome, re-read only when the genome was written."""
+        try:
+            from consciousness.genome_manager import get_genome
+            revision = get_genome().revision
+        except Exception:
+            revision = None
+        if self._params_cache is not None and self._params_cache[0] == revision:
+            return self._params_cache[1]
+
+        params = {
+            "revision": revision,
+            "base_mult": self._genome_get('cognition.scoring.base_priority_multiplier', 10),
+            "recency_mult": self._genome_get('cognition.scoring.recency_multiplier', 2),
+            "recency_max": self._genome_get('cognition.scoring.recency_max_bonus', 20),
+            "never_exec_bonus": self._genome_get('actions.scoring.never_executed_bonus', 15),
+            "cat_penalty": self._genome_get('actions.scoring.diversity_penalty_category', -15),
+            "same_penalty": self._genome_get('actions.scoring.diversity_penalty_same', -25),
+            "intent_bonus": self._genome_get('actions.scoring.intention_alignment_bonus', 20),
+            "su_bonus": self._genome_get('actions.scoring.self_understanding_bonus', 15),
+            "random_max": self._genome_get('actions.scoring.random_exploration_max', 5),
+        }
+        self._params_cache = (revision, params)
+        return params
+
+    def _base_score(
         self,
         action: ProactiveAction,
-        context: Dict[str, Any]
+        params: Dict[str, Any],
+        context: Dict[str, Any],
+        current_mood: Optional[str],
+        mood_intensity: str,
+        intention_categories: List[str]
     ) -> float:
-        """
-        Score an action based on current context, diversity, and mood.
-
-        Scoring factors:
-        1. Base priority (10-40 points)
-        2. Recency bonus (0-20 points)
-        3. Diversity penalty (-15 per category repeat, -25 for same action)
-        4. Context bonuses (CPU, discoveries, idle)
-        5. MOOD BONUS/PENALTY (up to ±22 points based on mood alignment)
-        6. Random exploration factor (0-5 points)
-        """
-        # Read scoring params from genome (with fallbacks)
-        base_mult = self._genome_get('actions.scoring.priority_slot_interval', 10)  # legacy: priority * 10
-        # Actually base_priority_multiplier is in cognition domain
-        base_mult = self._genome_get('cognition.scoring.base_priority_multiplier', 10)
-        recency_mult = self._genome_get('cognition.scoring.recency_multiplier', 2)
-        recency_max = self._genome_get('cognition.scoring.recency_max_bonus', 20)
-        never_exec_bonus = self._genome_get('actions.scoring.never_executed_bonus', 15)
-        cat_penalty = self._genome_get('actions.scoring.diversity_penalty_category', -15)
-        same_penalty = self._genome_get('actions.scoring.diversity_penalty_same', -25)
-
-        score = action.priority.value * base_mult
-
-        # Bonus for actions not executed recently
-        if action.last_executed:
-            hours_since = (datetime.now() - action.last_executed).total_seconds() / 3600
-            score += min(hours_since * recency_mult, recency_max)
-        else:
-            score += never_exec_bonus
-
-        # DIVERSITY PENALTY: Reduce score for recently used categories
-        category_count = self._recent_categories.count(action.category)
-        if category_count > 0:
-            score += category_count * cat_penalty  # cat_penalty is negative
-            logger.debug(f"Action {action.id}: -{category_count * 15} for category {action.category.value} used {category_count}x recently")
-
-        # DIVERSITY PENALTY: Reduce score for same action repeated
-        if action.id in self._recent_action_ids:
-            score += same_penalty  # same_penalty is negative
-            logger.debug(f"Action {action.id}: -25 for being recently executed")
+        """Priority, context, mood and intention terms of the score (cacheable)."""
+        score = action.priority.value * params["base_mult"]
 
         # Context-based bonuses
         if context.get("cpu_high") and action.category == ActionCategory.MAINTENANCE:
@@ -1149,9 +1234,6 @@ class ProactiveEngine:
             score += 10
 
         # MOOD-BASED SCORING: Adjust score based on current emotional state
-        current_mood = context.get("mood")
-        mood_intensity = context.get("mood_intensity", "medium")
-
         if current_mood:
             mood_bonus = self._calculate_mood_bonus(action, current_mood, mood_intensity)
             score += mood_bonus
@@ -1163,12 +1245,9 @@ class ProactiveEngine:
                 )
 
         # INTENTION-BASED SCORING: Boost actions aligned with chat intentions
-        intent_bonus = self._genome_get('actions.scoring.intention_alignment_bonus', 20)
-        su_bonus = self._genome_get('actions.scoring.self_understanding_bonus', 15)
-        intention_categories = context.get("intention_categories", [])
         if intention_categories:
             if action.category.value in intention_categories:
-                score += intent_bonus
+                score += params["intent_bonus"]
                 logger.debug(
                     f"Action {action.id}: +20 intention alignment "
                     f"(category {action.category.value} matches intention)"
@@ -1177,12 +1256,73 @@ class ProactiveEngine:
             if "self_understanding" in intention_categories and action.category in (
                 ActionCategory.EXPLORATION, ActionCategory.LEARNING
             ):
-                score += su_bonus
+                score += params["su_bonus"]
                 logger.debug(f"Action {action.id}: +15 self_understanding boost")
 
+        return score
+
+    def _score_action(
+        self,
+        action: ProactiveAction,
+        context: Dict[str, Any]
+    ) -> float:
+        """
+        Score an action based on current context, diversity, and mood.
+
+        Scoring factors:
+        1. Base priority (10-40 points)
+        2. Recency bonus (0-20 points)
+        3. Diversity penalty (-15 per category repeat, -25 for same action)
+        4. Context bonuses (CPU, discoveries, idle)
+        5. MOOD BONUS/PENALTY (up to ±22 points based on mood alignment)
+        6. Random exploration factor (0-5 points)
+
+        Factors 1, 4 and 5 (plus intention alignment) are cached per action
+        and recomputed only when the genome, the context/mood inputs or the
+        action itself change.
+        """
+        params = self._scoring_params()
+        current_mood = context.get("mood")
+        mood_intensity = context.get("mood_intensity", "medium")
+        intention_categories = context.get("intention_categories", [])
+
+        # Priority, context, mood and intention terms only change with their
+        # inputs, so they're cached per action under this signature
+        signature = (
+            params["revision"],
+            self._index.version(action.id),
+            bool(context.get("cpu_high")),
+            bool(context.get("new_discoveries")),
+            bool(context.get("is_idle")),
+            current_mood,
+            mood_intensity,
+            tuple(intention_categories),
+        )
+        score = self._index.cached_score(action.id, signature)
+        if score is None:
+            score = self._base_score(action, params, context, current_mood, mood_intensity, intention_categories)
+            self._index.store_score(action.id, signature, score)
+
+        # Bonus for actions not executed recently
+        if action.last_executed:
+            hours_since = (datetime.now() - action.last_executed).total_seconds() / 3600
+            score += min(hours_since * params["recency_mult"], params["recency_max"])
+        else:
+            score += params["never_exec_bonus"]
+
+        # DIVERSITY PENALTY: Reduce score for recently used categories
+        category_count = self._recent_categories.count(action.category)
+        if category_count > 0:
+            score += category_count * params["cat_penalty"]  # cat_penalty is negative
+            logger.debug(f"Action {action.id}: -{category_count * 15} for category {action.category.value} used {category_count}x recently")
+
+        # DIVERSITY PENALTY: Reduce score for same action repeated
+        if action.id in self._recent_action_ids:
+            score += params["same_penalty"]  # same_penalty is negative
+            logger.debug(f"Action {action.id}: -25 for being recently executed")
+
         # Random factor
-        random_max = self._genome_get('actions.scoring.random_exploration_max', 5)
-        score += random.random() * random_max
+        score += random.random() * params["random_max"]
 
         return score
 
@@ -1201,6 +1341,52 @@ class ProactiveEngine:
         Returns:
             Execution result
         """
+        started = datetime.now()
+        ready_since = self._ready_since.pop(action.id, started)
+        try:
+            return await self._run_action(action, context)
+        finally:
+            # Last run / failures / auto-disable changed: move it in the index
+            self._index.refresh(action)
+            self._record_timing(
+                action.id,
+                queue_wait_s=(started - ready_since).total_seconds(),
+                run_s=(datetime.now() - started).total_seconds()
+            )
+
+    def _record_timing(self, action_id: str, queue_wait_s: float, run_s: float) -> None:
+        """Accumulate queue wait and run time for one execution."""
+        t = self._action_timings.setdefault(action_id, {
+            "runs": 0, "total_wait_s": 0.0, "max_wait_s": 0.0, "total_run_s": 0.0, "max_run_s": 0.0
+        })
+        t["runs"] += 1
+        t["last_wait_s"] = round(queue_wait_s, 2)
+        t["last_run_s"] = round(run_s, 2)
+        t["total_wait_s"] += queue_wait_s
+        t["total_run_s"] += run_s
+        t["max_wait_s"] = max(t["max_wait_s"], round(queue_wait_s, 2))
+        t["max_run_s"] = max(t["max_run_s"], round(run_s, 2))
+
+    def _get_timing_stats(self, action_id: str) -> Optional[Dict[str, float]]:
+        t = self._action_timings.get(action_id)
+        if not t:
+            return None
+        return {
+            "runs": t["runs"],
+            "last_wait_s": t["last_wait_s"],
+            "avg_wait_s": round(t["total_wait_s"] / t["runs"], 2),
+            "max_wait_s": t["max_wait_s"],
+            "last_run_s": t["last_run_s"],
+            "avg_run_s": round(t["total_run_s"] / t["runs"], 2),
+            "max_run_s": t["max_run_s"],
+        }
+
+    async def _run_action(
+        self,
+        action: ProactiveAction,
+        context: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """Run an action with timeout, bookkeeping and error escalation."""
         logger.info(f"🚀 Executing proactive action: {action.name}")
 
         # Log to activity monitor
@@ -2713,15 +2899,30 @@ Output format - just the search queries, one per line:"""
     async def run_proactive_loop(
         self,
         interval_seconds: int = 300,
-        max_actions_per_hour: int = 10
+        max_actions_per_hour: int = 10,
+        concurrent: bool = False,
+        class_limits: Optional[Dict[ResourceClass, int]] = None
     ):
         """
         Run the proactive action loop.
 
         This runs in the background and periodically executes
         proactive actions based on availability and context.
+
+        In concurrent mode each tick dispatches up to one action per
+        resource class without waiting for it to finish, so a long
+        network/LLM action no longer blocks cheap local ones. Actions of a
+        class only start while the class is below its limit.
         """
         self.running = True
+        self.concurrent = concurrent
+        if class_limits:
+            self.class_limits.update(class_limits)
+
+        if concurrent:
+            await self._run_concurrent_loop(interval_seconds, max_actions_per_hour)
+            return
+
         actions_this_hour = 0
         hour_start = datetime.now()
 
@@ -2757,6 +2958,78 @@ Output format - just the search queries, one per line:"""
                 logger.error(f"Error in proactive loop: {e}")
                 await asyncio.sleep(interval_seconds)
 
+    def _in_flight_by_class(self) -> Dict[ResourceClass, List[str]]:
+        """Running action ids grouped by resource class."""
+        by_class: Dict[ResourceClass, List[str]] = {rc: [] for rc in ResourceClass}
+        for action_id in self._in_flight:
+            action = self.actions.get(action_id)
+            if action:
+                by_class[action.resource_class].append(action_id)
+        return by_class
+
+    async def _run_concurrent_loop(self, interval_seconds: int, max_actions_per_hour: int):
+        """Concurrent scheduler: per-class limits, one dispatch per class per tick."""
+        self._actions_this_hour = 0
+        hour_start = datetime.now()
+        limits = {rc.value: n for rc, n in self.class_limits.items()}
+        logger.info(f"🔄 Starting concurrent proactive loop (interval: {interval_seconds}s, limits: {limits})")
+
+        while self.running:
+            try:
+                if (datetime.now() - hour_start).total_seconds() > 3600:
+                    self._actions_this_hour = 0
+                    hour_start = datetime.now()
+
+                context = await self._gather_context()
+                by_class = self._in_flight_by_class()
+                dispatched_classes: set = set()
+
+                def eligible(action: ProactiveAction) -> bool:
+                    rc = action.resource_class
+                    return (action.id not in self._in_flight and
+                            rc not in dispatched_classes and
+                            len(by_class[rc]) < self.class_limits.get(rc, 1))
+
+                # One selection per free slot; every dispatch counts against the
+                # hourly budget, whether or not the action goes on to succeed
+                skipped: Set[str] = set()
+                selected: Set[str] = set()
+                while self._actions_this_hour < max_actions_per_hour:
+                    action = self.select_next_action(context, eligible=eligible, skipped=skipped)
+                    if not action:
+                        break
+                    self._dispatch(action, context)
+                    self._actions_this_hour += 1
+                    selected.add(action.id)
+                    by_class[action.resource_class].append(action.id)
+                    dispatched_classes.add(action.resource_class)
+
+                # Passed-over actions are skipped once per tick, like the
+                # sequential loop, not once per selection made in it
+                for action_id in skipped - selected:
+                    action = self.actions.get(action_id)
+                    if action:
+                        action.record_skipped()
+
+                await asyncio.sleep(interval_seconds)
+
+            except Exception as e:
+                logger.error(f"Error in concurrent proactive loop: {e}")
+                await asyncio.sleep(interval_seconds)
+
+    def _dispatch(self, action: ProactiveAction, context: Dict[str, Any]) -> None:
+        """Start an action in the background and track it until it finishes."""
+        from utils.task_refs import create_safe_task
+
+        task = create_safe_task(self.execute_action(action, context), name=f"proactive_{action.id}")
+        self._in_flight[action.id] = task
+
+        def _done(t: asyncio.Task) -> None:
+            self._in_flight.pop(action.id, None)
+
+        task.add_done_callback(_done)
+        logger.info(f"🧵 Dispatched {action.id} [{action.resource_class.value}] ({len(self._in_flight)} in flight)")
+
     async def _gather_context(self) -> Dict[str, Any]:
         """Gather current context for action selection, including mood state."""
         context = {}
@@ -5182,6 +5455,7 @@ We're happy to provide any additional information needed.
         action.disabled_until = None
         action.disable_reason = None
         action.consecutive_failures = 0
+        self._index.refresh(action)
         logger.info(f"✅ Action re-enabled: {action.name}")
         return True
 
@@ -5219,6 +5493,7 @@ We're happy to provide any additional information needed.
         # Calculate starvation stats
         starving_actions = [a for a in self.actions.values() if a.is_starving()]
         overdue_actions = [a for a in self.actions.values() if a.is_overdue()]
+        next_ready = self._index.next_ready_at()
 
         return {
             "running": self.running,
@@ -5230,6 +5505,18 @@ We're happy to provide any additional information needed.
             "disabled_count": sum(1 for a in self.actions.values() if a.disabled_until and datetime.now() < a.disabled_until),
             "recent_history": self.action_history[-10:],
             "error_stats": self.get_error_stats(),
+            "scheduler": {
+                "concurrent": self.concurrent,
+                "class_limits": {rc.value: n for rc, n in self.class_limits.items()},
+                "in_flight": {rc.value: ids for rc, ids in self._in_flight_by_class().items()},
+                "waiting": {
+                    action_id: round((datetime.now() - since).total_seconds(), 1)
+                    for action_id, since in self._ready_since.items()
+                    if action_id not in self._in_flight
+                },
+                "index": self._index.get_stats(),
+                "next_ready_at": next_ready.isoformat() if next_ready else None
+            },
             "memory_stats": {
                 "action_history_count": len(self.action_history),
                 "action_history_max": self._max_action_history,
@@ -5266,7 +5553,11 @@ We're happy to provide any additional information needed.
                     "skipped_count": a.skipped_count,
                     "is_starving": a.is_starving(),
                     "is_overdue": a.is_overdue(),
-                    "max_hours_between_runs": a.max_hours_between_runs
+                    "max_hours_between_runs": a.max_hours_between_runs,
+                    # Scheduler stats
+                    "resource_class": a.resource_class.value,
+                    "running": a.id in self._in_flight,
+                    "timing": self._get_timing_stats(a.id)
                 }
                 for a in self.actions.values()
             }
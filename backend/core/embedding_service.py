@@ -0,0 +1,280 @@
+"""
+Embedding Service
+Shared, lazily loaded sentence-transformers model with micro-batching and caching
+"""
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class EmbeddingService:
+    """
+    One embedding model for the whole process.
+
+    - The SentenceTransformer is loaded on first encode, not at construction,
+      so SemanticMemory/HierarchicalMemory startup doesn't pay for it.
+    - embed() calls arriving within batch_window_ms of each other are
+      encoded together in one model.encode() call in a worker thread,
+      keeping the event loop free.
+    - Embeddings are memoized by content hash in a bounded LRU and written
+      to a SQLite store, so re-embedding the same text (task descriptions,
+      RAG queries) costs a lookup, even after a restart.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        batch_window_ms: float = 5.0,
+        max_batch_size: int = 64,
+        cache_size: int = 4096,
+        cache_path: Optional[str] = "./data/embedding_cache.db"
+    ):
+        self.model_name = model_name
+        self.batch_window_ms = batch_window_ms
+        self.max_batch_size = max_batch_size
+        self.cache_size = cache_size
+        self.cache_path = Path(cache_path) if cache_path else None
+
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._encode_lock = threading.Lock()
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # Pending (key, text, future) requests for the next batch
+        self._pending: List[Tuple[str, str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+        self.stats = {
+            "requests": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "encoded": 0,
+            "batches": 0,
+            "batched_requests": 0,
+            "model_load_seconds": None,
+        }
+
+        self._init_store()
+
+    # ------------------------------------------------------------------
+    # Model
+    # ------------------------------------------------------------------
+
+    @property
+    def model(self):
+        """The SentenceTransformer, loaded on first access"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+
+                    logger.info(f"Loading sentence-transformers model {self.model_name}...")
+                    start = time.time()
+                    self._model = SentenceTransformer(self.model_name)
+                    self.stats["model_load_seconds"] = round(time.time() - start, 2)
+                    logger.info(f"Embedding model loaded in {self.stats['model_load_seconds']}s")
+        return self._model
+
+    def _encode_batch(self, texts: List[str]) -> List[List[float]]:
+        # torch is not guaranteed thread-safe across concurrent encode() calls
+        with self._encode_lock:
+            vectors = self.model.encode(texts, batch_size=self.max_batch_size)
+        self.stats["encoded"] += len(texts)
+        return [v.tolist() for v in vectors]
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\x00{text}".encode()).hexdigest()
+
+    def _init_store(self):
+        if not self.cache_path:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.cache_path))
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    key TEXT PRIMARY KEY,
+                    vector BLOB
+                )
+            """)
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Failed to init embedding store: {e}")
+            self.cache_path = None
+
+    def _memory_get(self, key: str) -> Optional[List[float]]:
+        with self._cache_lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+            return vector
+
+    def _memory_put(self, key: str, vector: List[float]):
+        with self._cache_lock:
+            self._cache[key] = vector
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _disk_get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        if not self.cache_path or not keys:
+            return {}
+        try:
+            conn = sqlite3.connect(str(self.cache_path), timeout=10)
+            placeholders = ",".join("?" * len(keys))
+            rows = conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", keys
+            ).fetchall()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Embedding store lookup failed: {e}")
+            return {}
+        return {key: array("f", blob).tolist() for key, blob in rows}
+
+    def _disk_put_many(self, items: Dict[str, List[float]]):
+        if not self.cache_path or not items:
+            return
+        try:
+            conn = sqlite3.connect(str(self.cache_path), timeout=10)
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(key, array("f", vector).tobytes()) for key, vector in items.items()]
+                )
+            conn.close()
+        except Exception as e:
+            logger.error(f"Embedding store write failed: {e}")
+
+    def _resolve(self, keyed_texts: Dict[str, str]) -> Dict[str, List[float]]:
+        """Disk lookup, then encode whatever is still missing (blocking)"""
+        found = self._disk_get_many(list(keyed_texts))
+        self.stats["disk_hits"] += len(found)
+
+        missing = [key for key in keyed_texts if key not in found]
+        if missing:
+            vectors = self._encode_batch([keyed_texts[key] for key in missing])
+            encoded = dict(zip(missing, vectors))
+            self._disk_put_many(encoded)
+            found.update(encoded)
+
+        for key, vector in found.items():
+            self._memory_put(key, vector)
+        return found
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def encode_sync(self, text: str) -> List[float]:
+        """Embed one text from synchronous code (or a worker thread)"""
+        self.stats["requests"] += 1
+        key = self._key(text)
+        vector = self._memory_get(key)
+        if vector is not None:
+            self.stats["memory_hits"] += 1
+            return vector
+        return self._resolve({key: text})[key]
+
+    async def embed(self, text: str) -> List[float]:
+        """Embed one text; concurrent calls are micro-batched"""
+        self.stats["requests"] += 1
+        key = self._key(text)
+        vector = self._memory_get(key)
+        if vector is not None:
+            self.stats["memory_hits"] += 1
+            return vector
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((key, text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._schedule_flush(loop, immediate=True)
+        elif self._flush_handle is None:
+            self._schedule_flush(loop)
+        return await future
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts (one batch when they miss the cache)"""
+        return list(await asyncio.gather(*(self.embed(text) for text in texts)))
+
+    def _schedule_flush(self, loop: asyncio.AbstractEventLoop, immediate: bool = False):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if immediate:
+            loop.create_task(self._flush())
+        else:
+            self._flush_handle = loop.call_later(
+                self.batch_window_ms / 1000, lambda: loop.create_task(self._flush())
+            )
+
+    async def _flush(self):
+        self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        keyed_texts = {key: text for key, text, _ in batch}
+        self.stats["batches"] += 1
+        self.stats["batched_requests"] += len(batch)
+        try:
+            vectors = await asyncio.to_thread(self._resolve, keyed_texts)
+        except Exception as e:
+            logger.error(f"Embedding batch of {len(keyed_texts)} failed: {e}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, _, future in batch:
+            if not future.done():
+                future.set_result(vectors[key])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache hit counts, batching efficiency and model load time"""
+        stats = dict(self.stats)
+        requests = stats["requests"]
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        stats["hit_rate"] = round(hits / requests, 3) if requests else 0.0
+        stats["avg_batch_size"] = (
+            round(stats["batched_requests"] / stats["batches"], 2) if stats["batches"] else 0.0
+        )
+        stats["cache_entries"] = len(self._cache)
+        stats["model_loaded"] = self._model is not None
+        return stats
+
+
+# Global instance
+_embedding_service: Optional[EmbeddingService] = None
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Get the process-wide embedding service"""
+    global _embedding_service
+    if _embedding_service is None:
+        _embedding_service = EmbeddingService()
+    return _embedding_service
+
+
+def configure_embedding_service(**kwargs) -> EmbeddingService:
+    """Replace the global service with one using the given settings (call before memories are built)"""
+    global _embedding_service
+    _embedding_service = EmbeddingService(**kwargs)
+    return _embedding_service
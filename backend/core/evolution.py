@@ -1,6 +1,8 @@
 """Evolution engine for iterative code improvement with Phase 2 enhancements"""
+import asyncio
+import time
 import uuid
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from .nucleus import Nucleus
 from .executor import SafeExecutor
 from .memory import MemoryStore
@@ -60,6 +62,7 @@ class EvolutionEngine:
     - Multi-model code analysis
     - Semantic memory integration
     - Meta-learning optimization
+    - Optional concurrent mode (parallel generation and evaluation)
     """
 
     def __init__(
@@ -67,16 +70,41 @@ class EvolutionEngine:
         nucleus: Nucleus,
         executor: SafeExecutor,
         memory: MemoryStore,
-        meta_learner=None
+        meta_learner=None,
+        concurrent: bool = False,
+        max_generations_per_model: int = 2,
+        max_parallel_evaluations: int = 3
     ):
+        """
+        Args:
+            nucleus: Nucleus used to generate and evolve code
+            executor: Sandbox used to evaluate candidates
+            memory: Execution history store
+            meta_learner: Optional meta-learner
+            concurrent: Default evolution mode for evolve_task
+            max_generations_per_model: Max in-flight code generations per model
+                (concurrent mode). With a router the bound is the router's
+                per-model slot, taken on the model each call actually runs
+                on; without one, every call goes to the nucleus' provider.
+            max_parallel_evaluations: Max sandbox executions in flight (concurrent mode)
+        """
         self.nucleus = nucleus
         self.executor = executor
         self.memory = memory
         self.meta_learner = meta_learner
         self.active_tasks = {}
 
+        self.concurrent = concurrent
+        self.max_generations_per_model = max(1, max_generations_per_model)
+        self.max_parallel_evaluations = max(1, max_parallel_evaluations)
+        self._provider_semaphore: Optional[asyncio.Semaphore] = None
+        self._evaluation_semaphore: Optional[asyncio.Semaphore] = None
+
         logger.info("EvolutionEngine initialized", extra={
-            "meta_learning_enabled": meta_learner is not None
+            "meta_learning_enabled": meta_learner is not None,
+            "concurrent": concurrent,
+            "max_generations_per_model": self.max_generations_per_model,
+            "max_parallel_evaluations": self.max_parallel_evaluations
         })
 
     async def evolve_task(
@@ -87,7 +115,9 @@ class EvolutionEngine:
         callback=None,
         use_rag: bool = True,
         use_web_research: bool = False,
-        use_multi_model_analysis: bool = True
+        use_multi_model_analysis: bool = True,
+        concurrent: Optional[bool] = None,
+        stream_tokens: bool = False
     ) -> Dict:
         """
         Enhanced evolution with Phase 2 features
@@ -100,18 +130,24 @@ class EvolutionEngine:
             use_rag: Use semantic memory for context
             use_web_research: Use web research
             use_multi_model_analysis: Use multi-model code analysis
+            concurrent: Generate and evaluate candidates in parallel
+                (defaults to the engine-level setting)
+            stream_tokens: Send partial code to the callback as it is generated
 
         Returns:
             Best solution found with comprehensive metadata
         """
         task_id = task['id']
+        if concurrent is None:
+            concurrent = self.concurrent
         logger.info("Starting enhanced evolution", extra={
             "task_id": task_id,
             "max_generations": max_generations,
             "population_size": population_size,
             "rag_enabled": use_rag,
             "web_research_enabled": use_web_research,
-            "multi_model_analysis": use_multi_model_analysis
+            "multi_model_analysis": use_multi_model_analysis,
+            "concurrent": concurrent
         })
 
         best_solution = None
@@ -146,100 +182,46 @@ class EvolutionEngine:
             population = await self._create_population(
                 task, gen, population_size, best_solution,
                 use_rag=use_rag,
-                use_web_research=use_web_research
+                use_web_research=use_web_research,
+                concurrent=concurrent,
+                token_callback=callback if stream_tokens else None
             )
 
             # Evaluate population
             results = []
-            for idx, solution in enumerate(population):
-                result = self.executor.execute(solution['code'], task_id=task_id)
-
-                # Multi-model code analysis if enabled
-                code_analysis = None
-                if use_multi_model_analysis and self.nucleus.router and result['success']:
-                    try:
-                        analysis = await self.nucleus.router.analyze_with_multiple(
-                            solution['code'],
-                            task['description']
-                        )
-                        code_analysis = analysis.get('aggregated_scores', {})
-                    except Exception as e:
-                        logger.error(f"Multi-model analysis failed: {e}")
-
-                # Calculate enhanced fitness
-                fitness = fitness_function(result, code_analysis)
-
-                solution_data = {
-                    'id': str(uuid.uuid4()),
-                    'task_id': task_id,
-                    'task_description': task['description'],
-                    'task_type': task['type'],
-                    'code': solution['code'],
-                    'success': result['success'],
-                    'execution_time': result['execution_time'],
-                    'memory_used': result.get('memory_used', 0),
-                    'fitness_score': fitness,
-                    'generation_number': gen + 1,
-                    'output': result.get('output', ''),
-                    'error': result.get('error', ''),
-                    'code_analysis': code_analysis,
-                    'metadata': {
-                        'population_index': idx,
-                        'variation_type': solution.get('variation_type', 'initial'),
-                        'model_used': solution.get('model_used', 'unknown')
-                    }
-                }
+            if concurrent:
+                evaluations = [
+                    asyncio.create_task(self._evaluate_solution_async(
+                        task, gen, idx, solution, use_multi_model_analysis
+                    ))
+                    for idx, solution in enumerate(population)
+                ]
+                # Stream results to the callback in completion order
+                for finished in asyncio.as_completed(evaluations):
+                    idx, solution_data, result = await finished
+                    results.append(solution_data)
+
+                    if solution_data['fitness_score'] > best_fitness:
+                        best_fitness = solution_data['fitness_score']
+                        best_solution = solution_data
+
+                    if callback:
+                        await callback(self._solution_event(solution_data, result, idx))
+            else:
+                for idx, solution in enumerate(population):
+                    result = self.executor.execute(solution['code'], task_id=task_id)
+                    solution_data = await self._process_result(
+                        task, gen, idx, solution, result, use_multi_model_analysis
+                    )
+                    results.append(solution_data)
+
+                    # Track best
+                    if solution_data['fitness_score'] > best_fitness:
+                        best_fitness = solution_data['fitness_score']
+                        best_solution = solution_data
 
-                # Save to memory
-                self.memory.save_execution(solution_data)
-
-                # Save to semantic memory if available
-                if self.nucleus.semantic_memory:
-                    try:
-                        await self.nucleus.semantic_memory.store_execution(
-                            task_id=solution_data['id'],
-                            task_description=task['description'],
-                            code=solution['code'],
-                            result=result,
-                            metadata=solution_data['metadata']
-                        )
-                    except Exception as e:
-                        logger.error(f"Failed to store in semantic memory: {e}")
-
-                # Record in meta-learner if available
-                if self.meta_learner:
-                    try:
-                        await self.meta_learner.record_execution(
-                            task_id=solution_data['id'],
-                            task_description=task['description'],
-                            code=solution['code'],
-                            result=result,
-                            model_used=solution_data['metadata'].get('model_used', 'unknown'),
-                            generation_time=solution.get('generation_time', 0)
-                        )
-                    except Exception as e:
-                        logger.error(f"Failed to record in meta-learner: {e}")
-
-                results.append(solution_data)
-
-                # Track best
-                if fitness > best_fitness:
-                    best_fitness = fitness
-                    best_solution = solution_data
-
-                if callback:
-                    await callback({
-                        'type': 'solution_executed',
-                        'data': {
-                            'task_id': task_id,
-                            'generation': gen + 1,
-                            'solution_index': idx + 1,
-                            'success': result['success'],
-                            'fitness': fitness,
-                            'output': result.get('output', '')[:200],
-                            'code_quality': code_analysis.get('quality') if code_analysis else None
-                        }
-                    })
+                    if callback:
+                        await callback(self._solution_event(solution_data, result, idx))
 
             generation_history.append({
                 'generation': gen + 1,
@@ -280,6 +262,183 @@ class EvolutionEngine:
             'task_id': task_id
         }
 
+    async def _process_result(
+        self,
+        task: Dict,
+        gen: int,
+        idx: int,
+        solution: Dict,
+        result: Dict,
+        use_multi_model_analysis: bool
+    ) -> Dict:
+        """
+        Analyze, score and record one executed candidate.
+
+        Returns:
+            Solution data dictionary (as saved to memory)
+        """
+        task_id = task['id']
+
+        # Multi-model code analysis if enabled
+        code_analysis = None
+        if use_multi_model_analysis and self.nucleus.router and result['success']:
+            try:
+                analysis = await self.nucleus.router.analyze_with_multiple(
+                    solution['code'],
+                    task['description']
+                )
+                code_analysis = analysis.get('aggregated_scores', {})
+            except Exception as e:
+                logger.error(f"Multi-model analysis failed: {e}")
+
+        # Calculate enhanced fitness
+        fitness = fitness_function(result, code_analysis)
+
+        solution_data = {
+            'id': str(uuid.uuid4()),
+            'task_id': task_id,
+            'task_description': task['description'],
+            'task_type': task['type'],
+            'code': solution['code'],
+            'success': result['success'],
+            'execution_time': result['execution_time'],
+            'memory_used': result.get('memory_used', 0),
+            'fitness_score': fitness,
+            'generation_number': gen + 1,
+            'output': result.get('output', ''),
+            'error': result.get('error', ''),
+            'code_analysis': code_analysis,
+            'metadata': {
+                'population_index': idx,
+                'variation_type': solution.get('variation_type', 'initial'),
+                'model_used': solution.get('model_used', 'unknown')
+            }
+        }
+
+        # Save to memory
+        self.memory.save_execution(solution_data)
+
+        # Save to semantic memory if available
+        if self.nucleus.semantic_memory:
+            try:
+                await self.nucleus.semantic_memory.store_execution(
+                    task_id=solution_data['id'],
+                    task_description=task['description'],
+                    code=solution['code'],
+                    result=result,
+                    metadata=solution_data['metadata']
+                )
+            except Exception as e:
+                logger.error(f"Failed to store in semantic memory: {e}")
+
+        # Record in meta-learner if available
+        if self.meta_learner:
+            try:
+                await self.meta_learner.record_execution(
+                    task_id=solution_data['id'],
+                    task_description=task['description'],
+                    code=solution['code'],
+                    result=result,
+                    model_used=solution_data['metadata'].get('model_used', 'unknown'),
+                    generation_time=solution.get('generation_time', 0)
+                )
+            except Exception as e:
+                logger.error(f"Failed to record in meta-learner: {e}")
+
+        return solution_data
+
+    async def _evaluate_solution_async(
+        self,
+        task: Dict,
+        gen: int,
+        idx: int,
+        solution: Dict,
+        use_multi_model_analysis: bool
+    ) -> Tuple[int, Dict, Dict]:
+        """
+        Execute a candidate off the event loop and process its result.
+
+        Sandbox runs are bounded by the evaluation semaphore so a large
+        population cannot spawn unbounded sandbox processes.
+        """
+        if self._evaluation_semaphore is None:
+            self._evaluation_semaphore = asyncio.Semaphore(self.max_parallel_evaluations)
+
+        async with self._evaluation_semaphore:
+            try:
+                result = await self.executor.execute_async(solution['code'], task_id=task['id'])
+            except Exception as e:
+                logger.error(f"Sandbox execution failed: {e}", extra={"task_id": task['id']})
+                result = {
+                    'success': False,
+                    'output': '',
+                    'error': f"Executor error: {e}",
+                    'execution_time': 0,
+                    'memory_used': 0
+                }
+
+        solution_data = await self._process_result(
+            task, gen, idx, solution, result, use_multi_model_analysis
+        )
+        return idx, solution_data, result
+
+    @staticmethod
+    def _solution_event(solution_data: Dict, result: Dict, idx: int) -> Dict:
+        """Build the per-candidate progress event sent to the callback"""
+        code_analysis = solution_data.get('code_analysis')
+        return {
+            'type': 'solution_executed',
+            'data': {
+                'task_id': solution_data['task_id'],
+                'generation': solution_data['generation_number'],
+                'solution_index': idx + 1,
+                'success': result['success'],
+                'fitness': solution_data['fitness_score'],
+                'output': result.get('output', '')[:200],
+                'code_quality': code_analysis.get('quality') if code_analysis else None
+            }
+        }
+
+    def _select_model(self, task: Dict) -> str:
+        if self.nucleus.router:
+            return self.nucleus.router.select_model(task['description'])
+        return self.nucleus.provider
+
+    async def _generate_candidate(
+        self,
+        task: Dict,
+        variation_type: str,
+        produce,
+        concurrent: bool = False
+    ) -> Dict:
+        """
+        Generate a single candidate.
+
+        Args:
+            task: Task dictionary
+            variation_type: Label stored in the candidate metadata
+            produce: Zero-argument coroutine factory returning the code
+            concurrent: Bound direct-provider calls (the router bounds its own)
+        """
+        model_used = self._select_model(task)
+
+        start_time = time.time()
+        if concurrent and not self.nucleus.router:
+            if self._provider_semaphore is None:
+                self._provider_semaphore = asyncio.Semaphore(self.max_generations_per_model)
+            async with self._provider_semaphore:
+                code = await produce()
+        else:
+            code = await produce()
+        generation_time = time.time() - start_time
+
+        return {
+            'code': code,
+            'variation_type': variation_type,
+            'generation_time': generation_time,
+            'model_used': model_used
+        }
+
     async def _create_population(
         self,
         task: Dict,
@@ -287,7 +446,9 @@ class EvolutionEngine:
         size: int,
         best_previous: Dict = None,
         use_rag: bool = True,
-        use_web_research: bool = False
+        use_web_research: bool = False,
+        concurrent: bool = False,
+        token_callback=None
     ) -> List[Dict]:
         """
         Create population of solutions with Phase 2 enhancements
@@ -299,73 +460,86 @@ class EvolutionEngine:
             best_previous: Best solution from previous generation
             use_rag: Use semantic memory
             use_web_research: Use web research
+            concurrent: Generate candidates in parallel
+            token_callback: Optional async callback receiving 'generation_token' events
 
         Returns:
             List of solution dictionaries
         """
-        import time
-        population = []
+        factories = []
+
+        def token_sink(index: int):
+            """Per-candidate on_token hook (None when not streaming)"""
+            if token_callback is None:
+                return None
+
+            async def on_token(text: str):
+                await token_callback({
+                    'type': 'generation_token',
+                    'data': {
+                        'task_id': task['id'],
+                        'generation': generation + 1,
+                        'solution_index': index + 1,
+                        'text': text
+                    }
+                })
+            return on_token
 
         if generation == 0:
             # Initial generation - create diverse solutions with RAG/research
             for i in range(size):
-                start_time = time.time()
-                code = await self.nucleus.generate_solution(
-                    task,
-                    use_rag=use_rag,
-                    use_web_research=use_web_research and i == 0  # Only first solution uses web research
-                )
-                generation_time = time.time() - start_time
-
-                population.append({
-                    'code': code,
-                    'variation_type': 'initial_rag' if use_rag else 'initial',
-                    'generation_time': generation_time,
-                    'model_used': self.nucleus.router.select_model(task['description']) if self.nucleus.router else self.nucleus.provider
-                })
-        else:
-            # Evolve from best previous solution
-            if best_previous:
-                # Get analysis of best solution
-                analysis = await self.nucleus.analyze_result(
-                    best_previous['code'],
-                    {
-                        'success': best_previous['success'],
-                        'execution_time': best_previous['execution_time'],
-                        'output': best_previous.get('output', ''),
-                        'error': best_previous.get('error', '')
-                    },
-                    task
-                )
+                factories.append((
+                    'initial_rag' if use_rag else 'initial',
+                    lambda i=i: self.nucleus.generate_solution(
+                        task,
+                        use_rag=use_rag,
+                        use_web_research=use_web_research and i == 0,  # Only first solution uses web research
+                        on_token=token_sink(i)
+                    )
+                ))
+        elif best_previous:
+            # Evolve from best previous solution - get analysis of best solution
+            analysis = await self.nucleus.analyze_result(
+                best_previous['code'],
+                {
+                    'success': best_previous['success'],
+                    'execution_time': best_previous['execution_time'],
+                    'output': best_previous.get('output', ''),
+                    'error': best_previous.get('error', '')
+                },
+                task
+            )
 
-                # Create variations
-                for i in range(size):
-                    start_time = time.time()
-                    evolved_code = await self.nucleus.evolve_code(
+            # Create variations
+            for i in range(size):
+                factories.append((
+                    'evolved',
+                    lambda i=i: self.nucleus.evolve_code(
                         best_previous['code'],
                         {**analysis, **best_previous},
-                        task
+                        task,
+                        on_token=token_sink(i)
                     )
-                    generation_time = time.time() - start_time
-
-                    population.append({
-                        'code': evolved_code,
-                        'variation_type': 'evolved',
-                        'generation_time': generation_time,
-                        'model_used': self.nucleus.router.select_model(task['description']) if self.nucleus.router else self.nucleus.provider
-                    })
-            else:
-                # Fallback to new solutions
-                for i in range(size):
-                    start_time = time.time()
-                    code = await self.nucleus.generate_solution(task, use_rag=use_rag)
-                    generation_time = time.time() - start_time
-
-                    population.append({
-                        'code': code,
-                        'variation_type': 'fallback',
-                        'generation_time': generation_time,
-                        'model_used': self.nucleus.router.select_model(task['description']) if self.nucleus.router else self.nucleus.provider
-                    })
+                ))
+        else:
+            # Fallback to new solutions
+            for i in range(size):
+                factories.append((
+                    'fallback',
+                    lambda i=i: self.nucleus.generate_solution(
+                        task, use_rag=use_rag, on_token=token_sink(i)
+                    )
+                ))
+
+        if concurrent:
+            return list(await asyncio.gather(*[
+                self._generate_candidate(task, variation_type, produce, concurrent=True)
+                for variation_type, produce in factories
+            ]))
 
+        population = []
+        for variation_type, produce in factories:
+            population.append(
+                await self._generate_candidate(task, variation_type, produce)
+            )
         return population
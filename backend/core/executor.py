@@ -15,27 +15,20 @@ import sys
 import io
 import traceback
 import signal
-from typing import Dict
+from typing import Dict, Optional, Tuple
 from utils.logger import setup_logger
 from utils.security import CodeValidator, create_safe_builtins, set_resource_limits
 
 logger = setup_logger(__name__)
 
 
-def _execute_code(
-    code: str,
-    result_queue: multiprocessing.Queue,
-    timeout: int,
-    max_memory_mb: int
-):
+def _run_code(code: str, timeout: int, safe_builtins: dict) -> Dict:
     """
-    Execute code in isolated process with security restrictions.
+    Run code under a SIGALRM timeout with captured stdout/stderr.
 
-    This function runs in a separate process to provide isolation.
+    Must be called inside an isolated process that already has
+    resource limits applied.
     """
-    # Set resource limits FIRST (before any code runs)
-    set_resource_limits(max_memory_mb=max_memory_mb, max_cpu_seconds=timeout)
-
     # Set up timeout signal handler
     def timeout_handler(signum, frame):
         raise TimeoutError(f"Execution timed out after {timeout} seconds")
@@ -66,7 +59,7 @@ def _execute_code(
     try:
         # Create SECURE restricted globals
         safe_globals = {
-            '__builtins__': create_safe_builtins()
+            '__builtins__': safe_builtins
         }
 
         # Additional safety: Create a restricted locals dict
@@ -117,7 +110,25 @@ def _execute_code(
         sys.stdout = old_stdout
         sys.stderr = old_stderr
 
-        result_queue.put(result)
+    return result
+
+
+def _execute_code(
+    code: str,
+    result_queue: multiprocessing.Queue,
+    timeout: int,
+    max_memory_mb: int
+):
+    """
+    Execute code in isolated process with security restrictions.
+
+    This function runs in a separate process to provide isolation.
+    """
+    # Set resource limits FIRST (before any code runs)
+    set_resource_limits(max_memory_mb=max_memory_mb, max_cpu_seconds=timeout)
+
+    result = _run_code(code, timeout, create_safe_builtins())
+    result_queue.put(result)
 
 
 class SafeExecutor:
@@ -137,7 +148,8 @@ class SafeExecutor:
         self,
         timeout: int = 30,
         max_memory_mb: int = 256,
-        allowed_modules: str = ""
+        allowed_modules: str = "",
+        pool_size: int = 0
     ):
         """
         Initialize the safe executor.
@@ -146,10 +158,21 @@ class SafeExecutor:
             timeout: Maximum execution time in seconds
             max_memory_mb: Maximum memory usage in MB
             allowed_modules: Comma-separated list of allowed modules (default: none)
+            pool_size: Number of pre-forked warm workers (0 = spawn per execution)
         """
         self.timeout = timeout
         self.max_memory_mb = max_memory_mb
 
+        self.pool = None
+        if pool_size > 0:
+            from core.sandbox_pool import SandboxPool
+            self.pool = SandboxPool(
+                size=pool_size,
+                timeout=timeout,
+                max_memory_mb=max_memory_mb
+            )
+            self.pool.start()
+
         # Parse allowed modules (usually should be empty for safety)
         modules = set(m.strip() for m in allowed_modules.split(',') if m.strip())
         self.validator = CodeValidator(modules)
@@ -158,6 +181,7 @@ class SafeExecutor:
             "timeout": timeout,
             "max_memory_mb": max_memory_mb,
             "allowed_modules": list(modules),
+            "pool_size": pool_size,
             "security_features": [
                 "whitelist_validation",
                 "restricted_builtins",
@@ -203,31 +227,20 @@ class SafeExecutor:
             }
 
         # Phase 2: Execute in isolated process
-        result_queue = multiprocessing.Queue()
-        process = multiprocessing.Process(
-            target=_execute_code,
-            args=(code, result_queue, self.timeout, self.max_memory_mb)
-        )
-
         logger.info("Starting secure code execution", extra={
             "task_id": task_id,
             "code_length": len(code),
-            "timeout": self.timeout
+            "timeout": self.timeout,
+            "pooled": self.pool is not None
         })
 
-        process.start()
-        process.join(timeout=self.timeout + 5)  # Extra buffer for process overhead
-
-        if process.is_alive():
-            # Timeout occurred - forcefully terminate
-            process.terminate()
-            process.join(timeout=5)
-
-            if process.is_alive():
-                # Still alive - kill it
-                process.kill()
-                process.join()
+        if self.pool is not None:
+            result, status = self.pool.run(code)
+            timed_out = status == 'timeout'
+        else:
+            result, timed_out = self._execute_in_new_process(code)
 
+        if timed_out:
             logger.warning("Execution timeout - process terminated", extra={
                 "task_id": task_id,
                 "timeout": self.timeout
@@ -242,15 +255,11 @@ class SafeExecutor:
                 'timeout': True
             }
 
-        # Get result from queue
-        if not result_queue.empty():
-            result = result_queue.get()
-
+        if result is not None:
             # Sanitize output
             result['output'] = self.validator.sanitize_output(result['output'])
             result['error'] = self.validator.sanitize_output(result['error'])
 
-            log_level = "info" if result['success'] else "warning"
             log_extra = {
                 "task_id": task_id,
                 "success": result['success'],
@@ -274,6 +283,39 @@ class SafeExecutor:
                 'memory_used': 0
             }
 
+    def _execute_in_new_process(self, code: str) -> Tuple[Optional[Dict], bool]:
+        """
+        Run code in a freshly spawned process.
+
+        Returns:
+            (result or None, timed_out)
+        """
+        result_queue = multiprocessing.Queue()
+        process = multiprocessing.Process(
+            target=_execute_code,
+            args=(code, result_queue, self.timeout, self.max_memory_mb)
+        )
+
+        process.start()
+        process.join(timeout=self.timeout + 5)  # Extra buffer for process overhead
+
+        if process.is_alive():
+            # Timeout occurred - forcefully terminate
+            process.terminate()
+            process.join(timeout=5)
+
+            if process.is_alive():
+                # Still alive - kill it
+                process.kill()
+                process.join()
+
+            return None, True
+
+        # Get result from queue
+        if not result_queue.empty():
+            return result_queue.get(), False
+        return None, False
+
     async def execute_async(self, code: str, task_id: str = None) -> Dict:
         """
         Async wrapper for execute().
@@ -284,6 +326,20 @@ class SafeExecutor:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(None, self.execute, code, task_id)
 
+    def get_stats(self) -> Dict:
+        """Executor statistics, including warm pool health when pooled"""
+        return {
+            'pooled': self.pool is not None,
+            'timeout': self.timeout,
+            'max_memory_mb': self.max_memory_mb,
+            'pool': self.pool.get_stats() if self.pool else None
+        }
+
+    def shutdown(self):
+        """Terminate warm pool workers (no-op without a pool)"""
+        if self.pool is not None:
+            self.pool.shutdown()
+
     def validate_only(self, code: str) -> Dict:
         """
         Only validate code without executing.
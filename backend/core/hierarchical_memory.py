@@ -21,7 +21,7 @@ import numpy as np
 from enum import Enum
 
 from utils.logger import get_logger
-from core.semantic_memory import SemanticMemory
+from core.semantic_memory import get_semantic_memory
 
 logger = get_logger(__name__)
 
@@ -149,7 +149,7 @@ class HierarchicalMemory:
     Semantic Memory: General knowledge, long-term, persistent
     """
 
-    def __init__(self, storage_path: str = "./data/memory"):
+    def __init__(self, storage_path: str = "./data/memory", vector_memory=None):
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
 
@@ -167,8 +167,8 @@ class HierarchicalMemory:
         self.semantic_memory: Dict[str, SemanticKnowledge] = {}
         self.semantic_index_by_tag: Dict[str, List[str]] = {}
 
-        # Integration with existing SemanticMemory (vector DB)
-        self.vector_memory = SemanticMemory()
+        # Integration with existing SemanticMemory (vector DB), shared process-wide
+        self.vector_memory = vector_memory or get_semantic_memory()
 
         # Consolidation statistics
         self.consolidation_stats = {
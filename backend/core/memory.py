@@ -83,13 +83,18 @@ class MemoryStore:
     - Keyword-based fallback when semantic search unavailable
     """
 
-    def __init__(self, db_path: str = "/app/data/darwin.db", use_semantic: bool = True):
+    def __init__(
+        self,
+        db_path: str = "/app/data/darwin.db",
+        use_semantic: bool = True,
+        semantic_memory=None
+    ):
         self.db_path = db_path
         self.use_semantic = use_semantic
         self._semantic_memory = None
         self._query_cache = QueryCache(max_size=100, ttl_seconds=300)
         self._init_database()
-        self._init_semantic_memory()
+        self._init_semantic_memory(semantic_memory)
 
     def _init_database(self):
         """Initialize SQLite database with schema"""
@@ -146,15 +151,20 @@ class MemoryStore:
         conn.close()
         logger.info("Database initialized", extra={"db_path": self.db_path})
 
-    def _init_semantic_memory(self) -> None:
-        """Initialize semantic memory for vector-based search."""
+    def _init_semantic_memory(self, semantic_memory=None) -> None:
+        """Initialize semantic memory for vector-based search (the given instance, else the process-wide one)."""
         if not self.use_semantic:
             logger.info("Semantic memory disabled, using keyword-based search")
             return
 
+        if semantic_memory is not None:
+            self._semantic_memory = semantic_memory
+            logger.info("SemanticMemory integrated for vector-based similarity search")
+            return
+
         try:
-            from core.semantic_memory import SemanticMemory
-            self._semantic_memory = SemanticMemory()
+            from core.semantic_memory import get_semantic_memory
+            self._semantic_memory = get_semantic_memory()
             logger.info("SemanticMemory integrated for vector-based similarity search")
         except ImportError as e:
             logger.warning(f"SemanticMemory not available: {e}. Using keyword-based fallback.")
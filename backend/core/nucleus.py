@@ -1,7 +1,8 @@
 """AI nucleus - Core intelligence using Claude/Gemini with RAG and Multi-Model support"""
+import asyncio
 import anthropic
 import google.generativeai as genai
-from typing import Dict, Optional
+from typing import Awaitable, Callable, Dict, Optional
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -51,7 +52,13 @@ class Nucleus:
             "web_research_enabled": self.web_researcher is not None
         })
 
-    async def generate_solution(self, task: Dict, use_rag: bool = True, use_web_research: bool = False) -> str:
+    async def generate_solution(
+        self,
+        task: Dict,
+        use_rag: bool = True,
+        use_web_research: bool = False,
+        on_token: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> str:
         """
         Generate Python code to solve a task with RAG and web research support
 
@@ -59,6 +66,7 @@ class Nucleus:
             task: Task dictionary
             use_rag: Use semantic memory for context
             use_web_research: Use web research for additional context
+            on_token: Optional async callback receiving partial output (router only)
 
         Returns:
             Generated code
@@ -97,7 +105,8 @@ class Nucleus:
                 result = await self.router.generate(
                     task_description=task.get('description', ''),
                     prompt=prompt,
-                    max_tokens=8192
+                    max_tokens=8192,
+                    on_token=on_token
                 )
                 code = self._extract_code(result["result"])
                 logger.info(f"Solution generated using {result['model_used']}", extra={
@@ -107,7 +116,8 @@ class Nucleus:
                 })
             # Fallback to direct provider
             elif self.provider == "claude":
-                response = self.client.messages.create(
+                response = await asyncio.to_thread(
+                    self.client.messages.create,
                     model=self.model,
                     max_tokens=8192,
                     messages=[{
@@ -122,7 +132,7 @@ class Nucleus:
                 })
 
             elif self.provider == "gemini":
-                response = self.client.generate_content(prompt)
+                response = await asyncio.to_thread(self.client.generate_content, prompt)
                 code = self._extract_code(response.text)
                 logger.info("Solution generated", extra={
                     "task_id": task.get('id'),
@@ -164,6 +174,8 @@ Keep response concise and actionable."""
 
         try:
             if self.router:
+                # Not cached: the prompt carries the run's timing, and a
+                # near-match would be an analysis of different code
                 res = await self.router.generate(
                     task_description="code analysis",
                     prompt=prompt,
@@ -171,7 +183,8 @@ Keep response concise and actionable."""
                 )
                 analysis = res["result"]
             elif self.provider == "claude":
-                response = self.client.messages.create(
+                response = await asyncio.to_thread(
+                    self.client.messages.create,
                     model=self.model,
                     max_tokens=512,
                     messages=[{"role": "user", "content": prompt}]
@@ -179,7 +192,7 @@ Keep response concise and actionable."""
                 analysis = response.content[0].text
 
             elif self.provider == "gemini":
-                response = self.client.generate_content(prompt)
+                response = await asyncio.to_thread(self.client.generate_content, prompt)
                 analysis = response.text
 
             return {
@@ -194,8 +207,14 @@ Keep response concise and actionable."""
                 'suggestions': []
             }
 
-    async def evolve_code(self, code: str, feedback: Dict, task: Dict) -> str:
-        """Create improved version of code based on feedback"""
+    async def evolve_code(
+        self,
+        code: str,
+        feedback: Dict,
+        task: Dict,
+        on_token: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> str:
+        """Create improved version of code based on feedback (streams to on_token if given)"""
         prompt = f"""Improve this Python code based on the feedback provided.
 
 Task: {task.get('description', 'Unknown')}
@@ -225,11 +244,13 @@ Return ONLY the improved Python code, no explanations."""
                 res = await self.router.generate(
                     task_description=f"code evolution: {task.get('description', '')[:60]}",
                     prompt=prompt,
-                    max_tokens=8192
+                    max_tokens=8192,
+                    on_token=on_token
                 )
                 improved_code = self._extract_code(res["result"])
             elif self.provider == "claude":
-                response = self.client.messages.create(
+                response = await asyncio.to_thread(
+                    self.client.messages.create,
                     model=self.model,
                     max_tokens=8192,
                     messages=[{"role": "user", "content": prompt}]
@@ -237,7 +258,7 @@ Return ONLY the improved Python code, no explanations."""
                 improved_code = self._extract_code(response.content[0].text)
 
             elif self.provider == "gemini":
-                response = self.client.generate_content(prompt)
+                response = await asyncio.to_thread(self.client.generate_content, prompt)
                 improved_code = self._extract_code(response.text)
 
             logger.info("Code evolved", extra={
@@ -320,13 +341,14 @@ The code should be ready to execute.""")
 
         return code
 
-    async def generate(self, prompt: str, max_tokens: int = 512) -> str:
+    async def generate(self, prompt: str, max_tokens: int = 512, cache: bool = False) -> str:
         """
         Simple text generation with a prompt.
 
         Args:
             prompt: The text prompt to send to the AI
             max_tokens: Maximum tokens in response
+            cache: Allow a cached response (router only; off for creative prompts)
 
         Returns:
             Generated text response
@@ -336,12 +358,14 @@ The code should be ready to execute.""")
                 result = await self.router.generate(
                     task_description="text generation",
                     prompt=prompt,
-                    max_tokens=max_tokens
+                    max_tokens=max_tokens,
+                    cache=cache
                 )
                 return result["result"]
 
             elif self.provider == "claude":
-                response = self.client.messages.create(
+                response = await asyncio.to_thread(
+                    self.client.messages.create,
                     model=self.model,
                     max_tokens=max_tokens,
                     messages=[{"role": "user", "content": prompt}]
@@ -349,7 +373,7 @@ The code should be ready to execute.""")
                 return response.content[0].text
 
             elif self.provider == "gemini":
-                response = self.client.generate_content(prompt)
+                response = await asyncio.to_thread(self.client.generate_content, prompt)
                 return response.text
 
             else:
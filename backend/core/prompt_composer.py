@@ -282,8 +282,10 @@ Formato:
 
 Ferramentas:
 - backup_tool.create_full_backup — args: label (string, opcional)
+- backup_tool.create_incremental_backup — args: label (string, opcional)
 - backup_tool.list_backups — args: {{}} (sem argumentos)
 - backup_tool.verify_backup — args: backup_name (string — nome EXATO do backup, sem .tar.gz)
+- backup_tool.restore_backup — args: backup_name (string), path_prefix (string, opcional)
 - file_operations_tool.read_file — args: file_path (string)
 - file_operations_tool.write_file — args: file_path (string), content (string)
 - file_operations_tool.append_file — args: file_path (string), content (string)
@@ -0,0 +1,273 @@
+"""
+Warm sandbox worker pool for SafeExecutor.
+
+Spawning a process, applying resource limits and building the safe
+builtins dominates the cost of running short snippets. The pool keeps
+N workers that have already done all of that and are blocked waiting
+for a job, so the only cost on the critical path is sending the code.
+
+Isolation is preserved: every worker runs exactly one job and then
+exits. Replacements are forked in the background by a refill thread,
+and workers that crash, time out or hit the memory limit are counted
+separately so the pool's health is visible.
+"""
+
+import multiprocessing
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from utils.logger import setup_logger
+from utils.security import create_safe_builtins, set_resource_limits
+from utils.stats import percentile
+
+logger = setup_logger(__name__)
+
+
+def _pool_worker(conn, timeout: int, max_memory_mb: int):
+    """
+    Pre-forked worker: prepare the sandbox, then run a single job.
+
+    Runs in a separate process. Limits and builtins are set up before
+    the job arrives so the caller doesn't wait for them.
+    """
+    from core.executor import _run_code
+
+    # Set resource limits FIRST (before any code runs). RLIMIT_CPU counts
+    # CPU time, not wall time, so idling in recv() does not consume it.
+    set_resource_limits(max_memory_mb=max_memory_mb, max_cpu_seconds=timeout)
+    safe_builtins = create_safe_builtins()
+
+    try:
+        code = conn.recv()
+    except (EOFError, OSError):
+        # Pool shut down before we got a job
+        return
+
+    result = _run_code(code, timeout, safe_builtins)
+
+    try:
+        conn.send(result)
+    finally:
+        conn.close()
+
+
+class _Worker:
+    """Handle to one pre-forked worker process"""
+
+    __slots__ = ('process', 'conn', 'spawned_at')
+
+    def __init__(self, process: multiprocessing.Process, conn, spawned_at: float):
+        self.process = process
+        self.conn = conn
+        self.spawned_at = spawned_at
+
+    def stop(self):
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=2)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+
+
+class SandboxPool:
+    """
+    Pool of pre-forked, pre-limited single-use sandbox workers.
+
+    Thread-safe: SafeExecutor.execute is normally called from the default
+    thread pool via execute_async, so several jobs may run at once.
+    Concurrent jobs are bounded by the pool size; callers beyond that
+    wait in line and are reported as queue depth.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        timeout: int = 30,
+        max_memory_mb: int = 256,
+        latency_window: int = 500
+    ):
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.max_memory_mb = max_memory_mb
+
+        self._idle: deque = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._refill_event = threading.Event()
+        self._refill_thread: Optional[threading.Thread] = None
+        self._running = False
+
+        self._queued = 0
+        self._active = 0
+        self._latencies: deque = deque(maxlen=latency_window)
+        self._stats = {
+            'jobs': 0,
+            'spawned': 0,
+            'cold_starts': 0,
+            'recycled': 0,
+            'crashed': 0,
+            'timeouts': 0,
+            'memory_limit_hits': 0,
+            'dead_idle_workers': 0
+        }
+
+    def start(self):
+        """Pre-fork the workers and start the background refill thread"""
+        if self._running:
+            return
+        self._running = True
+        self._fill()
+        self._refill_thread = threading.Thread(
+            target=self._refill_loop, name="sandbox-pool-refill", daemon=True
+        )
+        self._refill_thread.start()
+        logger.info("Sandbox pool started", extra={
+            "size": self.size,
+            "timeout": self.timeout,
+            "max_memory_mb": self.max_memory_mb
+        })
+
+    def shutdown(self):
+        """Stop the refill thread and terminate all idle workers"""
+        self._running = False
+        self._refill_event.set()
+        if self._refill_thread:
+            self._refill_thread.join(timeout=5)
+        with self._lock:
+            workers = list(self._idle)
+            self._idle.clear()
+        for worker in workers:
+            worker.stop()
+        logger.info("Sandbox pool shut down", extra={"terminated_idle": len(workers)})
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = multiprocessing.Pipe(duplex=True)
+        process = multiprocessing.Process(
+            target=_pool_worker,
+            args=(child_conn, self.timeout, self.max_memory_mb),
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        with self._lock:
+            self._stats['spawned'] += 1
+        return _Worker(process, parent_conn, time.time())
+
+    def _fill(self):
+        """Fork workers until the idle list is back to full size"""
+        while self._running:
+            with self._lock:
+                if len(self._idle) + self._active >= self.size:
+                    return
+            try:
+                worker = self._spawn()
+            except Exception as e:
+                logger.error(f"Failed to spawn sandbox worker: {e}")
+                return
+            with self._lock:
+                self._idle.append(worker)
+
+    def _refill_loop(self):
+        while self._running:
+            self._refill_event.wait()
+            self._refill_event.clear()
+            if self._running:
+                self._fill()
+
+    def _acquire(self) -> _Worker:
+        """Take a live idle worker, or fork one if none is ready"""
+        with self._lock:
+            while self._idle:
+                worker = self._idle.popleft()
+                if worker.process.is_alive():
+                    self._active += 1
+                    return worker
+                self._stats['dead_idle_workers'] += 1
+                worker.stop()
+            self._stats['cold_starts'] += 1
+            self._active += 1
+        return self._spawn()
+
+    def _release(self, worker: _Worker, reason: str):
+        """Retire a used worker and schedule a replacement"""
+        worker.stop()
+        with self._lock:
+            self._active -= 1
+            self._stats['recycled'] += 1
+            if reason in ('crashed', 'timeouts', 'memory_limit_hits'):
+                self._stats[reason] += 1
+        self._refill_event.set()
+
+    def run(self, code: str) -> Tuple[Optional[Dict], str]:
+        """
+        Run code on a warm worker.
+
+        Returns:
+            (result, status) where status is 'ok', 'timeout' or 'crashed'.
+            result is None unless status is 'ok'.
+        """
+        with self._lock:
+            self._queued += 1
+        self._slots.acquire()
+        with self._lock:
+            self._queued -= 1
+
+        start = time.time()
+        worker = None
+        status = 'crashed'
+        result = None
+        try:
+            worker = self._acquire()
+            worker.conn.send(code)
+
+            # Extra buffer for IPC overhead, same as the per-process path
+            if worker.conn.poll(self.timeout + 5):
+                result = worker.conn.recv()
+                status = 'ok'
+            else:
+                status = 'timeout'
+        except (EOFError, OSError, BrokenPipeError):
+            # Worker died mid-job (e.g. killed by RLIMIT_CPU)
+            status = 'crashed'
+        finally:
+            if worker is not None:
+                reason = {'ok': 'ok', 'timeout': 'timeouts'}.get(status, 'crashed')
+                if result and result.get('error') == "Memory limit exceeded":
+                    reason = 'memory_limit_hits'
+                self._release(worker, reason)
+            with self._lock:
+                self._stats['jobs'] += 1
+                self._latencies.append(time.time() - start)
+            self._slots.release()
+
+        return result, status
+
+    def get_stats(self) -> Dict:
+        """Pool health: queue depth, spawn/recycle counts, latency percentiles"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = dict(self._stats)
+            idle = len(self._idle)
+            active = self._active
+            queued = self._queued
+
+        return {
+            'size': self.size,
+            'idle_workers': idle,
+            'active_jobs': active,
+            'queue_depth': queued,
+            **stats,
+            'latency_ms': {
+                'p50': round(percentile(latencies, 50) * 1000, 2),
+                'p95': round(percentile(latencies, 95) * 1000, 2),
+                'p99': round(percentile(latencies, 99) * 1000, 2),
+                'samples': len(latencies)
+            }
+        }
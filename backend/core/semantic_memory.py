@@ -3,46 +3,74 @@ Semantic Memory System with ChromaDB and RAG
 Provides vector-based memory storage and retrieval for intelligent task execution
 """
 import asyncio
+import os
+import threading
+import uuid
 import chromadb
 from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Tuple
 import json
 from datetime import datetime
+from pathlib import Path
 import numpy as np
 from sklearn.cluster import DBSCAN
 
+from core.embedding_service import EmbeddingService, get_embedding_service
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+# One Chroma client per persist directory, shared by every SemanticMemory
+_chroma_clients: Dict[str, Any] = {}
+_chroma_lock = threading.Lock()
+
+
+def get_chroma_client(persist_directory: str):
+    """Get the process-wide Chroma client for a persist directory"""
+    key = os.path.abspath(persist_directory)
+    with _chroma_lock:
+        client = _chroma_clients.get(key)
+        if client is None:
+            os.makedirs(persist_directory, exist_ok=True)
+            client = chromadb.PersistentClient(
+                path=persist_directory,
+                settings=Settings(anonymized_telemetry=False)
+            )
+            _chroma_clients[key] = client
+        return client
+
+
 class SemanticMemory:
     """
     Semantic memory system using ChromaDB for vector storage
     Enables RAG (Retrieval Augmented Generation) for intelligent code evolution
     """
 
-    def __init__(self, persist_directory: str = "./data/chroma"):
+    def __init__(
+        self,
+        persist_directory: str = "./data/chroma",
+        embedding_service: Optional[EmbeddingService] = None,
+        pattern_eps: float = 0.3,
+        max_unassigned: int = 5000
+    ):
         """
         Initialize semantic memory with ChromaDB and embedding model
 
         Args:
             persist_directory: Directory to persist vector database
+            embedding_service: Embedding service (defaults to the shared one;
+                the model itself loads on first use)
+            pattern_eps: Max distance from a pattern centroid (and DBSCAN eps)
+            max_unassigned: Cap on executions waiting to be clustered
         """
         self.persist_directory = persist_directory
 
-        # Initialize ChromaDB with persistent storage
-        import os
-        os.makedirs(persist_directory, exist_ok=True)
-        self.client = chromadb.PersistentClient(
-            path=persist_directory,
-            settings=Settings(anonymized_telemetry=False)
-        )
+        # ChromaDB with persistent storage (one client per directory per process)
+        self.client = get_chroma_client(persist_directory)
 
-        # Initialize embedding model
-        logger.info("Loading sentence-transformers model...")
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+        # Shared, lazily loaded embedding model with batching and caching
+        self.embeddings = embedding_service or get_embedding_service()
 
         # Create or get collections
         self.executions_collection = self.client.get_or_create_collection(
@@ -55,12 +83,32 @@ class SemanticMemory:
             metadata={"description": "Reusable code patterns"}
         )
 
+        # Incremental pattern mining: centroids of known patterns plus the
+        # "dirty" executions that didn't fit any of them yet
+        self.pattern_eps = pattern_eps
+        self.max_unassigned = max_unassigned
+        self._pattern_state_path = Path(persist_directory) / "pattern_state.json"
+        self._centroids: Dict[str, np.ndarray] = {}
+        self._pattern_meta: Dict[str, Dict[str, Any]] = {}
+        self._unassigned: List[str] = []
+        self._patterns_bootstrapped = False
+        self._unsaved_assignments = 0
+        self._load_pattern_state()
+
+        # (on_store, on_delete) callbacks told about every stored or deleted
+        # execution, e.g. so memory sync can keep its index current
+        self._change_listeners: List[Tuple[Callable, Optional[Callable]]] = []
+
         logger.info("SemanticMemory initialized successfully")
 
+    @property
+    def embedding_model(self):
+        """The underlying SentenceTransformer (loads it if needed)"""
+        return self.embeddings.model
+
     def _generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding vector for text"""
-        embedding = self.embedding_model.encode(text)
-        return embedding.tolist()
+        """Generate embedding vector for text (blocking; async code uses embeddings.embed)"""
+        return self.embeddings.encode_sync(text)
 
     async def store_execution(
         self,
@@ -84,8 +132,8 @@ class SemanticMemory:
             # Combine task and code for embedding
             combined_text = f"{task_description}\n\n{code}"
 
-            # Generate embedding
-            embedding = self._generate_embedding(combined_text)
+            # Generate embedding (micro-batched with concurrent stores)
+            embedding = await self.embeddings.embed(combined_text)
 
             # Prepare metadata
             meta = {
@@ -105,10 +153,90 @@ class SemanticMemory:
             )
 
             logger.info(f"Stored execution {task_id} in semantic memory")
+            self._notify_store(self._record(task_id, code, meta))
+
+            if meta["success"]:
+                self._assign_to_pattern(task_id, embedding)
 
         except Exception as e:
             logger.error(f"Failed to store execution: {e}")
 
+    # ------------------------------------------------------------------
+    # Record access (memory sync)
+    # ------------------------------------------------------------------
+
+    def add_change_listener(
+        self,
+        on_store: Callable[[Dict[str, Any]], None],
+        on_delete: Optional[Callable[[str], None]] = None
+    ) -> None:
+        """Call on_store(record) after each store and on_delete(id) after each delete"""
+        self._change_listeners.append((on_store, on_delete))
+
+    def _notify_store(self, record: Dict[str, Any]):
+        for on_store, _ in self._change_listeners:
+            try:
+                on_store(record)
+            except Exception as e:
+                logger.warning(f"Semantic memory store listener failed: {e}")
+
+    def _notify_delete(self, memory_id: str):
+        for _, on_delete in self._change_listeners:
+            if on_delete is None:
+                continue
+            try:
+                on_delete(memory_id)
+            except Exception as e:
+                logger.warning(f"Semantic memory delete listener failed: {e}")
+
+    @staticmethod
+    def _record(memory_id: str, code: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """One execution as a plain record (the same shape from every accessor)"""
+        record = {"id": memory_id, "code": code, "metadata": dict(metadata or {})}
+        if record["metadata"].get("timestamp"):
+            record["created_at"] = record["updated_at"] = record["metadata"]["timestamp"]
+        return record
+
+    async def get_all(self) -> List[Dict[str, Any]]:
+        """Every stored execution as a record"""
+        results = await asyncio.to_thread(
+            self.executions_collection.get, include=["documents", "metadatas"]
+        )
+        return [
+            self._record(memory_id, document, metadata)
+            for memory_id, document, metadata in zip(
+                results["ids"], results["documents"], results["metadatas"]
+            )
+        ]
+
+    async def get(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        """One stored execution as a record, or None"""
+        results = await asyncio.to_thread(
+            self.executions_collection.get, ids=[memory_id], include=["documents", "metadatas"]
+        )
+        if not results["ids"]:
+            return None
+        return self._record(results["ids"][0], results["documents"][0], results["metadatas"][0])
+
+    async def store(self, record: Dict[str, Any], memory_id: Optional[str] = None) -> None:
+        """Insert or replace an execution from a record (e.g. one received from a peer)"""
+        memory_id = memory_id or record["id"]
+        code = record.get("code", "")
+        meta = dict(record.get("metadata") or {})
+        embedding = await self.embeddings.embed(f"{meta.get('task_description', '')}\n\n{code}")
+        self.executions_collection.upsert(
+            ids=[memory_id],
+            embeddings=[embedding],
+            documents=[code],
+            metadatas=[meta]
+        )
+        self._notify_store(self._record(memory_id, code, meta))
+
+    async def delete(self, memory_id: str) -> None:
+        """Remove a stored execution"""
+        self.executions_collection.delete(ids=[memory_id])
+        self._notify_delete(memory_id)
+
     async def retrieve_similar(
         self,
         query: str,
@@ -128,7 +256,7 @@ class SemanticMemory:
         """
         try:
             # Generate query embedding
-            query_embedding = self._generate_embedding(query)
+            query_embedding = await self.embeddings.embed(query)
 
             # Build filter
             where_filter = {"success": True} if filter_success else None
@@ -157,64 +285,249 @@ class SemanticMemory:
             logger.error(f"Failed to retrieve similar executions: {e}")
             return []
 
-    async def find_reusable_patterns(self, min_cluster_size: int = 3) -> List[Dict[str, Any]]:
+    # ------------------------------------------------------------------
+    # Pattern mining
+    # ------------------------------------------------------------------
+
+    def _load_pattern_state(self):
+        """Load pattern centroids from ChromaDB and the unassigned backlog from disk"""
+        try:
+            stored = self.patterns_collection.get(include=["embeddings", "metadatas"])
+            for pid, emb, meta in zip(stored["ids"], stored["embeddings"], stored["metadatas"]):
+                self._centroids[pid] = np.asarray(emb, dtype=np.float32)
+                self._pattern_meta[pid] = dict(meta or {})
+        except Exception as e:
+            logger.error(f"Failed to load pattern centroids: {e}")
+
+        if self._pattern_state_path.exists():
+            try:
+                state = json.loads(self._pattern_state_path.read_text())
+                self._unassigned = state.get("unassigned", [])
+                self._patterns_bootstrapped = True
+            except Exception as e:
+                logger.error(f"Failed to load pattern state: {e}")
+
+    def _save_pattern_state(self):
+        try:
+            self._pattern_state_path.write_text(json.dumps({
+                "unassigned": self._unassigned,
+                "saved_at": datetime.now().isoformat()
+            }))
+            self._unsaved_assignments = 0
+        except Exception as e:
+            logger.error(f"Failed to save pattern state: {e}")
+
+    @staticmethod
+    def _new_pattern_id() -> str:
+        """Id for a newly formed cluster; it is kept for the pattern's lifetime"""
+        return f"pattern_{uuid.uuid4().hex[:12]}"
+
+    def _match_previous(
+        self,
+        centroid: np.ndarray,
+        previous: Dict[str, tuple],
+        claimed: set
+    ) -> Optional[str]:
+        """Id of the nearest unclaimed pre-rebuild pattern within pattern_eps, if any"""
+        best_id, best_distance = None, self.pattern_eps
+        for pid, (old_centroid, _) in previous.items():
+            if pid in claimed:
+                continue
+            distance = float(np.linalg.norm(old_centroid - centroid))
+            if distance <= best_distance:
+                best_id, best_distance = pid, distance
+        return best_id
+
+    def _nearest_pattern(self, embedding: np.ndarray) -> Optional[str]:
+        if not self._centroids:
+            return None
+        ids = list(self._centroids)
+        distances = np.linalg.norm(np.stack([self._centroids[pid] for pid in ids]) - embedding, axis=1)
+        best = int(np.argmin(distances))
+        return ids[best] if distances[best] <= self.pattern_eps else None
+
+    def _assign_to_pattern(self, task_id: str, embedding: List[float]):
+        """
+        Fold a new successful execution into the nearest pattern, or queue it
+        for the next recluster if it's too far from every centroid.
+        """
+        if not self._patterns_bootstrapped:
+            return  # first find_reusable_patterns() will do a full pass
+
+        vector = np.asarray(embedding, dtype=np.float32)
+        pid = self._nearest_pattern(vector)
+        if pid is None:
+            self._unassigned.append(task_id)
+            if len(self._unassigned) > self.max_unassigned:
+                self._unassigned = self._unassigned[-self.max_unassigned:]
+            self._unsaved_assignments += 1
+            if self._unsaved_assignments >= 20:
+                self._save_pattern_state()
+            return
+
+        meta = self._pattern_meta[pid]
+        count = meta.get("occurrences", 1)
+        # Running mean keeps the centroid exact without revisiting members
+        self._centroids[pid] = self._centroids[pid] + (vector - self._centroids[pid]) / (count + 1)
+        meta["occurrences"] = count + 1
+        meta["updated_at"] = datetime.now().isoformat()
+        try:
+            self.patterns_collection.update(
+                ids=[pid],
+                embeddings=[self._centroids[pid].tolist()],
+                metadatas=[meta]
+            )
+        except Exception as e:
+            logger.error(f"Failed to update pattern {pid}: {e}")
+
+    def _upsert_clusters(
+        self,
+        ids: List[str],
+        embeddings: np.ndarray,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        labels: np.ndarray,
+        previous: Optional[Dict[str, tuple]] = None
+    ) -> List[str]:
+        """
+        Turn DBSCAN clusters into patterns; returns ids left as noise.
+
+        previous maps the patterns known before a full rebuild to their
+        (centroid, metadata); a cluster that re-forms near one keeps its id,
+        so stored references to patterns survive reclustering.
+        """
+        now = datetime.now().isoformat()
+        previous = previous or {}
+        claimed: set = set()
+        for cluster_id in set(labels):
+            if cluster_id == -1:  # Noise
+                continue
+            members = np.where(labels == cluster_id)[0]
+            centroid = embeddings[members].mean(axis=0)
+            pid = self._match_previous(centroid, previous, claimed) or self._new_pattern_id()
+            claimed.add(pid)
+            discovered_at = previous[pid][1].get("discovered_at", now) if pid in previous else now
+            meta = {
+                "occurrences": len(members),
+                "discovered_at": discovered_at,
+                "updated_at": now,
+                "task_types": " | ".join(
+                    metadatas[i].get("task_description", "")[:50] for i in members[:3]
+                )
+            }
+            self.patterns_collection.upsert(
+                ids=[pid],
+                embeddings=[centroid.tolist()],
+                documents=[documents[members[0]]],
+                metadatas=[meta]
+            )
+            self._centroids[pid] = centroid.astype(np.float32)
+            self._pattern_meta[pid] = meta
+        return [ids[i] for i in np.where(labels == -1)[0]]
+
+    def has_pending_patterns(self, min_cluster_size: int = 3) -> bool:
+        """True when enough unassigned executions exist to be worth reclustering"""
+        return not self._patterns_bootstrapped or len(self._unassigned) >= min_cluster_size
+
+    async def find_reusable_patterns(
+        self,
+        min_cluster_size: int = 3,
+        full: bool = False
+    ) -> List[Dict[str, Any]]:
         """
         Identify reusable code patterns using clustering
 
+        Executions are assigned to existing pattern centroids as they are
+        stored, so this only has to cluster the executions that matched no
+        pattern (the dirty region). The first call, or full=True, clusters
+        every successful execution and seeds the centroids.
+
         Args:
             min_cluster_size: Minimum executions to form a pattern
+            full: Recluster the whole collection instead of the backlog
 
         Returns:
-            List of identified patterns with example code
+            List of known patterns with example code
         """
         try:
-            # Get all executions
-            all_executions = self.executions_collection.get(
-                where={"success": True},
-                include=["embeddings", "documents", "metadatas"]
-            )
-
-            if len(all_executions["ids"]) < min_cluster_size:
-                logger.info("Not enough executions to identify patterns")
-                return []
-
-            # Perform clustering on embeddings
-            embeddings = np.array(all_executions["embeddings"])
-            clustering = DBSCAN(eps=0.3, min_samples=min_cluster_size).fit(embeddings)
-
-            # Extract patterns
-            patterns = []
-            for cluster_id in set(clustering.labels_):
-                if cluster_id == -1:  # Noise
-                    continue
-
-                # Get executions in this cluster
-                cluster_indices = np.where(clustering.labels_ == cluster_id)[0]
-                cluster_docs = [all_executions["documents"][i] for i in cluster_indices]
-                cluster_metas = [all_executions["metadatas"][i] for i in cluster_indices]
-
-                # Create pattern
-                pattern = {
-                    "pattern_id": f"pattern_{cluster_id}",
-                    "occurrences": len(cluster_indices),
-                    "example_code": cluster_docs[0],
-                    "task_types": [meta.get("task_description", "")[:50] for meta in cluster_metas[:3]]
+            rebuild = full or not self._patterns_bootstrapped
+            previous_ids = set(self._centroids)
+            previous = {}
+            if rebuild:
+                previous = {
+                    pid: (centroid, self._pattern_meta.get(pid, {}))
+                    for pid, centroid in self._centroids.items()
                 }
-                patterns.append(pattern)
-
-                # Store pattern in patterns collection
-                pattern_embedding = embeddings[cluster_indices[0]].tolist()
-                self.patterns_collection.add(
-                    ids=[pattern["pattern_id"]],
-                    embeddings=[pattern_embedding],
-                    documents=[pattern["example_code"]],
-                    metadatas=[{
-                        "occurrences": pattern["occurrences"],
-                        "discovered_at": datetime.now().isoformat()
-                    }]
+                batch = self.executions_collection.get(
+                    where={"success": True},
+                    include=["embeddings", "documents", "metadatas"]
                 )
+                previous_ids |= set(self.patterns_collection.get()["ids"])
+                self._centroids.clear()
+                self._pattern_meta.clear()
+            elif self._unassigned:
+                batch = self.executions_collection.get(
+                    ids=self._unassigned,
+                    include=["embeddings", "documents", "metadatas"]
+                )
+            else:
+                batch = {"ids": []}
+
+            if batch["ids"]:
+                embeddings = np.asarray(batch["embeddings"], dtype=np.float32)
+                noise = list(batch["ids"])
+
+                # Backlog items may fit centroids created since they were stored
+                if not rebuild:
+                    fresh = []
+                    for i, eid in enumerate(batch["ids"]):
+                        if self._nearest_pattern(embeddings[i]) is None:
+                            fresh.append(i)
+                        else:
+                            self._assign_to_pattern(eid, embeddings[i])
+                    noise = [batch["ids"][i] for i in fresh]
+                    embeddings = embeddings[fresh]
+                    batch = {
+                        "ids": noise,
+                        "documents": [batch["documents"][i] for i in fresh],
+                        "metadatas": [batch["metadatas"][i] for i in fresh],
+                    }
+
+                if len(noise) >= min_cluster_size:
+                    labels = await asyncio.to_thread(
+                        lambda: DBSCAN(eps=self.pattern_eps, min_samples=min_cluster_size).fit(embeddings).labels_
+                    )
+                    noise = self._upsert_clusters(
+                        batch["ids"], embeddings, batch["documents"], batch["metadatas"], labels,
+                        previous=previous
+                    )
+                self._unassigned = noise[-self.max_unassigned:]
+
+            if rebuild:
+                # Drop patterns that no longer form (and legacy pattern_<n> ids)
+                stale = list(previous_ids - set(self._centroids))
+                if stale:
+                    self.patterns_collection.delete(ids=stale)
+
+            self._patterns_bootstrapped = True
+            self._save_pattern_state()
+
+            stored = self.patterns_collection.get(include=["documents", "metadatas"])
+            patterns = [
+                {
+                    "pattern_id": pid,
+                    "occurrences": (meta or {}).get("occurrences", 0),
+                    "example_code": doc,
+                    "task_types": [t for t in (meta or {}).get("task_types", "").split(" | ") if t]
+                }
+                for pid, doc, meta in zip(stored["ids"], stored["documents"], stored["metadatas"])
+            ]
+            patterns.sort(key=lambda p: p["occurrences"], reverse=True)
 
-            logger.info(f"Identified {len(patterns)} reusable patterns")
+            logger.info(
+                f"Identified {len(patterns)} reusable patterns "
+                f"({len(self._unassigned)} executions unassigned)"
+            )
             return patterns
 
         except Exception as e:
@@ -262,8 +575,31 @@ class SemanticMemory:
             return {
                 "total_executions": len(executions["ids"]),
                 "total_patterns": len(patterns["ids"]),
-                "collection_names": ["executions", "patterns"]
+                "collection_names": ["executions", "patterns"],
+                "embeddings": self.embeddings.get_stats()
             }
         except Exception as e:
             logger.error(f"Failed to get stats: {e}")
             return {}
+
+
+# Global instance
+_semantic_memory: Optional[SemanticMemory] = None
+_semantic_memory_lock = threading.Lock()
+
+
+def get_semantic_memory() -> SemanticMemory:
+    """Get the process-wide semantic memory (created with defaults if not configured)"""
+    global _semantic_memory
+    with _semantic_memory_lock:
+        if _semantic_memory is None:
+            _semantic_memory = SemanticMemory()
+        return _semantic_memory
+
+
+def configure_semantic_memory(**kwargs) -> SemanticMemory:
+    """Replace the global semantic memory with one using the given settings (call before memories are built)"""
+    global _semantic_memory
+    with _semantic_memory_lock:
+        _semantic_memory = SemanticMemory(**kwargs)
+        return _semantic_memory
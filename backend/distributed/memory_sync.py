@@ -8,17 +8,25 @@ Handles synchronization of:
 - Learning progress
 
 Supports conflict resolution and selective sync.
+
+Each memory type keeps a MerkleIndex (id -> checksum hash tree), so peers
+exchange only the subtrees that diverge instead of their whole index. The
+tree is updated as synced memories are saved, through note_local_change()
+from local save paths, and re-read from get_all() when it is older than the
+reindex interval - before this node walks a peer's tree or serves its own.
 """
 
 import asyncio
 import hashlib
 import json
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional, Any, Set, Tuple
 from pathlib import Path
 
+from distributed.merkle_index import MerkleIndex
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -133,13 +141,21 @@ class SyncResult:
     started_at: datetime = field(default_factory=datetime.utcnow)
     completed_at: Optional[datetime] = None
     duration_seconds: float = 0
+    method: str = "tree"            # "tree" (delta) or "full_index" (legacy peer)
+    bytes_sent: int = 0             # Request payload bytes
+    bytes_received: int = 0         # Response payload bytes
+    requests: int = 0
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             'success': self.success,
             'mode': self.mode.value,
+            'method': self.method,
             'records_sent': self.records_sent,
             'records_received': self.records_received,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'requests': self.requests,
             'conflicts_count': len(self.conflicts),
             'errors': self.errors,
             'started_at': self.started_at.isoformat(),
@@ -148,12 +164,18 @@ class SyncResult:
         }
 
 
+class _TreeUnsupported(Exception):
+    """Peer has no /sync/tree endpoint (or a different tree depth)"""
+
+
 class MemorySyncProtocol:
     """
     Protocol for synchronizing memories between Darwin instances.
 
     Features:
     - Incremental sync based on change detection
+    - Merkle-tree delta exchange (only divergent subtrees cross the wire)
+    - Chunked, pipelined pulls and pushes
     - Conflict detection and resolution
     - Selective sync by memory type
     - Versioning for consistency
@@ -162,7 +184,10 @@ class MemorySyncProtocol:
     def __init__(
         self,
         instance_id: str,
-        data_path: str = "./data/distributed/sync"
+        data_path: str = "./data/distributed/sync",
+        chunk_size: int = 200,
+        max_in_flight: int = 4,
+        reindex_interval_seconds: float = 300.0
     ):
         """
         Initialize the sync protocol.
@@ -170,13 +195,23 @@ class MemorySyncProtocol:
         Args:
             instance_id: ID of this instance
             data_path: Path for sync state storage
+            chunk_size: Records per pull/push request
+            max_in_flight: Concurrent pull/push requests per peer
+            reindex_interval_seconds: How often syncs and tree requests
+                re-read get_all() to catch writes that bypassed
+                note_local_change()
         """
         self.instance_id = instance_id
         self.data_path = Path(data_path)
         self.data_path.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight
+        self.reindex_interval = reindex_interval_seconds
 
-        # Local memory index (id -> checksum)
-        self._local_index: Dict[str, str] = {}
+        # Local memory index: one hash tree (id -> checksum) per memory type
+        self._trees: Dict[MemoryType, MerkleIndex] = {t: MerkleIndex() for t in MemoryType}
+        self._last_reindex: Dict[MemoryType, float] = {}
+        self._reindex_lock = asyncio.Lock()
 
         # Pending conflicts
         self._conflicts: List[SyncConflict] = []
@@ -193,8 +228,48 @@ class MemorySyncProtocol:
         # Memory type handlers
         self._memory_handlers: Dict[MemoryType, Dict[str, callable]] = {}
 
+        self._load_state()
+
         logger.info(f"MemorySyncProtocol initialized for instance {instance_id}")
 
+    # ------------------------------------------------------------------
+    # Local index maintenance
+    # ------------------------------------------------------------------
+
+    def _local_checksum(self, memory_type: MemoryType, memory_id: str) -> Optional[str]:
+        return self._trees[memory_type].get(memory_id)
+
+    def note_local_change(self, memory_type: MemoryType, memory: Any) -> None:
+        """Index a memory saved locally (call from the memory store's save path)."""
+        record = self._to_memory_record(memory, memory_type)
+        self._trees[memory_type].set(record.id, record.checksum)
+
+    def note_local_delete(self, memory_type: MemoryType, memory_id: str) -> None:
+        self._trees[memory_type].remove(memory_id)
+
+    async def rebuild_index(self, memory_type: MemoryType) -> int:
+        """Re-read every local memory of a type through get_all() and rebuild its tree."""
+        handler = self._memory_handlers.get(memory_type)
+        if not handler:
+            return 0
+        memories = await handler['get_all']()
+        records = [self._to_memory_record(m, memory_type) for m in memories]
+        self._trees[memory_type].replace_all((r.id, r.checksum) for r in records)
+        self._last_reindex[memory_type] = time.monotonic()
+        return len(records)
+
+    async def _ensure_indexed(self, memory_types: List[MemoryType]) -> None:
+        # Serialized so the concurrent requests of one tree walk rebuild once
+        async with self._reindex_lock:
+            now = time.monotonic()
+            for memory_type in memory_types:
+                last = self._last_reindex.get(memory_type)
+                if memory_type in self._memory_handlers and (last is None or now - last >= self.reindex_interval):
+                    try:
+                        await self.rebuild_index(memory_type)
+                    except Exception as e:
+                        logger.error(f"Failed to index {memory_type.value} memories: {e}")
+
     def register_memory_handler(
         self,
         memory_type: MemoryType,
@@ -226,7 +301,8 @@ class MemorySyncProtocol:
         peer_address: str,
         mode: SyncMode = SyncMode.BIDIRECTIONAL,
         memory_types: List[MemoryType] = None,
-        conflict_resolution: ConflictResolution = None
+        conflict_resolution: ConflictResolution = None,
+        session=None
     ) -> SyncResult:
         """
         Synchronize memories with a peer instance.
@@ -236,6 +312,7 @@ class MemorySyncProtocol:
             mode: Synchronization mode
             memory_types: Types to sync (None = all)
             conflict_resolution: How to resolve conflicts
+            session: aiohttp session to reuse (a temporary one is opened if None)
 
         Returns:
             SyncResult with details of the operation
@@ -245,28 +322,22 @@ class MemorySyncProtocol:
         memory_types = memory_types or list(MemoryType)
 
         try:
-            import aiohttp
+            await self._ensure_indexed(memory_types)
 
-            async with aiohttp.ClientSession() as session:
-                # Get peer's memory index
-                peer_index = await self._get_peer_index(session, peer_address, memory_types)
-
-                if mode in (SyncMode.PULL, SyncMode.BIDIRECTIONAL):
-                    # Pull changes from peer
-                    received = await self._pull_from_peer(
-                        session, peer_address, peer_index, memory_types, conflict_resolution
-                    )
-                    result.records_received = received
+            if session is None:
+                import aiohttp
 
-                if mode in (SyncMode.PUSH, SyncMode.BIDIRECTIONAL):
-                    # Push changes to peer
-                    sent = await self._push_to_peer(
-                        session, peer_address, peer_index, memory_types
+                async with aiohttp.ClientSession() as own_session:
+                    await self._sync_session(
+                        own_session, peer_address, mode, memory_types, conflict_resolution, result
                     )
-                    result.records_sent = sent
+            else:
+                await self._sync_session(
+                    session, peer_address, mode, memory_types, conflict_resolution, result
+                )
 
-                result.success = True
-                result.conflicts = [c for c in self._conflicts if not c.resolved]
+            result.success = True
+            result.conflicts = [c for c in self._conflicts if not c.resolved]
 
         except Exception as e:
             logger.error(f"Sync error with {peer_address}: {e}")
@@ -287,72 +358,195 @@ class MemorySyncProtocol:
 
         return result
 
+    async def _sync_session(
+        self,
+        session,
+        peer_address: str,
+        mode: SyncMode,
+        memory_types: List[MemoryType],
+        conflict_resolution: ConflictResolution,
+        result: SyncResult
+    ) -> None:
+        # Find which ids differ: walk the peer's hash trees, or fall back to
+        # its full index if it predates tree sync
+        try:
+            peer_entries, local_ids = await self._diff_with_peer(
+                session, peer_address, memory_types, result
+            )
+        except _TreeUnsupported:
+            result.method = "full_index"
+            peer_index = await self._get_peer_index(session, peer_address, memory_types, result)
+            peer_entries = {t: peer_index.get(t.value, {}) for t in memory_types}
+            local_ids = {t: set(self._trees[t].entries) for t in memory_types}
+
+        if mode in (SyncMode.PULL, SyncMode.BIDIRECTIONAL):
+            # Pull changes from peer
+            result.records_received = await self._pull_from_peer(
+                session, peer_address, peer_entries, memory_types, conflict_resolution, result
+            )
+
+        if mode in (SyncMode.PUSH, SyncMode.BIDIRECTIONAL):
+            # Push changes to peer
+            result.records_sent = await self._push_to_peer(
+                session, peer_address, peer_entries, local_ids, memory_types, result
+            )
+
+    async def _request(
+        self,
+        session,
+        method: str,
+        url: str,
+        result: SyncResult,
+        payload: Any = None,
+        params: Dict[str, str] = None
+    ) -> Tuple[int, Any]:
+        """One HTTP exchange, counting payload bytes both ways."""
+        body = json.dumps(payload) if payload is not None else None
+        result.requests += 1
+        if body:
+            result.bytes_sent += len(body)
+        kwargs: Dict[str, Any] = {}
+        if body is not None:
+            kwargs['data'] = body
+            kwargs['headers'] = {'Content-Type': 'application/json'}
+        if params:
+            kwargs['params'] = params
+        request = session.post if method == "POST" else session.get
+        async with request(url, **kwargs) as response:
+            raw = await response.read()
+            result.bytes_received += len(raw)
+            data = json.loads(raw) if raw and response.status == 200 else None
+            return response.status, data
+
     async def _get_peer_index(
         self,
         session,
         peer_address: str,
-        memory_types: List[MemoryType]
+        memory_types: List[MemoryType],
+        result: SyncResult
     ) -> Dict[str, Dict[str, str]]:
-        """Get memory index from peer"""
+        """Get the full memory index from a peer (legacy fallback)"""
         url = f"http://{peer_address}/api/v1/distributed/sync/index"
         params = {'types': ','.join(t.value for t in memory_types)}
 
-        async with session.get(url, params=params) as response:
-            if response.status == 200:
-                data = await response.json()
-                return data.get('index', {})
-            else:
-                raise Exception(f"Failed to get peer index: {response.status}")
+        status, data = await self._request(session, "GET", url, result, params=params)
+        if status == 200:
+            return data.get('index', {})
+        raise Exception(f"Failed to get peer index: {status}")
+
+    async def _diff_with_peer(
+        self,
+        session,
+        peer_address: str,
+        memory_types: List[MemoryType],
+        result: SyncResult
+    ) -> Tuple[Dict[MemoryType, Dict[str, str]], Dict[MemoryType, Set[str]]]:
+        """
+        Walk the peer's hash trees top-down, one request per tree level for
+        all types at once, descending only where hashes differ.
+
+        Returns:
+            (peer {id: checksum}, local ids) restricted to divergent leaf buckets
+        """
+        url = f"http://{peer_address}/api/v1/distributed/sync/tree"
+        peer_entries: Dict[MemoryType, Dict[str, str]] = {t: {} for t in memory_types}
+        local_ids: Dict[MemoryType, Set[str]] = {t: set() for t in memory_types}
+
+        # Level 0: compare roots
+        frontier: Dict[MemoryType, List[str]] = {t: [""] for t in memory_types}
+        while any(frontier.values()):
+            payload = {
+                'depth': next(iter(self._trees.values())).depth,
+                'query': {t.value: prefixes for t, prefixes in frontier.items() if prefixes}
+            }
+            status, data = await self._request(session, "POST", url, result, payload=payload)
+            if status == 404:
+                raise _TreeUnsupported()
+            if status != 200 or data.get('depth') != payload['depth']:
+                raise _TreeUnsupported()
+
+            answers = data.get('nodes', {})
+            next_frontier: Dict[MemoryType, List[str]] = {t: [] for t in memory_types}
+            for memory_type, prefixes in frontier.items():
+                tree = self._trees[memory_type]
+                remote = answers.get(memory_type.value, {})
+                for prefix in prefixes:
+                    node = remote.get(prefix)
+                    if len(prefix) >= tree.depth:
+                        # Leaf bucket: collect both sides' entries
+                        peer_entries[memory_type].update(node or {})
+                        local_ids[memory_type].update(tree.bucket(prefix))
+                    else:
+                        next_frontier[memory_type].extend(tree.divergent_children(prefix, node or ""))
+            frontier = next_frontier
+
+        return peer_entries, local_ids
+
+    async def _pipelined(self, chunks: List[List[Any]], send) -> List[Any]:
+        """Run send(chunk) for every chunk with at most max_in_flight at once."""
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        async def run(chunk):
+            async with semaphore:
+                return await send(chunk)
+
+        return await asyncio.gather(*(run(chunk) for chunk in chunks))
+
+    def _chunks(self, items: List[Any]) -> List[List[Any]]:
+        return [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
 
     async def _pull_from_peer(
         self,
         session,
         peer_address: str,
-        peer_index: Dict[str, Dict[str, str]],
+        peer_entries: Dict[MemoryType, Dict[str, str]],
         memory_types: List[MemoryType],
-        conflict_resolution: ConflictResolution
+        conflict_resolution: ConflictResolution,
+        result: SyncResult
     ) -> int:
         """Pull changed memories from peer"""
         records_received = 0
+        url = f"http://{peer_address}/api/v1/distributed/sync/memories"
 
         for memory_type in memory_types:
             type_key = memory_type.value
-            peer_memories = peer_index.get(type_key, {})
 
             # Find memories we need
-            needed_ids = []
-            for mem_id, checksum in peer_memories.items():
-                local_checksum = self._local_index.get(f"{type_key}:{mem_id}")
-                if local_checksum != checksum:
-                    needed_ids.append(mem_id)
-
+            needed_ids = [
+                mem_id for mem_id, checksum in peer_entries.get(memory_type, {}).items()
+                if self._local_checksum(memory_type, mem_id) != checksum
+            ]
             if not needed_ids:
                 continue
 
-            # Fetch needed memories
-            url = f"http://{peer_address}/api/v1/distributed/sync/memories"
-            payload = {'type': type_key, 'ids': needed_ids}
-
-            async with session.post(url, json=payload) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    for record_data in data.get('memories', []):
-                        record = MemoryRecord.from_dict(record_data)
-
-                        # Check for conflict
-                        local_checksum = self._local_index.get(f"{type_key}:{record.id}")
-                        if local_checksum and local_checksum != record.checksum:
-                            # We have a conflict
-                            conflict = await self._handle_conflict(
-                                memory_type, record, conflict_resolution
-                            )
-                            if conflict:
-                                self._conflicts.append(conflict)
-                                continue
-
-                        # Save the memory
-                        await self._save_memory(memory_type, record)
-                        records_received += 1
+            async def fetch(ids: List[str]) -> List[Dict[str, Any]]:
+                status, data = await self._request(
+                    session, "POST", url, result, payload={'type': type_key, 'ids': ids}
+                )
+                return data.get('memories', []) if status == 200 else []
+
+            # Fetch in chunks, several in flight; apply in arrival order
+            for records in await self._pipelined(self._chunks(needed_ids), fetch):
+                for record_data in records:
+                    record = MemoryRecord.from_dict(record_data)
+
+                    # Check for conflict
+                    local_checksum = self._local_checksum(memory_type, record.id)
+                    if local_checksum and local_checksum != record.checksum:
+                        # We have a conflict
+                        conflict = await self._handle_conflict(
+                            memory_type, record, conflict_resolution
+                        )
+                        if conflict:
+                            self._conflicts.append(conflict)
+                        elif self._local_checksum(memory_type, record.id) == record.checksum:
+                            records_received += 1  # resolved in the peer's favor
+                        # Resolution already saved whichever version won
+                        continue
+
+                    # Save the memory
+                    await self._save_memory(memory_type, record)
+                    records_received += 1
 
         return records_received
 
@@ -360,45 +554,46 @@ class MemorySyncProtocol:
         self,
         session,
         peer_address: str,
-        peer_index: Dict[str, Dict[str, str]],
-        memory_types: List[MemoryType]
+        peer_entries: Dict[MemoryType, Dict[str, str]],
+        local_ids: Dict[MemoryType, Set[str]],
+        memory_types: List[MemoryType],
+        result: SyncResult
     ) -> int:
-        """Push local memories to peer"""
+        """Push local memories the peer lacks (or has an older copy of)"""
         records_sent = 0
+        url = f"http://{peer_address}/api/v1/distributed/sync/receive"
 
         for memory_type in memory_types:
             if memory_type not in self._memory_handlers:
                 continue
 
-            type_key = memory_type.value
-            peer_memories = peer_index.get(type_key, {})
+            peer_memories = peer_entries.get(memory_type, {})
             handler = self._memory_handlers[memory_type]
 
-            # Get local memories
-            local_memories = await handler['get_all']()
-
-            # Find memories peer doesn't have or are outdated
-            to_push = []
-            for memory in local_memories:
-                record = self._to_memory_record(memory, memory_type)
-                peer_checksum = peer_memories.get(record.id)
-                if peer_checksum != record.checksum:
-                    to_push.append(record)
-
-            if not to_push:
+            # Only ids in divergent buckets are candidates
+            to_push_ids = [
+                mem_id for mem_id in local_ids.get(memory_type, ())
+                if (checksum := self._local_checksum(memory_type, mem_id)) is not None
+                and peer_memories.get(mem_id) != checksum
+            ]
+            if not to_push_ids:
                 continue
 
-            # Push to peer
-            url = f"http://{peer_address}/api/v1/distributed/sync/receive"
-            payload = {
-                'source_instance': self.instance_id,
-                'memories': [r.to_dict() for r in to_push]
-            }
-
-            async with session.post(url, json=payload) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    records_sent += data.get('accepted', 0)
+            async def push(ids: List[str]) -> int:
+                records = []
+                for mem_id in ids:
+                    memory = await handler['get_by_id'](mem_id)
+                    if memory:
+                        records.append(self._to_memory_record(memory, memory_type).to_dict())
+                if not records:
+                    return 0
+                status, data = await self._request(session, "POST", url, result, payload={
+                    'source_instance': self.instance_id,
+                    'memories': records
+                })
+                return data.get('accepted', 0) if status == 200 else 0
+
+            records_sent += sum(await self._pipelined(self._chunks(to_push_ids), push))
 
         return records_sent
 
@@ -486,7 +681,7 @@ class MemorySyncProtocol:
         handler = self._memory_handlers.get(memory_type)
         if handler:
             await handler['save'](record.content, record.id)
-            self._local_index[f"{memory_type.value}:{record.id}"] = record.checksum
+            self._trees[memory_type].set(record.id, record.checksum)
 
     def _to_memory_record(self, memory: Any, memory_type: MemoryType) -> MemoryRecord:
         """Convert a memory object to MemoryRecord"""
@@ -506,21 +701,53 @@ class MemorySyncProtocol:
         else:
             raise ValueError(f"Cannot convert {type(memory)} to MemoryRecord")
 
-    def get_local_index(self, memory_types: List[MemoryType] = None) -> Dict[str, Dict[str, str]]:
-        """Get index of local memories for sync"""
-        index = {}
+    async def get_local_index(self, memory_types: List[MemoryType] = None) -> Dict[str, Dict[str, str]]:
+        """Get the full index of local memories (legacy peers without tree sync)"""
         memory_types = memory_types or list(MemoryType)
+        await self._ensure_indexed(memory_types)
+        return {t.value: dict(self._trees[t].entries) for t in memory_types}
 
-        for memory_type in memory_types:
-            type_key = memory_type.value
-            index[type_key] = {}
+    async def get_tree_nodes(self, query: Dict[str, List[str]], depth: int) -> Dict[str, Any]:
+        """
+        Answer a peer's tree walk (reindexing first if the tree is stale).
+
+        Args:
+            query: {memory_type: [prefixes]} - internal prefixes get child
+                hashes back, leaf buckets get their {id: checksum} entries
+            depth: The peer's tree depth (must match ours)
+        """
+        local_depth = next(iter(self._trees.values())).depth
+        if depth != local_depth:
+            return {'depth': local_depth, 'nodes': {}}
+
+        memory_types = {}
+        for type_key in query:
+            try:
+                memory_types[type_key] = MemoryType(type_key)
+            except ValueError:
+                continue
+        await self._ensure_indexed(list(memory_types.values()))
 
-            for key, checksum in self._local_index.items():
-                if key.startswith(f"{type_key}:"):
-                    mem_id = key[len(f"{type_key}:"):]
-                    index[type_key][mem_id] = checksum
+        nodes = {
+            type_key: self._trees[memory_type].describe(query[type_key])
+            for type_key, memory_type in memory_types.items()
+        }
+        return {'depth': local_depth, 'nodes': nodes}
 
-        return index
+    async def get_memories(self, memory_type: MemoryType, ids: List[str]) -> List[Dict[str, Any]]:
+        """Serialize the requested local memories for a peer's pull"""
+        handler = self._memory_handlers.get(memory_type)
+        if not handler:
+            return []
+        records = []
+        for mem_id in ids:
+            try:
+                memory = await handler['get_by_id'](mem_id)
+                if memory:
+                    records.append(self._to_memory_record(memory, memory_type).to_dict())
+            except Exception as e:
+                logger.debug(f"Could not load memory {mem_id} for sync: {e}")
+        return records
 
     async def receive_memories(
         self,
@@ -542,7 +769,7 @@ class MemorySyncProtocol:
                     continue
 
                 # Check for conflict
-                local_checksum = self._local_index.get(f"{memory_type.value}:{record.id}")
+                local_checksum = self._local_checksum(memory_type, record.id)
                 if local_checksum and local_checksum != record.checksum:
                     # Conflict - use default resolution
                     conflict = await self._handle_conflict(
@@ -596,7 +823,11 @@ class MemorySyncProtocol:
         try:
             state_file = self.data_path / "sync_state.json"
             state = {
-                'local_index': self._local_index,
+                'local_index': {
+                    f"{t.value}:{mem_id}": checksum
+                    for t, tree in self._trees.items()
+                    for mem_id, checksum in tree.entries.items()
+                },
                 'peer_sync_state': self._peer_sync_state,
                 'conflicts': [c.to_dict() for c in self._conflicts],
                 'updated_at': datetime.utcnow().isoformat()
@@ -616,7 +847,12 @@ class MemorySyncProtocol:
                 with open(state_file) as f:
                     state = json.load(f)
 
-                self._local_index = state.get('local_index', {})
+                for key, checksum in state.get('local_index', {}).items():
+                    type_key, _, mem_id = key.partition(':')
+                    try:
+                        self._trees[MemoryType(type_key)].set(mem_id, checksum)
+                    except ValueError:
+                        continue
                 self._peer_sync_state = state.get('peer_sync_state', {})
 
         except Exception as e:
@@ -626,7 +862,8 @@ class MemorySyncProtocol:
         """Get sync protocol status"""
         return {
             'instance_id': self.instance_id,
-            'local_memory_count': len(self._local_index),
+            'local_memory_count': sum(len(tree) for tree in self._trees.values()),
+            'tree_roots': {t.value: tree.root for t, tree in self._trees.items() if len(tree)},
             'pending_conflicts': len([c for c in self._conflicts if not c.resolved]),
             'registered_handlers': [t.value for t in self._memory_handlers.keys()],
             'peer_sync_state': self._peer_sync_state,
@@ -0,0 +1,123 @@
+"""
+Merkle Index - incremental hash tree over one memory type's checksums
+
+Memory ids are bucketed by the first DEPTH hex digits of sha1(id), giving a
+fixed 16-ary tree that every instance builds identically. Each node's hash
+is the XOR of the hashes of the (id, checksum) entries beneath it, so a save
+or delete updates DEPTH + 1 nodes in O(1) each instead of rehashing the
+subtree. Two peers find what changed by comparing hashes top-down and only
+descending into children that differ.
+"""
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+HEX = "0123456789abcdef"
+DEPTH = 4            # 16^4 = 65536 leaf buckets (~2 entries each at 100k memories)
+_MASK = (1 << 64) - 1
+
+
+def _entry_hash(memory_id: str, checksum: str) -> int:
+    digest = hashlib.sha1(f"{memory_id}\x00{checksum}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def bucket_of(memory_id: str, depth: int = DEPTH) -> str:
+    """Leaf bucket (hex prefix) an id belongs to."""
+    return hashlib.sha1(memory_id.encode()).hexdigest()[:depth]
+
+
+class MerkleIndex:
+    """id -> checksum map plus XOR hash tree, updated incrementally."""
+
+    def __init__(self, depth: int = DEPTH):
+        self.depth = depth
+        self.entries: Dict[str, str] = {}
+        self._buckets: Dict[str, Dict[str, str]] = {}  # leaf prefix -> {id: checksum}
+        self._nodes: Dict[str, int] = {}                # prefix ("" = root) -> hash
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, memory_id: str) -> Optional[str]:
+        return self.entries.get(memory_id)
+
+    def _apply(self, bucket: str, delta: int) -> None:
+        nodes = self._nodes
+        for i in range(self.depth + 1):
+            prefix = bucket[:i]
+            value = nodes.get(prefix, 0) ^ delta
+            if value:
+                nodes[prefix] = value
+            else:
+                nodes.pop(prefix, None)
+
+    def set(self, memory_id: str, checksum: str) -> bool:
+        """Record a memory's checksum. Returns True if the tree changed."""
+        old = self.entries.get(memory_id)
+        if old == checksum:
+            return False
+        bucket = bucket_of(memory_id, self.depth)
+        delta = _entry_hash(memory_id, checksum)
+        if old is not None:
+            delta ^= _entry_hash(memory_id, old)
+        self.entries[memory_id] = checksum
+        self._buckets.setdefault(bucket, {})[memory_id] = checksum
+        self._apply(bucket, delta)
+        return True
+
+    def remove(self, memory_id: str) -> bool:
+        old = self.entries.pop(memory_id, None)
+        if old is None:
+            return False
+        bucket = bucket_of(memory_id, self.depth)
+        members = self._buckets.get(bucket)
+        if members is not None:
+            members.pop(memory_id, None)
+            if not members:
+                del self._buckets[bucket]
+        self._apply(bucket, _entry_hash(memory_id, old))
+        return True
+
+    def replace_all(self, items: Iterable[Tuple[str, str]]) -> None:
+        """Rebuild from scratch (initial seeding / reconcile)."""
+        self.entries.clear()
+        self._buckets.clear()
+        self._nodes.clear()
+        for memory_id, checksum in items:
+            self.set(memory_id, checksum)
+
+    @property
+    def root(self) -> str:
+        return self.node_hash("")
+
+    def node_hash(self, prefix: str) -> str:
+        return format(self._nodes.get(prefix, 0) & _MASK, "016x")
+
+    def children(self, prefix: str) -> str:
+        """The 16 child hashes of an internal node, concatenated (empty = zeros)."""
+        nodes = self._nodes
+        return "".join(format(nodes.get(prefix + c, 0), "016x") for c in HEX)
+
+    def bucket(self, prefix: str) -> Dict[str, str]:
+        """Entries of a leaf bucket."""
+        return dict(self._buckets.get(prefix, {}))
+
+    def describe(self, prefixes: List[str]) -> Dict[str, Any]:
+        """
+        Answer a peer's tree query: concatenated child hashes for internal
+        prefixes, {id: checksum} entries for leaf buckets.
+        """
+        return {
+            prefix: self.bucket(prefix) if len(prefix) >= self.depth else self.children(prefix)
+            for prefix in prefixes
+        }
+
+    def divergent_children(self, prefix: str, remote_children: str) -> List[str]:
+        """Child prefixes whose hash differs from the peer's (including one-sided)."""
+        local_children = self.children(prefix)
+        remote_children = remote_children or "0" * len(local_children)
+        return [
+            prefix + c
+            for i, c in enumerate(HEX)
+            if local_children[i * 16:(i + 1) * 16] != remote_children[i * 16:(i + 1) * 16]
+        ]
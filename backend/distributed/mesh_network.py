@@ -9,7 +9,7 @@ Provides:
 """
 
 import asyncio
-import json
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -113,6 +113,193 @@ class PeerConnection:
         }
 
 
+class PeerLink:
+    """
+    Long-lived outbound link to one peer.
+
+    Messages are queued (bounded - a full queue makes senders wait, and
+    eventually fail, instead of buffering without limit) and a single writer
+    task drains them in batches over the network's shared keep-alive HTTP
+    session. When the link is idle the writer sends an empty batch as the
+    heartbeat, so RTT is measured on the same connection messages use.
+    """
+
+    RTT_ALPHA = 0.2  # Weight of the newest sample in the RTT moving average
+
+    def __init__(
+        self,
+        network: 'MeshNetwork',
+        peer: PeerConnection,
+        queue_size: int,
+        batch_size: int,
+        flush_interval: float,
+        heartbeat_interval: float
+    ):
+        self.network = network
+        self.peer = peer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.batch_supported = True  # Cleared if the peer predates /mesh/receive_batch
+        self.rtt_ms: Optional[float] = None
+        self.last_ack: float = time.monotonic()
+        self.consecutive_failures = 0
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: list = []  # (message, future) pairs of the batch being sent
+        self._stats = {
+            'batches_sent': 0,
+            'messages_sent': 0,
+            'heartbeats_sent': 0,
+            'send_failures': 0,
+            'enqueue_timeouts': 0,
+            'max_queue_depth': 0
+        }
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.peer.address}/api/v1/distributed/mesh"
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._writer())
+
+    async def close(self):
+        """Stop the writer and fail anything still queued."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        pending = self._inflight
+        self._inflight = []
+        while not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_result(False)
+
+    async def send(self, message: Dict[str, Any], timeout: float) -> bool:
+        """
+        Queue a message and wait until the peer has acknowledged the batch
+        carrying it. Waits for queue space first (backpressure); gives up
+        after `timeout` seconds in total.
+        """
+        future = asyncio.get_running_loop().create_future()
+        deadline = time.monotonic() + timeout
+        try:
+            await asyncio.wait_for(self.queue.put((message, future)), timeout)
+        except asyncio.TimeoutError:
+            self._stats['enqueue_timeouts'] += 1
+            return False
+
+        depth = self.queue.qsize()
+        if depth > self._stats['max_queue_depth']:
+            self._stats['max_queue_depth'] = depth
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(future), max(0.0, deadline - time.monotonic())
+            )
+        except asyncio.TimeoutError:
+            return False
+
+    async def _writer(self):
+        while True:
+            try:
+                first = await asyncio.wait_for(self.queue.get(), self.heartbeat_interval)
+            except asyncio.TimeoutError:
+                await self._heartbeat()
+                continue
+
+            # Give concurrent senders a moment to join this batch
+            if self.flush_interval and self.queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.flush_interval)
+
+            batch = self._inflight = [first]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            ok = await self._post_batch([message for message, _ in batch])
+            self._inflight = []
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(ok)
+
+    async def _post_batch(self, messages: List[Dict[str, Any]]) -> bool:
+        session = await self.network._get_session()
+        started = time.monotonic()
+        try:
+            if self.batch_supported:
+                async with session.post(
+                    f"{self.url}/receive_batch",
+                    json={'source_id': self.network.instance_id, 'messages': messages}
+                ) as response:
+                    if response.status == 404:
+                        self.batch_supported = False
+                        logger.info(f"Peer {self.peer.peer_name} has no batch endpoint, sending singly")
+                    else:
+                        ok = response.status == 200
+                        if ok:
+                            await response.read()
+            if not self.batch_supported:
+                if messages:
+                    ok = True
+                    for message in messages:
+                        async with session.post(f"{self.url}/receive", json=message) as response:
+                            ok = response.status == 200 and ok
+                            await response.read()
+                else:
+                    # Heartbeat to a peer without the batch endpoint: ping it
+                    ok = await self.network._send_ping(self.peer.address)
+        except Exception as e:
+            logger.debug(f"Transmit failed to {self.peer.address}: {e}")
+            ok = False
+
+        self._record(ok, time.monotonic() - started)
+        if ok:
+            self._stats['batches_sent'] += 1 if messages else 0
+            self._stats['messages_sent'] += len(messages)
+        return ok
+
+    async def _heartbeat(self):
+        self._stats['heartbeats_sent'] += 1
+        await self._post_batch([])
+
+    def _record(self, ok: bool, elapsed: float):
+        if ok:
+            sample = elapsed * 1000
+            self.rtt_ms = sample if self.rtt_ms is None else (
+                self.RTT_ALPHA * sample + (1 - self.RTT_ALPHA) * self.rtt_ms
+            )
+            self.peer.latency_ms = round(self.rtt_ms, 2)
+            self.peer.last_activity = datetime.utcnow()
+            self.last_ack = time.monotonic()
+            self.consecutive_failures = 0
+        else:
+            self.consecutive_failures += 1
+            self._stats['send_failures'] += 1
+            self.peer.errors += 1
+
+    def is_dead(self) -> bool:
+        """Heartbeats keep failing or nothing has been acknowledged for a while."""
+        silence = time.monotonic() - self.last_ack
+        return self.consecutive_failures >= 3 or silence > self.heartbeat_interval * 3
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'rtt_ms': round(self.rtt_ms, 2) if self.rtt_ms is not None else None,
+            'queue_depth': self.queue.qsize(),
+            'queue_capacity': self.queue.maxsize,
+            'batch_endpoint': self.batch_supported,
+            'consecutive_failures': self.consecutive_failures,
+            **self._stats
+        }
+
+
 class MeshNetwork:
     """
     Peer-to-peer mesh network for Darwin instances.
@@ -130,7 +317,12 @@ class MeshNetwork:
         instance_name: str,
         host: str = "0.0.0.0",
         port: int = 8001,
-        data_path: str = "./data/distributed/mesh"
+        data_path: str = "./data/distributed/mesh",
+        queue_size: int = 500,
+        batch_size: int = 50,
+        flush_interval_ms: float = 10.0,
+        heartbeat_seconds: float = 15.0,
+        send_timeout_seconds: float = 10.0
     ):
         """
         Initialize the mesh network.
@@ -141,6 +333,11 @@ class MeshNetwork:
             host: Host to listen on
             port: Port for mesh communication
             data_path: Path for persistent storage
+            queue_size: Outbound messages queued per peer before senders wait
+            batch_size: Most messages sent to a peer in one request
+            flush_interval_ms: How long a link waits for more messages to batch
+            heartbeat_seconds: Idle time after which a link sends a heartbeat
+            send_timeout_seconds: How long a send may wait for queue space and delivery
         """
         self.instance_id = instance_id
         self.instance_name = instance_name
@@ -149,8 +346,18 @@ class MeshNetwork:
         self.data_path = Path(data_path)
         self.data_path.mkdir(parents=True, exist_ok=True)
 
-        # Peer connections
+        # Peer connections and their outbound links
         self._peers: Dict[str, PeerConnection] = {}
+        self._links: Dict[str, PeerLink] = {}
+        self._link_options = {
+            'queue_size': queue_size,
+            'batch_size': batch_size,
+            'flush_interval': flush_interval_ms / 1000,
+            'heartbeat_interval': heartbeat_seconds
+        }
+        self.heartbeat_seconds = heartbeat_seconds
+        self.send_timeout = send_timeout_seconds
+        self._session = None  # Shared keep-alive aiohttp session, created on first use
 
         # Message handlers
         self._handlers: Dict[MessageType, List[Callable[[MeshMessage], Awaitable[None]]]] = {
@@ -205,8 +412,36 @@ class MeshNetwork:
         for peer_id in list(self._peers.keys()):
             await self.disconnect_peer(peer_id)
 
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
         logger.info("MeshNetwork stopped")
 
+    async def _get_session(self):
+        """The keep-alive HTTP session every peer link shares."""
+        if self._session is None or self._session.closed:
+            import aiohttp
+
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.send_timeout),
+                connector=aiohttp.TCPConnector(limit_per_host=4, keepalive_timeout=max(60, self.heartbeat_seconds * 3))
+            )
+        return self._session
+
+    def _open_link(self, peer: PeerConnection) -> PeerLink:
+        link = self._links.get(peer.peer_id)
+        if link is None or link.peer is not peer:
+            link = PeerLink(self, peer, **self._link_options)
+            self._links[peer.peer_id] = link
+        link.start()
+        return link
+
+    async def _close_link(self, peer_id: str):
+        link = self._links.pop(peer_id, None)
+        if link:
+            await link.close()
+
     async def connect_peer(self, peer_id: str, peer_name: str, address: str) -> bool:
         """
         Connect to a peer.
@@ -242,6 +477,7 @@ class MeshNetwork:
                 connection.state = ConnectionState.CONNECTED
                 connection.connected_at = datetime.utcnow()
                 connection.latency_ms = latency
+                self._open_link(connection)
 
                 logger.info(f"Connected to peer: {peer_name} ({address}) - {latency:.1f}ms")
 
@@ -263,6 +499,7 @@ class MeshNetwork:
 
     async def disconnect_peer(self, peer_id: str):
         """Disconnect from a peer"""
+        await self._close_link(peer_id)
         if peer_id in self._peers:
             peer = self._peers[peer_id]
             peer.state = ConnectionState.DISCONNECTED
@@ -273,10 +510,13 @@ class MeshNetwork:
         try:
             import aiohttp
 
+            session = await self._get_session()
             url = f"http://{address}/api/v1/distributed/mesh/ping"
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
-                async with session.post(url, json={'source_id': self.instance_id}) as response:
-                    return response.status == 200
+            async with session.post(
+                url, json={'source_id': self.instance_id}, timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                await response.read()
+                return response.status == 200
 
         except Exception as e:
             logger.debug(f"Ping failed to {address}: {e}")
@@ -347,7 +587,7 @@ class MeshNetwork:
         if target_id in self._peers:
             peer = self._peers[target_id]
             if peer.state == ConnectionState.CONNECTED:
-                success = await self._transmit(peer.address, message)
+                success = await self._transmit(peer, message)
                 if success:
                     peer.messages_sent += 1
                     self._stats['messages_sent'] += 1
@@ -369,7 +609,7 @@ class MeshNetwork:
                         hop_count=message.hop_count,
                         path=message.path.copy()
                     )
-                    success = await self._transmit(peer.address, relay_message)
+                    success = await self._transmit(peer, relay_message)
                     if success:
                         self._stats['messages_relayed'] += 1
                         return True
@@ -378,13 +618,20 @@ class MeshNetwork:
 
     async def _broadcast(self, message: MeshMessage) -> bool:
         """Broadcast a message to all connected peers"""
-        success = False
+        targets = [
+            peer for peer_id, peer in self._peers.items()
+            if peer.state == ConnectionState.CONNECTED and peer_id not in message.path
+        ]
+        if not targets:
+            return False
 
-        for peer_id, peer in self._peers.items():
-            if peer.state == ConnectionState.CONNECTED and peer_id not in message.path:
-                if await self._transmit(peer.address, message):
-                    peer.messages_sent += 1
-                    success = True
+        # Fan out concurrently; each peer's link batches and sends independently
+        results = await asyncio.gather(*(self._transmit(peer, message) for peer in targets))
+        success = False
+        for peer, sent in zip(targets, results):
+            if sent:
+                peer.messages_sent += 1
+                success = True
 
         if success:
             self._stats['broadcasts_sent'] += 1
@@ -392,19 +639,10 @@ class MeshNetwork:
 
         return success
 
-    async def _transmit(self, address: str, message: MeshMessage) -> bool:
-        """Transmit a message to an address"""
-        try:
-            import aiohttp
-
-            url = f"http://{address}/api/v1/distributed/mesh/receive"
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-                async with session.post(url, json=message.to_dict()) as response:
-                    return response.status == 200
-
-        except Exception as e:
-            logger.debug(f"Transmit failed to {address}: {e}")
-            return False
+    async def _transmit(self, peer: PeerConnection, message: MeshMessage) -> bool:
+        """Queue a message on the peer's link and wait for it to be delivered"""
+        link = self._links.get(peer.peer_id) or self._open_link(peer)
+        return await link.send(message.to_dict(), self.send_timeout)
 
     async def receive_message(self, message_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -456,6 +694,22 @@ class MeshNetwork:
             logger.error(f"Error receiving message: {e}")
             return {'status': 'error', 'error': str(e)}
 
+    async def receive_batch(self, source_id: Optional[str], messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Handle a batch from a peer link. Messages are processed in order; an
+        empty batch is a heartbeat.
+        """
+        peer = self._peers.get(source_id) if source_id else None
+        if peer:
+            peer.last_activity = datetime.utcnow()
+
+        results = [await self.receive_message(data) for data in messages]
+        return {
+            'status': 'received',
+            'instance_id': self.instance_id,
+            'results': results
+        }
+
     async def _handle_relay(self, message: MeshMessage) -> Dict[str, Any]:
         """Handle a relay message"""
         original_data = message.payload.get('original_message')
@@ -495,19 +749,19 @@ class MeshNetwork:
         """Periodic maintenance tasks"""
         while self._running:
             try:
-                # Ping connected peers to check health
+                # Links heartbeat themselves when idle; drop the ones that stopped answering
                 for peer_id, peer in list(self._peers.items()):
-                    if peer.state == ConnectionState.CONNECTED:
-                        # Check last activity
-                        inactive_seconds = (datetime.utcnow() - peer.last_activity).total_seconds()
-                        if inactive_seconds > 30:
-                            # Send ping
-                            success = await self._send_ping(peer.address)
-                            if not success:
-                                peer.state = ConnectionState.DISCONNECTED
-                                logger.warning(f"Lost connection to peer: {peer.peer_name}")
-
-                await asyncio.sleep(15)
+                    if peer.state != ConnectionState.CONNECTED:
+                        continue
+                    link = self._links.get(peer_id)
+                    if link is None:
+                        self._open_link(peer)
+                    elif link.is_dead():
+                        await self._close_link(peer_id)
+                        peer.state = ConnectionState.DISCONNECTED
+                        logger.warning(f"Lost connection to peer: {peer.peer_name}")
+
+                await asyncio.sleep(self.heartbeat_seconds)
 
             except asyncio.CancelledError:
                 break
@@ -533,7 +787,10 @@ class MeshNetwork:
             'port': self.port,
             'total_peers': len(self._peers),
             'connected_peers': len(self.get_connected_peers()),
-            'peers': [p.to_dict() for p in self._peers.values()],
+            'peers': [
+                {**p.to_dict(), 'link': self._links[p.peer_id].get_stats() if p.peer_id in self._links else None}
+                for p in self._peers.values()
+            ],
             'statistics': self._stats,
             'seen_messages': len(self._seen_messages)
         }
@@ -7,6 +7,8 @@ This module organizes Darwin's startup into logical phases:
 - Phase 3: Agents, dreams, poetry, curiosity
 - Phase 4: Advanced learning, experimentation, tools
 - Consciousness: Main consciousness engine
+
+Independent services are started concurrently by a ServiceContainer.
 """
 
 from initialization.phase1 import init_core_services, init_health_tracking
@@ -14,6 +16,7 @@ from initialization.phase2 import init_phase2_services
 from initialization.phase3 import init_phase3_services
 from initialization.phase4 import init_phase4_services
 from initialization.consciousness import init_consciousness_engine
+from initialization.container import ServiceContainer
 
 __all__ = [
     'init_core_services',
@@ -21,5 +24,6 @@ __all__ = [
     'init_phase2_services',
     'init_phase3_services',
     'init_phase4_services',
-    'init_consciousness_engine'
+    'init_consciousness_engine',
+    'ServiceContainer'
 ]
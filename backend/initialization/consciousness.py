@@ -413,7 +413,7 @@ async def init_consciousness_engine(
         # Start Proactive Engine for autonomous actions (Moltbook, exploration, etc.)
         # Integrate with mood system for mood-aware action selection
         from consciousness.proactive_engine import get_proactive_engine, init_proactive_engine_with_mood
-        from consciousness.proactive_engine import ProactiveAction, ActionCategory, ActionPriority
+        from consciousness.proactive_engine import ProactiveAction, ActionCategory, ActionPriority, ResourceClass
         proactive_engine = init_proactive_engine_with_mood(services['mood_system'])
         services['proactive_engine'] = proactive_engine
 
@@ -466,7 +466,14 @@ async def init_consciousness_engine(
 
         create_safe_task(proactive_engine.run_proactive_loop(
             interval_seconds=120,  # Check every 2 minutes
-            max_actions_per_hour=30  # Increased for more activity
+            max_actions_per_hour=30,  # Increased for more activity
+            concurrent=settings.proactive_concurrent,
+            class_limits={
+                ResourceClass.LLM: settings.proactive_llm_slots,
+                ResourceClass.NETWORK: settings.proactive_network_slots,
+                ResourceClass.CPU: settings.proactive_cpu_slots,
+                ResourceClass.LOCAL: settings.proactive_local_slots,
+            }
         ), name="proactive_loop")
         logger.info("Proactive Engine started (interval: 2min, mood-action integration active)")
 
@@ -0,0 +1,205 @@
+"""
+Service Container - Dependency-ordered, concurrent service startup
+
+Services are registered with a factory and the names of the services it
+needs. start() builds every eager service as soon as its dependencies are
+ready, so independent services initialize concurrently:
+
+- async factories run on the event loop
+- sync factories run in a worker thread (in_thread=False keeps them on the
+  loop, for constructors that schedule tasks)
+
+A factory receives its dependencies as keyword arguments. A factory that
+raises leaves its service as None - the same contract as the phase init
+functions - and dependants decide what to do without it.
+
+Every build (and every sequential startup step wrapped in step()) is timed
+for the startup report.
+"""
+
+import asyncio
+import inspect
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class ServiceSpec:
+    """How to build one service"""
+    name: str
+    factory: Callable[..., Any]
+    depends_on: Tuple[str, ...] = ()
+    in_thread: bool = True
+
+
+@dataclass
+class ServiceTiming:
+    """When one service (or startup step) was built and how long it took"""
+    name: str
+    started_at: float  # Seconds since the container started
+    seconds: float
+    status: str  # ok, failed, unavailable
+    kind: str = "service"  # service, step
+    depends_on: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+class ServiceContainer:
+    """Registry of service factories with concurrent, dependency-ordered startup"""
+
+    def __init__(self):
+        self.specs: Dict[str, ServiceSpec] = {}
+        self.instances: Dict[str, Any] = {}
+        self.timings: Dict[str, ServiceTiming] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._t0 = time.perf_counter()
+        self._started_at = datetime.now().isoformat()
+        self._ready_seconds: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def register(
+        self,
+        name: str,
+        factory: Callable[..., Any],
+        depends_on: Sequence[str] = (),
+        in_thread: bool = True
+    ):
+        """Declare a service; nothing is built until start()"""
+        if name in self.specs or name in self.instances:
+            raise ValueError(f"Service already registered: {name}")
+        self.specs[name] = ServiceSpec(name, factory, tuple(depends_on), in_thread)
+
+    def provide(self, name: str, instance: Any):
+        """Add an already-built service (available as a dependency)"""
+        self.instances[name] = instance
+
+    def _check_graph(self):
+        """Fail fast on unknown dependencies and cycles"""
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str, path: List[str]):
+            if name in self.instances and name not in self.specs:
+                return
+            if name not in self.specs:
+                raise ValueError(f"Unknown service dependency: {' -> '.join(path + [name])}")
+            if state.get(name) == 1:
+                raise ValueError(f"Service dependency cycle: {' -> '.join(path + [name])}")
+            if state.get(name) == 2:
+                return
+            state[name] = 1
+            for dep in self.specs[name].depends_on:
+                visit(dep, path + [name])
+            state[name] = 2
+
+        for name in self.specs:
+            visit(name, [])
+
+    # ------------------------------------------------------------------
+    # Startup
+    # ------------------------------------------------------------------
+
+    async def start(self) -> Dict[str, Any]:
+        """Build every registered service, concurrently where dependencies allow"""
+        self._check_graph()
+        await asyncio.gather(*(self._task(name) for name in self.specs))
+        return {name: self.instances.get(name) for name in self.specs}
+
+    def _task(self, name: str) -> "asyncio.Future":
+        if name in self.instances:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(self.instances[name])
+            return future
+        if name not in self._tasks:
+            self._tasks[name] = asyncio.ensure_future(self._build(name))
+        return self._tasks[name]
+
+    async def _build(self, name: str) -> Any:
+        spec = self.specs[name]
+        values = await asyncio.gather(*(self._task(dep) for dep in spec.depends_on))
+        kwargs = dict(zip(spec.depends_on, values))
+
+        instance = None
+        with self._timed(name, "service", spec.depends_on) as timing:
+            if inspect.iscoroutinefunction(spec.factory):
+                instance = await spec.factory(**kwargs)
+            elif spec.in_thread:
+                instance = await asyncio.to_thread(spec.factory, **kwargs)
+            else:
+                instance = spec.factory(**kwargs)
+            timing.status = "ok" if instance is not None else "unavailable"
+
+        return self.instances.setdefault(name, instance)
+
+    # ------------------------------------------------------------------
+    # Timing
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _timed(self, name: str, kind: str, depends_on: Sequence[str] = (), reraise: bool = False):
+        timing = ServiceTiming(
+            name=name,
+            started_at=round(time.perf_counter() - self._t0, 4),
+            seconds=0.0,
+            status="ok",
+            kind=kind,
+            depends_on=list(depends_on)
+        )
+        start = time.perf_counter()
+        try:
+            yield timing
+        except Exception as e:
+            timing.status = "failed"
+            timing.error = str(e)
+            logger.error(f"Failed to initialize {name}: {e}")
+            if reraise:
+                raise
+        finally:
+            timing.seconds = round(time.perf_counter() - start, 4)
+            self.timings[name] = timing
+
+    @contextmanager
+    def step(self, name: str):
+        """Time a sequential startup step that isn't a registered service (errors propagate)"""
+        with self._timed(name, "step", reraise=True) as timing:
+            yield timing
+
+    def mark_ready(self):
+        """Record the end of startup"""
+        self._ready_seconds = round(time.perf_counter() - self._t0, 4)
+
+    def get_startup_report(self) -> Dict[str, Any]:
+        """Per-service timings, slowest first, with the time saved by concurrency"""
+        timings = sorted(self.timings.values(), key=lambda t: t.started_at)
+        built = [t for t in timings if t.kind == "service"]
+        graph_wall = (
+            max(t.started_at + t.seconds for t in built) - min(t.started_at for t in built)
+            if built else 0.0
+        )
+        graph_sum = sum(t.seconds for t in built)
+        return {
+            "started_at": self._started_at,
+            "ready": self._ready_seconds is not None,
+            "total_seconds": self._ready_seconds,
+            "concurrent_services": {
+                "count": len(built),
+                "wall_seconds": round(graph_wall, 4),
+                "sequential_seconds": round(graph_sum, 4),
+                "saved_seconds": round(max(0.0, graph_sum - graph_wall), 4),
+            },
+            "slowest": [
+                {"name": t.name, "seconds": t.seconds}
+                for t in sorted(timings, key=lambda t: -t.seconds)[:5]
+            ],
+            "failed": [t.name for t in timings if t.status == "failed"],
+            "services": [asdict(t) for t in timings],
+        }
@@ -17,6 +17,54 @@ from utils.logger import setup_logger
 logger = setup_logger(__name__)
 
 
+def register_semantic_memory_sync(sync, semantic_memory) -> None:
+    """
+    Let memory sync read and write semantic memory, and keep its index current.
+
+    Every local store or delete (including ones applied from a peer) updates
+    the sync tree immediately, so syncs don't wait for the periodic get_all()
+    reindex to see local changes.
+    """
+    from distributed.memory_sync import MemoryType
+
+    async def get_all_memories():
+        try:
+            return await semantic_memory.get_all()
+        except Exception as e:
+            logger.error(f"Failed to list semantic memories: {e}")
+            return []
+
+    async def get_memory_by_id(memory_id):
+        try:
+            return await semantic_memory.get(memory_id)
+        except Exception:
+            return None
+
+    async def save_memory(content, memory_id):
+        try:
+            await semantic_memory.store(content, memory_id)
+        except Exception as e:
+            logger.error(f"Failed to save synced memory {memory_id}: {e}")
+
+    async def delete_memory(memory_id):
+        try:
+            await semantic_memory.delete(memory_id)
+        except Exception as e:
+            logger.error(f"Failed to delete synced memory {memory_id}: {e}")
+
+    sync.register_memory_handler(
+        MemoryType.SEMANTIC,
+        get_all=get_all_memories,
+        get_by_id=get_memory_by_id,
+        save=save_memory,
+        delete=delete_memory
+    )
+    semantic_memory.add_change_listener(
+        lambda record: sync.note_local_change(MemoryType.SEMANTIC, record),
+        lambda memory_id: sync.note_local_delete(MemoryType.SEMANTIC, memory_id)
+    )
+
+
 async def init_distributed_services(settings, phase2: Dict[str, Any] = None) -> Dict[str, Any]:
     """
     Initialize distributed consciousness services.
@@ -100,37 +148,7 @@ async def init_distributed_services(settings, phase2: Dict[str, Any] = None) ->
 
             # Register memory handlers if semantic memory available
             if phase2 and phase2.get('semantic_memory'):
-                semantic_memory = phase2['semantic_memory']
-
-                # Register handlers for different memory types
-                from distributed.memory_sync import MemoryType
-
-                # These would need to be implemented based on your memory storage
-                # For now, we'll use placeholder handlers
-                async def get_all_memories():
-                    try:
-                        return await semantic_memory.get_all()
-                    except:
-                        return []
-
-                async def get_memory_by_id(memory_id):
-                    try:
-                        return await semantic_memory.get(memory_id)
-                    except:
-                        return None
-
-                async def save_memory(content, memory_id):
-                    try:
-                        await semantic_memory.store(content, memory_id)
-                    except:
-                        pass
-
-                sync.register_memory_handler(
-                    MemoryType.SEMANTIC,
-                    get_all=get_all_memories,
-                    get_by_id=get_memory_by_id,
-                    save=save_memory
-                )
+                register_semantic_memory_sync(sync, phase2['semantic_memory'])
 
             services['memory_sync'] = sync
             logger.info("Memory Sync Protocol initialized")
@@ -146,7 +164,12 @@ async def init_distributed_services(settings, phase2: Dict[str, Any] = None) ->
             mesh = MeshNetwork(
                 instance_id=services['instance_registry'].instance_id,
                 instance_name=services['instance_registry'].instance_name,
-                port=port + 1  # Use different port for mesh
+                port=port + 1,  # Use different port for mesh
+                queue_size=getattr(settings, 'mesh_queue_size', 500),
+                batch_size=getattr(settings, 'mesh_batch_size', 50),
+                flush_interval_ms=getattr(settings, 'mesh_flush_interval_ms', 10.0),
+                heartbeat_seconds=getattr(settings, 'mesh_heartbeat_seconds', 15.0),
+                send_timeout_seconds=getattr(settings, 'mesh_send_timeout_seconds', 10.0)
             )
 
             await mesh.start()
@@ -43,6 +43,37 @@ def init_health_tracking() -> Tuple[Any, Dict[str, Any]]:
     return health_tracker, crash_info
 
 
+def init_memory_store(semantic_memory: Optional[Any] = None) -> MemoryStore:
+    """
+    Execution history store.
+
+    Its vector search uses the given SemanticMemory, so it is built after
+    Phase 2's semantic memory when started from the container. Without one
+    it falls back to the process-wide instance.
+    """
+    return MemoryStore(
+        settings.database_url.replace('sqlite:///', ''),
+        semantic_memory=semantic_memory
+    )
+
+
+def init_executor() -> SafeExecutor:
+    """Sandboxed code executor"""
+    return SafeExecutor(
+        timeout=settings.execution_timeout,
+        max_memory_mb=settings.max_memory_mb,
+        allowed_modules=settings.allowed_modules,
+        pool_size=settings.executor_pool_size
+    )
+
+
+def register_core_services(container) -> None:
+    """Declare core services and their dependencies on a ServiceContainer."""
+    container.provide('settings', settings)
+    container.register('memory_store', init_memory_store, depends_on=['semantic_memory'])
+    container.register('executor', init_executor)
+
+
 def init_core_services() -> Dict[str, Any]:
     """
     Initialize core services.
@@ -52,13 +83,8 @@ def init_core_services() -> Dict[str, Any]:
     """
     logger.info("Initializing core services...")
 
-    memory_store = MemoryStore(settings.database_url.replace('sqlite:///', ''))
-
-    executor = SafeExecutor(
-        timeout=settings.execution_timeout,
-        max_memory_mb=settings.max_memory_mb,
-        allowed_modules=settings.allowed_modules
-    )
+    memory_store = init_memory_store()
+    executor = init_executor()
 
     logger.info("Core services initialized")
 
@@ -139,7 +165,10 @@ def init_evolution_and_metrics(
         nucleus,
         executor,
         memory_store,
-        meta_learner=meta_learner
+        meta_learner=meta_learner,
+        concurrent=settings.evolution_concurrent,
+        max_generations_per_model=settings.evolution_max_per_model,
+        max_parallel_evaluations=settings.evolution_parallel_evaluations
     )
 
     metrics_service = MetricsService(memory_store)
@@ -7,120 +7,193 @@ Initializes:
 - Web researcher
 - Meta-learner
 - Hierarchical memory
+
+Each service has its own factory, so the startup container can build
+independent services concurrently; init_phase2_services() runs them in order.
 """
 
 from typing import Dict, Any, Optional
 
 from config import get_settings
 from utils.logger import setup_logger
-from app.lifespan import set_service
 
 logger = setup_logger(__name__)
 settings = get_settings()
 
 
-async def init_phase2_services(core: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Initialize Phase 2 services.
-
-    Args:
-        core: Core services dict from Phase 1
-
-    Returns:
-        Dict with phase 2 service instances
-    """
-    services = {
-        'semantic_memory': None,
-        'multi_model_router': None,
-        'web_researcher': None,
-        'meta_learner': None,
-        'hierarchical_memory': None
-    }
+def init_semantic_memory(embedding_service: Optional[Any] = None) -> Optional[Any]:
+    """Semantic Memory (ChromaDB), installed as the process-wide instance"""
+    if not settings.enable_semantic_memory:
+        return None
+    try:
+        from core.semantic_memory import configure_semantic_memory
+        semantic_memory = configure_semantic_memory(
+            persist_directory=settings.chroma_persist_directory,
+            embedding_service=embedding_service
+        )
+        logger.info("Semantic Memory initialized")
+        return semantic_memory
+    except Exception as e:
+        logger.error(f"Failed to initialize Semantic Memory: {e}")
+        return None
 
-    # Semantic Memory
-    if settings.enable_semantic_memory:
-        try:
-            from core.semantic_memory import SemanticMemory
-            services['semantic_memory'] = SemanticMemory(
-                persist_directory=settings.chroma_persist_directory
-            )
-            logger.info("Semantic Memory initialized")
-        except Exception as e:
-            logger.error(f"Failed to initialize Semantic Memory: {e}")
 
-    # Hierarchical Memory (3-layer system)
+def init_hierarchical_memory(semantic_memory: Optional[Any] = None) -> Optional[Any]:
+    """Hierarchical Memory (3-layer system) on top of the shared Semantic Memory"""
     try:
         from core.hierarchical_memory import HierarchicalMemory
-        services['hierarchical_memory'] = HierarchicalMemory(
-            storage_path="./data/memory"
+        hierarchical_memory = HierarchicalMemory(
+            storage_path="./data/memory",
+            vector_memory=semantic_memory
         )
-        set_service('hierarchical_memory', services['hierarchical_memory'])
         logger.info("Hierarchical Memory initialized (Working, Episodic, Semantic)")
+        return hierarchical_memory
     except Exception as e:
         logger.error(f"Failed to initialize Hierarchical Memory: {e}")
         import traceback
         logger.error(traceback.format_exc())
+        return None
+
 
-    # Multi-Model Router
-    if settings.enable_multi_model:
-        try:
-            from ai.multi_model_router import MultiModelRouter
-
-            router_config = {"routing_strategy": settings.routing_strategy}
-
-            if settings.claude_api_key:
-                router_config["claude_api_key"] = settings.claude_api_key
-                if settings.claude_model:
-                    router_config["claude_model"] = settings.claude_model
-
-            if settings.gemini_api_key:
-                router_config["gemini_api_key"] = settings.gemini_api_key
-                if settings.gemini_model:
-                    router_config["gemini_model"] = settings.gemini_model
-
-            if settings.openai_api_key:
-                router_config["openai_api_key"] = settings.openai_api_key
-                if settings.openai_model:
-                    router_config["openai_model"] = settings.openai_model
-
-            # Ollama (Local LLM - FREE!)
-            router_config["ollama_enabled"] = settings.ollama_enabled
-            router_config["ollama_url"] = settings.ollama_url
-            router_config["ollama_model"] = settings.ollama_model
-            router_config["ollama_code_model"] = settings.ollama_code_model
-            router_config["ollama_reasoning_model"] = settings.ollama_reasoning_model
-
-            services['multi_model_router'] = MultiModelRouter(router_config)
-            logger.info(f"Multi-Model Router initialized ({settings.routing_strategy} strategy)")
-        except Exception as e:
-            logger.error(f"Failed to initialize Multi-Model Router: {e}")
-
-    # Web Researcher
-    if settings.enable_web_research:
-        try:
-            from research.web_researcher import WebResearcher
-
-            researcher_config = {
-                "serpapi_api_key": settings.serpapi_api_key,
-                "github_token": settings.github_token
-            }
-            services['web_researcher'] = WebResearcher(researcher_config)
-            logger.info("Web Researcher initialized")
-        except Exception as e:
-            logger.error(f"Failed to initialize Web Researcher: {e}")
-
-    # Meta-Learner
-    if (settings.enable_meta_learning and
-        services['semantic_memory'] and
-        services['multi_model_router']):
-        try:
-            from meta.meta_learner import MetaLearner
-            services['meta_learner'] = MetaLearner(
-                services['semantic_memory'],
-                services['multi_model_router']
+async def init_multi_model_router(semantic_memory: Optional[Any] = None) -> Optional[Any]:
+    """Multi-Model Router (async: its stats flusher needs the running loop)"""
+    if not settings.enable_multi_model:
+        return None
+    try:
+        from ai.multi_model_router import MultiModelRouter
+
+        router_config = {
+            "routing_strategy": settings.routing_strategy,
+            "analysis_timeout": settings.analysis_timeout_seconds,
+            "analysis_quorum": settings.analysis_quorum,
+            "analysis_cache_size": settings.analysis_cache_size,
+            "analysis_cache_ttl": settings.analysis_cache_ttl_seconds,
+            "stats_flush_interval": settings.router_stats_flush_seconds,
+            "hedging_enabled": settings.router_hedging_enabled,
+            "hedge_after_ms": settings.router_hedge_after_ms,
+            "max_concurrent_per_model": settings.router_max_concurrent_per_model or (
+                settings.evolution_max_per_model if settings.evolution_concurrent else 0
+            ),
+            "circuit_failure_threshold": settings.circuit_failure_threshold,
+            "circuit_cooldown_seconds": settings.circuit_cooldown_seconds,
+            "response_cache_enabled": settings.response_cache_enabled,
+            "response_cache_max_entries": settings.response_cache_max_entries,
+            "response_cache_similarity": settings.response_cache_similarity
+        }
+
+        if settings.claude_api_key:
+            router_config["claude_api_key"] = settings.claude_api_key
+            if settings.claude_model:
+                router_config["claude_model"] = settings.claude_model
+
+        if settings.gemini_api_key:
+            router_config["gemini_api_key"] = settings.gemini_api_key
+            if settings.gemini_model:
+                router_config["gemini_model"] = settings.gemini_model
+
+        if settings.openai_api_key:
+            router_config["openai_api_key"] = settings.openai_api_key
+            if settings.openai_model:
+                router_config["openai_model"] = settings.openai_model
+
+        # Ollama (Local LLM - FREE!)
+        router_config["ollama_enabled"] = settings.ollama_enabled
+        router_config["ollama_url"] = settings.ollama_url
+        router_config["ollama_model"] = settings.ollama_model
+        router_config["ollama_code_model"] = settings.ollama_code_model
+        router_config["ollama_reasoning_model"] = settings.ollama_reasoning_model
+
+        multi_model_router = MultiModelRouter(router_config)
+        multi_model_router.stats.start()
+
+        # Semantic tier of the response cache reuses the loaded embedding model
+        if semantic_memory and multi_model_router.response_cache:
+            multi_model_router.response_cache.set_embedder(
+                semantic_memory.embeddings.encode_sync
             )
-            logger.info("Meta-Learner initialized")
-        except Exception as e:
-            logger.error(f"Failed to initialize Meta-Learner: {e}")
+        logger.info(f"Multi-Model Router initialized ({settings.routing_strategy} strategy)")
+        return multi_model_router
+    except Exception as e:
+        logger.error(f"Failed to initialize Multi-Model Router: {e}")
+        return None
+
+
+def init_web_researcher() -> Optional[Any]:
+    """Web Researcher"""
+    if not settings.enable_web_research:
+        return None
+    try:
+        from research.web_researcher import WebResearcher
+
+        researcher_config = {
+            "serpapi_api_key": settings.serpapi_api_key,
+            "github_token": settings.github_token,
+            "deadline_seconds": settings.research_deadline_seconds,
+            "host_rate": settings.research_host_rate,
+            "host_burst": settings.research_host_burst,
+            "cache_ttl_seconds": settings.research_cache_ttl_seconds
+        }
+        web_researcher = WebResearcher(researcher_config)
+        logger.info("Web Researcher initialized")
+        return web_researcher
+    except Exception as e:
+        logger.error(f"Failed to initialize Web Researcher: {e}")
+        return None
+
+
+def init_meta_learner(
+    semantic_memory: Optional[Any] = None,
+    multi_model_router: Optional[Any] = None
+) -> Optional[Any]:
+    """Meta-Learner (needs both Semantic Memory and the router)"""
+    if not (settings.enable_meta_learning and semantic_memory and multi_model_router):
+        return None
+    try:
+        from meta.meta_learner import MetaLearner
+        meta_learner = MetaLearner(semantic_memory, multi_model_router)
+        logger.info("Meta-Learner initialized")
+        return meta_learner
+    except Exception as e:
+        logger.error(f"Failed to initialize Meta-Learner: {e}")
+        return None
+
+
+def register_phase2_services(container) -> None:
+    """
+    Declare Phase 2 services and their dependencies on a ServiceContainer.
+
+    Semantic memory needs the 'embedding_service' registered by the caller.
+    Web research starts alongside it; the router, hierarchical memory and
+    the meta-learner wait for what they need.
+    """
+    container.register('semantic_memory', init_semantic_memory,
+                       depends_on=['embedding_service'])
+    container.register('hierarchical_memory', init_hierarchical_memory,
+                       depends_on=['semantic_memory'])
+    container.register('multi_model_router', init_multi_model_router,
+                       depends_on=['semantic_memory'])
+    container.register('web_researcher', init_web_researcher)
+    container.register('meta_learner', init_meta_learner,
+                       depends_on=['semantic_memory', 'multi_model_router'])
+
 
-    return services
+async def init_phase2_services(core: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Initialize Phase 2 services one after another.
+
+    Args:
+        core: Core services dict from Phase 1
+
+    Returns:
+        Dict with phase 2 service instances
+    """
+    semantic_memory = init_semantic_memory()
+    multi_model_router = await init_multi_model_router(semantic_memory)
+
+    return {
+        'semantic_memory': semantic_memory,
+        'multi_model_router': multi_model_router,
+        'web_researcher': init_web_researcher(),
+        'meta_learner': init_meta_learner(semantic_memory, multi_model_router),
+        'hierarchical_memory': init_hierarchical_memory()
+    }
@@ -68,7 +68,10 @@ async def init_phase4_services(phase2: Dict[str, Any], settings) -> Dict[str, An
         explorer_config = {
             'max_depth': 2,
             'max_urls_per_session': 10,
-            'request_timeout': 10
+            'request_timeout': 10,
+            'max_concurrent_fetches': getattr(settings, 'web_explorer_concurrency', 4),
+            'politeness_delay': getattr(settings, 'web_explorer_politeness_seconds', 2.0),
+            'extraction_batch_size': getattr(settings, 'web_explorer_extraction_batch', 4)
         }
         services['web_explorer'] = WebExplorer(
             semantic_memory, multi_model_router, explorer_config
@@ -0,0 +1,170 @@
+"""
+Code Analysis: single-pass AST analysis shared by the validation checks
+
+Parses a source string once, compiles the resulting tree, and collects
+everything CodeValidator's checks need in one ast.walk() traversal.
+Results are cached by source hash, so validating several changes to the
+same file only analyses the original once.
+"""
+import ast
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple, Type
+
+# Functions longer than this (in source lines) are reported
+LONG_FUNCTION_LINES = 50
+
+# Attribute names that suggest shelling out (os.system, os.popen, subprocess.call)
+COMMAND_ATTRIBUTES = {'system', 'popen', 'call'}
+
+_CACHE_SIZE = 256
+
+
+@dataclass
+class CodeAnalysis:
+    """Everything the validator needs to know about one piece of source"""
+    source_hash: str
+    parse_error: Optional[Exception] = None    # ast.parse() failed - nothing else is filled in
+    compile_error: Optional[Exception] = None  # parsed, but compile() rejected the tree
+    # ('import', name) / ('from', module), in walk order
+    imports: List[Tuple[str, str]] = field(default_factory=list)
+    # ('eval_exec', name) / ('import', name) / ('command', attr), in walk order
+    security_findings: List[Tuple[str, str]] = field(default_factory=list)
+    long_functions: List[Tuple[str, int]] = field(default_factory=list)  # (name, lines)
+    complexity: int = 1
+    has_docstrings: bool = False
+    public_functions: Set[str] = field(default_factory=set)
+    classes: Set[str] = field(default_factory=set)
+
+    @property
+    def parsed(self) -> bool:
+        return self.parse_error is None
+
+
+class _Collector:
+    """Per-node handlers, dispatched by node type during one walk"""
+
+    def __init__(self, analysis: CodeAnalysis):
+        self.analysis = analysis
+        self.handlers: Dict[Type[ast.AST], List[Callable[[ast.AST], None]]] = {}
+        self._on(ast.Import, self._import)
+        self._on(ast.ImportFrom, self._import_from)
+        self._on(ast.Call, self._call)
+        self._on(ast.Attribute, self._attribute)
+        self._on(ast.FunctionDef, self._function)
+        self._on(ast.ClassDef, self._class)
+        for branch in (ast.If, ast.While, ast.For, ast.ExceptHandler):
+            self._on(branch, self._branch)
+        self._on(ast.BoolOp, self._bool_op)
+
+    def _on(self, node_type: Type[ast.AST], handler: Callable[[ast.AST], None]):
+        self.handlers.setdefault(node_type, []).append(handler)
+
+    def run(self, tree: ast.AST):
+        handlers = self.handlers
+        for node in ast.walk(tree):
+            for handler in handlers.get(type(node), ()):
+                handler(node)
+
+    def _import(self, node: ast.Import):
+        for alias in node.names:
+            self.analysis.imports.append(('import', alias.name))
+            self.analysis.security_findings.append(('import', alias.name))
+
+    def _import_from(self, node: ast.ImportFrom):
+        if node.module:
+            self.analysis.imports.append(('from', node.module))
+
+    def _call(self, node: ast.Call):
+        if isinstance(node.func, ast.Name) and node.func.id in ('eval', 'exec'):
+            self.analysis.security_findings.append(('eval_exec', node.func.id))
+
+    def _attribute(self, node: ast.Attribute):
+        if node.attr in COMMAND_ATTRIBUTES:
+            self.analysis.security_findings.append(('command', node.attr))
+
+    def _function(self, node: ast.FunctionDef):
+        # ast.unparse() is the length measure, but rendering every function is
+        # the expensive part - only render those whose source span (decorators
+        # included) is already over the limit. unparse output is almost never
+        # longer than the source it came from.
+        first = min([node.lineno] + [d.lineno for d in node.decorator_list])
+        lines = (node.end_lineno or node.lineno) - first + 1
+        if lines > LONG_FUNCTION_LINES:
+            lines = len(ast.unparse(node).splitlines())
+        if lines > LONG_FUNCTION_LINES:
+            self.analysis.long_functions.append((node.name, lines))
+        if not node.name.startswith('_'):
+            self.analysis.public_functions.add(node.name)
+        self._docstring(node)
+
+    def _class(self, node: ast.ClassDef):
+        self.analysis.classes.add(node.name)
+        self._docstring(node)
+
+    def _docstring(self, node: ast.AST):
+        if not self.analysis.has_docstrings and ast.get_docstring(node):
+            self.analysis.has_docstrings = True
+
+    def _branch(self, node: ast.AST):
+        self.analysis.complexity += 1
+
+    def _bool_op(self, node: ast.BoolOp):
+        self.analysis.complexity += len(node.values) - 1
+
+
+_cache: "OrderedDict[str, CodeAnalysis]" = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {'hits': 0, 'misses': 0}
+
+
+def source_hash(code: str) -> str:
+    return hashlib.sha256(code.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def analyze_source(code: str) -> CodeAnalysis:
+    """
+    Analyse a source string, reusing a cached result for identical source.
+
+    The returned object is shared between callers - treat it as read-only.
+    """
+    key = source_hash(code)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            _cache_stats['hits'] += 1
+            return cached
+        _cache_stats['misses'] += 1
+
+    analysis = CodeAnalysis(source_hash=key)
+    try:
+        tree = ast.parse(code)
+    except Exception as e:
+        analysis.parse_error = e
+    else:
+        try:
+            # Catches what parsing alone misses (e.g. 'return' outside a function)
+            compile(tree, '<string>', 'exec')
+        except Exception as e:
+            analysis.compile_error = e
+        _Collector(analysis).run(tree)
+
+    with _cache_lock:
+        _cache[key] = analysis
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return analysis
+
+
+def get_cache_stats() -> Dict[str, int]:
+    with _cache_lock:
+        return {**_cache_stats, 'size': len(_cache)}
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+        _cache_stats['hits'] = _cache_stats['misses'] = 0
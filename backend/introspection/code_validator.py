@@ -2,13 +2,13 @@
 Code Validator: Validates generated code before applying
 Performs syntax checks, import validation, and security scans
 """
-import ast
 import re
 import subprocess
 from typing import Dict, List, Any, Set
 from pathlib import Path
 from dataclasses import dataclass, asdict
 
+from introspection.code_analysis import analyze_source
 from introspection.code_generator import GeneratedCode
 
 
@@ -53,6 +53,16 @@ class CodeValidator:
             'logging': r'logger\.',
         }
 
+        # Modules treated as available (common/expected plus Darwin-specific)
+        self.known_modules = {
+            'os', 'sys', 'json', 'pathlib', 'typing', 'datetime',
+            'fastapi', 'pydantic', 'sqlalchemy', 'redis',
+            'asyncio', 're', 'collections', 'dataclasses',
+            # Darwin-specific
+            'core', 'services', 'agents', 'dream', 'utils',
+            'api', 'introspection', 'poetry', 'curiosity'
+        }
+
     async def validate(self, generated: GeneratedCode) -> ValidationResult:
         """
         Perform comprehensive validation on generated code
@@ -197,248 +207,158 @@ class CodeValidator:
         Validate Python syntax using both ast.parse() and compile()
 
         ast.parse() catches most syntax errors
-        compile() catches additional errors like unterminated f-strings
+        compile() catches additional errors like 'return' outside a function
         """
-        try:
-            # First check: Parse the AST
-            ast.parse(code)
-
-            # Second check: Compile the code
-            # This catches errors that ast.parse() might miss
-            # Like unterminated f-strings, invalid syntax in specific contexts, etc.
-            compile(code, '<string>', 'exec')
-
+        analysis = analyze_source(code)
+        error = analysis.parse_error or analysis.compile_error
+        if error is None:
             return {'valid': True}
-        except SyntaxError as e:
+        if isinstance(error, SyntaxError):
             return {
                 'valid': False,
-                'error': f'Line {e.lineno}: {e.msg}'
-            }
-        except Exception as e:
-            return {
-                'valid': False,
-                'error': str(e)
+                'error': f'Line {error.lineno}: {error.msg}'
             }
+        return {
+            'valid': False,
+            'error': str(error)
+        }
 
     def _validate_imports(self, code: str) -> Dict[str, Any]:
         """
         Validate that all imports are available
         Returns warnings for potentially missing imports
         """
-        warnings = []
-
-        try:
-            tree = ast.parse(code)
-
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        if not self._is_import_available(alias.name):
-                            warnings.append(
-                                f'⚠️ Import may not be available: {alias.name}'
-                            )
-
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module and not self._is_import_available(node.module):
-                        warnings.append(
-                            f'⚠️ Module may not be available: {node.module}'
-                        )
-
-            return {
-                'valid': len(warnings) == 0,
-                'warnings': warnings
-            }
-
-        except Exception as e:
+        analysis = analyze_source(code)
+        if not analysis.parsed:
             return {
                 'valid': False,
-                'warnings': [f'⚠️ Import validation failed: {str(e)}']
+                'warnings': [f'⚠️ Import validation failed: {str(analysis.parse_error)}']
             }
 
-    def _is_import_available(self, module_name: str) -> bool:
-        """Check if module is available"""
-        # Check common/expected modules
-        known_modules = {
-            'os', 'sys', 'json', 'pathlib', 'typing', 'datetime',
-            'fastapi', 'pydantic', 'sqlalchemy', 'redis',
-            'asyncio', 're', 'collections', 'dataclasses',
-            # Darwin-specific
-            'core', 'services', 'agents', 'dream', 'utils',
-            'api', 'introspection', 'poetry', 'curiosity'
+        warnings = []
+        for kind, name in analysis.imports:
+            if not self._is_import_available(name):
+                if kind == 'import':
+                    warnings.append(f'⚠️ Import may not be available: {name}')
+                else:
+                    warnings.append(f'⚠️ Module may not be available: {name}')
+
+        return {
+            'valid': len(warnings) == 0,
+            'warnings': warnings
         }
 
+    def _is_import_available(self, module_name: str) -> bool:
+        """Check if module is available"""
         base_module = module_name.split('.')[0]
-        return base_module in known_modules
+        return base_module in self.known_modules
 
     def _security_scan(self, code: str) -> Dict[str, Any]:
         """
         Scan for security vulnerabilities
         """
+        analysis = analyze_source(code)
+        if not analysis.parsed:
+            return {
+                'safe': False,
+                'issues': [f'🚨 Security scan failed: {str(analysis.parse_error)}']
+            }
+
         issues = []
 
-        try:
-            tree = ast.parse(code)
-
-            # Check for dangerous function calls
-            for node in ast.walk(tree):
-                # Check for eval/exec
-                if isinstance(node, ast.Call):
-                    if isinstance(node.func, ast.Name):
-                        if node.func.id in ['eval', 'exec']:
-                            issues.append('🚨 CRITICAL: Use of eval/exec detected')
-
-                # Check for dangerous imports
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        if any(danger in alias.name for danger in self.dangerous_imports):
-                            issues.append(
-                                f'🚨 WARNING: Potentially dangerous import: {alias.name}'
-                            )
-
-                # Check for command execution
-                if isinstance(node, ast.Attribute):
-                    if node.attr in ['system', 'popen', 'call']:
-                        issues.append('🚨 WARNING: Command execution detected')
-
-            # Check for SQL injection patterns (basic)
-            if re.search(r'f".*SELECT.*\{', code) or re.search(r'".*SELECT.*\+', code):
-                issues.append('🚨 WARNING: Potential SQL injection pattern')
-
-            # Check for hardcoded credentials
-            if re.search(r'password\s*=\s*["\'](?!.*\{)', code, re.IGNORECASE):
-                issues.append('🚨 WARNING: Potential hardcoded password')
-
-            if re.search(r'api_key\s*=\s*["\'](?!.*\{)', code, re.IGNORECASE):
-                issues.append('🚨 WARNING: Potential hardcoded API key')
+        # Dangerous calls, imports and command execution, in source walk order
+        for kind, name in analysis.security_findings:
+            if kind == 'eval_exec':
+                issues.append('🚨 CRITICAL: Use of eval/exec detected')
+            elif kind == 'import':
+                if any(danger in name for danger in self.dangerous_imports):
+                    issues.append(f'🚨 WARNING: Potentially dangerous import: {name}')
+            elif kind == 'command':
+                issues.append('🚨 WARNING: Command execution detected')
 
-            return {
-                'safe': len(issues) == 0,
-                'issues': issues
-            }
+        # Check for SQL injection patterns (basic)
+        if re.search(r'f".*SELECT.*\{', code) or re.search(r'".*SELECT.*\+', code):
+            issues.append('🚨 WARNING: Potential SQL injection pattern')
 
-        except Exception as e:
-            return {
-                'safe': False,
-                'issues': [f'🚨 Security scan failed: {str(e)}']
-            }
+        # Check for hardcoded credentials
+        if re.search(r'password\s*=\s*["\'](?!.*\{)', code, re.IGNORECASE):
+            issues.append('🚨 WARNING: Potential hardcoded password')
+
+        if re.search(r'api_key\s*=\s*["\'](?!.*\{)', code, re.IGNORECASE):
+            issues.append('🚨 WARNING: Potential hardcoded API key')
+
+        return {
+            'safe': len(issues) == 0,
+            'issues': issues
+        }
 
     def _check_code_quality(self, code: str) -> Dict[str, Any]:
         """
         Check code quality metrics
         """
-        warnings = []
-
-        try:
-            tree = ast.parse(code)
-
-            # Check function length
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    func_lines = len(ast.unparse(node).splitlines())
-                    if func_lines > 50:
-                        warnings.append(
-                            f'⚠️ Function {node.name} is long ({func_lines} lines)'
-                        )
-
-            # Check complexity (basic - count nested blocks)
-            complexity = self._calculate_complexity(tree)
-            if complexity > 10:
-                warnings.append(f'⚠️ High complexity detected: {complexity}')
-
-            # Check for docstrings
-            has_docstrings = False
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
-                    if ast.get_docstring(node):
-                        has_docstrings = True
-                        break
-
-            if not has_docstrings:
-                warnings.append('⚠️ No docstrings found')
-
-            return {
-                'passed': len(warnings) < 3,  # Allow up to 2 warnings
-                'warnings': warnings
-            }
-
-        except Exception as e:
+        analysis = analyze_source(code)
+        if not analysis.parsed:
             return {
                 'passed': True,  # Don't fail on quality check errors
-                'warnings': [f'⚠️ Quality check failed: {str(e)}']
+                'warnings': [f'⚠️ Quality check failed: {str(analysis.parse_error)}']
             }
 
-    def _calculate_complexity(self, tree: ast.AST) -> int:
-        """
-        Calculate cyclomatic complexity (simplified)
-        """
-        complexity = 1
+        warnings = []
 
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.If, ast.While, ast.For, ast.ExceptHandler)):
-                complexity += 1
-            elif isinstance(node, ast.BoolOp):
-                complexity += len(node.values) - 1
+        # Check function length
+        for name, func_lines in analysis.long_functions:
+            warnings.append(f'⚠️ Function {name} is long ({func_lines} lines)')
 
-        return complexity
+        # Check complexity (basic - count branches and boolean operands)
+        if analysis.complexity > 10:
+            warnings.append(f'⚠️ High complexity detected: {analysis.complexity}')
+
+        # Check for docstrings
+        if not analysis.has_docstrings:
+            warnings.append('⚠️ No docstrings found')
+
+        return {
+            'passed': len(warnings) < 3,  # Allow up to 2 warnings
+            'warnings': warnings
+        }
 
     def _check_regressions(self, original: str, new: str) -> Dict[str, Any]:
         """
         Check for potential regressions
         """
-        warnings = []
-
-        try:
-            original_tree = ast.parse(original) if original.strip() else None
-            new_tree = ast.parse(new)
-
-            if original_tree:
-                # Check if public functions were removed
-                original_functions = self._extract_function_names(original_tree)
-                new_functions = self._extract_function_names(new_tree)
-
-                removed = original_functions - new_functions
-                if removed:
-                    warnings.append(
-                        f'⚠️ Functions removed: {", ".join(removed)}'
-                    )
-
-                # Check if classes were removed
-                original_classes = self._extract_class_names(original_tree)
-                new_classes = self._extract_class_names(new_tree)
-
-                removed_classes = original_classes - new_classes
-                if removed_classes:
-                    warnings.append(
-                        f'⚠️ Classes removed: {", ".join(removed_classes)}'
-                    )
+        # The original is usually the same file across several candidate
+        # changes, so its analysis normally comes straight from the cache
+        original_analysis = analyze_source(original) if original.strip() else None
+        new_analysis = analyze_source(new)
 
-            return {
-                'safe': len(warnings) == 0,
-                'warnings': warnings
-            }
-
-        except Exception as e:
+        error = (original_analysis and original_analysis.parse_error) or new_analysis.parse_error
+        if error is not None:
             return {
                 'safe': True,  # Don't fail on regression check errors
-                'warnings': [f'⚠️ Regression check failed: {str(e)}']
+                'warnings': [f'⚠️ Regression check failed: {str(error)}']
             }
 
-    def _extract_function_names(self, tree: ast.AST) -> Set[str]:
-        """Extract all function names from AST"""
-        functions = set()
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                if not node.name.startswith('_'):  # Only public functions
-                    functions.add(node.name)
-        return functions
-
-    def _extract_class_names(self, tree: ast.AST) -> Set[str]:
-        """Extract all class names from AST"""
-        classes = set()
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                classes.add(node.name)
-        return classes
+        warnings = []
+
+        if original_analysis:
+            # Check if public functions were removed
+            removed = original_analysis.public_functions - new_analysis.public_functions
+            if removed:
+                warnings.append(
+                    f'⚠️ Functions removed: {", ".join(removed)}'
+                )
+
+            # Check if classes were removed
+            removed_classes = original_analysis.classes - new_analysis.classes
+            if removed_classes:
+                warnings.append(
+                    f'⚠️ Classes removed: {", ".join(removed_classes)}'
+                )
+
+        return {
+            'safe': len(warnings) == 0,
+            'warnings': warnings
+        }
 
     def _high_risk_validation(self, generated: GeneratedCode) -> Dict[str, Any]:
         """
@@ -0,0 +1,261 @@
+"""
+Metrics Index: incremental line-count index of Darwin's own codebase
+
+Walks the project with os.scandir, pruning skipped directories instead of
+descending into them, and counts lines by scanning raw bytes in fixed-size
+chunks. Each file's (size, mtime, lines, component, language) is persisted,
+so a re-scan only reads files whose size or mtime changed, and every scan
+reports what changed since the previous one.
+"""
+import codecs
+import json
+import os
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+CHUNK_SIZE = 1 << 20  # 1 MiB
+INDEX_VERSION = 1
+
+
+def count_lines(path: str) -> Optional[int]:
+    """
+    Count lines the way len(open(path, encoding='utf-8').readlines()) does
+    (universal newlines: \\n, \\r\\n and a lone \\r each end a line) without
+    building the list. Returns None if the file is not valid UTF-8, which
+    is when readlines() would have raised.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    lines = 0
+    previous_cr = False   # Last chunk ended in \r (a following \n belongs to it)
+    last_byte = b''
+
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            try:
+                decoder.decode(chunk)
+            except UnicodeDecodeError:
+                return None
+
+            crlf = chunk.count(b'\r\n')
+            if previous_cr and chunk[:1] == b'\n':
+                crlf += 1  # \r\n split across chunks - already counted as \r
+            lines += chunk.count(b'\n') + chunk.count(b'\r') - crlf
+            previous_cr = chunk[-1:] == b'\r'
+            last_byte = chunk[-1:]
+
+    try:
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return None
+
+    if last_byte and last_byte not in (b'\n', b'\r'):
+        lines += 1  # Final line without a terminator
+    return lines
+
+
+def language_of(path: str) -> str:
+    suffix = os.path.splitext(path)[1]
+    if suffix == '.py':
+        return 'python'
+    if suffix in ('.js', '.jsx', '.ts', '.tsx'):
+        return 'javascript'
+    return 'other'
+
+
+@dataclass
+class MetricsScan:
+    """Totals from one scan plus what changed since the scan before it"""
+    total_files: int
+    total_lines: int
+    components: Dict[str, int]
+    languages: Dict[str, int]
+    files_read: int = 0
+    delta: Dict[str, Any] = field(default_factory=dict)
+
+
+class CodebaseMetricsIndex:
+    """Per-file line counts, persisted and refreshed incrementally"""
+
+    def __init__(
+        self,
+        project_root: Path,
+        skip_dirs: Set[str],
+        index_path: Path,
+        component_of: Callable[[Path], str]
+    ):
+        self.project_root = Path(project_root)
+        self.skip_dirs = set(skip_dirs)
+        self.index_path = Path(index_path)
+        self.component_of = component_of
+        # path -> [size, mtime_ns, lines or None, component, language]
+        self.files: Dict[str, List[Any]] = {}
+        self.last_scan_at: Optional[str] = None
+        self._loaded = False
+
+    def _load(self):
+        self._loaded = True
+        try:
+            if self.index_path.exists():
+                with open(self.index_path, 'r') as f:
+                    data = json.load(f)
+                if data.get('version') == INDEX_VERSION and data.get('root') == str(self.project_root):
+                    self.files = data.get('files', {})
+                    self.last_scan_at = data.get('scanned_at')
+        except Exception as e:
+            print(f"Warning: Could not load metrics index: {e}")
+
+    def _save(self):
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'version': INDEX_VERSION,
+                    'root': str(self.project_root),
+                    'scanned_at': self.last_scan_at,
+                    'files': self.files,
+                }, f)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            print(f"Warning: Could not save metrics index: {e}")
+
+    def _walk(self, directory: str):
+        """Yield (path, stat) for files, never entering skipped directories"""
+        try:
+            with os.scandir(directory) as entries:
+                entries = list(entries)
+        except OSError:
+            return
+        for entry in entries:
+            if entry.name in self.skip_dirs:
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._walk(entry.path)
+                elif entry.is_file():
+                    yield entry.path, entry.stat()
+            except OSError:
+                continue
+
+    def scan(self) -> MetricsScan:
+        """Refresh the index (reading only new or modified files) and return totals"""
+        if not self._loaded:
+            self._load()
+
+        previous = self.files
+        had_previous = bool(previous)
+        current: Dict[str, List[Any]] = {}
+        files_read = 0
+
+        if self.project_root.exists():
+            for path, stat in self._walk(str(self.project_root)):
+                entry = previous.get(path)
+                if entry is not None and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                    current[path] = entry
+                    continue
+                try:
+                    lines = count_lines(path)
+                except OSError:
+                    lines = None
+                files_read += 1
+                current[path] = [
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    lines,
+                    self.component_of(Path(path)),
+                    language_of(path),
+                ]
+
+        scan = self._totals(current)
+        scan.files_read = files_read
+        scan.delta = self._delta(previous, current, scan) if had_previous else {'baseline': True}
+        scan.delta['since'] = self.last_scan_at
+
+        self.files = current
+        self.last_scan_at = datetime.now().isoformat()
+        if files_read or len(current) != len(previous):
+            self._save()
+        return scan
+
+    def _totals(self, files: Dict[str, List[Any]]) -> MetricsScan:
+        components: Dict[str, int] = {}
+        languages = {'python': 0, 'javascript': 0, 'other': 0}
+        total_lines = 0
+        for _, _, lines, component, language in files.values():
+            if lines is None:
+                continue  # Counted as a file, but its lines can't be read
+            total_lines += lines
+            components[component] = components.get(component, 0) + lines
+            languages[language] += lines
+        return MetricsScan(
+            total_files=len(files),
+            total_lines=total_lines,
+            components=components,
+            languages=languages,
+        )
+
+    def _delta(
+        self,
+        previous: Dict[str, List[Any]],
+        current: Dict[str, List[Any]],
+        scan: MetricsScan,
+        top: int = 10
+    ) -> Dict[str, Any]:
+        """What grew (or shrank) since the previous scan"""
+        before = self._totals(previous)
+        added = [p for p in current if p not in previous]
+        removed = [p for p in previous if p not in current]
+
+        changes = []
+        for path, entry in current.items():
+            old = previous.get(path)
+            if old is not None and old[:2] == entry[:2]:
+                continue
+            old_lines = (old[2] or 0) if old else 0
+            diff = (entry[2] or 0) - old_lines
+            if diff or old is None:
+                changes.append((path, diff))
+        changes.extend((path, -(previous[path][2] or 0)) for path in removed)
+        changes.sort(key=lambda item: -item[1])
+
+        def relative(path: str) -> str:
+            try:
+                return str(Path(path).relative_to(self.project_root))
+            except ValueError:
+                return path
+
+        components = set(scan.components) | set(before.components)
+        return {
+            'files_added': len(added),
+            'files_removed': len(removed),
+            'files_modified': sum(
+                1 for path, entry in current.items()
+                if path in previous and previous[path][:2] != entry[:2]
+            ),
+            'lines': scan.total_lines - before.total_lines,
+            'components': {
+                name: scan.components.get(name, 0) - before.components.get(name, 0)
+                for name in sorted(components)
+                if scan.components.get(name, 0) != before.components.get(name, 0)
+            },
+            'grew': [
+                {'path': relative(path), 'lines': diff}
+                for path, diff in changes[:top] if diff > 0
+            ],
+            'shrank': [
+                {'path': relative(path), 'lines': diff}
+                for path, diff in reversed(changes[-top:]) if diff < 0
+            ],
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'indexed_files': len(self.files),
+            'last_scan_at': self.last_scan_at,
+            'index_path': str(self.index_path),
+        }
@@ -8,10 +8,12 @@ import json
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, asdict
 import subprocess
 import re
 
+from introspection.metrics_index import CodebaseMetricsIndex
+
 
 @dataclass
 class CodeInsight:
@@ -38,6 +40,7 @@ class SystemMetrics:
     languages: Dict[str, int]
     docker_stats: Dict[str, Any]
     code_complexity: Dict[str, Any]
+    delta: Dict[str, Any] = field(default_factory=dict)  # Changes since the previous analysis
 
 
 class SelfAnalyzer:
@@ -48,12 +51,20 @@ class SelfAnalyzer:
     """
 
     IMPLEMENTED_FILE = "data/implemented_improvements.json"
+    METRICS_INDEX_FILE = "data/self_analysis/metrics_index.json"
+    SKIP_DIRS = {'node_modules', '__pycache__', '.git', 'data', 'logs', 'venv'}
 
     def __init__(self, project_root: str = "/app"):
         self.project_root = Path(project_root)
         self.insights: List[CodeInsight] = []
         self.metrics: Optional[SystemMetrics] = None
         self.implemented: Dict[str, Any] = self._load_implemented()
+        self.metrics_index = CodebaseMetricsIndex(
+            self.project_root,
+            skip_dirs=self.SKIP_DIRS,
+            index_path=self.project_root / self.METRICS_INDEX_FILE,
+            component_of=self._get_component
+        )
 
     def _load_implemented(self) -> Dict[str, Any]:
         """Load list of already-implemented improvements."""
@@ -151,55 +162,25 @@ class SelfAnalyzer:
         }
 
     def _collect_system_metrics(self) -> SystemMetrics:
-        """Collect metrics about the codebase"""
-        total_files = 0
-        total_lines = 0
-        components = {}
-        languages = {'python': 0, 'javascript': 0, 'other': 0}
-
-        # Scan project directory
-        if self.project_root.exists():
-            for file_path in self.project_root.rglob('*'):
-                if file_path.is_file() and not self._should_skip(file_path):
-                    total_files += 1
-
-                    # Count lines
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            lines = len(f.readlines())
-                            total_lines += lines
-
-                        # Categorize by component
-                        component = self._get_component(file_path)
-                        components[component] = components.get(component, 0) + lines
-
-                        # Categorize by language
-                        if file_path.suffix == '.py':
-                            languages['python'] += lines
-                        elif file_path.suffix in ['.js', '.jsx', '.ts', '.tsx']:
-                            languages['javascript'] += lines
-                        else:
-                            languages['other'] += lines
-
-                    except Exception:
-                        pass
+        """Collect metrics about the codebase (only changed files are re-read)"""
+        scan = self.metrics_index.scan()
 
         # Get Docker stats
         docker_stats = self._get_docker_stats()
 
         return SystemMetrics(
-            total_files=total_files,
-            total_lines_of_code=total_lines,
-            components=components,
-            languages=languages,
+            total_files=scan.total_files,
+            total_lines_of_code=scan.total_lines,
+            components=scan.components,
+            languages=scan.languages,
             docker_stats=docker_stats,
-            code_complexity=self._estimate_complexity()
+            code_complexity=self._estimate_complexity(),
+            delta=scan.delta
         )
 
     def _should_skip(self, file_path: Path) -> bool:
         """Check if file should be skipped"""
-        skip_dirs = {'node_modules', '__pycache__', '.git', 'data', 'logs', 'venv'}
-        return any(skip_dir in file_path.parts for skip_dir in skip_dirs)
+        return any(skip_dir in file_path.parts for skip_dir in self.SKIP_DIRS)
 
     def _get_component(self, file_path: Path) -> str:
         """Identify which component a file belongs to"""
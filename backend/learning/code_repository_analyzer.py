@@ -5,7 +5,6 @@ Analyzes popular GitHub repositories and other code sources
 to learn patterns, best practices, and innovative solutions.
 """
 
-import aiohttp
 import asyncio
 from typing import Dict, Any, List, Optional
 from datetime import datetime
@@ -13,6 +12,7 @@ import hashlib
 import base64
 import re
 
+from services.fetch_cache import get_fetch_cache
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -177,6 +177,25 @@ class CodeRepositoryAnalyzer:
         report['completed_at'] = datetime.utcnow().isoformat()
         return report
 
+    async def _github_get(self, url: str, params: Optional[Dict[str, Any]] = None):
+        """
+        GET a GitHub API URL through the shared fetch cache
+
+        Stale entries are revalidated with their ETag; GitHub doesn't count
+        304 responses against the rate limit.
+        """
+        headers = {'Accept': 'application/vnd.github.v3+json'}
+
+        if self.github_token:
+            headers['Authorization'] = f'token {self.github_token}'
+
+        return await get_fetch_cache().fetch(
+            url,
+            headers=headers,
+            params=params,
+            client_name='code_repository_analyzer'
+        )
+
     async def _fetch_repo_info(self, repo_full_name: str) -> Optional[Dict[str, Any]]:
         """
         Fetch repository information from GitHub API
@@ -188,19 +207,12 @@ class CodeRepositoryAnalyzer:
             Repository info or None
         """
         try:
-            url = f"https://api.github.com/repos/{repo_full_name}"
-            headers = {'Accept': 'application/vnd.github.v3+json'}
-
-            if self.github_token:
-                headers['Authorization'] = f'token {self.github_token}'
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        logger.warning(f"Failed to fetch repo info: {response.status}")
-                        return None
+            response = await self._github_get(f"https://api.github.com/repos/{repo_full_name}")
+            if response.ok:
+                return response.json()
+            else:
+                logger.warning(f"Failed to fetch repo info: {response.status}")
+                return None
 
         except Exception as e:
             logger.error(f"Error fetching repo info: {e}")
@@ -220,45 +232,38 @@ class CodeRepositoryAnalyzer:
 
         try:
             # Fetch root directory contents
-            url = f"https://api.github.com/repos/{repo_full_name}/contents"
-            headers = {'Accept': 'application/vnd.github.v3+json'}
+            response = await self._github_get(f"https://api.github.com/repos/{repo_full_name}/contents")
+            if response.ok:
+                contents = response.json()
 
-            if self.github_token:
-                headers['Authorization'] = f'token {self.github_token}'
+                # Analyze structure
+                directories = [item['name'] for item in contents if item['type'] == 'dir']
+                files = [item['name'] for item in contents if item['type'] == 'file']
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 200:
-                        contents = await response.json()
+                # Identify patterns
+                if 'tests' in directories or 'test' in directories:
+                    result['insights'].append("Repository includes comprehensive test suite")
 
-                        # Analyze structure
-                        directories = [item['name'] for item in contents if item['type'] == 'dir']
-                        files = [item['name'] for item in contents if item['type'] == 'file']
+                if 'docs' in directories or 'documentation' in directories:
+                    result['insights'].append("Well-documented with dedicated docs directory")
 
-                        # Identify patterns
-                        if 'tests' in directories or 'test' in directories:
-                            result['insights'].append("Repository includes comprehensive test suite")
+                if 'docker-compose.yml' in files or 'Dockerfile' in files:
+                    result['insights'].append("Uses containerization for deployment")
 
-                        if 'docs' in directories or 'documentation' in directories:
-                            result['insights'].append("Well-documented with dedicated docs directory")
+                if '.github' in directories:
+                    result['insights'].append("Implements CI/CD with GitHub Actions")
 
-                        if 'docker-compose.yml' in files or 'Dockerfile' in files:
-                            result['insights'].append("Uses containerization for deployment")
+                if 'README.md' in files:
+                    result['insights'].append("Includes comprehensive README for onboarding")
 
-                        if '.github' in directories:
-                            result['insights'].append("Implements CI/CD with GitHub Actions")
+                # Check for common patterns
+                if 'src' in directories or 'lib' in directories:
+                    result['insights'].append("Clean source code organization")
 
-                        if 'README.md' in files:
-                            result['insights'].append("Includes comprehensive README for onboarding")
+                if 'examples' in directories:
+                    result['insights'].append("Provides example code for learning")
 
-                        # Check for common patterns
-                        if 'src' in directories or 'lib' in directories:
-                            result['insights'].append("Clean source code organization")
-
-                        if 'examples' in directories:
-                            result['insights'].append("Provides example code for learning")
-
-                        logger.info(f"Analyzed structure: {len(result['insights'])} insights")
+                logger.info(f"Analyzed structure: {len(result['insights'])} insights")
 
         except Exception as e:
             logger.error(f"Error analyzing repo structure: {e}")
@@ -314,23 +319,18 @@ class CodeRepositoryAnalyzer:
             File content or None
         """
         try:
-            url = f"https://api.github.com/repos/{repo_full_name}/contents/{filename}"
-            headers = {'Accept': 'application/vnd.github.v3+json'}
-
-            if self.github_token:
-                headers['Authorization'] = f'token {self.github_token}'
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
+            response = await self._github_get(
+                f"https://api.github.com/repos/{repo_full_name}/contents/{filename}"
+            )
+            if response.ok:
+                data = response.json()
 
-                        # Decode base64 content
-                        if data.get('encoding') == 'base64':
-                            content_bytes = base64.b64decode(data['content'])
-                            return content_bytes.decode('utf-8', errors='ignore')
+                # Decode base64 content
+                if data.get('encoding') == 'base64':
+                    content_bytes = base64.b64decode(data['content'])
+                    return content_bytes.decode('utf-8', errors='ignore')
 
-                    return None
+            return None
 
         except Exception as e:
             logger.debug(f"Error fetching file {filename}: {e}")
@@ -516,28 +516,23 @@ Provide 2-3 architectural patterns or design decisions:"""
                 'per_page': 5
             }
 
-            headers = {'Accept': 'application/vnd.github.v3+json'}
-            if self.github_token:
-                headers['Authorization'] = f'token {self.github_token}'
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
+            response = await self._github_get(url, params=params)
+            if response.ok:
+                data = response.json()
 
-                        for repo in data.get('items', [])[:3]:  # Analyze top 3
-                            repo_name = repo['full_name']
+                for repo in data.get('items', [])[:3]:  # Analyze top 3
+                    repo_name = repo['full_name']
 
-                            analysis = await self.analyze_repository(repo_name, 'trending')
+                    analysis = await self.analyze_repository(repo_name, 'trending')
 
-                            if analysis.get('success'):
-                                report['repositories_analyzed'] += 1
-                                insights = analysis.get('insights', [])
-                                report['total_insights'] += len(insights)
-                                report['insights'].extend(insights[:3])  # Top 3 from each
+                    if analysis.get('success'):
+                        report['repositories_analyzed'] += 1
+                        insights = analysis.get('insights', [])
+                        report['total_insights'] += len(insights)
+                        report['insights'].extend(insights[:3])  # Top 3 from each
 
-                            # Rate limiting
-                            await asyncio.sleep(3)
+                    # Rate limiting
+                    await asyncio.sleep(3)
 
         except Exception as e:
             logger.error(f"Error analyzing trending repos: {e}")
@@ -5,17 +5,23 @@ Reads, analyzes, and learns from official documentation of frameworks,
 libraries, and technologies.
 """
 
-import aiohttp
 import asyncio
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import hashlib
 import re
 
+from services.fetch_cache import get_fetch_cache
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Seconds a fetched documentation page is reused before revalidating
+DOC_MAX_AGE = 86400
+
+# Fetch-cache name of _extract_doc_text's output; bump when it changes
+DOC_EXTRACTOR = 'documentation_reader.text/v2'
+
 
 class DocumentationReader:
     """
@@ -166,57 +172,61 @@ class DocumentationReader:
         try:
             base_url = doc_info['base_url']
 
-            # Try to fetch documentation
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Darwin AI Bot) Documentation/1.0'
-            }
+            # Try to fetch documentation (docs change rarely: fresh for a day)
+            response = await get_fetch_cache().fetch(
+                base_url,
+                headers={'User-Agent': 'Mozilla/5.0 (Darwin AI Bot) Documentation/1.0'},
+                max_age=DOC_MAX_AGE,
+                timeout=15,
+                client_name='documentation_reader'
+            )
+
+            if response.ok:
+                content = await get_fetch_cache().extract(
+                    DOC_EXTRACTOR, response.text(), self._extract_doc_text
+                )
+
+                if content is not None:
+                    # Limit length
+                    result['content'] = content[:4000]
+                    result['url'] = base_url
+                    result['success'] = True
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    base_url,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=15)
-                ) as response:
-                    if response.status == 200:
-                        html = await response.text()
-
-                        # Extract text content (simplified)
-                        from bs4 import BeautifulSoup
-                        soup = BeautifulSoup(html, 'html.parser')
-
-                        # Remove scripts, styles
-                        for element in soup(['script', 'style', 'nav', 'footer']):
-                            element.decompose()
-
-                        # Get main content
-                        main_content = (
-                            soup.find('main') or
-                            soup.find('article') or
-                            soup.find('div', class_=re.compile('content|docs|documentation', re.I)) or
-                            soup.find('body')
-                        )
-
-                        if main_content:
-                            text = main_content.get_text(separator='\n', strip=True)
-
-                            # Clean up
-                            lines = [line.strip() for line in text.split('\n') if line.strip()]
-                            content = '\n'.join(lines)
-
-                            # Limit length
-                            result['content'] = content[:4000]
-                            result['url'] = base_url
-                            result['success'] = True
-
-                            logger.info(f"Successfully read {tech} docs from {base_url}")
-                    else:
-                        logger.warning(f"Failed to fetch {base_url}: {response.status}")
+                    logger.info(f"Successfully read {tech} docs from {base_url}")
+            else:
+                logger.warning(f"Failed to fetch {base_url}: {response.status}")
 
         except Exception as e:
             logger.error(f"Error reading doc section: {e}")
 
         return result
 
+    def _extract_doc_text(self, html: str) -> Optional[str]:
+        """Main text of a documentation page, None if it has none (runs in a worker thread)"""
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # Remove scripts, styles
+        for element in soup(['script', 'style', 'nav', 'footer']):
+            element.decompose()
+
+        # Get main content
+        main_content = (
+            soup.find('main') or
+            soup.find('article') or
+            soup.find('div', class_=re.compile('content|docs|documentation', re.I)) or
+            soup.find('body')
+        )
+
+        if not main_content:
+            return None
+
+        text = main_content.get_text(separator='\n', strip=True)
+
+        # Clean up
+        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        return '\n'.join(lines)
+
     async def _extract_doc_insights(self,
                                    content: str,
                                    tech: str,
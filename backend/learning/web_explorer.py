@@ -3,21 +3,96 @@ Web Explorer - Autonomous Web Navigation and Learning
 
 This module enables Darwin to autonomously explore the web,
 follow links, extract knowledge, and learn from diverse sources.
+
+Crawling is driven by a priority frontier: links are queued by relevance
+to the topic, several pages are fetched at once (each host no more often
+than the politeness delay allows), HTML is parsed in worker threads, and
+pages are deduplicated by canonical URL and by content hash. Knowledge is
+extracted from several pages per LLM call.
 """
 
-import aiohttp
 import asyncio
-from typing import Dict, Any, List, Optional, Set
+import heapq
+import time
+from typing import Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
 from bs4 import BeautifulSoup
 import re
 import hashlib
 
+from services.fetch_cache import get_fetch_cache
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ref', 'ref_src'}
+
+# Frontier score for seed URLs: always crawled before discovered links
+SEED_SCORE = 100.0
+
+# Fetch-cache name of _parse_page's output; bump when the parser changes
+PAGE_EXTRACTOR = 'web_explorer.page/v2'
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for deduplication: lower-case scheme and host,
+    no default port, fragment or tracking parameters, sorted query, and no
+    trailing slash (except for the root path).
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    port = parts.port if parts.port and (scheme, parts.port) not in (('http', 80), ('https', 443)) else None
+    netloc = f"{host}:{port}" if port else host
+
+    path = re.sub(r'/{2,}', '/', parts.path or '/')
+    if len(path) > 1 and path.endswith('/'):
+        path = path.rstrip('/') or '/'
+
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ))
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+
+def content_fingerprint(text: str) -> str:
+    """Hash of page text with whitespace and case normalized"""
+    return hashlib.sha256(' '.join(text.lower().split()).encode('utf-8')).hexdigest()
+
+
+class CrawlFrontier:
+    """URLs waiting to be fetched, best score first (ties: shallower, then older)"""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, int, str]] = []
+        self._seen: Set[str] = set()
+        self._counter = 0
+
+    def push(self, url: str, score: float, depth: int) -> bool:
+        """Queue a URL unless its canonical form was queued before"""
+        canonical = canonicalize_url(url)
+        if canonical in self._seen:
+            return False
+        self._seen.add(canonical)
+        self._counter += 1
+        heapq.heappush(self._heap, (-score, depth, self._counter, canonical))
+        return True
+
+    def pop(self) -> Tuple[str, int]:
+        """Highest-priority (url, depth)"""
+        _, depth, _, url = heapq.heappop(self._heap)
+        return url, depth
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
 
 class WebExplorer:
     """
@@ -47,6 +122,20 @@ class WebExplorer:
         self.request_timeout = self.config.get('request_timeout', 10)
         self.user_agent = self.config.get('user_agent',
             'Mozilla/5.0 (Darwin AI Bot) Learning/1.0')
+        self.max_concurrent_fetches = self.config.get('max_concurrent_fetches', 4)
+        self.politeness_delay = self.config.get('politeness_delay', 2.0)  # Seconds between hits to one host
+        self.links_per_page = self.config.get('links_per_page', 3)
+        self.extraction_batch_size = self.config.get('extraction_batch_size', 4)
+
+        # Earliest time (loop clock) each host may be fetched again
+        self._host_next_fetch: Dict[str, float] = {}
+        self.crawl_stats = {
+            'pages_fetched': 0,
+            'fetch_failures': 0,
+            'duplicate_pages': 0,
+            'llm_calls': 0,
+            'elapsed_seconds': 0.0,
+        }
 
         # Interesting domains for learning
         self.priority_domains = [
@@ -76,6 +165,11 @@ class WebExplorer:
         """
         Autonomously explore the web starting from seed URLs
 
+        Pages are fetched up to max_concurrent_fetches at a time, most
+        relevant links first, and at most once per politeness_delay per
+        host. Link depth is counted from the seeds (depth 0); links are
+        followed while the next depth is below max_depth.
+
         Args:
             seed_urls: Initial URLs to start exploration
             topic: Topic of interest for focused exploration
@@ -84,9 +178,13 @@ class WebExplorer:
             Exploration report with discoveries
         """
         logger.info(f"Starting autonomous exploration on topic: {topic}")
+        started = time.monotonic()
 
         # Reset visited URLs for this session to allow fresh exploration
         self.visited_urls.clear()
+        self._host_next_fetch.clear()
+        self.crawl_stats = {key: 0 for key in self.crawl_stats}
+        self.crawl_stats['elapsed_seconds'] = 0.0
 
         exploration_report = {
             'topic': topic,
@@ -98,59 +196,80 @@ class WebExplorer:
             'discoveries': []
         }
 
-        urls_to_visit = seed_urls.copy()
-        depth = 0
-
-        while urls_to_visit and depth < self.max_depth and len(self.visited_urls) < self.max_urls_per_session:
-            current_url = urls_to_visit.pop(0)
-
-            # Skip if already visited
-            if current_url in self.visited_urls:
-                continue
-
-            try:
-                # Explore the URL
-                result = await self._explore_url(current_url, topic)
-
-                if result['success']:
-                    self.visited_urls.add(current_url)
-                    exploration_report['urls_explored'] += 1
-
-                    # Extract and store knowledge
-                    if result.get('content'):
-                        knowledge = await self._extract_knowledge(
-                            result['content'],
-                            current_url,
-                            topic
-                        )
-
-                        if knowledge:
-                            exploration_report['knowledge_extracted'] += 1
-                            exploration_report['discoveries'].append({
-                                'url': current_url,
-                                'title': result.get('title'),
-                                'key_points': knowledge.get('key_points', [])
-                            })
-
-                            # Store in semantic memory
-                            await self._store_discovery(knowledge, current_url, topic)
-
-                    # Find interesting links to follow
-                    if result.get('links') and depth < self.max_depth - 1:
-                        interesting_links = self._filter_interesting_links(
-                            result['links'],
-                            topic
-                        )
-                        urls_to_visit.extend(interesting_links[:3])  # Follow top 3
-
-                # Rate limiting
-                await asyncio.sleep(2)
-
-            except Exception as e:
-                logger.error(f"Error exploring {current_url}: {e}")
-                continue
-
-            depth += 1
+        frontier = CrawlFrontier()
+        for url in seed_urls:
+            frontier.push(url, SEED_SCORE, 0)
+
+        seen_content: Set[str] = set()
+        pending_pages: List[Dict[str, Any]] = []  # Waiting for a knowledge extraction batch
+        extractions: List[asyncio.Task] = []
+        in_flight: Dict[asyncio.Task, Tuple[str, int]] = {}
+
+        def flush_extraction(force: bool = False):
+            while pending_pages and (force or len(pending_pages) >= self.extraction_batch_size):
+                batch = pending_pages[:self.extraction_batch_size]
+                del pending_pages[:self.extraction_batch_size]
+                extractions.append(asyncio.ensure_future(self._extract_knowledge_batch(batch, topic)))
+
+        while frontier or in_flight:
+            # Keep up to max_concurrent_fetches pages in flight, within the session budget
+            while (frontier and len(in_flight) < self.max_concurrent_fetches and
+                   len(self.visited_urls) + len(in_flight) < self.max_urls_per_session):
+                url, depth = frontier.pop()
+                task = asyncio.ensure_future(self._polite_explore(url, topic))
+                in_flight[task] = (url, depth)
+
+            if not in_flight:
+                break
+
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                url, depth = in_flight.pop(task)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    logger.error(f"Error exploring {url}: {e}")
+                    continue
+
+                if not result['success']:
+                    self.crawl_stats['fetch_failures'] += 1
+                    continue
+
+                self.visited_urls.add(url)
+                self.crawl_stats['pages_fetched'] += 1
+                exploration_report['urls_explored'] += 1
+
+                # Mirrors and syndicated copies: same text under another URL
+                content = result.get('content')
+                if content:
+                    fingerprint = content_fingerprint(content)
+                    if fingerprint in seen_content:
+                        self.crawl_stats['duplicate_pages'] += 1
+                        content = None
+                    else:
+                        seen_content.add(fingerprint)
+                if content:
+                    pending_pages.append({'url': url, 'title': result.get('title'), 'content': content})
+                    flush_extraction()
+
+                # Find interesting links to follow
+                if result.get('links') and depth + 1 < self.max_depth:
+                    scored = self._score_links(result['links'], topic)
+                    for link, score in scored[:self.links_per_page]:
+                        frontier.push(link, score, depth + 1)
+
+        flush_extraction(force=True)
+        for knowledge_items in await asyncio.gather(*extractions):
+            for page, knowledge in knowledge_items:
+                exploration_report['knowledge_extracted'] += 1
+                exploration_report['discoveries'].append({
+                    'url': page['url'],
+                    'title': page.get('title'),
+                    'key_points': knowledge.get('key_points', [])
+                })
+
+                # Store in semantic memory
+                await self._store_discovery(knowledge, page['url'], topic)
 
         # Generate AI insights from all discoveries
         if exploration_report['discoveries']:
@@ -161,12 +280,34 @@ class WebExplorer:
             exploration_report['insights_generated'] = len(insights)
             exploration_report['insights'] = insights
 
+        elapsed = time.monotonic() - started
+        pages = self.crawl_stats['pages_fetched']
+        self.crawl_stats['elapsed_seconds'] = round(elapsed, 2)
+        exploration_report['crawl'] = {
+            **self.crawl_stats,
+            'pages_per_minute': round(pages * 60 / elapsed, 1) if elapsed else 0.0,
+            'llm_calls_per_page': round(self.crawl_stats['llm_calls'] / pages, 2) if pages else 0.0,
+        }
+
         exploration_report['completed_at'] = datetime.utcnow().isoformat()
         logger.info(f"Exploration complete: {exploration_report['urls_explored']} URLs, "
                    f"{exploration_report['knowledge_extracted']} knowledge items extracted")
 
         return exploration_report
 
+    async def _polite_explore(self, url: str, topic: str) -> Dict[str, Any]:
+        """_explore_url, after waiting out the host's politeness delay"""
+        host = urlparse(url).netloc
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        # Reserve the host's next slot before sleeping, so concurrent
+        # fetches to one host queue up behind each other
+        slot = max(now, self._host_next_fetch.get(host, now))
+        self._host_next_fetch[host] = slot + self.politeness_delay
+        if slot > now:
+            await asyncio.sleep(slot - now)
+        return await self._explore_url(url, topic)
+
     async def _explore_url(self, url: str, topic: str) -> Dict[str, Any]:
         """
         Explore a single URL and extract content
@@ -187,32 +328,13 @@ class WebExplorer:
         }
 
         try:
-            headers = {'User-Agent': self.user_agent}
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=self.request_timeout)
-                ) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-
-                        # Extract title
-                        title_tag = soup.find('title')
-                        result['title'] = title_tag.get_text().strip() if title_tag else 'No title'
-
-                        # Extract main content
-                        result['content'] = self._extract_main_content(soup)
-
-                        # Extract links
-                        result['links'] = self._extract_links(soup, url)
-
-                        result['success'] = True
-                        logger.info(f"Successfully explored: {url}")
-                    else:
-                        logger.warning(f"Failed to fetch {url}: Status {response.status}")
+            html = await self._fetch_html(url)
+            if html is not None:
+                # Parsed pages are cached by content; BeautifulSoup only
+                # runs (in a worker thread) for pages it hasn't seen
+                result.update(await get_fetch_cache().extract(PAGE_EXTRACTOR, html, self._parse_page, url))
+                result['success'] = True
+                logger.info(f"Successfully explored: {url}")
 
         except asyncio.TimeoutError:
             logger.warning(f"Timeout fetching {url}")
@@ -221,6 +343,37 @@ class WebExplorer:
 
         return result
 
+    async def _fetch_html(self, url: str) -> Optional[str]:
+        """GET a page through the shared fetch cache; None unless it returns 200"""
+        response = await get_fetch_cache().fetch(
+            url,
+            headers={'User-Agent': self.user_agent},
+            timeout=self.request_timeout,
+            client_name='web_explorer',
+            content_types=('html',)
+        )
+        if response.ok:
+            return response.text()
+        logger.warning(f"Failed to fetch {url}: Status {response.status}")
+        return None
+
+    def _parse_page(self, html: str, url: str) -> Dict[str, Any]:
+        """Title, main text and links of a page (runs in a worker thread)"""
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # Extract title
+        title_tag = soup.find('title')
+        title = title_tag.get_text().strip() if title_tag else 'No title'
+
+        # Extract main content (drops nav/header/footer before links are read)
+        content = self._extract_main_content(soup)
+
+        return {
+            'title': title,
+            'content': content,
+            'links': self._extract_links(soup, url)
+        }
+
     def _extract_main_content(self, soup: BeautifulSoup) -> str:
         """
         Extract main textual content from HTML
@@ -279,6 +432,35 @@ class WebExplorer:
 
         return links
 
+    def _score_link(self, link: str, topic: str) -> float:
+        """
+        Relevance of a link to the topic: 1.0 for a priority domain plus 0.5
+        per topic keyword in the URL. 0 means not worth following.
+        """
+        parsed = urlparse(link)
+        link_lower = link.lower()
+        score = 0.0
+        if any(priority_domain in parsed.netloc for priority_domain in self.priority_domains):
+            score += 1.0
+        score += 0.5 * sum(1 for keyword in set(topic.lower().split()) if keyword in link_lower)
+        return score
+
+    def _score_links(self, links: List[str], topic: str) -> List[Tuple[str, float]]:
+        """Unvisited links worth following, most relevant first (page order breaks ties)"""
+        scored = []
+        seen = set()
+        for link in links:
+            canonical = canonicalize_url(link)
+            # Already visited (or listed twice on the page)
+            if canonical in self.visited_urls or canonical in seen:
+                continue
+            seen.add(canonical)
+            score = self._score_link(link, topic)
+            if score > 0:
+                scored.append((link, score))
+        scored.sort(key=lambda item: -item[1])
+        return scored[:10]  # Limit to top 10
+
     def _filter_interesting_links(self, links: List[str], topic: str) -> List[str]:
         """
         Filter links to find interesting ones for exploration
@@ -288,31 +470,9 @@ class WebExplorer:
             topic: Topic context
 
         Returns:
-            Filtered list of interesting URLs
+            Filtered list of interesting URLs, most relevant first
         """
-        interesting = []
-
-        for link in links:
-            # Already visited
-            if link in self.visited_urls:
-                continue
-
-            parsed = urlparse(link)
-
-            # Check if domain is in priority list
-            for priority_domain in self.priority_domains:
-                if priority_domain in parsed.netloc:
-                    interesting.append(link)
-                    break
-            else:
-                # Check if URL contains topic-related keywords
-                topic_keywords = topic.lower().split()
-                link_lower = link.lower()
-
-                if any(keyword in link_lower for keyword in topic_keywords):
-                    interesting.append(link)
-
-        return interesting[:10]  # Limit to top 10
+        return [link for link, _ in self._score_links(links, topic)]
 
     async def _extract_knowledge(self,
                                  content: str,
@@ -343,6 +503,7 @@ Content:
 
 Provide your response as a list of key points."""
 
+            self.crawl_stats['llm_calls'] += 1
             result = await self.ai_router.generate(
                 task_description=f"Extract knowledge from {url}",
                 prompt=prompt,
@@ -370,6 +531,89 @@ Provide your response as a list of key points."""
             logger.error(f"Error extracting knowledge: {e}")
             return None
 
+    async def _extract_knowledge_batch(self,
+                                       pages: List[Dict[str, Any]],
+                                       topic: str) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Extract knowledge from several pages with one LLM call
+
+        Args:
+            pages: Dicts with url, title and content
+            topic: Topic context
+
+        Returns:
+            (page, knowledge) pairs for pages that yielded key points
+        """
+        pages = [page for page in pages if page.get('content') and len(page['content']) >= 100]
+        if not pages:
+            return []
+        if len(pages) == 1:
+            knowledge = await self._extract_knowledge(pages[0]['content'], pages[0]['url'], topic)
+            return [(pages[0], knowledge)] if knowledge else []
+
+        try:
+            sections = "\n\n".join(
+                f"### PAGE {i}\nSource: {page['url']}\n{page['content'][:2000]}"
+                for i, page in enumerate(pages, 1)
+            )
+            prompt = f"""Analyze the following {len(pages)} pages about {topic}.
+For each page, extract the 3-5 most important key points or insights that would be valuable for learning.
+Be concise and focus on actionable or novel information.
+
+{sections}
+
+Answer with one section per page, starting each with its "### PAGE <n>" header
+on a line of its own, followed by that page's key points as a list."""
+
+            self.crawl_stats['llm_calls'] += 1
+            result = await self.ai_router.generate(
+                task_description=f"Extract knowledge from {len(pages)} pages about {topic}",
+                prompt=prompt,
+                max_tokens=300 * len(pages)
+            )
+
+            response_text = result.get('result', '') if isinstance(result, dict) else str(result)
+
+            # Split the answer back into per-page sections
+            points_by_page: Dict[int, List[str]] = {}
+            current = None
+            for line in response_text.split('\n'):
+                # Only the "### PAGE <n>" header the prompt asks for, so a key
+                # point like "- Page 2 of the guide..." stays a key point
+                header = re.match(r'^#{1,6}\s*PAGE\s+(\d+)\s*:?\s*$', line.strip(), re.I)
+                if header:
+                    current = int(header.group(1))
+                    points_by_page.setdefault(current, [])
+                elif current is not None and line.strip() and len(line.strip()) > 10:
+                    points_by_page[current].append(line.strip('- •*').strip())
+
+            if not points_by_page:
+                # Answer didn't keep the page sections apart: one call per page
+                logger.warning("Batched extraction answer had no page sections, extracting per page")
+                results = await asyncio.gather(*(
+                    self._extract_knowledge(page['content'], page['url'], topic) for page in pages
+                ))
+                return [(page, knowledge) for page, knowledge in zip(pages, results) if knowledge]
+
+            extracted = []
+            timestamp = datetime.utcnow().isoformat()
+            for i, page in enumerate(pages, 1):
+                key_points = points_by_page.get(i)
+                if not key_points:
+                    continue
+                extracted.append((page, {
+                    'url': page['url'],
+                    'topic': topic,
+                    'key_points': key_points[:5],
+                    'full_content': page['content'][:1000],
+                    'timestamp': timestamp
+                }))
+            return extracted
+
+        except Exception as e:
+            logger.error(f"Error extracting knowledge: {e}")
+            return []
+
     async def _store_discovery(self, knowledge: Dict[str, Any], url: str, topic: str):
         """
         Store discovered knowledge in semantic memory
@@ -442,6 +686,7 @@ Discoveries:
 
 Provide 3 synthesized insights:"""
 
+            self.crawl_stats['llm_calls'] += 1
             result = await self.ai_router.generate(
                 task_description=f"Synthesize insights about {topic}",
                 prompt=prompt,
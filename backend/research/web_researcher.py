@@ -1,19 +1,49 @@
 """
 Web Research System
 Integrates multiple sources: SerpAPI, GitHub, StackOverflow, ArXiv
+
+Sources are searched concurrently over the shared keep-alive HTTP pool,
+each host behind its own token bucket, and per-source results are cached
+by normalized query for a TTL.
 """
-import aiohttp
 import asyncio
-from typing import Dict, Any, List, Optional
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from urllib.parse import urlsplit
 import json
 import re
 
+from services.fetch_cache import get_fetch_cache
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+class TokenBucket:
+    """Allows `rate` requests per second on average, with bursts of up to `burst`"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available, then take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
 class WebResearcher:
     """
     Advanced web research system for gathering context and solutions
@@ -30,30 +60,106 @@ class WebResearcher:
         self.serpapi_key = config.get("serpapi_api_key", "")
         self.github_token = config.get("github_token", "")
 
-        # Rate limiting
-        self.request_delay = 1.0  # seconds between requests
-        self.last_request_time = 0
+        # Rate limiting: one token bucket per host, so a slow or strict
+        # API doesn't hold back requests to the others
+        self.host_rate = config.get("host_rate", 1.0)
+        self.host_burst = config.get("host_burst", 2)
+        self._buckets: Dict[str, TokenBucket] = {}
+
+        # comprehensive_search returns whatever sources answered by the deadline
+        self.deadline_seconds = config.get("deadline_seconds", 10.0)
+
+        # Per-source results keyed by (source, normalized query)
+        self.cache_ttl_seconds = config.get("cache_ttl_seconds", 900.0)
+        self.cache_max_entries = config.get("cache_max_entries", 256)
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+
+        self.stats = {
+            "searches": 0,
+            "source_searches": 0,
+            "cache_hits": 0,
+            "timeouts": 0,
+        }
 
         logger.info("WebResearcher initialized")
 
-    async def _rate_limited_request(self, url: str, headers: Optional[Dict] = None) -> Dict[str, Any]:
-        """Make rate-limited HTTP request"""
-        # Wait if needed
-        current_time = asyncio.get_event_loop().time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.request_delay:
-            await asyncio.sleep(self.request_delay - time_since_last)
-
-        self.last_request_time = asyncio.get_event_loop().time()
-
-        # Make request
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers or {}) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    logger.error(f"Request failed: {response.status}")
-                    return {}
+    def _bucket_for(self, url: str) -> TokenBucket:
+        host = urlsplit(url).hostname or ""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.host_rate, self.host_burst)
+        return bucket
+
+    async def _rate_limited_request(
+        self,
+        url: str,
+        headers: Optional[Dict] = None,
+        as_text: bool = False
+    ) -> Any:
+        """
+        GET through the shared fetch cache (JSON, or text with as_text).
+
+        The host's token bucket is only spent when the request actually
+        goes to the network, not on a cache hit.
+        """
+        response = await get_fetch_cache().fetch(
+            url,
+            headers=headers,
+            throttle=self._bucket_for(url).acquire,
+            client_name="web_researcher"
+        )
+        if response.ok:
+            return response.text() if as_text else response.json()
+        logger.error(f"Request failed: {response.status}")
+        return "" if as_text else {}
+
+    # ------------------------------------------------------------------
+    # Result cache
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def _cache_get(self, source: str, query: str) -> Optional[List[Dict[str, Any]]]:
+        key = (source, self._normalize_query(query))
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires, results = entry
+        if expires < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return results
+
+    def _cache_put(self, source: str, query: str, results: List[Dict[str, Any]]):
+        key = (source, self._normalize_query(query))
+        self._cache[key] = (time.monotonic() + self.cache_ttl_seconds, results)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+
+    async def _search_source(self, source: str, query: str) -> List[Dict[str, Any]]:
+        """Search one source, answering from the cache when possible"""
+        cached = self._cache_get(source, query)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached
+
+        search = {
+            "web": self.search_web,
+            "github": self.search_github,
+            "stackoverflow": self.search_stackoverflow,
+            "arxiv": self.search_arxiv,
+        }[source]
+        self.stats["source_searches"] += 1
+        results = await search(query)
+        # Empty results aren't cached: the search methods return [] on errors
+        # and rate limiting too, and those should be retried
+        if results:
+            self._cache_put(source, query, results)
+        return results
 
     async def search_web(self, query: str, num_results: int = 5) -> List[Dict[str, Any]]:
         """
@@ -189,31 +295,29 @@ class WebResearcher:
 
             url = f"http://export.arxiv.org/api/query?search_query=all:{query}&start=0&max_results={max_results}"
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        xml_data = await response.text()
-                        root = ET.fromstring(xml_data)
-
-                        results = []
-                        namespace = {'atom': 'http://www.w3.org/2005/Atom'}
-
-                        for entry in root.findall('atom:entry', namespace):
-                            title = entry.find('atom:title', namespace)
-                            link = entry.find('atom:id', namespace)
-                            summary = entry.find('atom:summary', namespace)
-
-                            results.append({
-                                "title": title.text.strip() if title is not None else "",
-                                "link": link.text if link is not None else "",
-                                "summary": summary.text.strip() if summary is not None else "",
-                                "source": "arxiv"
-                            })
+            xml_data = await self._rate_limited_request(url, as_text=True)
+            if not xml_data:
+                return []
 
-                        logger.info(f"Found {len(results)} ArXiv results for: {query}")
-                        return results
+            root = ET.fromstring(xml_data)
 
-            return []
+            results = []
+            namespace = {'atom': 'http://www.w3.org/2005/Atom'}
+
+            for entry in root.findall('atom:entry', namespace):
+                title = entry.find('atom:title', namespace)
+                link = entry.find('atom:id', namespace)
+                summary = entry.find('atom:summary', namespace)
+
+                results.append({
+                    "title": title.text.strip() if title is not None else "",
+                    "link": link.text if link is not None else "",
+                    "summary": summary.text.strip() if summary is not None else "",
+                    "source": "arxiv"
+                })
+
+            logger.info(f"Found {len(results)} ArXiv results for: {query}")
+            return results
 
         except Exception as e:
             logger.error(f"ArXiv search failed: {e}")
@@ -222,50 +326,70 @@ class WebResearcher:
     async def comprehensive_search(
         self,
         query: str,
-        sources: Optional[List[str]] = None
+        sources: Optional[List[str]] = None,
+        deadline_seconds: Optional[float] = None
     ) -> Dict[str, List[Dict[str, Any]]]:
         """
         Perform comprehensive search across multiple sources
 
+        All sources are searched concurrently, so this takes as long as the
+        slowest source rather than the sum of them. Sources that haven't
+        answered by the deadline are cancelled and return no results.
+
         Args:
             query: Search query
             sources: List of sources to search (default: all)
+            deadline_seconds: Overall time limit (default: the configured deadline)
 
         Returns:
             Results grouped by source
         """
         available_sources = ["web", "github", "stackoverflow", "arxiv"]
         sources_to_search = sources or available_sources
+        deadline = self.deadline_seconds if deadline_seconds is None else deadline_seconds
 
-        results = {}
-
-        # Create search tasks
-        tasks = []
-        if "web" in sources_to_search and self.serpapi_key:
-            tasks.append(("web", self.search_web(query)))
-
-        if "github" in sources_to_search:
-            tasks.append(("github", self.search_github(query)))
-
-        if "stackoverflow" in sources_to_search:
-            tasks.append(("stackoverflow", self.search_stackoverflow(query)))
-
-        if "arxiv" in sources_to_search:
-            tasks.append(("arxiv", self.search_arxiv(query)))
+        selected = [
+            source for source in available_sources
+            if source in sources_to_search and (source != "web" or self.serpapi_key)
+        ]
+        self.stats["searches"] += 1
 
         # Execute searches in parallel
-        for source, task in tasks:
-            try:
-                results[source] = await task
-            except Exception as e:
-                logger.error(f"Search failed for {source}: {e}")
-                results[source] = []
+        tasks = {
+            asyncio.ensure_future(self._search_source(source, query)): source
+            for source in selected
+        }
+        results = {source: [] for source in selected}
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=deadline)
+
+            for task in done:
+                source = tasks[task]
+                try:
+                    results[source] = task.result()
+                except Exception as e:
+                    logger.error(f"Search failed for {source}: {e}")
+
+            if pending:
+                for task in pending:
+                    task.cancel()
+                timed_out = sorted(tasks[task] for task in pending)
+                self.stats["timeouts"] += len(timed_out)
+                logger.warning(f"Search deadline ({deadline}s) passed without: {', '.join(timed_out)}")
 
         total_results = sum(len(r) for r in results.values())
         logger.info(f"Comprehensive search complete: {total_results} total results")
 
         return results
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Search counts, cache hits, deadline misses and per-host buckets"""
+        return {
+            **self.stats,
+            "cache_entries": len(self._cache),
+            "hosts": sorted(self._buckets),
+        }
+
     def format_research_context(self, results: Dict[str, List[Dict[str, Any]]]) -> str:
         """
         Format research results into context string for AI
@@ -413,7 +537,7 @@ class WebResearcher:
             # Strategy 3: Also try GitHub search (works without token, but rate limited)
             if len(findings) < max_results:
                 try:
-                    github_results = await self.search_github(query)
+                    github_results = await self._search_source("github", query)
                     for item in github_results[:max_results - len(findings)]:
                         url = item.get('link', '')
                         if url:
@@ -0,0 +1,681 @@
+"""
+Fetch Cache - shared HTTP GET layer with an on-disk response cache
+
+Every web reader (WebExplorer, DocumentationReader, CodeRepositoryAnalyzer,
+WebResearcher, web_search_tool) fetches through one FetchCache:
+
+- Responses are indexed in SQLite by request (URL, query, Accept and a hash
+  of any Authorization header). Bodies are stored once per content hash,
+  zlib-compressed, so the same page under several URLs costs one file.
+- Freshness comes from Cache-Control max-age (or the caller's max_age, or
+  the default). A stale entry is revalidated with If-None-Match /
+  If-Modified-Since, and a 304 just extends it.
+- Within the stale-while-revalidate window a stale entry is returned at
+  once and refreshed in the background.
+- extract() caches what a parser made of a body (title, main text, links)
+  keyed by the body's hash, so an unchanged page is never parsed twice.
+- offline=True never touches the network: entries are served whatever
+  their age and misses come back as 504, so tests can run against a
+  recorded cache directory.
+- Bodies larger than max_body_bytes are not read past the limit (413), and
+  callers that only want some content types get a 415 before the body is
+  downloaded. Neither is stored.
+- start_pruning() drops entries not refreshed within the retention period,
+  so the store doesn't grow without bound under the crawler.
+
+Network errors fall back to a stored copy when there is one.
+"""
+import asyncio
+import codecs
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Query parameters whose values are never written to the index
+SECRET_PARAM = re.compile(r'key|token|secret|password', re.I)
+
+# Response headers kept with an entry
+STORED_HEADERS = ('content-type', 'etag', 'last-modified', 'cache-control', 'content-encoding')
+
+CHARSET_PARAM = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+
+
+@dataclass
+class FetchResponse:
+    """A fetched (or cached) response"""
+    url: str
+    status: int
+    body: bytes = b''
+    headers: Dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False
+    stale: bool = False
+    revalidated: bool = False
+    body_hash: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200
+
+    @property
+    def charset(self) -> str:
+        """Charset named by the Content-Type header (utf-8 if missing or unknown)"""
+        match = CHARSET_PARAM.search(self.headers.get('content-type', ''))
+        if match:
+            try:
+                return codecs.lookup(match.group(1)).name
+            except LookupError:
+                pass
+        return 'utf-8'
+
+    def text(self, encoding: Optional[str] = None) -> str:
+        return self.body.decode(encoding or self.charset, errors='replace')
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+def _redact(url: str) -> str:
+    parts = urlsplit(url)
+    query = urlencode([
+        (key, '***' if SECRET_PARAM.search(key) else value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+    ])
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))
+
+
+def _parse_max_age(cache_control: str) -> Tuple[Optional[int], bool, bool]:
+    """(max-age, no-store, no-cache) from a Cache-Control header"""
+    directives = [d.strip().lower() for d in cache_control.split(',') if d.strip()]
+    max_age = None
+    for directive in directives:
+        if directive.startswith('max-age='):
+            try:
+                max_age = int(directive.split('=', 1)[1].strip('"'))
+            except ValueError:
+                pass
+    return max_age, 'no-store' in directives, 'no-cache' in directives
+
+
+class FetchCache:
+    """Shared GET-with-cache for web readers; see the module docstring"""
+
+    def __init__(
+        self,
+        cache_dir: str = "./data/http_cache",
+        default_max_age: float = 3600.0,
+        stale_while_revalidate: float = 86400.0,
+        offline: bool = False,
+        user_agent: str = 'Mozilla/5.0 (Darwin AI Bot) Learning/1.0',
+        max_body_bytes: int = 5 * 1024 * 1024
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.bodies_dir = self.cache_dir / "bodies"
+        self.index_path = self.cache_dir / "index.db"
+        self.default_max_age = default_max_age
+        self.stale_while_revalidate = stale_while_revalidate
+        self.offline = offline
+        self.user_agent = user_agent
+        self.max_body_bytes = max_body_bytes
+        self._pruner: Optional[asyncio.Task] = None
+
+        self._revalidating: Dict[str, Any] = {}
+        self._revalidating_lock = threading.Lock()
+        self.stats = {
+            'requests': 0,
+            'fresh_hits': 0,
+            'stale_hits': 0,
+            'revalidated': 0,
+            'fetched': 0,
+            'errors_served_stale': 0,
+            'offline_misses': 0,
+            'too_large': 0,
+            'wrong_type': 0,
+            'extract_hits': 0,
+            'extract_misses': 0,
+        }
+        self._init_store()
+
+    # ------------------------------------------------------------------
+    # Store
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.index_path), timeout=10)
+
+    def _init_store(self):
+        self.bodies_dir.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    url TEXT,
+                    status INTEGER,
+                    headers TEXT,
+                    body_hash TEXT,
+                    fetched_at REAL,
+                    expires_at REAL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS extracted (
+                    key TEXT PRIMARY KEY,
+                    value TEXT,
+                    created_at REAL
+                )
+            """)
+        conn.close()
+
+    @staticmethod
+    def request_key(url: str, params: Optional[Dict[str, Any]] = None,
+                    headers: Optional[Dict[str, str]] = None) -> str:
+        """Cache key of a GET: URL with sorted query, Accept, and hashed Authorization"""
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        query += [(str(k), str(v)) for k, v in (params or {}).items()]
+        full_url = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/',
+                               urlencode(sorted(query)), ''))
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        auth = headers.get('authorization')
+        material = '\x00'.join([
+            full_url,
+            headers.get('accept', ''),
+            hashlib.sha256(auth.encode()).hexdigest() if auth else '',
+        ])
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def _body_path(self, body_hash: str) -> Path:
+        return self.bodies_dir / body_hash[:2] / f"{body_hash}.z"
+
+    def _write_body(self, body: bytes) -> str:
+        body_hash = hashlib.sha256(body).hexdigest()
+        path = self._body_path(body_hash)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".tmp{threading.get_ident()}")
+            tmp_path.write_bytes(zlib.compress(body, 6))
+            os.replace(tmp_path, path)
+        return body_hash
+
+    def _read_body(self, body_hash: str) -> Optional[bytes]:
+        try:
+            return zlib.decompress(self._body_path(body_hash).read_bytes())
+        except (OSError, zlib.error):
+            return None
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT url, status, headers, body_hash, fetched_at, expires_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        body = self._read_body(row[3])
+        if body is None:
+            return None  # Body file lost: treat as a miss
+        return {
+            'url': row[0], 'status': row[1], 'headers': json.loads(row[2]),
+            'body_hash': row[3], 'fetched_at': row[4], 'expires_at': row[5], 'body': body,
+        }
+
+    def _store(self, key: str, url: str, status: int, headers: Dict[str, str],
+               body: bytes, max_age: Optional[float]) -> Optional[str]:
+        """Persist a 200 response; returns its body hash (None if not storable)"""
+        header_max_age, no_store, no_cache = _parse_max_age(headers.get('cache-control', ''))
+        if no_store or status != 200:
+            return None
+        if max_age is None:
+            max_age = 0 if no_cache else (header_max_age if header_max_age is not None else self.default_max_age)
+        now = time.time()
+        body_hash = self._write_body(body)
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, status, headers, body_hash, fetched_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, _redact(url), status, json.dumps(headers), body_hash, now, now + max_age)
+            )
+        conn.close()
+        return body_hash
+
+    def _extend(self, key: str, headers: Dict[str, str], max_age: Optional[float]):
+        """A 304: keep the body, move the expiry"""
+        header_max_age, _, no_cache = _parse_max_age(headers.get('cache-control', ''))
+        if max_age is None:
+            max_age = 0 if no_cache else (header_max_age if header_max_age is not None else self.default_max_age)
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "UPDATE responses SET fetched_at = ?, expires_at = ? WHERE key = ?",
+                (now, now + max_age, key)
+            )
+        conn.close()
+
+    @staticmethod
+    def _keep_headers(headers) -> Dict[str, str]:
+        return {name: headers[name] for name in STORED_HEADERS if headers.get(name) is not None}
+
+    @staticmethod
+    def _type_allowed(headers: Dict[str, str], content_types: Optional[Tuple[str, ...]]) -> bool:
+        if not content_types:
+            return True
+        content_type = headers.get('content-type', '').lower()
+        return any(wanted in content_type for wanted in content_types)
+
+    @staticmethod
+    def _conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+        conditional = {}
+        if entry['headers'].get('etag'):
+            conditional['If-None-Match'] = entry['headers']['etag']
+        if entry['headers'].get('last-modified'):
+            conditional['If-Modified-Since'] = entry['headers']['last-modified']
+        return conditional
+
+    @staticmethod
+    def _from_entry(url: str, entry: Dict[str, Any], **flags) -> FetchResponse:
+        return FetchResponse(
+            url=url, status=entry['status'], body=entry['body'], headers=entry['headers'],
+            from_cache=True, body_hash=entry['body_hash'], **flags
+        )
+
+    def _classify(self, entry: Optional[Dict[str, Any]], stale_while_revalidate: Optional[float]) -> str:
+        """fresh, stale-usable (serve and refresh in background), or expired"""
+        if entry is None:
+            return 'miss'
+        now = time.time()
+        if now < entry['expires_at']:
+            return 'fresh'
+        window = self.stale_while_revalidate if stale_while_revalidate is None else stale_while_revalidate
+        return 'stale' if now < entry['expires_at'] + window else 'expired'
+
+    # ------------------------------------------------------------------
+    # Async fetch (shared aiohttp pool)
+    # ------------------------------------------------------------------
+
+    async def fetch(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        max_age: Optional[float] = None,
+        stale_while_revalidate: Optional[float] = None,
+        timeout: float = 15.0,
+        throttle: Optional[Callable[[], Awaitable[Any]]] = None,
+        client_name: str = 'fetch_cache',
+        content_types: Optional[Tuple[str, ...]] = None
+    ) -> FetchResponse:
+        """
+        GET a URL through the cache.
+
+        Args:
+            url: URL to fetch
+            headers: Request headers (User-Agent defaults to the cache's)
+            params: Query parameters (part of the cache key)
+            max_age: Seconds a response stays fresh (default: its Cache-Control, else default_max_age)
+            stale_while_revalidate: Override of the stale window (0 disables it)
+            timeout: Total request timeout
+            throttle: Awaited before any network request (e.g. a rate limiter)
+            client_name: Name requests are recorded under in the HTTP pool metrics
+            content_types: Only download bodies whose Content-Type contains one
+                of these (others come back as 415 without a body)
+
+        Returns:
+            FetchResponse; non-200 responses are returned but not cached
+
+        Raises:
+            Network errors, when there is no stored copy to fall back to
+        """
+        self.stats['requests'] += 1
+        key = self.request_key(url, params, headers)
+        entry = await asyncio.to_thread(self._lookup, key)
+
+        if self.offline:
+            if entry is None:
+                self.stats['offline_misses'] += 1
+                return FetchResponse(url=url, status=504)
+            self.stats['fresh_hits'] += 1
+            return self._from_entry(url, entry)
+
+        state = self._classify(entry, stale_while_revalidate)
+        if state == 'fresh':
+            self.stats['fresh_hits'] += 1
+            return self._from_entry(url, entry)
+        if state == 'stale':
+            self.stats['stale_hits'] += 1
+            self._schedule_revalidation(key, url, headers, params, max_age, timeout, throttle,
+                                        client_name, content_types)
+            return self._from_entry(url, entry, stale=True)
+
+        try:
+            return await self._network_fetch(key, url, headers, params, max_age, timeout,
+                                             throttle, client_name, entry, content_types)
+        except Exception as e:
+            if entry is None:
+                raise
+            self.stats['errors_served_stale'] += 1
+            logger.warning(f"Fetch of {_redact(url)} failed ({e}); serving stored copy")
+            return self._from_entry(url, entry, stale=True)
+
+    async def _network_fetch(self, key, url, headers, params, max_age, timeout,
+                             throttle, client_name, entry, content_types=None) -> FetchResponse:
+        import aiohttp
+        from ai.models.http_pool import get_http_pool
+
+        request_headers = {'User-Agent': self.user_agent, **(headers or {})}
+        if entry is not None:
+            request_headers.update(self._conditional_headers(entry))
+
+        if throttle is not None:
+            await throttle()
+
+        pool = get_http_pool()
+        session = await pool.get_session()
+        start = time.time()
+        try:
+            async with session.get(
+                url,
+                params=params,
+                headers=request_headers,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                trace_request_ctx={'client_name': client_name}
+            ) as response:
+                status = response.status
+                response_headers = self._keep_headers(
+                    {name.lower(): value for name, value in response.headers.items()}
+                )
+                status, body = await self._read_limited(
+                    status, response_headers, response.content_length,
+                    response.content.iter_chunked(65536), content_types
+                )
+        except Exception:
+            pool.record_request(client_name, start, error=True)
+            raise
+        pool.record_request(client_name, start, error=status not in (200, 304, 413, 415))
+
+        return await asyncio.to_thread(
+            self._finish, key, url, status, response_headers, body, max_age, entry
+        )
+
+    async def _read_limited(self, status, headers, content_length, chunks, content_types) -> Tuple[int, bytes]:
+        """(status, body) of a 200, refusing unwanted types and oversized bodies unread"""
+        if status != 200:
+            return status, b''
+        if not self._type_allowed(headers, content_types):
+            self.stats['wrong_type'] += 1
+            return 415, b''
+        if content_length is not None and content_length > self.max_body_bytes:
+            self.stats['too_large'] += 1
+            return 413, b''
+        body = bytearray()
+        async for chunk in chunks:
+            body += chunk
+            if len(body) > self.max_body_bytes:
+                self.stats['too_large'] += 1
+                return 413, b''
+        return status, bytes(body)
+
+    def _finish(self, key, url, status, headers, body, max_age, entry) -> FetchResponse:
+        """Store or extend after a network response (blocking)"""
+        if status == 304 and entry is not None:
+            self.stats['revalidated'] += 1
+            merged = {**entry['headers'], **headers}
+            self._extend(key, merged, max_age)
+            return self._from_entry(url, entry, revalidated=True)
+
+        self.stats['fetched'] += 1
+        body_hash = self._store(key, url, status, headers, body, max_age)
+        return FetchResponse(url=url, status=status, body=body, headers=headers, body_hash=body_hash)
+
+    def _schedule_revalidation(self, key, url, headers, params, max_age, timeout, throttle,
+                               client_name, content_types):
+        with self._revalidating_lock:
+            if key in self._revalidating:
+                return
+            self._revalidating[key] = True
+
+        async def revalidate():
+            try:
+                entry = await asyncio.to_thread(self._lookup, key)
+                await self._network_fetch(key, url, headers, params, max_age, timeout,
+                                          throttle, client_name, entry, content_types)
+            except Exception as e:
+                logger.debug(f"Background revalidation of {_redact(url)} failed: {e}")
+            finally:
+                self._revalidating.pop(key, None)
+
+        task = asyncio.ensure_future(revalidate())
+        self._revalidating[key] = task
+
+    # ------------------------------------------------------------------
+    # Sync fetch (urllib, for code without an event loop of its own)
+    # ------------------------------------------------------------------
+
+    def fetch_sync(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        max_age: Optional[float] = None,
+        stale_while_revalidate: Optional[float] = None,
+        timeout: float = 15.0,
+        content_types: Optional[Tuple[str, ...]] = None
+    ) -> FetchResponse:
+        """fetch() for synchronous callers; background revalidation runs in a thread"""
+        self.stats['requests'] += 1
+        key = self.request_key(url, None, headers)
+        entry = self._lookup(key)
+
+        if self.offline:
+            if entry is None:
+                self.stats['offline_misses'] += 1
+                return FetchResponse(url=url, status=504)
+            self.stats['fresh_hits'] += 1
+            return self._from_entry(url, entry)
+
+        state = self._classify(entry, stale_while_revalidate)
+        if state == 'fresh':
+            self.stats['fresh_hits'] += 1
+            return self._from_entry(url, entry)
+        if state == 'stale':
+            self.stats['stale_hits'] += 1
+            with self._revalidating_lock:
+                start_thread = key not in self._revalidating
+                self._revalidating[key] = True
+            if start_thread:
+                def revalidate():
+                    try:
+                        self._network_fetch_sync(key, url, headers, max_age, timeout,
+                                                 self._lookup(key), content_types)
+                    except Exception as e:
+                        logger.debug(f"Background revalidation of {_redact(url)} failed: {e}")
+                    finally:
+                        self._revalidating.pop(key, None)
+                threading.Thread(target=revalidate, daemon=True).start()
+            return self._from_entry(url, entry, stale=True)
+
+        try:
+            return self._network_fetch_sync(key, url, headers, max_age, timeout, entry, content_types)
+        except Exception as e:
+            if entry is None:
+                raise
+            self.stats['errors_served_stale'] += 1
+            logger.warning(f"Fetch of {_redact(url)} failed ({e}); serving stored copy")
+            return self._from_entry(url, entry, stale=True)
+
+    def _network_fetch_sync(self, key, url, headers, max_age, timeout, entry, content_types=None) -> FetchResponse:
+        import urllib.error
+        import urllib.request
+
+        request_headers = {'User-Agent': self.user_agent, **(headers or {})}
+        if entry is not None:
+            request_headers.update(self._conditional_headers(entry))
+
+        request = urllib.request.Request(url, headers=request_headers)
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                status = response.status
+                response_headers = self._keep_headers(
+                    {name.lower(): value for name, value in response.headers.items()}
+                )
+                body = b''
+                if not self._type_allowed(response_headers, content_types):
+                    self.stats['wrong_type'] += 1
+                    status = 415
+                else:
+                    body = response.read(self.max_body_bytes + 1)
+                    if len(body) > self.max_body_bytes:
+                        self.stats['too_large'] += 1
+                        status, body = 413, b''
+        except urllib.error.HTTPError as e:
+            status = e.code
+            response_headers = self._keep_headers(
+                {name.lower(): value for name, value in e.headers.items()}
+            )
+            body = b''
+        return self._finish(key, url, status, response_headers, body, max_age, entry)
+
+    # ------------------------------------------------------------------
+    # Extracted text
+    # ------------------------------------------------------------------
+
+    def _extract_key(self, name: str, text: str, args: tuple) -> str:
+        material = f"{name}\x00{json.dumps(args, default=str)}\x00{text}"
+        return hashlib.sha256(material.encode('utf-8', errors='replace')).hexdigest()
+
+    def extract_sync(self, name: str, text: str, extractor: Callable[..., Any], *args) -> Any:
+        """
+        extractor(text, *args), cached by (name, args, text hash).
+
+        The name identifies the extractor and should change with its
+        behaviour (e.g. 'web_explorer.page/v2'). Results must be JSON
+        serializable; None is not cached.
+        """
+        key = self._extract_key(name, text, args)
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM extracted WHERE key = ?", (key,)).fetchone()
+        finally:
+            conn.close()
+        if row is not None:
+            self.stats['extract_hits'] += 1
+            return json.loads(row[0])
+
+        self.stats['extract_misses'] += 1
+        value = extractor(text, *args)
+        if value is not None:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO extracted (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), time.time())
+                )
+            conn.close()
+        return value
+
+    async def extract(self, name: str, text: str, extractor: Callable[..., Any], *args) -> Any:
+        """extract_sync() in a worker thread (parsing is CPU-bound)"""
+        return await asyncio.to_thread(self.extract_sync, name, text, extractor, *args)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def prune(self, older_than_seconds: float) -> Dict[str, int]:
+        """Drop entries not refreshed for this long, and bodies nothing refers to"""
+        cutoff = time.time() - older_than_seconds
+        conn = self._connect()
+        with conn:
+            responses = conn.execute("DELETE FROM responses WHERE fetched_at < ?", (cutoff,)).rowcount
+            extracted = conn.execute("DELETE FROM extracted WHERE created_at < ?", (cutoff,)).rowcount
+            referenced = {row[0] for row in conn.execute("SELECT DISTINCT body_hash FROM responses")}
+        conn.close()
+
+        bodies = 0
+        for path in self.bodies_dir.glob("*/*.z"):
+            if path.stem not in referenced:
+                try:
+                    path.unlink()
+                    bodies += 1
+                except OSError:
+                    pass
+        return {'responses': responses, 'extracted': extracted, 'bodies': bodies}
+
+    def start_pruning(self, retention_seconds: float, interval_seconds: float = 21600.0):
+        """Run prune(retention_seconds) now and then every interval_seconds (needs a running loop)"""
+        if self._pruner is not None or retention_seconds <= 0:
+            return
+
+        async def prune_loop():
+            while True:
+                try:
+                    removed = await asyncio.to_thread(self.prune, retention_seconds)
+                    if any(removed.values()):
+                        logger.info(f"Fetch cache pruned: {removed}")
+                except Exception as e:
+                    logger.error(f"Fetch cache prune failed: {e}")
+                await asyncio.sleep(interval_seconds)
+
+        self._pruner = asyncio.ensure_future(prune_loop())
+
+    async def stop_pruning(self):
+        if self._pruner is None:
+            return
+        self._pruner.cancel()
+        try:
+            await self._pruner
+        except asyncio.CancelledError:
+            pass
+        self._pruner = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus entry counts and stored size"""
+        stats = dict(self.stats)
+        try:
+            conn = self._connect()
+            stats['entries'] = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            stats['extracted_entries'] = conn.execute("SELECT COUNT(*) FROM extracted").fetchone()[0]
+            conn.close()
+        except sqlite3.Error:
+            pass
+        stats['stored_bytes'] = sum(p.stat().st_size for p in self.bodies_dir.glob("*/*.z"))
+        requests = stats['requests']
+        hits = stats['fresh_hits'] + stats['stale_hits'] + stats['revalidated']
+        stats['hit_rate'] = round(hits / requests, 3) if requests else 0.0
+        stats['offline'] = self.offline
+        return stats
+
+
+# Global instance
+_fetch_cache: Optional[FetchCache] = None
+
+
+def get_fetch_cache() -> FetchCache:
+    """Get the process-wide fetch cache"""
+    global _fetch_cache
+    if _fetch_cache is None:
+        _fetch_cache = FetchCache()
+    return _fetch_cache
+
+
+def configure_fetch_cache(**kwargs) -> FetchCache:
+    """Replace the global fetch cache with one using the given settings"""
+    global _fetch_cache
+    _fetch_cache = FetchCache(**kwargs)
+    return _fetch_cache
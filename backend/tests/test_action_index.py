@@ -0,0 +1,102 @@
+"""Tests for the proactive action eligibility index."""
+from datetime import datetime
+
+import pytest
+
+from consciousness.action_index import ActionIndex
+from consciousness.proactive_engine import ActionCategory, ActionPriority, ProactiveAction
+
+NOW = 1_800_000_000.0
+
+
+def action(action_id="a", cooldown_minutes=10, last_executed=None, enabled=True, disabled_until=None):
+    return ProactiveAction(
+        id=action_id,
+        name=action_id,
+        description="Test action",
+        category=ActionCategory.LEARNING,
+        priority=ActionPriority.MEDIUM,
+        trigger_condition="test",
+        cooldown_minutes=cooldown_minutes,
+        last_executed=last_executed,
+        enabled=enabled,
+        disabled_until=disabled_until,
+    )
+
+
+def at(seconds):
+    return datetime.fromtimestamp(NOW + seconds)
+
+
+@pytest.fixture
+def index():
+    return ActionIndex()
+
+
+class TestEligibility:
+    def test_never_run_action_is_ready(self, index):
+        index.refresh(action(), now=NOW)
+        assert index.ready_ids(now=NOW) == {"a"}
+
+    def test_cooldown_promotes_when_it_expires(self, index):
+        index.refresh(action(last_executed=at(0)), now=NOW)
+
+        assert index.ready_ids(now=NOW + 599) == set()
+        assert index.waiting_count() == 1
+        assert index.next_ready_at() == at(600)
+        assert index.ready_ids(now=NOW + 600) == {"a"}
+        assert index.waiting_count() == 0
+
+    def test_disabled_until_extends_cooldown(self, index):
+        index.refresh(action(last_executed=at(0), disabled_until=at(3600)), now=NOW)
+
+        assert index.ready_ids(now=NOW + 600) == set()
+        assert index.ready_ids(now=NOW + 3600) == {"a"}
+
+    def test_disabled_action_is_never_ready(self, index):
+        index.refresh(action(enabled=False), now=NOW)
+
+        assert index.ready_ids(now=NOW + 10**6) == set()
+        assert index.get_stats()["disabled"] == 1
+
+    def test_refresh_supersedes_stale_heap_entry(self, index):
+        index.refresh(action(last_executed=at(0)), now=NOW)
+        index.refresh(action(last_executed=at(1000)), now=NOW + 1000)  # Ran again
+
+        assert index.ready_ids(now=NOW + 700) == set()
+        assert index.next_ready_at() == at(1600)
+        assert index.ready_ids(now=NOW + 1600) == {"a"}
+
+    def test_remove(self, index):
+        index.refresh(action(), now=NOW)
+        index.remove("a")
+        assert index.ready_ids(now=NOW) == set()
+
+    def test_heap_is_compacted(self, index):
+        for i in range(200):
+            index.refresh(action(last_executed=at(i)), now=NOW)
+        assert index.get_stats()["heap_size"] < 200
+        assert index.waiting_count() == 1
+
+
+class TestScoreCache:
+    def test_hit_only_for_same_signature(self, index):
+        index.store_score("a", ("morning", 3), 0.8)
+
+        assert index.cached_score("a", ("morning", 3)) == 0.8
+        assert index.cached_score("a", ("evening", 3)) is None
+
+    def test_refresh_drops_score_and_bumps_version(self, index):
+        index.store_score("a", "sig", 0.8)
+        before = index.version("a")
+
+        index.refresh(action(), now=NOW)
+
+        assert index.cached_score("a", "sig") is None
+        assert index.version("a") == before + 1
+
+    def test_invalidate_scores(self, index):
+        index.store_score("a", "sig", 0.8)
+        index.store_score("b", "sig", 0.5)
+        index.invalidate_scores()
+        assert index.get_stats()["cached_scores"] == 0
@@ -0,0 +1,213 @@
+"""Tests for circuit breakers and probe handling in adaptive routing."""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from ai.adaptive_routing import CircuitBreaker
+from ai.models.base_client import BaseModelClient
+from ai.models.claude_client import ClaudeClient
+from ai.multi_model_router import MultiModelRouter
+
+
+class FakeModel:
+    """Model client stand-in; generate() sleeps for `delay` seconds"""
+
+    def __init__(self, delay: float = 0.0, text: str = "ok"):
+        self.model_name = "fake"
+        self.delay = delay
+        self.text = text
+        self.avg_latency_ms = 1
+        self.cost_per_1k_tokens = 0.0
+        self.input_cost_per_1m = 0.0
+        self.output_cost_per_1m = 0.0
+        self.last_truncated = False
+
+    async def generate(self, prompt, system_prompt=None, **kwargs):
+        await asyncio.sleep(self.delay)
+        return self.text
+
+    def get_capabilities(self):
+        return []
+
+
+def open_then_cool(breaker: CircuitBreaker):
+    """Trip the breaker and let its cooldown pass"""
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    breaker.opened_at -= breaker.cooldown_seconds
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker("m", failure_threshold=2, cooldown_seconds=60)
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+        assert breaker.is_open()
+
+    def test_success_resets_failures(self):
+        breaker = CircuitBreaker("m", failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_allows_single_probe(self):
+        breaker = CircuitBreaker("m", failure_threshold=1, cooldown_seconds=60)
+        open_then_cool(breaker)
+
+        assert breaker.allow_request()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow_request()
+        assert breaker.is_open()
+
+    def test_probe_success_closes(self):
+        breaker = CircuitBreaker("m", failure_threshold=1)
+        open_then_cool(breaker)
+        breaker.allow_request()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_probe_failure_reopens(self):
+        breaker = CircuitBreaker("m", failure_threshold=1)
+        open_then_cool(breaker)
+        breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.times_opened == 2
+
+    def test_release_probe_lets_next_request_probe(self):
+        breaker = CircuitBreaker("m", failure_threshold=1)
+        open_then_cool(breaker)
+        breaker.allow_request()
+        breaker.release_probe()
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.is_open()
+        assert breaker.allow_request()
+
+
+class TestCancelledProbe:
+    @pytest.fixture
+    def router(self, tmp_path):
+        router = MultiModelRouter({
+            "ollama_enabled": False,
+            "response_cache_enabled": False,
+            "hedging_enabled": False,
+            "stats_db_path": str(tmp_path / "stats.db"),
+        })
+        router.models["ollama"] = FakeModel(delay=5)
+        router.models["haiku"] = FakeModel()
+        return router
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_releases_circuit(self, router):
+        breaker = router._breaker("ollama")
+        open_then_cool(breaker)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                router.generate("probe", "hello", preferred_model="ollama"),
+                timeout=0.05
+            )
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.is_open()
+        assert breaker.allow_request()
+
+    @pytest.mark.asyncio
+    async def test_completed_probe_closes_circuit(self, router):
+        router.models["ollama"] = FakeModel()
+        breaker = router._breaker("ollama")
+        open_then_cool(breaker)
+
+        result = await router.generate("probe", "hello", preferred_model="ollama")
+
+        assert result["model_used"] == "ollama"
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+class CountingModel(FakeModel):
+    """FakeModel that records its peak number of concurrent calls"""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        super().__init__(delay=delay)
+        self.fail = fail
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate(self, prompt, system_prompt=None, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("down")
+            return self.text
+        finally:
+            self.in_flight -= 1
+
+
+class TestPerModelBound:
+    @pytest.fixture
+    def router(self, tmp_path):
+        router = MultiModelRouter({
+            "ollama_enabled": False,
+            "response_cache_enabled": False,
+            "hedging_enabled": False,
+            "max_concurrent_per_model": 2,
+            "stats_db_path": str(tmp_path / "stats.db"),
+        })
+        router.models["ollama"] = CountingModel(fail=True)
+        router.models["haiku"] = CountingModel(delay=0.02)
+        return router
+
+    @pytest.mark.asyncio
+    async def test_fallbacks_count_against_the_model_that_ran(self, router):
+        results = await asyncio.gather(*[
+            router.generate("task", "hello", preferred_model="ollama")
+            for _ in range(6)
+        ])
+
+        assert all(r["model_used"] == "haiku (fallback)" for r in results)
+        assert router.models["haiku"].peak == 2
+
+
+class TestHedgingBlockingPrimary:
+    @pytest.mark.asyncio
+    async def test_hedge_fires_while_sdk_primary_blocks(self, tmp_path):
+        primary = ClaudeClient.__new__(ClaudeClient)
+        BaseModelClient.__init__(primary, "claude-test", "test")
+
+        def create(**kwargs):
+            time.sleep(0.5)  # Sync SDK call, as in production
+            return SimpleNamespace(
+                content=[SimpleNamespace(text="slow")],
+                stop_reason="end_turn",
+                usage=SimpleNamespace(input_tokens=1, output_tokens=1),
+            )
+
+        primary.client = SimpleNamespace(messages=SimpleNamespace(create=create))
+
+        router = MultiModelRouter({
+            "ollama_enabled": False,
+            "response_cache_enabled": False,
+            "hedge_after_ms": 50,
+            "stats_db_path": str(tmp_path / "stats.db"),
+        })
+        router.models.clear()
+        router.models["claude"] = primary
+        router.models["haiku"] = FakeModel(text="fast")
+
+        started = time.perf_counter()
+        result = await router._hedged_generate("claude", "task", "hello", None, None, {})
+        elapsed = time.perf_counter() - started
+
+        assert result["model_used"] == "haiku"
+        assert result["hedged"]
+        assert router.hedge_stats["secondary_won"] == 1
+        assert elapsed < 0.3
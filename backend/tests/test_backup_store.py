@@ -0,0 +1,152 @@
+"""Tests for incremental backups and the content-addressed backup store."""
+import sqlite3
+
+import pytest
+
+from tools import backup_tool
+
+
+@pytest.fixture
+def layout(tmp_path, monkeypatch):
+    """Project, data and backup roots under tmp_path"""
+    project = tmp_path / "project"
+    data = tmp_path / "data"
+    backup = tmp_path / "backup"
+    for path in (project, data, backup):
+        path.mkdir()
+    monkeypatch.setattr(backup_tool, "PROJECT_PATH", project)
+    monkeypatch.setattr(backup_tool, "CODE_PATH", tmp_path / "missing")
+    monkeypatch.setattr(backup_tool, "DATA_PATH", data)
+    monkeypatch.setattr(backup_tool, "BACKUP_ROOT", backup)
+    return project, data, backup
+
+
+def objects_in_store(backup):
+    return sorted(p.name for p in (backup / "store" / "objects").rglob("*") if p.is_file())
+
+
+class TestIncrementalBackup:
+    @pytest.mark.asyncio
+    async def test_identical_content_is_stored_once(self, layout):
+        project, data, backup = layout
+        (project / "a.py").write_text("same")
+        (project / "b.py").write_text("same")
+        (project / "c.py").write_text("other")
+
+        first = await backup_tool.create_incremental_backup(include_data=False, label="one")
+        assert first["success"] and first["total_files"] == 3
+        assert first["new_objects"] == 2
+        assert len(objects_in_store(backup)) == 2
+
+        (project / "d.py").write_text("other")  # Copy of existing content
+        second = await backup_tool.create_incremental_backup(include_data=False, label="two")
+        assert second["new_objects"] == 0
+        assert second["reused_files"] == 4
+        assert len(objects_in_store(backup)) == 2
+
+    @pytest.mark.asyncio
+    async def test_sqlite_is_snapshotted_with_its_wal(self, layout):
+        project, data, backup = layout
+        db_path = data / "memory.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE t (v TEXT)")
+        conn.execute("INSERT INTO t VALUES ('committed')")
+        conn.commit()  # Still in the WAL: the connection stays open
+
+        result = await backup_tool.create_incremental_backup(include_code=False, label="db")
+        conn.close()
+
+        manifest = backup_tool._load_json(backup / "snapshots" / f"{result['backup_name']}.json", None)
+        assert "data/memory.db-wal" not in manifest["files"]
+        entry = manifest["files"]["data/memory.db"]
+        assert entry["sqlite"]
+        snapshot = sqlite3.connect(backup_tool._object_path(entry["hash"]))
+        try:
+            assert snapshot.execute("SELECT v FROM t").fetchall() == [("committed",)]
+        finally:
+            snapshot.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_file_marks_backup_partial(self, layout, monkeypatch):
+        project, data, backup = layout
+        (project / "ok.py").write_text("fine")
+        (project / "bad.py").write_text("broken")
+        real_backup_file = backup_tool._backup_file
+
+        def failing(name, source, index):
+            if name.endswith("bad.py"):
+                raise OSError("unreadable")
+            return real_backup_file(name, source, index)
+
+        monkeypatch.setattr(backup_tool, "_backup_file", failing)
+        result = await backup_tool.create_incremental_backup(include_data=False)
+
+        assert not result["success"]
+        assert result["partial"]
+        assert result["total_files"] == 1
+        assert result["total_errors"] == 1
+
+
+class TestRestore:
+    @pytest.mark.asyncio
+    async def test_prefix_restores_only_selected_files(self, layout):
+        project, data, backup = layout
+        (data / "identity").mkdir()
+        (data / "identity" / "core.json").write_text('{"name": "darwin"}')
+        (data / "other.json").write_text("{}")
+        (project / "main.py").write_text("print()")
+        made = await backup_tool.create_incremental_backup(label="r")
+
+        result = await backup_tool.restore_backup(made["backup_name"], path_prefix="data/identity")
+
+        target = backup / "restore" / made["backup_name"]
+        assert result["success"] and result["restored_files"] == 1
+        assert (target / "data" / "identity" / "core.json").read_text() == '{"name": "darwin"}'
+        assert not (target / "data" / "other.json").exists()
+        assert not (target / "code").exists()
+
+        again = await backup_tool.restore_backup(made["backup_name"], path_prefix="data/identity")
+        assert again["restored_files"] == 0 and again["unchanged_files"] == 1
+
+    @pytest.mark.asyncio
+    async def test_target_outside_restore_root_is_refused(self, layout):
+        project, data, backup = layout
+        (project / "main.py").write_text("print()")
+        made = await backup_tool.create_incremental_backup(include_data=False)
+
+        result = await backup_tool.restore_backup(made["backup_name"], target_dir="../../escape")
+
+        assert not result["success"]
+
+
+class TestVerify:
+    @pytest.mark.asyncio
+    async def test_new_objects_are_not_rehashed(self, layout):
+        project, data, backup = layout
+        (project / "a.py").write_text("a")
+        (project / "b.py").write_text("b")
+        made = await backup_tool.create_incremental_backup(include_data=False)
+
+        result = await backup_tool.verify_backup(made["backup_name"])
+        assert result["success"]
+        assert result["objects_checked"] == 2
+        assert result["objects_rehashed"] == 0
+
+        deep = await backup_tool.verify_backup(made["backup_name"], deep=True)
+        assert deep["objects_rehashed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_corrupted_object_is_reported(self, layout):
+        project, data, backup = layout
+        (project / "a.py").write_text("a")
+        made = await backup_tool.create_incremental_backup(include_data=False)
+        manifest = backup_tool._load_json(backup / "snapshots" / f"{made['backup_name']}.json", None)
+        obj = backup_tool._object_path(manifest["files"]["code/a.py"]["hash"])
+        obj.chmod(0o644)
+        obj.write_text("z")  # Same size, different content
+
+        result = await backup_tool.verify_backup(made["backup_name"], deep=True)
+
+        assert not result["success"]
+        assert result["errors"] == ["CORRUPTED: code/a.py"]
@@ -0,0 +1,80 @@
+"""Tests for the consciousness stream's write-behind buffer."""
+import threading
+
+import pytest
+
+from consciousness.consciousness_stream import ConsciousEvent, ConsciousnessStream
+
+
+@pytest.fixture
+def stream(tmp_path):
+    # Long interval and large batches: nothing is flushed unless a test asks
+    stream = ConsciousnessStream(
+        db_path=str(tmp_path / "stream.db"), flush_interval_ms=60_000, batch_size=10_000
+    )
+    yield stream
+    stream.close()
+
+
+def event(source="inner_voice", event_type="thought", salience=0.8):
+    return ConsciousEvent.create(source, event_type, "title", "content", salience=salience)
+
+
+class TestPendingEvents:
+    def test_stats_include_unflushed_events(self, stream):
+        stream.publish(event())
+        stream.publish(event(source="dream_engine", event_type="dream"))
+        stream.flush()
+        stream.publish(event())
+
+        stats = stream.get_stats()
+
+        assert stats["total_events"] == 3
+        assert stats["by_type"] == {"thought": 2, "dream": 1}
+        assert stats["by_source"]["inner_voice"] == 2
+        assert stats["write_behind"]["pending"] == 1
+
+    def test_context_summary_sees_events_beyond_the_ring(self, stream):
+        for _ in range(stream.RING_SIZE):
+            stream.publish(event(salience=0.1))
+        stream.publish(event(event_type="dream", salience=0.9))
+        for _ in range(stream.RING_SIZE):
+            stream.publish(event(salience=0.1))
+
+        summary = stream.get_context_summary(limit=8, min_salience=0.3)
+
+        assert summary.count("[inner_voice]") == 1
+
+    def test_batch_being_written_stays_visible(self, stream, monkeypatch):
+        stream.publish(event(event_type="dream"))
+        seen = {}
+        write_events = stream._write_events
+
+        def observe_then_write(events):
+            seen["recent"] = stream.get_recent(event_type_filter="dream")
+            write_events(events)
+
+        monkeypatch.setattr(stream, "_write_events", observe_then_write)
+        stream._by_type.clear()  # Force the DB + unflushed path
+        stream.flush()
+
+        assert len(seen["recent"]) == 1
+
+
+class TestWriteStats:
+    def test_concurrent_publishes_are_all_counted(self, stream):
+        def publish_many():
+            for _ in range(500):
+                stream.publish(event())
+
+        threads = [threading.Thread(target=publish_many) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stream.flush()
+
+        stats = stream.get_stats()["write_behind"]
+        assert stats["published"] == 2000
+        assert stats["flushed_events"] == 2000
+        assert stats["pending"] == 0
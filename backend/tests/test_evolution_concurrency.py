@@ -0,0 +1,49 @@
+"""Tests for the per-model bound in concurrent evolution."""
+import asyncio
+
+import pytest
+
+from core.evolution import EvolutionEngine
+
+
+class ProviderNucleus:
+    """Nucleus without a router: every generation goes to one provider"""
+
+    router = None
+    provider = "claude"
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate_solution(self, task, use_rag=True, use_web_research=False, on_token=None):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.02)
+            return "print('ok')"
+        finally:
+            self.in_flight -= 1
+
+
+class TestProviderBound:
+    @pytest.mark.asyncio
+    async def test_direct_provider_generations_are_bounded(self):
+        nucleus = ProviderNucleus()
+        engine = EvolutionEngine(nucleus, None, None, concurrent=True, max_generations_per_model=2)
+        task = {"id": "t", "description": "task"}
+
+        population = await engine._create_population(task, 0, 6, use_rag=False, concurrent=True)
+
+        assert len(population) == 6
+        assert nucleus.peak == 2
+        assert all(p["model_used"] == "claude" for p in population)
+
+    @pytest.mark.asyncio
+    async def test_sequential_mode_runs_one_at_a_time(self):
+        nucleus = ProviderNucleus()
+        engine = EvolutionEngine(nucleus, None, None, max_generations_per_model=4)
+
+        await engine._create_population({"id": "t", "description": "task"}, 0, 3, use_rag=False)
+
+        assert nucleus.peak == 1
@@ -0,0 +1,160 @@
+"""Tests for the shared on-disk FetchCache."""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from services.fetch_cache import FetchCache
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Serves /page (HTML with an ETag), /latin1, /image, /big and counts requests"""
+    hits = {}
+
+    def do_GET(self):
+        Handler.hits[self.path] = Handler.hits.get(self.path, 0) + 1
+        if self.path == '/page':
+            if self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self._send(b'<html><title>Hi</title></html>', 'text/html', etag='"v1"')
+        elif self.path == '/latin1':
+            self._send('<p>café</p>'.encode('latin-1'), 'text/html; charset="ISO-8859-1"')
+        elif self.path == '/image':
+            self._send(b'\x89PNG' * 100, 'image/png')
+        elif self.path == '/big':
+            self._send(b'x' * 2048, 'text/html')
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+    def _send(self, body, content_type, etag=None):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'max-age=0')
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def server():
+    httpd = HTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}'
+    httpd.shutdown()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    Handler.hits = {}
+    return FetchCache(cache_dir=str(tmp_path), stale_while_revalidate=0, max_body_bytes=1024)
+
+
+class TestRequestKey:
+    def test_query_order_does_not_matter(self):
+        assert FetchCache.request_key('http://a/x?b=2&a=1') == FetchCache.request_key('http://a/x?a=1&b=2')
+
+    def test_params_merge_with_query(self):
+        assert FetchCache.request_key('http://a/x?a=1', {'b': 2}) == FetchCache.request_key('http://a/x?a=1&b=2')
+
+    def test_authorization_separates_entries(self):
+        assert (FetchCache.request_key('http://a/x', headers={'Authorization': 'one'}) !=
+                FetchCache.request_key('http://a/x', headers={'Authorization': 'two'}))
+
+
+class TestFetchSync:
+    def test_stores_and_revalidates_with_etag(self, server, cache):
+        first = cache.fetch_sync(server + '/page')
+        assert first.ok and not first.from_cache
+
+        # max-age=0: the second request revalidates and gets a 304
+        second = cache.fetch_sync(server + '/page')
+        assert second.revalidated and second.body == first.body
+        assert Handler.hits['/page'] == 2
+
+    def test_fresh_entry_served_without_request(self, server, cache):
+        cache.fetch_sync(server + '/page', max_age=60)
+        response = cache.fetch_sync(server + '/page', max_age=60)
+
+        assert response.from_cache and not response.revalidated
+        assert Handler.hits['/page'] == 1
+
+    def test_unwanted_type_refused_and_not_stored(self, server, cache):
+        response = cache.fetch_sync(server + '/image', content_types=('html',))
+
+        assert response.status == 415 and response.body == b''
+        assert cache.get_stats()['entries'] == 0
+        assert cache.stats['wrong_type'] == 1
+
+    def test_oversized_body_refused_and_not_stored(self, server, cache):
+        response = cache.fetch_sync(server + '/big')
+
+        assert response.status == 413
+        assert cache.get_stats()['entries'] == 0
+        assert cache.stats['too_large'] == 1
+
+    def test_text_decoded_with_header_charset(self, server, cache, tmp_path):
+        assert cache.fetch_sync(server + '/latin1').text() == '<p>café</p>'
+
+        cached = FetchCache(cache_dir=str(tmp_path), offline=True).fetch_sync(server + '/latin1')
+        assert cached.from_cache and cached.text() == '<p>café</p>'
+        assert cache.fetch_sync(server + '/page').charset == 'utf-8'
+
+    def test_offline_serves_entries_and_misses_with_504(self, server, cache, tmp_path):
+        cache.fetch_sync(server + '/page')
+        offline = FetchCache(cache_dir=str(tmp_path), offline=True)
+
+        assert offline.fetch_sync(server + '/page').ok
+        assert offline.fetch_sync(server + '/missing').status == 504
+
+
+class TestExtractAndPrune:
+    def test_extract_runs_once_per_text(self, cache):
+        calls = []
+
+        def extractor(text):
+            calls.append(text)
+            return {'length': len(text)}
+
+        assert cache.extract_sync('test/v1', 'abc', extractor) == {'length': 3}
+        assert cache.extract_sync('test/v1', 'abc', extractor) == {'length': 3}
+        assert calls == ['abc']
+
+    def test_prune_drops_old_entries_and_orphan_bodies(self, server, cache):
+        cache.fetch_sync(server + '/page')
+        cache.extract_sync('test/v1', 'abc', lambda text: text)
+        time.sleep(0.01)
+
+        removed = cache.prune(older_than_seconds=0)
+
+        assert removed == {'responses': 1, 'extracted': 1, 'bodies': 1}
+        assert cache.get_stats()['stored_bytes'] == 0
+
+
+class TestFetchAsync:
+    @pytest.mark.asyncio
+    async def test_unwanted_type_refused_before_body(self, server, cache):
+        response = await cache.fetch(server + '/image', content_types=('html',))
+        assert response.status == 415 and response.body == b''
+
+    @pytest.mark.asyncio
+    async def test_oversized_body_refused(self, server, cache):
+        response = await cache.fetch(server + '/big')
+        assert response.status == 413
+        assert cache.get_stats()['entries'] == 0
+
+    @pytest.mark.asyncio
+    async def test_pruning_task_starts_and_stops(self, cache):
+        cache.start_pruning(retention_seconds=60, interval_seconds=3600)
+        assert cache._pruner is not None
+        await cache.stop_pruning()
+        assert cache._pruner is None
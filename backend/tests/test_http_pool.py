@@ -0,0 +1,31 @@
+"""Tests for per-client attribution in the shared HTTP connection pool."""
+import httpx
+
+from ai.models.http_pool import HTTPConnectionPool
+
+
+def mock_transport():
+    return httpx.MockTransport(lambda request: httpx.Response(200, json={}))
+
+
+class TestHttpxAttribution:
+    def test_sdk_traffic_is_counted_per_client_name(self):
+        pool = HTTPConnectionPool()
+        pool._httpx_transport = mock_transport()
+
+        pool.get_httpx_client("claude-sonnet").get("https://api.anthropic.com/v1/messages")
+        pool.get_httpx_client("claude-haiku").get("https://api.anthropic.com/v1/messages")
+        pool.get_httpx_client("claude-haiku").get("https://api.anthropic.com/v1/messages")
+
+        assert pool.get_client_stats("claude-sonnet")["http_requests"] == 1
+        assert pool.get_client_stats("claude-haiku")["http_requests"] == 2
+        assert "api.anthropic.com" not in pool.client_metrics
+
+    def test_clients_share_one_transport(self):
+        pool = HTTPConnectionPool()
+        first = pool.get_httpx_client("a")
+
+        assert pool.get_httpx_client("a") is first
+        assert pool.get_httpx_client("b") is not first
+        assert first._transport is pool._httpx_transport
+        assert len(pool._httpx_clients) == 2
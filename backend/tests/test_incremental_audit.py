@@ -0,0 +1,56 @@
+"""Tests for the incremental Darwin auditor."""
+from unittest.mock import patch
+
+import pytest
+
+from tools.darwin_auditor.incremental import AuditCache, IncrementalAudit
+from tools.darwin_auditor.quality_checks import QualityChecker
+from tools.darwin_auditor.security_checks import SecurityChecker
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "main.py").write_text("def main():\n    return 1\n")
+    (tmp_path / "requirements.txt").write_text("requests==2.0\n")
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / "requirements.txt").write_text("x\n")
+    (tmp_path / "node_modules" / "pkg" / "setup.py").write_text("x = 1\n")
+    return tmp_path
+
+
+@pytest.fixture
+def audit(project, tmp_path_factory):
+    cache_path = tmp_path_factory.mktemp("cache") / "audit.json"
+    return IncrementalAudit(
+        project,
+        SecurityChecker(str(project)),
+        QualityChecker(str(project)),
+        AuditCache(cache_path),
+        workers=1
+    )
+
+
+class TestIncrementalAudit:
+    def test_walk_prunes_excluded_dirs(self, audit, project):
+        files, requirements = audit.iter_project_files({"node_modules"})
+
+        assert files == [str(project / "app" / "main.py")]
+        assert requirements == [str(project / "requirements.txt")]
+
+    def test_dependencies_rechecked_only_when_requirements_change(self, audit, project):
+        with patch.object(audit.security, "check_dependencies", return_value=[]) as check:
+            audit.run({"node_modules"})
+            audit.run({"node_modules"})
+            assert check.call_count == 1
+
+            (project / "requirements.txt").write_text("requests==3.0\n")
+            audit.run({"node_modules"})
+            assert check.call_count == 2
+
+    def test_unchanged_files_come_from_cache(self, audit):
+        with patch.object(audit.security, "check_dependencies", return_value=[]):
+            audit.run({"node_modules"})
+            with patch("tools.darwin_auditor.incremental.analyze_file") as analyze:
+                audit.run({"node_modules"})
+                analyze.assert_not_called()
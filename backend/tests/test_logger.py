@@ -0,0 +1,82 @@
+"""Tests for the shared logging pipeline."""
+import logging
+
+import pytest
+
+from utils import logger as logger_module
+from utils.logger import RateLimitFilter, _LoggingPipeline, configure_logging
+
+
+def record(level=logging.INFO, lineno=10, name="darwin.test"):
+    return logging.LogRecord(name, level, "/app/module.py", lineno, "message", None, None)
+
+
+class TestRateLimitFilter:
+    def test_unlimited_by_default(self):
+        limit = RateLimitFilter()
+        assert all(limit.filter(record()) for _ in range(1000))
+
+    def test_burst_then_suppressed(self, monkeypatch):
+        monkeypatch.setattr(logger_module.time, "monotonic", lambda: 100.0)
+        limit = RateLimitFilter(rate=1.0, burst=3)
+
+        passed = [limit.filter(record()) for _ in range(5)]
+
+        assert passed == [True, True, True, False, False]
+        assert limit.suppressed_total == 2
+
+    def test_next_record_carries_suppressed_count(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(logger_module.time, "monotonic", lambda: now[0])
+        limit = RateLimitFilter(rate=1.0, burst=1)
+        limit.filter(record())
+        limit.filter(record())
+        limit.filter(record())
+
+        now[0] += 1.0
+        allowed = record()
+        assert limit.filter(allowed)
+        assert allowed.suppressed == 2
+
+    def test_call_sites_are_independent(self, monkeypatch):
+        monkeypatch.setattr(logger_module.time, "monotonic", lambda: 100.0)
+        limit = RateLimitFilter(rate=1.0, burst=1)
+
+        assert limit.filter(record(lineno=1))
+        assert limit.filter(record(lineno=2))
+        assert not limit.filter(record(lineno=1))
+
+    def test_warnings_always_pass(self, monkeypatch):
+        monkeypatch.setattr(logger_module.time, "monotonic", lambda: 100.0)
+        limit = RateLimitFilter(rate=1.0, burst=1)
+
+        assert all(limit.filter(record(level=logging.WARNING)) for _ in range(10))
+
+
+class TestConfigureLogging:
+    @pytest.fixture
+    def pipeline(self, tmp_path, monkeypatch):
+        pipeline = _LoggingPipeline(log_dir=tmp_path)
+        monkeypatch.setattr(logger_module, "_pipeline", pipeline)
+        yield pipeline
+        pipeline.stop()
+
+    def test_resize_keeps_handler_and_delivers_every_record(self, pipeline, tmp_path):
+        handler = pipeline.handler
+        log = logging.getLogger("darwin.test.resize")
+        log.propagate = False
+        log.addHandler(handler)
+        try:
+            log.warning("before")
+            configure_logging(queue_size=50)
+            log.warning("after")
+        finally:
+            log.removeHandler(handler)
+        pipeline.stop()
+
+        assert pipeline.handler is handler
+        assert handler.queue is pipeline.queue
+        assert pipeline.queue.maxsize == 50
+        assert handler.dropped == 0
+        written = (tmp_path / logger_module.LOG_FILE).read_text()
+        assert '"before"' in written and '"after"' in written
@@ -0,0 +1,173 @@
+"""Tests for the Merkle index and tree serving in MemorySyncProtocol."""
+import pytest
+
+from distributed.merkle_index import MerkleIndex, bucket_of
+from distributed.memory_sync import MemorySyncProtocol, MemoryType
+
+
+def diff(local: MerkleIndex, remote: MerkleIndex) -> set:
+    """Walk both trees top-down and return the ids whose entries differ"""
+    frontier = [""]
+    changed = set()
+    while frontier:
+        next_frontier = []
+        for prefix in frontier:
+            if len(prefix) >= local.depth:
+                ours, theirs = local.bucket(prefix), remote.bucket(prefix)
+                changed |= {i for i in ours.keys() | theirs.keys() if ours.get(i) != theirs.get(i)}
+            else:
+                next_frontier += local.divergent_children(prefix, remote.children(prefix))
+        frontier = next_frontier
+    return changed
+
+
+class TestMerkleIndex:
+    def test_root_independent_of_insert_order(self):
+        items = [(f"m{i}", f"c{i}") for i in range(50)]
+        a, b = MerkleIndex(), MerkleIndex()
+        for memory_id, checksum in items:
+            a.set(memory_id, checksum)
+        for memory_id, checksum in reversed(items):
+            b.set(memory_id, checksum)
+        assert a.root == b.root
+
+    def test_remove_restores_root(self):
+        tree = MerkleIndex()
+        tree.set("a", "1")
+        before = tree.root
+        tree.set("b", "2")
+        assert tree.root != before
+        tree.remove("b")
+        assert tree.root == before
+
+    def test_update_changes_root_and_is_idempotent(self):
+        tree = MerkleIndex()
+        tree.set("a", "1")
+        root = tree.root
+        assert tree.set("a", "1") is False
+        assert tree.root == root
+        assert tree.set("a", "2") is True
+        assert tree.root != root
+
+    def test_empty_tree(self):
+        tree = MerkleIndex()
+        assert tree.root == "0" * 16
+        assert tree.describe([""]) == {"": "0" * 256}
+
+    def test_diff_finds_only_changed_ids(self):
+        local, remote = MerkleIndex(), MerkleIndex()
+        for i in range(500):
+            local.set(f"m{i}", "same")
+            remote.set(f"m{i}", "same")
+        local.set("m7", "changed")
+        local.set("only-local", "x")
+        remote.set("only-remote", "y")
+        remote.remove("m42")
+
+        assert diff(local, remote) == {"m7", "only-local", "only-remote", "m42"}
+
+    def test_identical_trees_have_no_divergent_children(self):
+        a, b = MerkleIndex(), MerkleIndex()
+        a.replace_all([("x", "1"), ("y", "2")])
+        b.replace_all([("y", "2"), ("x", "1")])
+        assert a.divergent_children("", b.children("")) == []
+
+    def test_bucket_holds_entry(self):
+        tree = MerkleIndex()
+        tree.set("abc", "1")
+        assert tree.bucket(bucket_of("abc")) == {"abc": "1"}
+
+
+class TestTreeServing:
+    @pytest.fixture
+    def sync(self, tmp_path):
+        sync = MemorySyncProtocol("node-a", data_path=str(tmp_path))
+        self.memories = [{"id": "m1", "text": "one"}, {"id": "m2", "text": "two"}]
+
+        async def get_all():
+            return list(self.memories)
+
+        async def get_by_id(memory_id):
+            return next((m for m in self.memories if m["id"] == memory_id), None)
+
+        async def save(content, memory_id):
+            self.memories.append(content)
+
+        sync.register_memory_handler(MemoryType.SEMANTIC, get_all, get_by_id, save)
+        return sync
+
+    @pytest.mark.asyncio
+    async def test_tree_served_without_local_sync_is_indexed(self, sync):
+        response = await sync.get_tree_nodes({"semantic": [""]}, MerkleIndex().depth)
+        assert response["nodes"]["semantic"][""] != "0" * 256
+
+    @pytest.mark.asyncio
+    async def test_stale_tree_is_reindexed(self, sync):
+        await sync.get_local_index([MemoryType.SEMANTIC])
+        self.memories.append({"id": "m3", "text": "three"})
+        sync.reindex_interval = 0
+
+        index = await sync.get_local_index([MemoryType.SEMANTIC])
+        assert set(index["semantic"]) == {"m1", "m2", "m3"}
+
+    @pytest.mark.asyncio
+    async def test_note_local_change_updates_tree(self, sync):
+        await sync.get_local_index([MemoryType.SEMANTIC])
+        sync.note_local_change(MemoryType.SEMANTIC, {"id": "m4", "text": "four"})
+        sync.note_local_delete(MemoryType.SEMANTIC, "m1")
+
+        index = await sync.get_local_index([MemoryType.SEMANTIC])
+        assert set(index["semantic"]) == {"m2", "m4"}
+
+
+class FakeSemanticMemory:
+    """Record store with SemanticMemory's sync surface"""
+
+    def __init__(self, records):
+        self.records = {r["id"]: r for r in records}
+        self.get_all_calls = 0
+        self.listeners = []
+
+    def add_change_listener(self, on_store, on_delete=None):
+        self.listeners.append((on_store, on_delete))
+
+    async def get_all(self):
+        self.get_all_calls += 1
+        return list(self.records.values())
+
+    async def get(self, memory_id):
+        return self.records.get(memory_id)
+
+    async def store(self, record, memory_id=None):
+        self.records[memory_id or record["id"]] = record
+        for on_store, _ in self.listeners:
+            on_store(record)
+
+    async def delete(self, memory_id):
+        self.records.pop(memory_id, None)
+        for _, on_delete in self.listeners:
+            on_delete(memory_id)
+
+
+class TestSemanticMemoryWiring:
+    @pytest.mark.asyncio
+    async def test_local_writes_update_tree_without_reindex(self, tmp_path):
+        from initialization.distributed import register_semantic_memory_sync
+
+        memory = FakeSemanticMemory([{"id": "m1", "code": "one"}, {"id": "m2", "code": "two"}])
+        sync = MemorySyncProtocol("node-a", data_path=str(tmp_path))
+        register_semantic_memory_sync(sync, memory)
+        await sync.get_local_index([MemoryType.SEMANTIC])
+        assert memory.get_all_calls == 1
+
+        await memory.store({"id": "m3", "code": "three"})
+        await memory.store({"id": "m2", "code": "two, edited"})
+        await memory.delete("m1")
+
+        index = await sync.get_local_index([MemoryType.SEMANTIC])
+        assert memory.get_all_calls == 1
+        assert set(index["semantic"]) == {"m2", "m3"}
+
+        fresh = MemorySyncProtocol("node-b", data_path=str(tmp_path / "b"))
+        register_semantic_memory_sync(fresh, memory)
+        assert await fresh.get_local_index([MemoryType.SEMANTIC]) == index
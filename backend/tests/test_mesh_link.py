@@ -0,0 +1,97 @@
+"""Tests for PeerLink heartbeats and batching."""
+import pytest
+
+from distributed.mesh_network import PeerConnection, PeerLink
+
+
+class FakeResponse:
+    def __init__(self, status):
+        self.status = status
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        return b""
+
+
+class FakeSession:
+    """Records posted paths; answers 404 to /receive_batch when legacy"""
+
+    def __init__(self, legacy: bool):
+        self.legacy = legacy
+        self.posts = []
+
+    def post(self, url, json=None, **kwargs):
+        path = url.rsplit("/", 1)[-1]
+        self.posts.append(path)
+        status = 404 if self.legacy and path == "receive_batch" else 200
+        return FakeResponse(status)
+
+
+class FakeNetwork:
+    instance_id = "self"
+
+    def __init__(self, legacy: bool, ping_ok: bool = True):
+        self.session = FakeSession(legacy)
+        self.ping_ok = ping_ok
+        self.pings = 0
+
+    async def _get_session(self):
+        return self.session
+
+    async def _send_ping(self, address):
+        self.pings += 1
+        return self.ping_ok
+
+
+def make_link(network):
+    peer = PeerConnection(peer_id="p", peer_name="peer", address="peer:8001")
+    return PeerLink(network, peer, queue_size=10, batch_size=5, flush_interval=0, heartbeat_interval=1)
+
+
+class TestLegacyPeerHeartbeat:
+    @pytest.mark.asyncio
+    async def test_heartbeat_pings_when_batch_endpoint_missing(self):
+        network = FakeNetwork(legacy=True)
+        link = make_link(network)
+
+        await link._heartbeat()
+        await link._heartbeat()
+
+        assert not link.batch_supported
+        assert network.pings == 2
+        assert network.session.posts == ["receive_batch"]
+
+    @pytest.mark.asyncio
+    async def test_failed_ping_counts_as_failure(self):
+        network = FakeNetwork(legacy=True, ping_ok=False)
+        link = make_link(network)
+
+        await link._heartbeat()
+
+        assert link.consecutive_failures == 1
+        assert link.rtt_ms is None
+
+    @pytest.mark.asyncio
+    async def test_messages_to_legacy_peer_are_sent_singly(self):
+        network = FakeNetwork(legacy=True)
+        link = make_link(network)
+
+        assert await link._post_batch([{"id": "a"}, {"id": "b"}])
+        assert network.session.posts == ["receive_batch", "receive", "receive"]
+        assert network.pings == 0
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_uses_batch_endpoint_when_available(self):
+        network = FakeNetwork(legacy=False)
+        link = make_link(network)
+
+        await link._heartbeat()
+
+        assert network.session.posts == ["receive_batch"]
+        assert network.pings == 0
+        assert link.consecutive_failures == 0
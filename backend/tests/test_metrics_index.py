@@ -0,0 +1,97 @@
+"""Tests for the incremental codebase metrics index."""
+import os
+
+import pytest
+
+from introspection import metrics_index
+from introspection.metrics_index import CodebaseMetricsIndex, count_lines
+
+SAMPLES = [
+    b"",
+    b"one",
+    b"one\n",
+    b"one\ntwo",
+    b"one\r\ntwo\r\n",
+    b"one\rtwo\r",
+    b"\n\n\n",
+    b"mixed\r\nendings\rand\nmore",
+    "acentuação\né ótima\n".encode("utf-8"),
+]
+
+
+def readlines_count(path):
+    with open(path, encoding="utf-8") as f:
+        return len(f.readlines())
+
+
+class TestCountLines:
+    @pytest.mark.parametrize("content", SAMPLES)
+    def test_matches_readlines(self, tmp_path, content):
+        path = tmp_path / "sample.txt"
+        path.write_bytes(content)
+        assert count_lines(str(path)) == readlines_count(path)
+
+    @pytest.mark.parametrize("content", SAMPLES)
+    def test_matches_readlines_across_chunk_boundaries(self, tmp_path, monkeypatch, content):
+        monkeypatch.setattr(metrics_index, "CHUNK_SIZE", 1)
+        path = tmp_path / "sample.txt"
+        path.write_bytes(content)
+        assert count_lines(str(path)) == readlines_count(path)
+
+    def test_invalid_utf8_returns_none(self, tmp_path):
+        path = tmp_path / "binary.bin"
+        path.write_bytes(b"ok\n\xff\xfe\n")
+        assert count_lines(str(path)) is None
+
+    def test_multibyte_character_split_across_chunks(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(metrics_index, "CHUNK_SIZE", 1)
+        path = tmp_path / "utf8.txt"
+        path.write_bytes("ç\n".encode("utf-8"))
+        assert count_lines(str(path)) == 1
+
+
+class TestCodebaseMetricsIndex:
+    @pytest.fixture
+    def project(self, tmp_path):
+        root = tmp_path / "project"
+        (root / "core").mkdir(parents=True)
+        (root / "node_modules").mkdir()
+        (root / "core" / "a.py").write_text("x = 1\ny = 2\n")
+        (root / "app.js").write_text("let a;\n")
+        (root / "node_modules" / "lib.js").write_text("skipped\n" * 100)
+        return root
+
+    def make_index(self, project, tmp_path):
+        return CodebaseMetricsIndex(
+            project_root=project,
+            skip_dirs={"node_modules"},
+            index_path=tmp_path / "index.json",
+            component_of=lambda path: path.parent.name,
+        )
+
+    def test_first_scan_is_a_baseline(self, project, tmp_path):
+        scan = self.make_index(project, tmp_path).scan()
+
+        assert scan.total_files == 2
+        assert scan.total_lines == 3
+        assert scan.languages == {"python": 2, "javascript": 1, "other": 0}
+        assert scan.delta["baseline"]
+
+    def test_rescan_reads_only_changed_files(self, project, tmp_path):
+        self.make_index(project, tmp_path).scan()
+        (project / "core" / "a.py").write_text("x = 1\ny = 2\nz = 3\n")
+        (project / "core" / "b.py").write_text("new\n")
+
+        # A fresh instance picks the persisted index up
+        scan = self.make_index(project, tmp_path).scan()
+
+        assert scan.files_read == 2
+        assert scan.delta["files_added"] == 1
+        assert scan.delta["files_modified"] == 1
+        assert scan.delta["lines"] == 2
+        assert {"path": os.path.join("core", "a.py"), "lines": 1} in scan.delta["grew"]
+
+    def test_unchanged_tree_reads_nothing(self, project, tmp_path):
+        index = self.make_index(project, tmp_path)
+        index.scan()
+        assert index.scan().files_read == 0
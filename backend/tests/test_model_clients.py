@@ -0,0 +1,114 @@
+"""Tests that model clients don't block the event loop."""
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from ai.models.base_client import BaseModelClient
+from ai.models.claude_client import ClaudeClient
+from ai.models.openai_client import OpenAIClient
+from ai.multi_model_router import MultiModelRouter
+
+ANALYSIS = json.dumps({
+    "correctness_score": 80,
+    "quality_score": 80,
+    "efficiency_score": 80,
+    "issues": [],
+    "suggestions": [],
+    "overall_assessment": "fine",
+})
+
+
+def without_sdk(cls, model_name: str):
+    """Client instance with the SDK object left for the test to provide"""
+    client = cls.__new__(cls)
+    BaseModelClient.__init__(client, model_name, "test")
+    return client
+
+
+def blocking_claude(seconds: float, text: str = ANALYSIS) -> ClaudeClient:
+    """ClaudeClient whose SDK call blocks the calling thread"""
+    client = without_sdk(ClaudeClient, "claude-test")
+
+    def create(**kwargs):
+        time.sleep(seconds)
+        return SimpleNamespace(
+            content=[SimpleNamespace(text=text)],
+            stop_reason="end_turn",
+            usage=SimpleNamespace(input_tokens=10, output_tokens=10),
+        )
+
+    client.client = SimpleNamespace(messages=SimpleNamespace(create=create))
+    return client
+
+
+def blocking_openai(seconds: float, text: str = ANALYSIS) -> OpenAIClient:
+    """OpenAIClient whose SDK call blocks the calling thread"""
+    client = without_sdk(OpenAIClient, "gpt-test")
+
+    def create(**kwargs):
+        time.sleep(seconds)
+        return SimpleNamespace(choices=[
+            SimpleNamespace(finish_reason="stop", message=SimpleNamespace(content=text))
+        ])
+
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return client
+
+
+@pytest.fixture
+def router(tmp_path):
+    router = MultiModelRouter({
+        "ollama_enabled": False,
+        "response_cache_enabled": False,
+        "stats_db_path": str(tmp_path / "stats.db"),
+    })
+    router.models.clear()
+    return router
+
+
+class TestBlockingSdkCalls:
+    @pytest.mark.asyncio
+    async def test_generate_leaves_the_loop_free(self):
+        client = blocking_claude(0.3)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        await client.generate("hello")
+        ticking.cancel()
+
+        assert ticks >= 10
+
+    @pytest.mark.asyncio
+    async def test_fan_out_runs_models_concurrently(self, router):
+        router.models["a"] = blocking_claude(0.3)
+        router.models["b"] = blocking_claude(0.3)
+        router.models["c"] = blocking_openai(0.3)
+
+        started = time.perf_counter()
+        result = await router.analyze_with_multiple("code", "task", timeout=5, quorum=0, use_cache=False)
+        elapsed = time.perf_counter() - started
+
+        assert len(result["individual_analyses"]) == 3
+        assert elapsed < 0.6
+
+    @pytest.mark.asyncio
+    async def test_fan_out_timeout_fires_on_blocking_clients(self, router):
+        router.models["a"] = blocking_claude(0.5)
+        router.models["b"] = blocking_claude(0.5)
+        router.models["c"] = blocking_openai(0.5)
+
+        started = time.perf_counter()
+        result = await router.analyze_with_multiple("code", "task", timeout=0.1, quorum=0, use_cache=False)
+        elapsed = time.perf_counter() - started
+
+        assert "error" in result
+        assert elapsed < 0.3
@@ -0,0 +1,83 @@
+"""Tests for the concurrent ProactiveEngine scheduler."""
+import asyncio
+import pytest
+
+from consciousness.proactive_engine import (
+    ActionCategory,
+    ActionPriority,
+    ProactiveAction,
+    ProactiveEngine,
+    ResourceClass,
+)
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(ProactiveEngine, "_STATS_FILE", tmp_path / "stats.json")
+    monkeypatch.setattr(ProactiveEngine, "_load_moltbook_history", lambda self: None)
+    engine = ProactiveEngine()
+    engine.actions.clear()
+    engine._index = type(engine._index)()
+    for i, resource_class in enumerate(ResourceClass):
+        engine.register_action(ProactiveAction(
+            id=f"action_{i}",
+            name=f"Action {i}",
+            description="Test action",
+            category=ActionCategory.LEARNING,
+            priority=ActionPriority.MEDIUM,
+            trigger_condition="test",
+            cooldown_minutes=0,
+            resource_class=resource_class,
+        ))
+    return engine
+
+
+async def run_one_tick(engine, max_actions_per_hour=10):
+    """Run the concurrent loop for a single tick with actions that fail"""
+    async def failing_action(action, context):
+        return {"success": False}
+
+    async def no_context():
+        return {}
+
+    engine.execute_action = failing_action
+    engine._gather_context = no_context
+    engine.running = True
+    loop = asyncio.create_task(engine._run_concurrent_loop(3600, max_actions_per_hour))
+    await asyncio.sleep(0.05)
+    engine.running = False
+    loop.cancel()
+
+
+class TestSelection:
+    def test_skipped_collects_instead_of_recording(self, engine):
+        skipped = set()
+        selected = engine.select_next_action({}, skipped=skipped)
+
+        assert selected is not None
+        assert skipped == {a.id for a in engine.actions.values()} - {selected.id}
+        assert all(a.skipped_count == 0 for a in engine.actions.values())
+
+    def test_default_records_skips(self, engine):
+        selected = engine.select_next_action({})
+        others = [a for a in engine.actions.values() if a.id != selected.id]
+        assert all(a.skipped_count == 1 for a in others)
+
+
+class TestConcurrentLoop:
+    @pytest.mark.asyncio
+    async def test_one_dispatch_per_class_and_no_skip_inflation(self, engine):
+        await run_one_tick(engine)
+
+        # Every class had a free slot, so every action ran once
+        assert engine._actions_this_hour == len(ResourceClass)
+        assert all(a.skipped_count == 0 for a in engine.actions.values())
+
+    @pytest.mark.asyncio
+    async def test_failed_actions_count_against_hourly_cap(self, engine):
+        await run_one_tick(engine, max_actions_per_hour=2)
+
+        assert engine._actions_this_hour == 2
+        skipped = [a for a in engine.actions.values() if a.skipped_count]
+        assert len(skipped) == len(ResourceClass) - 2
+        assert all(a.skipped_count == 1 for a in skipped)
@@ -0,0 +1,96 @@
+"""Tests for the two-tier (exact + semantic) response cache."""
+import pytest
+
+from ai import response_cache as response_cache_module
+from ai.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(db_path=str(tmp_path / "cache.db"), max_entries=3)
+
+
+def namespace(system_prompt="sys", cache_type="default"):
+    return ResponseCache.namespace(system_prompt, "haiku", cache_type, {"temperature": 0.7})
+
+
+def store(cache, prompt, response="answer", ns=None, cache_type="default"):
+    cache.put(ns or namespace(cache_type=cache_type), cache_type, prompt, response, "haiku", 0.01, 500)
+
+
+def letter_embedder(text):
+    """Bag-of-letters vector: prompts with the same letters are near-identical"""
+    return [text.lower().count(c) for c in "abcdefghijklmnopqrstuvwxyz"]
+
+
+class TestExactTier:
+    def test_hit_and_miss(self, cache):
+        store(cache, "what is 2+2?", "4")
+
+        hit = cache.get(namespace(), "what is 2+2?")
+        assert hit["response"] == "4" and hit["cache_tier"] == "exact"
+        assert cache.get(namespace(), "what is 3+3?") is None
+
+        stats = cache.get_stats()
+        assert stats["exact_hits"] == 1 and stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_namespace_separates_system_prompts(self, cache):
+        store(cache, "prompt", ns=namespace(system_prompt="a"))
+        assert cache.get(namespace(system_prompt="b"), "prompt") is None
+
+    def test_entries_expire_by_cache_type(self, cache, monkeypatch):
+        store(cache, "status?", cache_type="status")
+        now = response_cache_module.time.time()
+        monkeypatch.setattr(response_cache_module.time, "time", lambda: now + 301)
+
+        assert cache.get(namespace(cache_type="status"), "status?") is None
+        assert cache.get_stats()["expired"] == 1
+
+    def test_lru_eviction(self, cache):
+        for prompt in ("one", "two", "three"):
+            store(cache, prompt)
+        cache.get(namespace(), "one")  # Most recently used now
+        store(cache, "four")
+
+        assert cache.get(namespace(), "two") is None
+        assert cache.get(namespace(), "one") is not None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_entries_survive_restart(self, cache, tmp_path):
+        store(cache, "persisted", "yes")
+
+        reloaded = ResponseCache(db_path=str(tmp_path / "cache.db"), max_entries=3)
+
+        assert reloaded.get(namespace(), "persisted")["response"] == "yes"
+
+
+class TestSemanticTier:
+    def test_similar_prompt_hits(self, cache):
+        cache.set_embedder(letter_embedder)
+        store(cache, "summarize the article", "summary")
+
+        hit = cache.get(namespace(), "the article summarize")
+
+        assert hit["cache_tier"] == "semantic"
+        assert hit["response"] == "summary"
+
+    def test_dissimilar_prompt_misses(self, cache):
+        cache.set_embedder(letter_embedder)
+        store(cache, "summarize the article")
+
+        assert cache.get(namespace(), "xyz qqq") is None
+
+    def test_long_prompts_are_exact_only(self, tmp_path):
+        cache = ResponseCache(db_path=str(tmp_path / "cache.db"), max_semantic_chars=10)
+        cache.set_embedder(letter_embedder)
+        store(cache, "summarize the article")
+
+        assert cache.get(namespace(), "the article summarize") is None
+
+
+class TestCacheType:
+    def test_taken_from_activity_type(self, cache):
+        assert cache.cache_type_for(None, {"activity_type": "code_analysis"}) == "analysis"
+        assert cache.cache_type_for(None, None) == "default"
+        assert cache.cache_type_for("status", {"activity_type": "analysis"}) == "status"
@@ -0,0 +1,54 @@
+"""Tests for the dependency-ordered startup container."""
+import asyncio
+import pytest
+
+from initialization.container import ServiceContainer
+
+
+class TestServiceContainer:
+    @pytest.mark.asyncio
+    async def test_dependencies_passed_as_kwargs(self):
+        container = ServiceContainer()
+        container.register('a', lambda: 'A')
+        container.register('b', lambda a: a + 'B', depends_on=['a'])
+
+        started = await container.start()
+
+        assert started == {'a': 'A', 'b': 'AB'}
+
+    @pytest.mark.asyncio
+    async def test_independent_services_start_concurrently(self):
+        container = ServiceContainer()
+
+        async def slow():
+            await asyncio.sleep(0.1)
+            return True
+
+        container.register('x', slow)
+        container.register('y', slow)
+        await container.start()
+
+        report = container.get_startup_report()
+        assert report['concurrent_services']['wall_seconds'] < 0.19
+
+    @pytest.mark.asyncio
+    async def test_failed_factory_leaves_none(self):
+        container = ServiceContainer()
+
+        def broken():
+            raise RuntimeError("boom")
+
+        container.register('broken', broken)
+        container.register('dependant', lambda broken: broken is None, depends_on=['broken'])
+        started = await container.start()
+
+        assert started['broken'] is None
+        assert started['dependant'] is True
+        assert container.get_startup_report()['failed'] == ['broken']
+
+    def test_cycle_detected(self):
+        container = ServiceContainer()
+        container.register('a', lambda b: b, depends_on=['b'])
+        container.register('b', lambda a: a, depends_on=['a'])
+        with pytest.raises(ValueError):
+            asyncio.run(container.start())
@@ -0,0 +1,97 @@
+"""Tests for web explorer URL canonicalization, the crawl frontier and batched extraction."""
+import pytest
+
+from learning.web_explorer import CrawlFrontier, WebExplorer, canonicalize_url, content_fingerprint
+
+
+class TestCanonicalizeUrl:
+    def test_scheme_and_host_are_lowercased(self):
+        assert canonicalize_url("HTTPS://Example.COM/Path") == "https://example.com/Path"
+
+    def test_default_ports_are_dropped(self):
+        assert canonicalize_url("http://example.com:80/a") == "http://example.com/a"
+        assert canonicalize_url("https://example.com:443/a") == "https://example.com/a"
+        assert canonicalize_url("https://example.com:8443/a") == "https://example.com:8443/a"
+
+    def test_fragment_and_tracking_params_are_dropped(self):
+        url = "https://example.com/a?utm_source=x&b=2&fbclid=y&a=1#section"
+        assert canonicalize_url(url) == "https://example.com/a?a=1&b=2"
+
+    def test_trailing_and_repeated_slashes(self):
+        assert canonicalize_url("https://example.com/docs//guide/") == "https://example.com/docs/guide"
+        assert canonicalize_url("https://example.com") == "https://example.com/"
+        assert canonicalize_url("https://example.com/") == "https://example.com/"
+
+    def test_blank_query_values_are_kept(self):
+        assert canonicalize_url("https://example.com/?q=") == "https://example.com/?q="
+
+    def test_unparseable_url_is_returned_unchanged(self):
+        assert canonicalize_url("http://[::1") == "http://[::1"
+
+
+class TestContentFingerprint:
+    def test_ignores_case_and_whitespace(self):
+        assert content_fingerprint("Hello   World\n") == content_fingerprint("hello world")
+
+
+class TestCrawlFrontier:
+    def test_equivalent_urls_are_queued_once(self):
+        frontier = CrawlFrontier()
+        assert frontier.push("https://example.com/a/", 1.0, 0)
+        assert not frontier.push("https://EXAMPLE.com/a#top", 5.0, 0)
+        assert len(frontier) == 1
+
+    def test_pops_best_score_then_shallowest_then_oldest(self):
+        frontier = CrawlFrontier()
+        frontier.push("https://example.com/low", 1.0, 0)
+        frontier.push("https://example.com/deep", 2.0, 2)
+        frontier.push("https://example.com/shallow", 2.0, 1)
+        frontier.push("https://example.com/shallow-later", 2.0, 1)
+
+        order = [frontier.pop()[0] for _ in range(4)]
+
+        assert order == [
+            "https://example.com/shallow",
+            "https://example.com/shallow-later",
+            "https://example.com/deep",
+            "https://example.com/low",
+        ]
+
+
+class FakeRouter:
+    def __init__(self, answer):
+        self.answer = answer
+        self.prompts = []
+
+    async def generate(self, task_description, prompt, max_tokens):
+        self.prompts.append(prompt)
+        return {'result': self.answer}
+
+
+class TestBatchedExtraction:
+    @pytest.mark.asyncio
+    async def test_key_points_mentioning_a_page_stay_in_their_section(self):
+        router = FakeRouter(
+            "### PAGE 1\n"
+            "- Page 2 of the guide covers connection pooling\n"
+            "- Indexes speed up lookups on large tables\n"
+            "### PAGE 2:\n"
+            "- Caching avoids repeated expensive queries\n"
+        )
+        explorer = WebExplorer(semantic_memory=None, multi_model_router=router)
+        pages = [
+            {'url': f'https://example.com/{i}', 'title': str(i), 'content': 'x' * 200}
+            for i in (1, 2)
+        ]
+
+        extracted = await explorer._extract_knowledge_batch(pages, 'databases')
+
+        points = {page['url']: knowledge['key_points'] for page, knowledge in extracted}
+        assert points == {
+            'https://example.com/1': [
+                'Page 2 of the guide covers connection pooling',
+                'Indexes speed up lookups on large tables',
+            ],
+            'https://example.com/2': ['Caching avoids repeated expensive queries'],
+        }
+        assert '### PAGE 1' in router.prompts[0]
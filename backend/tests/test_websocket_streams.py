@@ -0,0 +1,71 @@
+"""Tests for token stream routing in the WebSocket ConnectionManager."""
+import asyncio
+import json
+import pytest
+
+from api.websocket import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, port: int):
+        self.sent = []
+        self.client = type("Client", (), {"host": "test", "port": port})()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        self.sent.append(json.loads(text))
+
+    async def close(self):
+        pass
+
+
+async def drain():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestTokenStreams:
+    @pytest.mark.asyncio
+    async def test_tokens_only_reach_stream_subscribers(self):
+        manager = ConnectionManager()
+        subscriber, bystander = FakeWebSocket(1), FakeWebSocket(2)
+        await manager.connect(subscriber)
+        await manager.connect(bystander)
+        manager.subscribe_to_stream(subscriber, "chat-1")
+
+        on_token = manager.token_forwarder("chat-1", message_type="chat_token")
+        await on_token("Hel")
+        await on_token("lo")
+        await drain()
+
+        assert [m["text"] for m in subscriber.sent] == ["Hel", "lo"]
+        assert [m["seq"] for m in subscriber.sent] == [1, 2]
+        assert bystander.sent == []
+
+    @pytest.mark.asyncio
+    async def test_unsubscribed_stream_sends_nothing(self):
+        manager = ConnectionManager()
+        ws = FakeWebSocket(1)
+        await manager.connect(ws)
+
+        await manager.token_forwarder("nobody")("token")
+        await drain()
+
+        assert ws.sent == []
+        assert manager.messages_serialized == 0
+
+    @pytest.mark.asyncio
+    async def test_end_stream_and_disconnect_drop_subscriptions(self):
+        manager = ConnectionManager()
+        ws = FakeWebSocket(1)
+        await manager.connect(ws)
+        manager.subscribe_to_stream(ws, "a")
+        manager.subscribe_to_stream(ws, "b")
+
+        manager.end_stream("a")
+        manager.disconnect(ws)
+
+        assert "a" not in manager.stream_subscribers
+        assert manager.stream_subscribers["b"] == set()
@@ -9,17 +9,25 @@ Allows Darwin to create complete backups of himself:
 Backups are written to /backup (mounted USB drive).
 Each backup is timestamped and includes integrity verification.
 
+Full backups copy everything into a (optionally compressed) directory.
+Incremental backups share a content-addressed store, so each one only
+writes the file contents that changed since the previous backup.
+
 Darwin can trigger this autonomously or on request.
 """
 
+import asyncio
 import hashlib
 import json
 import os
 import shutil
 import tarfile
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from utils.logger import get_logger as _get_logger
 
@@ -106,6 +114,24 @@ def _format_size(size_bytes: int) -> str:
     return f"{size_bytes:.1f}TB"
 
 
+def _check_backup_drive() -> Optional[str]:
+    """Error message if the backup drive is missing or nearly full, else None."""
+    # Verify backup drive is accessible
+    if not BACKUP_ROOT.exists():
+        return "Backup drive not mounted at /backup. Ask Paulo to check the USB drive."
+
+    # Check available space
+    try:
+        stat = os.statvfs(str(BACKUP_ROOT))
+        free_bytes = stat.f_bavail * stat.f_frsize
+        free_mb = free_bytes / (1024 * 1024)
+        if free_mb < 200:  # Need at least 200MB free
+            return f"Not enough space on backup drive ({free_mb:.0f}MB free, need 200MB)"
+    except Exception as e:
+        logger.warning(f"Could not check disk space: {e}")
+    return None
+
+
 async def create_full_backup(
     include_code: bool = True,
     include_data: bool = True,
@@ -131,25 +157,9 @@ async def create_full_backup(
 
     backup_dir = BACKUP_ROOT / backup_name
 
-    # Verify backup drive is accessible
-    if not BACKUP_ROOT.exists():
-        return {
-            "success": False,
-            "error": "Backup drive not mounted at /backup. Ask Paulo to check the USB drive."
-        }
-
-    # Check available space
-    try:
-        stat = os.statvfs(str(BACKUP_ROOT))
-        free_bytes = stat.f_bavail * stat.f_frsize
-        free_mb = free_bytes / (1024 * 1024)
-        if free_mb < 200:  # Need at least 200MB free
-            return {
-                "success": False,
-                "error": f"Not enough space on backup drive ({free_mb:.0f}MB free, need 200MB)"
-            }
-    except Exception as e:
-        logger.warning(f"Could not check disk space: {e}")
+    error = _check_backup_drive()
+    if error:
+        return {"success": False, "error": error}
 
     results = {
         "success": True,
@@ -298,6 +308,458 @@ async def create_full_backup(
     return results
 
 
+# =============================================================================
+# Incremental backups: content-addressed object store + per-backup manifests
+# =============================================================================
+#
+# /backup/store/objects/ab/<sha256>   one copy of each distinct file content
+# /backup/store/hash_index.json       source path -> [size, mtime_ns, sha256]
+# /backup/store/verified.json         sha256 -> [size, mtime_ns] when last re-hashed
+# /backup/snapshots/<name>.json       manifest: "code/..." / "data/..." -> entry
+#
+# A backup only copies content the store doesn't already have, and files
+# whose size and mtime match the hash index aren't even read.
+
+# SQLite files are snapshotted with the online backup API, not copied raw
+SQLITE_HEADER = b"SQLite format 3\x00"
+SQLITE_SIDECARS = ('-wal', '-shm', '-journal')
+
+# Parallel hashing / copying
+BACKUP_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+
+def _store_dir() -> Path:
+    return BACKUP_ROOT / "store"
+
+
+def _snapshot_dir() -> Path:
+    return BACKUP_ROOT / "snapshots"
+
+
+def _object_path(digest: str) -> Path:
+    return _store_dir() / "objects" / digest[:2] / digest
+
+
+def _load_json(path: Path, default):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def _save_json(path: Path, data, indent: Optional[int] = None):
+    """Write JSON atomically (temp file + rename)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp_path, path)
+
+
+def _sha256_file(filepath: Path) -> str:
+    h = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _is_sqlite(filepath: Path) -> bool:
+    try:
+        with open(filepath, 'rb') as f:
+            return f.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+    except OSError:
+        return False
+
+
+def _collect_sources(include_code: bool, include_data: bool) -> Dict[str, Path]:
+    """Manifest path ("code/..." or "data/...") -> source file, same layout as a full backup."""
+    sources: Dict[str, Path] = {}
+
+    def walk(root: Path, prefix: str, exclude: bool):
+        for dirpath, dirnames, filenames in os.walk(root):
+            rel_dir = os.path.relpath(dirpath, root)
+            if exclude:
+                dirnames[:] = [d for d in dirnames
+                               if not _is_excluded(os.path.normpath(os.path.join(rel_dir, d)))]
+            for filename in filenames:
+                rel_path = os.path.normpath(os.path.join(rel_dir, filename))
+                if exclude and _is_excluded(rel_path):
+                    continue
+                path = Path(dirpath) / filename
+                if path.is_file():
+                    sources[f"{prefix}/{Path(rel_path).as_posix()}"] = path
+
+    if include_code:
+        if PROJECT_PATH.exists():
+            walk(PROJECT_PATH, "code", exclude=True)
+        elif CODE_PATH.exists():
+            walk(CODE_PATH, "code", exclude=True)
+    if include_data and DATA_PATH.exists():
+        walk(DATA_PATH, "data", exclude=False)
+
+    # A database's WAL/journal is folded into its snapshot
+    for name in [n for n in sources if n.endswith(SQLITE_SIDECARS)]:
+        base = name[:name.rfind('-')]
+        if base in sources and _is_sqlite(sources[base]):
+            del sources[name]
+    return sources
+
+
+def _file_signature(path: Path, sqlite: bool) -> List[int]:
+    """[size, mtime_ns] of a file (for SQLite, of the database and its WAL)."""
+    stat = path.stat()
+    signature = [stat.st_size, stat.st_mtime_ns]
+    if sqlite:
+        wal = Path(f"{path}-wal")
+        if wal.exists():
+            wal_stat = wal.stat()
+            signature += [wal_stat.st_size, wal_stat.st_mtime_ns]
+    return signature
+
+
+def _snapshot_sqlite(source: Path, dest: Path):
+    """Consistent copy of a live SQLite database via the online backup API."""
+    import sqlite3
+    src = sqlite3.connect(f"file:{source}?mode=ro", uri=True, timeout=30)
+    try:
+        dst = sqlite3.connect(str(dest))
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+
+
+def _store_object(source: Path, sqlite: bool) -> Tuple[str, int, Optional[List[int]]]:
+    """
+    Copy a file into the object store, hashing as it goes.
+
+    Returns (sha256, size, verified). The object is named by what was
+    actually copied, so a file that changes mid-backup is still stored
+    consistently. For a newly stored object, verified is its [size,
+    mtime_ns] - it was just hashed, so it goes straight into verified.json
+    and the next verify doesn't read it again. None if the store already
+    had it.
+    """
+    objects = _store_dir() / "objects"
+    objects.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=str(objects), prefix=".incoming-")
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    try:
+        if sqlite:
+            _snapshot_sqlite(source, tmp_path)
+            digest = _sha256_file(tmp_path)
+        else:
+            h = hashlib.sha256()
+            with open(source, 'rb') as src, open(tmp_path, 'wb') as dst:
+                for chunk in iter(lambda: src.read(1024 * 1024), b''):
+                    h.update(chunk)
+                    dst.write(chunk)
+            digest = h.hexdigest()
+        size = tmp_path.stat().st_size
+
+        final = _object_path(digest)
+        if final.exists():
+            return digest, size, None
+        final.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_path, final)
+        os.chmod(final, 0o444)
+        stat = final.stat()
+        return digest, size, [stat.st_size, stat.st_mtime_ns]
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _backup_file(name: str, source: Path, index: Dict[str, List]) -> Dict[str, Any]:
+    """Manifest entry for one source file, storing its content if the store lacks it."""
+    sqlite = name.startswith("data/") and _is_sqlite(source)
+    signature = _file_signature(source, sqlite)
+    mode = source.stat().st_mode & 0o777
+
+    known = index.get(str(source))
+    if known and known[:-1] == signature and _object_path(known[-1]).exists():
+        # Unchanged since the last backup: reference the existing object
+        digest = known[-1]
+        return {"hash": digest, "size": _object_path(digest).stat().st_size,
+                "mode": mode, "sqlite": sqlite, "verified": None, "signature": signature}
+
+    if not sqlite:
+        # Hash first so content the store already has (moved or copied
+        # files, touched but unchanged files) is never written again
+        digest = _sha256_file(source)
+        if _object_path(digest).exists():
+            return {"hash": digest, "size": signature[0],
+                    "mode": mode, "sqlite": False, "verified": None, "signature": signature}
+
+    digest, size, verified = _store_object(source, sqlite)
+    return {"hash": digest, "size": size, "mode": mode, "sqlite": sqlite,
+            "verified": verified, "signature": signature}
+
+
+def _run_incremental_backup(backup_name: str, label: str,
+                            include_code: bool, include_data: bool) -> Dict[str, Any]:
+    started = time.perf_counter()
+    store = _store_dir()
+    index_path = store / "hash_index.json"
+    index: Dict[str, List] = _load_json(index_path, {})
+
+    sources = _collect_sources(include_code, include_data)
+    files: Dict[str, Dict[str, Any]] = {}
+    errors: List[str] = []
+    new_objects = 0
+    new_bytes = 0
+    verified: Dict[str, List[int]] = {}
+
+    with ThreadPoolExecutor(max_workers=BACKUP_WORKERS) as pool:
+        futures = {pool.submit(_backup_file, name, path, index): name for name, path in sources.items()}
+        for future, name in futures.items():
+            try:
+                entry = future.result()
+            except Exception as e:
+                errors.append(f"{name}: {e}")
+                continue
+            index[str(sources[name])] = entry.pop("signature") + [entry["hash"]]
+            object_signature = entry.pop("verified")
+            if object_signature is not None:
+                verified[entry["hash"]] = object_signature
+                new_objects += 1
+                new_bytes += entry["size"]
+            files[name] = entry
+
+    manifest = {
+        "backup_name": backup_name,
+        "type": "incremental",
+        "created_at": datetime.now().isoformat(),
+        "darwin_version": "self-evolving",
+        "label": label,
+        "hash_algorithm": "sha256",
+        "files": dict(sorted(files.items())),
+        "total_files": len(files),
+        "total_size": sum(entry["size"] for entry in files.values()),
+        "new_objects": new_objects,
+        "new_bytes": new_bytes,
+        "partial": bool(errors),
+    }
+    _save_json(_snapshot_dir() / f"{backup_name}.json", manifest, indent=2)
+
+    if verified:
+        verified_path = store / "verified.json"
+        _save_json(verified_path, {**_load_json(verified_path, {}), **verified})
+
+    # Forget sources that no longer exist
+    live = {str(path) for path in sources.values()}
+    _save_json(index_path, {path: entry for path, entry in index.items() if path in live})
+
+    components = {}
+    for component in ("code", "data"):
+        entries = [e for n, e in files.items() if n.startswith(component + "/")]
+        if entries:
+            components[component] = {
+                "files": len(entries),
+                "size": _format_size(sum(e["size"] for e in entries)),
+            }
+
+    return {
+        "success": not errors,
+        "partial": bool(errors) and bool(files),
+        "backup_name": backup_name,
+        "backup_path": str(_snapshot_dir() / f"{backup_name}.json"),
+        "type": "incremental",
+        "components": components,
+        "total_files": len(files),
+        "total_size_human": _format_size(manifest["total_size"]),
+        "new_objects": new_objects,
+        "new_size": _format_size(new_bytes),
+        "reused_files": len(files) - new_objects,
+        "errors": errors[:20],
+        "total_errors": len(errors),
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+async def create_incremental_backup(
+    include_code: bool = True,
+    include_data: bool = True,
+    label: str = ""
+) -> Dict[str, Any]:
+    """
+    Create an incremental backup of Darwin.
+
+    Only file contents the backup store doesn't already hold are copied;
+    everything else is referenced from the new backup's manifest. SQLite
+    databases are snapshotted with the online backup API, so a database in
+    use is captured consistently.
+
+    Args:
+        include_code: Include the full project code
+        include_data: Include runtime data (identity, memory, conversations)
+        label: Optional label for this backup (e.g., "pre-upgrade")
+
+    Returns:
+        Dict with backup details: name, file count, new objects and bytes
+        written. success is False if any file failed; partial is True when
+        the manifest was still written for the files that succeeded.
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_name = f"darwin_backup_{timestamp}"
+    if label:
+        backup_name += f"_{label}"
+
+    error = _check_backup_drive()
+    if error:
+        return {"success": False, "error": error}
+
+    try:
+        results = await asyncio.to_thread(
+            _run_incremental_backup, backup_name, label, include_code, include_data
+        )
+        logger.info(
+            f"Incremental backup complete: {backup_name} ({results['total_files']} files, "
+            f"{results['new_objects']} new objects, {results['new_size']} written)"
+        )
+        if results["total_errors"]:
+            logger.warning(f"Incremental backup {backup_name} is partial: {results['total_errors']} files failed")
+        return results
+    except Exception as e:
+        logger.error(f"Incremental backup failed: {e}")
+        return {"success": False, "backup_name": backup_name, "error": str(e)}
+
+
+def _run_restore(manifest: Dict[str, Any], target: Path, prefix: str) -> Dict[str, Any]:
+    wanted = {name: entry for name, entry in manifest["files"].items() if name.startswith(prefix)}
+    restored = 0
+    skipped = 0
+    errors: List[str] = []
+
+    def restore_one(name: str, entry: Dict[str, Any]) -> bool:
+        dest = target / name
+        # Already there with the same content: nothing to materialize
+        if dest.is_file() and dest.stat().st_size == entry["size"] and _sha256_file(dest) == entry["hash"]:
+            return False
+        source = _object_path(entry["hash"])
+        if not source.exists():
+            raise FileNotFoundError(f"missing object {entry['hash'][:12]}")
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = dest.with_name(f".{dest.name}.restoring")
+        shutil.copyfile(source, tmp_path)
+        os.chmod(tmp_path, entry.get("mode", 0o644))
+        os.replace(tmp_path, dest)
+        return True
+
+    with ThreadPoolExecutor(max_workers=BACKUP_WORKERS) as pool:
+        futures = {pool.submit(restore_one, name, entry): name for name, entry in wanted.items()}
+        for future, name in futures.items():
+            try:
+                if future.result():
+                    restored += 1
+                else:
+                    skipped += 1
+            except Exception as e:
+                errors.append(f"{name}: {e}")
+
+    return {
+        "success": not errors,
+        "restored_files": restored,
+        "unchanged_files": skipped,
+        "errors": errors[:20],
+        "total_errors": len(errors),
+    }
+
+
+async def restore_backup(backup_name: str, target_dir: str = "", path_prefix: str = "") -> Dict[str, Any]:
+    """
+    Restore an incremental backup into a directory.
+
+    Only the objects the selected files need are copied, and files already
+    present in the target with the right content are left alone, so
+    restoring over a previous restore is cheap. Restores always land on the
+    backup drive, never over the live /app or /project trees; copying a
+    restored tree back is left to a human.
+
+    Args:
+        backup_name: Name of the incremental backup
+        target_dir: Directory under /backup/restore (default: the backup's name)
+        path_prefix: Only restore files under this path (e.g. "data/identity")
+
+    Returns:
+        Dict with restored and unchanged file counts.
+    """
+    manifest = _load_json(_snapshot_dir() / f"{backup_name}.json", None)
+    if manifest is None:
+        return {"success": False, "error": f"Incremental backup not found: {backup_name}"}
+
+    restore_root = (BACKUP_ROOT / "restore").resolve()
+    target = (restore_root / (target_dir or backup_name)).resolve()
+    if target != restore_root and restore_root not in target.parents:
+        return {"success": False, "error": f"Restore target must be inside {restore_root}"}
+    results = await asyncio.to_thread(_run_restore, manifest, target, path_prefix)
+    results.update({"backup": backup_name, "target": str(target)})
+    logger.info(
+        f"Restored {backup_name} to {target}: {results['restored_files']} files written, "
+        f"{results['unchanged_files']} already up to date"
+    )
+    return results
+
+
+def _verify_incremental(manifest: Dict[str, Any], deep: bool) -> Dict[str, Any]:
+    """
+    Check every object a manifest references.
+
+    Objects are immutable, so one whose size and mtime still match when it
+    was last re-hashed is trusted without reading it again (deep=True
+    re-hashes everything).
+    """
+    verified_path = _store_dir() / "verified.json"
+    verified_cache: Dict[str, List[int]] = _load_json(verified_path, {})
+    objects: Dict[str, List[str]] = {}
+    for name, entry in manifest.get("files", {}).items():
+        objects.setdefault(entry["hash"], []).append(name)
+    sizes = {entry["hash"]: entry["size"] for entry in manifest.get("files", {}).values()}
+
+    def check(digest: str) -> Tuple[str, Optional[str], Optional[List[int]], bool]:
+        path = _object_path(digest)
+        try:
+            stat = path.stat()
+        except OSError:
+            return digest, "MISSING", None, False
+        if stat.st_size != sizes[digest]:
+            return digest, "CORRUPTED", None, False
+        signature = [stat.st_size, stat.st_mtime_ns]
+        if not deep and verified_cache.get(digest) == signature:
+            return digest, None, signature, False
+        if _sha256_file(path) != digest:
+            return digest, "CORRUPTED", None, True
+        return digest, None, signature, True
+
+    errors: List[str] = []
+    rehashed = 0
+    with ThreadPoolExecutor(max_workers=BACKUP_WORKERS) as pool:
+        for digest, problem, signature, read in pool.map(check, objects):
+            rehashed += read
+            if problem:
+                verified_cache.pop(digest, None)
+                errors.extend(f"{problem}: {name}" for name in objects[digest])
+            else:
+                verified_cache[digest] = signature
+
+    _save_json(verified_path, verified_cache)
+    return {
+        "success": len(errors) == 0,
+        "backup": manifest.get("backup_name"),
+        "type": "incremental",
+        "verified_files": manifest.get("total_files", 0) - len(errors),
+        "objects_checked": len(objects),
+        "objects_rehashed": rehashed,
+        "errors": errors[:20],
+        "total_errors": len(errors),
+    }
+
+
 async def list_backups() -> Dict[str, Any]:
     """
     List all existing backups on the backup drive.
@@ -319,6 +781,16 @@ async def list_backups() -> Dict[str, Any]:
                 "modified": datetime.fromtimestamp(item.stat().st_mtime).isoformat(),
             })
 
+    for manifest_path in sorted(_snapshot_dir().glob("darwin_backup_*.json")):
+        manifest = _load_json(manifest_path, {})
+        backups.append({
+            "name": manifest_path.stem,
+            "type": "incremental",
+            "size": _format_size(manifest.get("total_size", 0)),
+            "new_size": _format_size(manifest.get("new_bytes", 0)),
+            "modified": datetime.fromtimestamp(manifest_path.stat().st_mtime).isoformat(),
+        })
+
     # Check free space
     stat = os.statvfs(str(BACKUP_ROOT))
     free_bytes = stat.f_bavail * stat.f_frsize
@@ -333,12 +805,13 @@ async def list_backups() -> Dict[str, Any]:
     }
 
 
-async def verify_backup(backup_name: str) -> Dict[str, Any]:
+async def verify_backup(backup_name: str, deep: bool = False) -> Dict[str, Any]:
     """
     Verify integrity of a backup using its manifest checksums.
 
     Args:
         backup_name: Name of the backup to verify
+        deep: For incremental backups, re-hash objects already verified
 
     Returns:
         Dict with verification results.
@@ -346,8 +819,15 @@ async def verify_backup(backup_name: str) -> Dict[str, Any]:
     # Find the backup
     backup_path = BACKUP_ROOT / backup_name
     archive_path = BACKUP_ROOT / f"{backup_name}.tar.gz"
+    snapshot_path = _snapshot_dir() / f"{backup_name}.json"
+
+    if snapshot_path.exists():
+        manifest = _load_json(snapshot_path, None)
+        if manifest is None:
+            return {"success": False, "error": f"Cannot read manifest of {backup_name}"}
+        return await asyncio.to_thread(_verify_incremental, manifest, deep)
 
-    if archive_path.exists():
+    elif archive_path.exists():
         # Need to extract manifest from archive
         try:
             with tarfile.open(str(archive_path), "r:gz") as tar:
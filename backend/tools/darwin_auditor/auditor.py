@@ -8,6 +8,7 @@ Combines:
 - Darwin-specific safety checks
 """
 
+import asyncio
 import json
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
@@ -17,6 +18,7 @@ from typing import List, Dict, Any, Optional, Set
 
 from .security_checks import SecurityChecker, SecurityFinding, OWASPCategory
 from .quality_checks import QualityChecker, QualityFinding
+from .incremental import AuditCache, IncrementalAudit
 
 
 class AuditSeverity(Enum):
@@ -50,6 +52,9 @@ class AuditResult:
     total_lines_of_code: int = 0
     average_complexity: float = 0.0
 
+    # How each file's results were obtained: total, cached, reanalyzed, skipped, removed
+    file_stats: Dict[str, int] = field(default_factory=dict)
+
     # Score (0-100)
     security_score: int = 100
     quality_score: int = 100
@@ -78,6 +83,7 @@ class AuditResult:
                 "high_issues": self.high_issues,
                 "average_complexity": self.average_complexity
             },
+            "files": self.file_stats,
             "security": {
                 "total_findings": len(self.security_findings),
                 "by_owasp": self.security_by_owasp,
@@ -128,6 +134,8 @@ class DarwinAuditor:
     Usage:
         auditor = DarwinAuditor(project_root="/app")
         result = auditor.run_full_audit()
+        # Later runs only re-analyze files that changed since the last one
+        result = auditor.run_full_audit(incremental=True)
         print(f"Security Score: {result.security_score}/100")
         print(f"Quality Score: {result.quality_score}/100")
     """
@@ -135,7 +143,9 @@ class DarwinAuditor:
     def __init__(
         self,
         project_root: str = "/app",
-        exclude_dirs: Set[str] = None
+        exclude_dirs: Set[str] = None,
+        cache_path: str = None,
+        workers: Optional[int] = None
     ):
         self.project_root = Path(project_root)
         self.exclude_dirs = exclude_dirs or {
@@ -147,8 +157,20 @@ class DarwinAuditor:
         self.security_checker = SecurityChecker(project_root)
         self.quality_checker = QualityChecker(project_root)
 
-    def run_full_audit(self) -> AuditResult:
-        """Run complete security and quality audit."""
+        # Per-file results reused by incremental audits
+        self.cache = AuditCache(
+            cache_path or self.project_root / "data" / "audits" / "audit_cache.json"
+        )
+        self.workers = workers
+
+    def run_full_audit(self, incremental: bool = False) -> AuditResult:
+        """
+        Run complete security and quality audit.
+
+        Every file is read and parsed once for both checkers, and files are
+        analyzed in parallel. With incremental=True, files unchanged since
+        the last audit reuse their cached results instead of being analyzed.
+        """
         import time
         start_time = time.time()
 
@@ -157,8 +179,18 @@ class DarwinAuditor:
             project_path=str(self.project_root)
         )
 
-        # Run security checks
-        security_findings = self.security_checker.check_project(self.exclude_dirs)
+        collected = IncrementalAudit(
+            self.project_root,
+            self.security_checker,
+            self.quality_checker,
+            self.cache,
+            workers=self.workers
+        ).run(self.exclude_dirs, use_cache=incremental)
+        result.file_stats = collected['file_stats']
+
+        # Security findings
+        security_findings = collected['security_findings']
+        self.security_checker.findings = security_findings
         result.security_findings = security_findings
 
         # Aggregate security findings
@@ -167,8 +199,10 @@ class DarwinAuditor:
             result.security_by_owasp[cat] = result.security_by_owasp.get(cat, 0) + 1
             result.security_by_severity[f.severity] = result.security_by_severity.get(f.severity, 0) + 1
 
-        # Run quality checks
-        quality_findings = self.quality_checker.check_project(self.exclude_dirs)
+        # Quality findings
+        quality_findings = collected['quality_findings']
+        self.quality_checker.findings = quality_findings
+        self.quality_checker.module_metrics = collected['module_metrics']
         result.quality_findings = quality_findings
 
         # Aggregate quality findings
@@ -374,10 +408,15 @@ class DarwinAuditor:
         return str(output_path)
 
 
+# One auditor per project root, so repeated audits keep their cache in memory
+_auditors: Dict[str, DarwinAuditor] = {}
+
+
 # Convenience function for Darwin's tool registry
 async def run_darwin_audit(
     project_root: str = "/app",
-    save_report: bool = True
+    save_report: bool = True,
+    incremental: bool = True
 ) -> Dict[str, Any]:
     """
     Run Darwin self-audit and return results.
@@ -385,8 +424,12 @@ async def run_darwin_audit(
     This function is designed to be called from Darwin's consciousness engine
     during self-improvement cycles.
     """
-    auditor = DarwinAuditor(project_root=project_root)
-    result = auditor.run_full_audit()
+    auditor = _auditors.get(project_root)
+    if auditor is None:
+        auditor = _auditors[project_root] = DarwinAuditor(project_root=project_root)
+
+    # File I/O, parsing and subprocess scanners - keep them off the event loop
+    result = await asyncio.to_thread(auditor.run_full_audit, incremental)
 
     report_path = None
     if save_report:
@@ -405,6 +448,7 @@ async def run_darwin_audit(
         "summary": {
             "files_analyzed": result.total_files,
             "lines_of_code": result.total_lines_of_code,
+            "files": result.file_stats,
             "security_findings": len(result.security_findings),
             "quality_findings": len(result.quality_findings),
             "top_owasp_categories": sorted(
@@ -0,0 +1,400 @@
+"""
+Incremental Audit - per-file result cache and parallel analysis.
+
+Each audited file's findings and metrics are cached under its path
+together with its mtime, size and content hash:
+
+- mtime and size unchanged -> cached results are reused without reading
+- content hash unchanged   -> cached results are reused after one read
+- otherwise                -> the file is read and parsed once, and the
+                              same AST goes to SecurityChecker and
+                              QualityChecker
+
+Files that need analysis are spread across a process pool when there are
+enough of them to pay for the workers' start-up. The cache is stored as
+JSON and tagged with a fingerprint of the loaded security patterns and
+quality thresholds, so changing either invalidates it.
+"""
+
+import ast
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .security_checks import SecurityChecker, SecurityFinding, OWASPCategory
+from .quality_checks import QualityChecker, QualityFinding, ModuleMetrics
+
+CACHE_VERSION = 1
+
+# Below this many files to analyze, starting worker processes costs more than it saves
+POOL_MIN_FILES = 16
+
+
+# ============================================================================
+# Serialization (cache entries and pool results share one format)
+# ============================================================================
+
+def security_to_dict(f: SecurityFinding) -> Dict[str, Any]:
+    data = asdict(f)
+    data['category'] = f.category.value if hasattr(f.category, 'value') else str(f.category)
+    return data
+
+
+def security_from_dict(data: Dict[str, Any]) -> SecurityFinding:
+    data = dict(data)
+    try:
+        data['category'] = OWASPCategory(data['category'])
+    except ValueError:
+        data['category'] = OWASPCategory.A04_INSECURE_DESIGN
+    return SecurityFinding(**data)
+
+
+def quality_from_dict(data: Dict[str, Any]) -> QualityFinding:
+    return QualityFinding(**data)
+
+
+def metrics_from_dict(data: Dict[str, Any]) -> ModuleMetrics:
+    return ModuleMetrics(**data)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def analyze_file(
+    security: SecurityChecker,
+    quality: QualityChecker,
+    file_path: str
+) -> Dict[str, Any]:
+    """Read, parse once and run both checkers on one file. Returns a cache entry."""
+    try:
+        stat = os.stat(file_path)
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+    except Exception as e:
+        metrics = ModuleMetrics(file_path=file_path)
+        return {
+            'mtime_ns': None,
+            'size': None,
+            'sha256': None,
+            'unreadable': True,
+            'security': [security_to_dict(security.unreadable_finding(file_path, e))],
+            'quality': [asdict(quality.unreadable_finding(file_path, e))],
+            'metrics': asdict(metrics),
+        }
+
+    # Same decoding the checkers use when they open files themselves
+    content = raw.decode('utf-8', errors='ignore')
+    tree: Optional[ast.AST] = None
+    syntax_error: Optional[SyntaxError] = None
+    try:
+        tree = ast.parse(content)
+    except SyntaxError as e:
+        syntax_error = e
+
+    security_findings = security.check_source(file_path, content, tree=tree, syntax_error=syntax_error)
+    quality_findings, metrics = quality.check_source(file_path, content, tree=tree, syntax_error=syntax_error)
+
+    return {
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': content_hash(raw),
+        'security': [security_to_dict(f) for f in security_findings],
+        'quality': [asdict(f) for f in quality_findings],
+        'metrics': asdict(metrics),
+    }
+
+
+# Per-process checkers for pool workers (patterns are loaded once per worker)
+_worker_checkers: Optional[Tuple[SecurityChecker, QualityChecker]] = None
+
+
+def _init_worker(project_root: str, patterns_dir: str):
+    global _worker_checkers
+    _worker_checkers = (
+        SecurityChecker(project_root, patterns_dir=patterns_dir),
+        QualityChecker(project_root),
+    )
+
+
+def _analyze_in_worker(file_path: str) -> Tuple[str, Dict[str, Any]]:
+    security, quality = _worker_checkers
+    return file_path, analyze_file(security, quality, file_path)
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+class AuditCache:
+    """Per-file audit results, persisted as JSON."""
+
+    def __init__(self, cache_path: Path):
+        self.cache_path = Path(cache_path)
+        self.fingerprint: Optional[str] = None
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.dependencies: Dict[str, Any] = {}
+        self._loaded = False
+
+    def load(self, fingerprint: str):
+        """Load from disk once; drop everything if the checker config changed."""
+        if not self._loaded:
+            self._loaded = True
+            if self.cache_path.exists():
+                try:
+                    with open(self.cache_path, 'r') as f:
+                        data = json.load(f)
+                    if data.get('version') == CACHE_VERSION:
+                        self.fingerprint = data.get('fingerprint')
+                        self.files = data.get('files', {})
+                        self.dependencies = data.get('dependencies', {})
+                except Exception as e:
+                    print(f"Warning: Could not load audit cache: {e}")
+
+        if self.fingerprint != fingerprint:
+            self.fingerprint = fingerprint
+            self.files = {}
+            self.dependencies = {}
+
+    def save(self):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'version': CACHE_VERSION,
+                'fingerprint': self.fingerprint,
+                'files': self.files,
+                'dependencies': self.dependencies,
+            }, f)
+        os.replace(tmp_path, self.cache_path)
+
+
+def checker_fingerprint(security: SecurityChecker, quality: QualityChecker) -> str:
+    """Hash of everything that decides what a file's findings are."""
+    loader = security.pattern_loader
+    config = {
+        'version': CACHE_VERSION,
+        'patterns': [
+            (p.id, p.pattern, p.title, p.owasp, p.cwe, p.severity, p.confidence)
+            for p in loader.patterns
+        ],
+        'recommendations': sorted(loader.recommendations.items()),
+        'quality': [
+            quality.MAX_FUNCTION_COMPLEXITY, quality.MAX_FILE_COMPLEXITY,
+            quality.MAX_FUNCTION_LENGTH, quality.MAX_CLASS_LENGTH, quality.MAX_IMPORTS,
+            quality.MIN_DOCSTRING_COVERAGE, quality.MIN_TYPE_HINT_COVERAGE,
+        ],
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+
+# ============================================================================
+# Incremental audit
+# ============================================================================
+
+class IncrementalAudit:
+    """Collects per-file results, reusing the cache where files are unchanged."""
+
+    def __init__(
+        self,
+        project_root: Path,
+        security: SecurityChecker,
+        quality: QualityChecker,
+        cache: AuditCache,
+        workers: Optional[int] = None
+    ):
+        self.project_root = Path(project_root)
+        self.security = security
+        self.quality = quality
+        self.cache = cache
+        self.workers = workers if workers is not None else max(1, min(8, (os.cpu_count() or 2) - 1))
+
+    def iter_project_files(self, exclude_dirs: Set[str]) -> Tuple[List[str], List[str]]:
+        """
+        Project .py files and requirements*.txt files, from one walk that
+        prunes excluded directories instead of descending into them.
+        """
+        files, requirements = [], []
+        for dirpath, dirnames, filenames in os.walk(self.project_root):
+            dirnames[:] = sorted(d for d in dirnames if d not in exclude_dirs)
+            for name in sorted(filenames):
+                if name.endswith('.py'):
+                    files.append(os.path.join(dirpath, name))
+                elif name.startswith('requirements') and name.endswith('.txt'):
+                    requirements.append(os.path.join(dirpath, name))
+        return files, requirements
+
+    def iter_python_files(self, exclude_dirs: Set[str]) -> List[str]:
+        """Project .py files, pruning excluded directories instead of walking them."""
+        return self.iter_project_files(exclude_dirs)[0]
+
+    def run(self, exclude_dirs: Set[str], use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Bring the cache up to date for every project file and return the
+        assembled findings plus file counts.
+        """
+        self.cache.load(checker_fingerprint(self.security, self.quality))
+        files, requirements = self.iter_project_files(exclude_dirs)
+
+        stats = {'total': len(files), 'cached': 0, 'reanalyzed': 0, 'skipped': 0, 'removed': 0}
+        to_analyze: List[str] = []
+        rehashed: Dict[str, Dict[str, Any]] = {}
+
+        for path in files:
+            entry = self.cache.files.get(path) if use_cache else None
+            if entry is None or entry.get('unreadable'):
+                to_analyze.append(path)
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                to_analyze.append(path)
+                continue
+            if stat.st_mtime_ns == entry['mtime_ns'] and stat.st_size == entry['size']:
+                stats['cached'] += 1
+                continue
+            # Touched but possibly unchanged (checkout, formatter no-op): compare content
+            try:
+                with open(path, 'rb') as f:
+                    digest = content_hash(f.read())
+            except OSError:
+                to_analyze.append(path)
+                continue
+            if digest == entry['sha256']:
+                rehashed[path] = {**entry, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+                stats['cached'] += 1
+            else:
+                to_analyze.append(path)
+
+        self.cache.files.update(rehashed)
+
+        for path, entry in self._analyze(to_analyze):
+            self.cache.files[path] = entry
+            if entry.get('unreadable'):
+                stats['skipped'] += 1
+            else:
+                stats['reanalyzed'] += 1
+
+        # External scanners only need to look at what changed
+        changed = [p for p in to_analyze if not self.cache.files[p].get('unreadable')]
+        if changed:
+            self._attach_external_findings(changed)
+
+        current = set(files)
+        for path in [p for p in self.cache.files if p not in current]:
+            del self.cache.files[path]
+            stats['removed'] += 1
+
+        dependency_findings, dependencies_changed = self._dependency_findings(requirements, use_cache)
+
+        if to_analyze or rehashed or stats['removed'] or dependencies_changed:
+            self.cache.save()
+
+        return self._assemble(files, dependency_findings, stats)
+
+    def _analyze(self, paths: List[str]) -> List[Tuple[str, Dict[str, Any]]]:
+        if not paths:
+            return []
+
+        if self.workers > 1 and len(paths) >= POOL_MIN_FILES:
+            # spawn, not fork: the auditor runs inside a threaded server process
+            context = multiprocessing.get_context('spawn')
+            patterns_dir = str(self.security.pattern_loader.patterns_dir)
+            with ProcessPoolExecutor(
+                max_workers=min(self.workers, len(paths)),
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(str(self.project_root), patterns_dir)
+            ) as pool:
+                return list(pool.map(_analyze_in_worker, paths, chunksize=8))
+
+        return [(path, analyze_file(self.security, self.quality, path)) for path in paths]
+
+    def _attach_external_findings(self, changed: List[str]):
+        """Run Bandit/Radon on changed files only and file their results per path."""
+        by_file: Dict[str, Dict[str, List[Dict[str, Any]]]] = {
+            path: {'bandit': [], 'radon': []} for path in changed
+        }
+        for finding in self.security.run_bandit(files=changed):
+            key = os.path.abspath(finding.file_path) if finding.file_path else None
+            target = by_file.get(finding.file_path) or by_file.get(key)
+            if target is not None:
+                target['bandit'].append(security_to_dict(finding))
+        for finding in self.quality.run_radon(files=changed):
+            key = os.path.abspath(finding.file_path) if finding.file_path else None
+            target = by_file.get(finding.file_path) or by_file.get(key)
+            if target is not None:
+                target['radon'].append(asdict(finding))
+
+        for path, external in by_file.items():
+            self.cache.files[path].update(external)
+
+    def _dependency_findings(
+        self,
+        requirements: List[str],
+        use_cache: bool
+    ) -> Tuple[List[SecurityFinding], bool]:
+        """`safety` results, re-run only when a requirements file changed."""
+        digest = hashlib.sha256()
+        for req_file in requirements:
+            try:
+                digest.update(req_file.encode())
+                digest.update(Path(req_file).read_bytes())
+            except OSError:
+                continue
+        key = digest.hexdigest()
+
+        cached = self.cache.dependencies
+        if use_cache and cached.get('key') == key:
+            return [security_from_dict(d) for d in cached.get('findings', [])], False
+
+        findings = self.security.check_dependencies([Path(r) for r in requirements])
+        self.cache.dependencies = {
+            'key': key,
+            'findings': [security_to_dict(f) for f in findings],
+        }
+        return findings, True
+
+    def _assemble(
+        self,
+        files: List[str],
+        dependency_findings: List[SecurityFinding],
+        stats: Dict[str, int]
+    ) -> Dict[str, Any]:
+        """Findings in the same order (and deduplicated the same way) as a full scan."""
+        entries = [self.cache.files[path] for path in files]
+
+        security_all: List[SecurityFinding] = []
+        for entry in entries:
+            security_all.extend(security_from_dict(d) for d in entry.get('bandit', []))
+        for entry in entries:
+            security_all.extend(security_from_dict(d) for d in entry['security'])
+        security_all.extend(dependency_findings)
+
+        seen = set()
+        security_findings = []
+        for f in security_all:
+            key = (f.file_path, f.line_number, f.title)
+            if key not in seen:
+                seen.add(key)
+                security_findings.append(f)
+
+        quality_findings: List[QualityFinding] = []
+        for entry in entries:
+            quality_findings.extend(quality_from_dict(d) for d in entry.get('radon', []))
+        module_metrics: Dict[str, ModuleMetrics] = {}
+        for path, entry in zip(files, entries):
+            quality_findings.extend(quality_from_dict(d) for d in entry['quality'])
+            module_metrics[path] = metrics_from_dict(entry['metrics'])
+
+        return {
+            'security_findings': security_findings,
+            'quality_findings': quality_findings,
+            'module_metrics': module_metrics,
+            'file_stats': stats,
+        }
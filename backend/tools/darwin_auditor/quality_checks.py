@@ -77,34 +77,54 @@ class QualityChecker:
 
     def check_file(self, file_path: str) -> Tuple[List[QualityFinding], ModuleMetrics]:
         """Analyze a single Python file for quality issues."""
-        findings = []
-        metrics = ModuleMetrics(file_path=file_path)
-
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read()
-                lines = content.split('\n')
         except Exception as e:
-            return [QualityFinding(
-                category="error",
-                severity="info",
-                title="Could not read file",
-                description=str(e),
-                file_path=file_path
-            )], metrics
+            return [self.unreadable_finding(file_path, e)], ModuleMetrics(file_path=file_path)
+
+        return self.check_source(file_path, content)
+
+    def unreadable_finding(self, file_path: str, error: Exception) -> QualityFinding:
+        return QualityFinding(
+            category="error",
+            severity="info",
+            title="Could not read file",
+            description=str(error),
+            file_path=file_path
+        )
+
+    def check_source(
+        self,
+        file_path: str,
+        content: str,
+        tree: Optional[ast.AST] = None,
+        syntax_error: Optional[SyntaxError] = None
+    ) -> Tuple[List[QualityFinding], ModuleMetrics]:
+        """
+        Analyze already-read source. Pass `tree` (or the `syntax_error` that
+        parsing raised) to reuse the caller's parse instead of parsing again.
+        """
+        findings = []
+        metrics = ModuleMetrics(file_path=file_path)
+        lines = content.split('\n')
 
         metrics.lines_of_code = len([l for l in lines if l.strip() and not l.strip().startswith('#')])
 
-        try:
-            tree = ast.parse(content)
-        except SyntaxError as e:
+        if tree is None and syntax_error is None:
+            try:
+                tree = ast.parse(content)
+            except SyntaxError as e:
+                syntax_error = e
+
+        if syntax_error is not None:
             return [QualityFinding(
                 category="syntax",
                 severity="critical",
                 title="Syntax error",
-                description=str(e),
+                description=str(syntax_error),
                 file_path=file_path,
-                line_number=e.lineno
+                line_number=syntax_error.lineno
             )], metrics
 
         # Analyze AST
@@ -181,15 +201,28 @@ class QualityChecker:
 
         return findings, metrics
 
-    def run_radon(self, target_path: str = None) -> List[QualityFinding]:
-        """Run Radon complexity analysis."""
-        target = target_path or str(self.project_root)
+    def run_radon(self, target_path: str = None, files: List[str] = None) -> List[QualityFinding]:
+        """
+        Run Radon complexity analysis.
+
+        With `files`, only those files are analyzed (used by incremental audits).
+        """
+        if files is not None:
+            findings = []
+            for start in range(0, len(files), 200):
+                findings.extend(self._run_radon(files[start:start + 200]))
+            return findings
+        return self._run_radon([target_path or str(self.project_root)])
+
+    def _run_radon(self, targets: List[str]) -> List[QualityFinding]:
         findings = []
+        if not targets:
+            return findings
 
         try:
             # Cyclomatic complexity
             result = subprocess.run(
-                ['radon', 'cc', target, '-j', '-a'],
+                ['radon', 'cc', *targets, '-j', '-a'],
                 capture_output=True,
                 text=True,
                 timeout=120
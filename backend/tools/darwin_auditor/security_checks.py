@@ -310,20 +310,37 @@ class SecurityChecker:
 
     def check_file(self, file_path: str) -> List[SecurityFinding]:
         """Run all security checks on a single file."""
-        findings = []
-
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read()
-                lines = content.split('\n')
         except Exception as e:
-            return [SecurityFinding(
-                category=OWASPCategory.A04_INSECURE_DESIGN,
-                severity="info",
-                title="Could not read file",
-                description=f"Error reading file: {e}",
-                file_path=file_path
-            )]
+            return [self.unreadable_finding(file_path, e)]
+
+        return self.check_source(file_path, content)
+
+    def unreadable_finding(self, file_path: str, error: Exception) -> SecurityFinding:
+        return SecurityFinding(
+            category=OWASPCategory.A04_INSECURE_DESIGN,
+            severity="info",
+            title="Could not read file",
+            description=f"Error reading file: {error}",
+            file_path=file_path
+        )
+
+    def check_source(
+        self,
+        file_path: str,
+        content: str,
+        tree: Optional[ast.AST] = None,
+        syntax_error: Optional[SyntaxError] = None
+    ) -> List[SecurityFinding]:
+        """
+        Run all security checks on already-read source. Pass `tree` (or the
+        `syntax_error` that parsing raised) to reuse the caller's parse
+        instead of parsing again.
+        """
+        findings = []
+        lines = content.split('\n')
 
         # Pattern-based checks using loaded patterns
         for pattern in self.pattern_loader.patterns:
@@ -358,11 +375,13 @@ class SecurityChecker:
                 pass  # Invalid regex pattern
 
         # AST-based checks for complex patterns
-        try:
-            tree = ast.parse(content)
+        if tree is None and syntax_error is None:
+            try:
+                tree = ast.parse(content)
+            except SyntaxError:
+                pass  # Skip AST checks for files with syntax errors
+        if tree is not None:
             findings.extend(self._ast_checks(tree, file_path, lines))
-        except SyntaxError:
-            pass  # Skip AST checks for files with syntax errors
 
         return findings
 
@@ -421,14 +440,27 @@ class SecurityChecker:
             return '.'.join(reversed(parts))
         return ""
 
-    def run_bandit(self, target_path: str = None) -> List[SecurityFinding]:
-        """Run Bandit security scanner and convert results."""
-        target = target_path or str(self.project_root)
+    def run_bandit(self, target_path: str = None, files: List[str] = None) -> List[SecurityFinding]:
+        """
+        Run Bandit security scanner and convert results.
+
+        With `files`, only those files are scanned (used by incremental audits).
+        """
+        if files is not None:
+            findings = []
+            for start in range(0, len(files), 200):
+                findings.extend(self._run_bandit(files[start:start + 200]))
+            return findings
+        return self._run_bandit(['-r', target_path or str(self.project_root)])
+
+    def _run_bandit(self, targets: List[str]) -> List[SecurityFinding]:
         findings = []
+        if not targets:
+            return findings
 
         try:
             result = subprocess.run(
-                ['bandit', '-r', target, '-f', 'json', '-q'],
+                ['bandit', *targets, '-f', 'json', '-q'],
                 capture_output=True,
                 text=True,
                 timeout=120
@@ -498,10 +530,11 @@ class SecurityChecker:
         }
         return mappings.get(test_id, OWASPCategory.A04_INSECURE_DESIGN)
 
-    def check_dependencies(self) -> List[SecurityFinding]:
-        """Check for vulnerable dependencies using safety."""
+    def check_dependencies(self, requirements_files: Optional[List[Path]] = None) -> List[SecurityFinding]:
+        """Check for vulnerable dependencies using safety (all requirements*.txt unless given)."""
         findings = []
-        requirements_files = list(self.project_root.glob('**/requirements*.txt'))
+        if requirements_files is None:
+            requirements_files = list(self.project_root.glob('**/requirements*.txt'))
 
         for req_file in requirements_files:
             try:
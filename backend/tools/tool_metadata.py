@@ -295,7 +295,7 @@ TOOL_METADATA: Dict[str, Dict[str, Any]] = {
         "cooldown_minutes": 5
     },
     "backup_tool": {
-        "description": "Create complete backups of Darwin (code + data + config) to USB drive at /backup. Includes integrity verification with checksums.",
+        "description": "Create complete or incremental (deduplicated) backups of Darwin (code + data + config) to USB drive at /backup, restore them, and verify their integrity with checksums.",
         "category": ToolCategory.REFLECTION,
         "mode": ToolMode.BOTH,
         "cost": 3,
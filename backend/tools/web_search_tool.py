@@ -1,8 +1,9 @@
 """
 Web Search Tool — Lets Darwin explore the web autonomously.
 
-Uses aiohttp + BeautifulSoup to fetch and extract content from URLs,
-and DuckDuckGo Lite for search queries (no API key needed).
+Fetches URLs through the shared fetch cache (services.fetch_cache),
+extracts their content with BeautifulSoup, and uses DuckDuckGo Lite for
+search queries (no API key needed).
 
 Available via autonomous loop as:
 - web_search_tool.search — search the web for a query
@@ -33,6 +34,11 @@ _TIMEOUT_SECONDS = 15
 # User agent
 _USER_AGENT = 'Mozilla/5.0 (Darwin AI Bot) Learning/1.0'
 
+# Fetch-cache name of _extract_page_content's output; bump when it changes
+_PAGE_EXTRACTOR = 'web_search_tool.page/v2'
+# Bodies of other content types are never downloaded
+_PAGE_CONTENT_TYPES = ('text', 'html')
+
 
 def _is_safe_url(url: str) -> bool:
     """Check if URL is safe to fetch (no internal/metadata endpoints)."""
@@ -189,72 +195,76 @@ def fetch_url(url: str) -> Dict[str, Any]:
         return {'success': False, 'error': f'URL blocked for safety: {url}'}
 
     try:
-        import asyncio
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                result = pool.submit(_fetch_url_sync, url).result(timeout=30)
-            return result
-        else:
-            return asyncio.run(_fetch_url_async(url))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return _fetch_url_sync(url)
+
+        # Called from inside an event loop: fetch on a worker thread
+        import concurrent.futures
+        with concurrent.futures.ThreadPoolExecutor() as pool:
+            result = pool.submit(_fetch_url_sync, url).result(timeout=30)
+        return result
     except Exception as e:
         logger.warning(f"URL fetch failed: {e}")
         return {'success': False, 'error': str(e), 'url': url}
 
 
 def _fetch_url_sync(url: str) -> Dict[str, Any]:
-    """Synchronous URL fetch."""
+    """Synchronous URL fetch through the shared fetch cache."""
     try:
-        import urllib.request
-
-        req = urllib.request.Request(url, headers={'User-Agent': _USER_AGENT})
-        with urllib.request.urlopen(req, timeout=_TIMEOUT_SECONDS) as response:
-            # Only process text/html
-            content_type = response.headers.get('Content-Type', '')
-            if 'text' not in content_type and 'html' not in content_type:
-                return {
-                    'success': False,
-                    'error': f'Not an HTML page: {content_type}',
-                    'url': url,
-                }
-
-            html = response.read().decode('utf-8', errors='replace')
+        from services.fetch_cache import get_fetch_cache
 
-        return _extract_page_content(html, url)
+        cache = get_fetch_cache()
+        response = cache.fetch_sync(
+            url,
+            headers={'User-Agent': _USER_AGENT},
+            timeout=_TIMEOUT_SECONDS,
+            content_types=_PAGE_CONTENT_TYPES,
+        )
+        return _page_result(cache, response, url)
 
     except Exception as e:
         return {'success': False, 'error': str(e), 'url': url}
 
 
 async def _fetch_url_async(url: str) -> Dict[str, Any]:
-    """Async URL fetch."""
+    """Async URL fetch through the shared fetch cache."""
     try:
-        import aiohttp
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                url,
-                headers={'User-Agent': _USER_AGENT},
-                timeout=aiohttp.ClientTimeout(total=_TIMEOUT_SECONDS),
-                allow_redirects=True,
-            ) as response:
-                content_type = response.headers.get('Content-Type', '')
-                if 'text' not in content_type and 'html' not in content_type:
-                    return {
-                        'success': False,
-                        'error': f'Not an HTML page: {content_type}',
-                        'url': url,
-                    }
-
-                html = await response.text()
-
-        return _extract_page_content(html, url)
+        from services.fetch_cache import get_fetch_cache
+
+        cache = get_fetch_cache()
+        response = await cache.fetch(
+            url,
+            headers={'User-Agent': _USER_AGENT},
+            timeout=_TIMEOUT_SECONDS,
+            client_name='web_search_tool',
+            content_types=_PAGE_CONTENT_TYPES,
+        )
+        return await asyncio.to_thread(_page_result, cache, response, url)
 
     except Exception as e:
         return {'success': False, 'error': str(e), 'url': url}
 
 
+def _page_result(cache, response, url: str) -> Dict[str, Any]:
+    """Extracted page for a fetch response (extraction is cached by content)."""
+    # Only process text/html: other types come back as 415 without a body,
+    # but a cached entry may have been stored for a caller accepting any type
+    content_type = response.headers.get('content-type', '')
+    if response.status == 415 or (response.ok and 'text' not in content_type and 'html' not in content_type):
+        return {
+            'success': False,
+            'error': f'Not an HTML page: {content_type}',
+            'url': url,
+        }
+
+    if not response.ok:
+        return {'success': False, 'error': f'HTTP {response.status}', 'url': url}
+
+    return cache.extract_sync(_PAGE_EXTRACTOR, response.text(), _extract_page_content, url)
+
+
 def _extract_page_content(html: str, url: str) -> Dict[str, Any]:
     """Extract title and main text content from HTML."""
     try:
@@ -1,49 +1,288 @@
-"""Logging configuration for Darwin System"""
-import logging
+"""Logging configuration for Darwin System
+
+Every logger from setup_logger() shares one pipeline:
+
+- a QueueHandler that only merges the message and enqueues the record
+  (never blocks: records that don't fit in the bounded queue are dropped
+  and counted)
+- an optional per-call-site rate limit in front of it, so a hot INFO line
+  can't flood the queue (off by default; WARNING and above always pass)
+- one background QueueListener thread that formats records as JSON and
+  writes them to the console and to a single rotating log file
+"""
+import atexit
 import json
-from datetime import datetime
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+LOG_DIR = Path("/app/logs")
+LOG_FILE = "darwin.log"
 
 
 class JSONFormatter(logging.Formatter):
-    """Custom JSON formatter for structured logging"""
+    """Custom JSON formatter for structured logging
+
+    The fields that depend only on the logger and call site are encoded
+    once and reused; per record only the timestamp and message are encoded.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._encode = json.JSONEncoder().encode
+        self._heads: Dict[Tuple[str, str], str] = {}
+        self._tails: Dict[Tuple[str, str, int], str] = {}
 
     def format(self, record: logging.LogRecord) -> str:
-        log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "level": record.levelname,
-            "logger": record.name,
-            "message": record.getMessage(),
-            "module": record.module,
-            "function": record.funcName,
-            "line": record.lineno
-        }
+        head_key = (record.levelname, record.name)
+        head = self._heads.get(head_key)
+        if head is None:
+            head = f'"level": {self._encode(record.levelname)}, "logger": {self._encode(record.name)}, '
+            self._heads[head_key] = head
 
-        if record.exc_info:
-            log_data["exception"] = self.formatException(record.exc_info)
+        tail_key = (record.module, record.funcName, record.lineno)
+        tail = self._tails.get(tail_key)
+        if tail is None:
+            tail = (f'"module": {self._encode(record.module)}, '
+                    f'"function": {self._encode(record.funcName)}, "line": {record.lineno}')
+            self._tails[tail_key] = tail
+
+        # record.created, not now: records are formatted on the listener thread
+        timestamp = datetime.fromtimestamp(record.created, timezone.utc).replace(tzinfo=None).isoformat()
+        parts = [
+            f'{{"timestamp": "{timestamp}", ', head,
+            f'"message": {self._encode(record.getMessage())}, ', tail
+        ]
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            parts.append(f', "exception": {self._encode(record.exc_text)}')
 
         if hasattr(record, "task_id"):
-            log_data["task_id"] = record.task_id
+            parts.append(f', "task_id": {self._encode(record.task_id)}')
+
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            parts.append(f', "suppressed": {suppressed}')
+
+        parts.append('}')
+        return ''.join(parts)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per call site (logger, file, line) for records below WARNING.
+
+    A call site may log `burst` records at once and `rate` per second after
+    that. The next record let through carries the number suppressed in
+    between as its `suppressed` field.
+    """
+
+    def __init__(self, rate: float = 0.0, burst: int = 20):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.suppressed_total = 0
+        self._sites: Dict[Tuple[str, str, int], list] = {}  # [tokens, updated, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate <= 0:
+            return True
+
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                site = self._sites[key] = [float(self.burst), now, 0]
+            site[0] = min(self.burst, site[0] + (now - site[1]) * self.rate)
+            site[1] = now
+            if site[0] < 1:
+                site[2] += 1
+                self.suppressed_total += 1
+                return False
+            site[0] -= 1
+            if site[2]:
+                record.suppressed = site[2]
+                site[2] = 0
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks the caller and counts what it drops"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args into the message here (they may change later) but
+        # leave JSON formatting to the listener thread
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+def _stop_listener(listener: logging.handlers.QueueListener):
+    """Let the listener drain its queue, then close its sinks"""
+    if listener._thread is not None:
+        try:
+            listener.stop()
+        except queue.Full:
+            pass  # No room for the stop sentinel; the thread is a daemon
+    for sink in listener.handlers:
+        sink.close()
+
+
+class _LoggingPipeline:
+    """The shared queue, handler, filter and listener behind every logger"""
+
+    def __init__(self, queue_size: int = 10000, rate: float = 0.0, burst: int = 20,
+                 max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                 log_dir: Path = LOG_DIR):
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.handler = DroppingQueueHandler(self.queue)
+        self.rate_limit = RateLimitFilter(rate, burst)
+        self.handler.addFilter(self.rate_limit)
+
+        formatter = JSONFormatter()
+        sinks = []
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        sinks.append(console_handler)
+
+        self.log_path: Optional[Path] = None
+        try:
+            log_dir.mkdir(parents=True, exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_dir / LOG_FILE, maxBytes=max_bytes, backupCount=backup_count
+            )
+            file_handler.setFormatter(formatter)
+            sinks.append(file_handler)
+            self.log_path = log_dir / LOG_FILE
+        except OSError:
+            pass  # Console only when the log directory isn't writable
+
+        self.listener = logging.handlers.QueueListener(self.queue, *sinks, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self):
+        """Flush queued records and stop the listener thread"""
+        _stop_listener(self.listener)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "enqueued": self.handler.enqueued,
+            "dropped": self.handler.dropped,
+            "rate_limited": self.rate_limit.suppressed_total,
+            "rate_per_call_site": self.rate_limit.rate,
+            "burst_per_call_site": self.rate_limit.burst,
+            "log_file": str(self.log_path) if self.log_path else None,
+        }
+
+
+_pipeline: Optional[_LoggingPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def _get_pipeline() -> _LoggingPipeline:
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = _LoggingPipeline()
+                atexit.register(_stop_pipeline)
+    return _pipeline
+
+
+def _stop_pipeline():
+    if _pipeline is not None:
+        _pipeline.stop()
+
+
+def configure_logging(queue_size: Optional[int] = None, rate: Optional[float] = None,
+                      burst: Optional[int] = None, max_bytes: Optional[int] = None,
+                      backup_count: Optional[int] = None):
+    """
+    Apply settings to the shared pipeline.
+
+    Rate limits change in place. A new queue size or rotation policy
+    starts a new listener; loggers keep their handler, which is pointed at
+    the new queue before the old listener drains what is left in the old one.
+    """
+    pipeline = _get_pipeline()
+    if rate is not None:
+        pipeline.rate_limit.rate = rate
+    if burst is not None:
+        pipeline.rate_limit.burst = burst
+
+    file_sink = next((h for h in pipeline.listener.handlers
+                      if isinstance(h, logging.handlers.RotatingFileHandler)), None)
+    current = (
+        pipeline.queue.maxsize,
+        file_sink.maxBytes if file_sink else 10 * 1024 * 1024,
+        file_sink.backupCount if file_sink else 5,
+    )
+    wanted = (
+        current[0] if queue_size is None else queue_size,
+        current[1] if max_bytes is None else max_bytes,
+        current[2] if backup_count is None else backup_count,
+    )
+    if wanted == current:
+        return
+
+    replacement = _LoggingPipeline(
+        queue_size=wanted[0],
+        rate=pipeline.rate_limit.rate,
+        burst=pipeline.rate_limit.burst,
+        max_bytes=wanted[1],
+        backup_count=wanted[2],
+        log_dir=pipeline.log_path.parent if pipeline.log_path else LOG_DIR,
+    )
+    # Keep the handler object (it is attached to every logger) and counters.
+    # Swap first so no record is enqueued behind the old listener's stop sentinel.
+    old_listener = pipeline.listener
+    pipeline.handler.queue = replacement.queue
+    pipeline.queue = replacement.queue
+    pipeline.listener = replacement.listener
+    pipeline.log_path = replacement.log_path
+    _stop_listener(old_listener)
+
 
-        return json.dumps(log_data)
+def get_logging_stats() -> Dict[str, Any]:
+    """Queued, enqueued, dropped (queue full) and rate-limited record counts"""
+    return _get_pipeline().get_stats()
 
 
 def setup_logger(name: str) -> logging.Logger:
-    """Setup logger with JSON formatting"""
+    """Setup logger with JSON formatting (idempotent: one shared queue handler)"""
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
 
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(JSONFormatter())
-    logger.addHandler(console_handler)
-
-    # File handler
-    log_dir = Path("/app/logs")
-    log_dir.mkdir(exist_ok=True)
-    file_handler = logging.FileHandler(log_dir / "darwin.log")
-    file_handler.setFormatter(JSONFormatter())
-    logger.addHandler(file_handler)
+    handler = _get_pipeline().handler
+    if handler not in logger.handlers:
+        logger.addHandler(handler)
 
     return logger
 
@@ -4,6 +4,35 @@ import { WS_BASE } from '../utils/config';
 const WS_URL = WS_BASE;
 const RECONNECT_DELAY = 3000; // 3 seconds
 
+// Partial-output messages: appended to one event per stream, not one per token
+const TOKEN_TYPES = new Set(['generation_token', 'chat_token']);
+
+function streamKey(message) {
+  if (message.stream_id) return message.stream_id;
+  const data = message.data || {};
+  return `${data.task_id}:${data.generation}:${data.solution_index}`;
+}
+
+// Merge token messages into the stream's existing event (or start one)
+function appendEvents(prev, incoming) {
+  const next = [...prev];
+  for (const event of incoming) {
+    if (!TOKEN_TYPES.has(event.type)) {
+      next.push(event);
+      continue;
+    }
+    const index = next.findIndex(
+      (e) => e.type === event.type && e.stream_key === event.stream_key
+    );
+    if (index === -1) {
+      next.push(event);
+    } else {
+      next[index] = { ...next[index], text: next[index].text + event.text };
+    }
+  }
+  return next;
+}
+
 export function useWebSocket() {
   const [socket, setSocket] = useState(null);
   const [events, setEvents] = useState([]);
@@ -15,7 +44,8 @@ export function useWebSocket() {
     if (!shouldConnectRef.current) return;
 
     console.log('🔌 Attempting to connect to WebSocket...');
-    const ws = new WebSocket(`${WS_URL}/ws`);
+    // batch=1: the server may pack several messages into one {type: 'batch'} frame
+    const ws = new WebSocket(`${WS_URL}/ws?batch=1`);
 
     ws.onopen = () => {
       console.log('✅ WebSocket connected');
@@ -29,27 +59,36 @@ export function useWebSocket() {
 
     ws.onmessage = (event) => {
       try {
-        let messageData = JSON.parse(event.data);
-
-        // Handle double-encoded JSON (backend sends JSON string of JSON)
-        if (typeof messageData === 'string') {
-          messageData = JSON.parse(messageData);
-        }
-
-        // Create a proper object with an id
-        const newEvent = {
-          id: Date.now(),
-          type: messageData.type,
-          message_type: messageData.message_type,
-          priority: messageData.priority,
-          message: messageData.message,
-          data: messageData.data,
-          mood: messageData.mood,
-          mood_intensity: messageData.mood_intensity,
-          timestamp: messageData.timestamp
-        };
-
-        setEvents((prev) => [...prev, newEvent]);
+        const frame = JSON.parse(event.data);
+        const messages = frame && frame.type === 'batch' ? frame.messages : [frame];
+
+        const newEvents = messages.map((raw, i) => {
+          let messageData = raw;
+
+          // Handle double-encoded JSON (backend sends JSON string of JSON)
+          if (typeof messageData === 'string') {
+            messageData = JSON.parse(messageData);
+          }
+
+          // Create a proper object with an id
+          return {
+            id: Date.now() + i / 1000,
+            type: messageData.type,
+            message_type: messageData.message_type,
+            priority: messageData.priority,
+            message: messageData.message,
+            data: messageData.data,
+            mood: messageData.mood,
+            mood_intensity: messageData.mood_intensity,
+            timestamp: messageData.timestamp,
+            ...(TOKEN_TYPES.has(messageData.type) && {
+              stream_key: streamKey(messageData),
+              text: messageData.text ?? (messageData.data && messageData.data.text) ?? ''
+            })
+          };
+        });
+
+        setEvents((prev) => appendEvents(prev, newEvents));
       } catch (e) {
         console.error('Error parsing WebSocket message:', e);
       }
@@ -97,10 +136,25 @@ export function useWebSocket() {
     setEvents([]);
   }, []);
 
+  // Token streams are opt-in: ask for a chat stream or an evolution task's tokens
+  const subscribeStream = useCallback((streamId) => {
+    if (socket && socket.readyState === WebSocket.OPEN) {
+      socket.send(JSON.stringify({ type: 'subscribe_stream', stream_id: streamId }));
+    }
+  }, [socket]);
+
+  const subscribeTask = useCallback((taskId) => {
+    if (socket && socket.readyState === WebSocket.OPEN) {
+      socket.send(JSON.stringify({ type: 'subscribe_task', task_id: taskId }));
+    }
+  }, [socket]);
+
   return {
     socket,
     events,
     isConnected,
-    clearEvents
+    clearEvents,
+    subscribeStream,
+    subscribeTask
   };
 }